@@ -12,16 +12,23 @@ Version: 2.0.0
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict, field
+from array import array
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
+from dataclasses import dataclass, asdict, field, fields
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from enum import Enum
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import json
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
+import itertools
 import uuid
 import re
 
+from .file_reader import MAX_TEXT_SIZE, SourceReader
+
 # ============================================================================
 # 增強型數據模型
 # ============================================================================
@@ -70,10 +77,94 @@ class CodeMetrics:
         return asdict(self)
 
 
+# 嚴重程度基礎分（乘以置信度即為問題分數）
+SEVERITY_SCORES = {
+    SeverityLevel.CRITICAL: 10.0,
+    SeverityLevel.HIGH: 7.5,
+    SeverityLevel.MEDIUM: 5.0,
+    SeverityLevel.LOW: 2.5,
+    SeverityLevel.INFO: 1.0
+}
+
+
+# 問題 ID：進程級前綴 + 單調序號，取代每個問題一次 uuid4()
+_ISSUE_ID_PREFIX = uuid.uuid4().hex[:12]
+_issue_sequence = itertools.count(1)
+
+# IssueStore 時間戳列的基準
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# 當前分析的時間戳：同一次分析產生的所有問題共用一個 datetime
+_analysis_time: ContextVar[Optional[datetime]] = ContextVar('analysis_time', default=None)
+
+
+def next_issue_id() -> str:
+    """生成進程內唯一的問題 ID"""
+    return f"{_ISSUE_ID_PREFIX}-{next(_issue_sequence)}"
+
+
+def issue_sequence(issue_id: str) -> int:
+    """next_issue_id() 生成的 ID 的序號；其他 ID 返回 0"""
+    prefix, _, number = issue_id.rpartition('-')
+    if prefix == _ISSUE_ID_PREFIX and number.isdigit():
+        return int(number)
+    return 0
+
+
+def current_analysis_time() -> datetime:
+    """當前分析的時間戳（不在分析中時為當前時間）"""
+    return _analysis_time.get() or datetime.now(timezone.utc)
+
+
+@contextmanager
+def analysis_clock() -> Iterator[datetime]:
+    """
+    固定一次分析的時間戳
+
+    嵌套使用時沿用最外層的時間戳。
+    """
+    current = _analysis_time.get()
+    if current is not None:
+        yield current
+        return
+    now = datetime.now(timezone.utc)
+    token = _analysis_time.set(now)
+    try:
+        yield now
+    finally:
+        _analysis_time.reset(token)
+
+
+@lru_cache(maxsize=4096)
+def render_message(template: str, *args: Any) -> str:
+    """按模板生成消息；相同參數返回同一個字符串對象"""
+    return template.format(*args)
+
+
+def with_slots(cls):
+    """
+    為 dataclass 生成帶 __slots__ 的類
+
+    等價於 Python 3.10+ 的 dataclass(slots=True)；Python 3.9 仍在測試矩陣中。
+    字段默認值已保存在生成的 __init__ 中，因此可以移除同名類屬性。
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@with_slots
 @dataclass
 class CodeIssue:
     """增強型代碼問題"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=next_issue_id)
     type: IssueType = IssueType.CODE_QUALITY
     severity: SeverityLevel = SeverityLevel.MEDIUM
     file: str = ""
@@ -83,24 +174,304 @@ class CodeIssue:
     description: str = ""
     suggestion: Optional[str] = None
     code_snippet: Optional[str] = None
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     confidence: float = 0.95  # 置信度 (0-1)
     repair_difficulty: str = "MEDIUM"  # EASY, MEDIUM, HARD
     estimated_repair_time: int = 0  # 秒
-    related_issues: List[str] = field(default_factory=list)
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    related_issues: Tuple[str, ...] = ()
+    timestamp: datetime = field(default_factory=current_analysis_time)
+    
+    def __post_init__(self):
+        # 標籤與關聯問題使用不可變元組，可在問題間共享
+        if type(self.tags) is not tuple:
+            self.tags = tuple(self.tags)
+        if type(self.related_issues) is not tuple:
+            self.related_issues = tuple(self.related_issues)
     
     @property
     def severity_score(self) -> float:
         """計算嚴重程度分數"""
-        severity_scores = {
-            SeverityLevel.CRITICAL: 10.0,
-            SeverityLevel.HIGH: 7.5,
-            SeverityLevel.MEDIUM: 5.0,
-            SeverityLevel.LOW: 2.5,
-            SeverityLevel.INFO: 1.0
-        }
-        return severity_scores.get(self.severity, 5.0) * self.confidence
+        return SEVERITY_SCORES.get(self.severity, 5.0) * self.confidence
+    
+    @property
+    def fingerprint(self) -> str:
+        """確定性指紋：同一位置的同一問題在每次分析中相同"""
+        issue_type = getattr(self.type, 'value', self.type)
+        content = f"{issue_type}:{self.file}:{self.line}:{self.column}:{self.message}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+
+class IssueStore:
+    """
+    列式問題存儲 - 大量問題的緊湊容器
+
+    每個字段一列（array.array），嚴重程度/類型存為枚舉序號，文件路徑、
+    消息文本與修復難度駐留（intern）到共享字符串表，標籤元組同樣駐留。
+    next_issue_id() 生成的 id 只存序號，UTC 時間戳存為紀元微秒；很少出現的
+    字段（code_snippet、related_issues、自定義 id、非 UTC 時間戳）稀疏存儲。
+    消息重複時每行約 65 字節，另加不重複字符串本身的大小。
+
+    質量評分所需的聚合（各嚴重程度計數、各類型計數、分數總和）在追加時
+    增量更新，查詢為 O(1)。
+
+    按索引/迭代訪問時才物化 CodeIssue 視圖；視圖是快照，修改不會寫回存儲。
+    """
+
+    _SEVERITIES = tuple(SeverityLevel)
+    _TYPES = tuple(IssueType)
+    _SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+    _TYPE_CODES = {issue_type: code for code, issue_type in enumerate(_TYPES)}
+    _SEVERITY_WEIGHTS = tuple(SEVERITY_SCORES[severity] for severity in _SEVERITIES)
+
+    def __init__(self, issues: Optional[Iterable[CodeIssue]] = None):
+        # 固定寬度列
+        self._severity = array('b')
+        self._type = array('b')
+        self._line = array('i')
+        self._column = array('i')
+        self._confidence = array('d')
+        self._repair_time = array('i')
+        # 駐留字符串表索引（-1 表示 None）
+        self._file = array('i')
+        self._message = array('i')
+        self._description = array('i')
+        self._suggestion = array('i')
+        self._difficulty = array('i')
+        self._tags = array('i')
+        # next_issue_id() 的序號（0 表示無）與 UTC 紀元微秒
+        self._id_sequence = array('q')
+        self._timestamp = array('q')
+        # 稀疏字段：行號 -> 值（無 id 的行使用 "<存儲前綴>-<行號>"）
+        self._id_prefix = uuid.uuid4().hex[:12]
+        self._ids: Dict[int, str] = {}
+        self._snippets: Dict[int, str] = {}
+        self._related: Dict[int, Tuple[str, ...]] = {}
+        self._other_timestamps: Dict[int, datetime] = {}
+        # 未固定分析時鐘時，未指定時間戳的行共用存儲創建時的時間
+        self._created = datetime.now(timezone.utc)
+
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self._tag_sets: List[tuple] = []
+        self._tag_index: Dict[tuple, int] = {}
+
+        # 增量聚合
+        self._severity_counts = [0] * len(self._SEVERITIES)
+        self._type_counts = [0] * len(self._TYPES)
+        self._score_sum = 0.0
+
+        if issues is not None:
+            self.extend(issues)
+
+    # ---- 寫入 ----
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = index
+        return index
+
+    def _intern_tags(self, tags: Iterable[str]) -> int:
+        key = tuple(tags)
+        index = self._tag_index.get(key)
+        if index is None:
+            index = len(self._tag_sets)
+            self._tag_sets.append(key)
+            self._tag_index[key] = index
+        return index
+
+    def _append_timestamp(self, row: int, timestamp: datetime) -> None:
+        if timestamp.tzinfo is timezone.utc:
+            self._timestamp.append((timestamp - _EPOCH) // _MICROSECOND)
+        else:
+            # naive 或其他時區：原樣保存以便物化時還原
+            self._timestamp.append(0)
+            self._other_timestamps[row] = timestamp
+
+    def add(self,
+            type: IssueType = IssueType.CODE_QUALITY,
+            severity: SeverityLevel = SeverityLevel.MEDIUM,
+            file: str = "",
+            line: int = 0,
+            column: int = 0,
+            message: str = "",
+            description: str = "",
+            suggestion: Optional[str] = None,
+            code_snippet: Optional[str] = None,
+            tags: Iterable[str] = (),
+            confidence: float = 0.95,
+            repair_difficulty: str = "MEDIUM",
+            estimated_repair_time: int = 0,
+            related_issues: Optional[List[str]] = None,
+            timestamp: Optional[datetime] = None,
+            id: Optional[str] = None) -> int:
+        """
+        直接追加一個問題（不創建 CodeIssue 實例）
+
+        Returns:
+            int: 行號（在存儲中的索引）
+        """
+        row = len(self._severity)
+        severity_code = self._SEVERITY_CODES[SeverityLevel(severity)]
+        type_code = self._TYPE_CODES[IssueType(type)]
+
+        self._severity.append(severity_code)
+        self._type.append(type_code)
+        self._line.append(line)
+        self._column.append(column)
+        self._confidence.append(confidence)
+        self._repair_time.append(estimated_repair_time)
+        self._file.append(self._intern(file))
+        self._message.append(self._intern(message))
+        self._description.append(self._intern(description))
+        self._suggestion.append(self._intern(suggestion))
+        self._difficulty.append(self._intern(repair_difficulty))
+        self._tags.append(self._intern_tags(tags))
+        self._append_timestamp(row, timestamp or _analysis_time.get() or self._created)
+
+        sequence = issue_sequence(id) if id is not None else 0
+        self._id_sequence.append(sequence)
+        if id is not None and not sequence:
+            self._ids[row] = id
+        if code_snippet is not None:
+            self._snippets[row] = code_snippet
+        if related_issues:
+            self._related[row] = tuple(related_issues)
+
+        self._severity_counts[severity_code] += 1
+        self._type_counts[type_code] += 1
+        self._score_sum += self._SEVERITY_WEIGHTS[severity_code] * confidence
+        return row
+
+    def append(self, issue: CodeIssue) -> None:
+        """追加一個 CodeIssue（列表兼容接口）"""
+        self.add(
+            type=issue.type,
+            severity=issue.severity,
+            file=issue.file,
+            line=issue.line,
+            column=issue.column,
+            message=issue.message,
+            description=issue.description,
+            suggestion=issue.suggestion,
+            code_snippet=issue.code_snippet,
+            tags=issue.tags,
+            confidence=issue.confidence,
+            repair_difficulty=issue.repair_difficulty,
+            estimated_repair_time=issue.estimated_repair_time,
+            related_issues=issue.related_issues,
+            timestamp=issue.timestamp,
+            id=issue.id
+        )
+
+    def extend(self, issues: Iterable[CodeIssue]) -> None:
+        """追加多個 CodeIssue"""
+        if isinstance(issues, IssueStore):
+            for row in range(len(issues)):
+                self.append(issues[row])
+            return
+        for issue in issues:
+            self.append(issue)
+
+    # ---- 讀取 ----
+
+    def __len__(self) -> int:
+        return len(self._severity)
+
+    def __bool__(self) -> bool:
+        return len(self._severity) > 0
+
+    def __iter__(self) -> Iterator[CodeIssue]:
+        for row in range(len(self._severity)):
+            yield self._materialize(row)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[CodeIssue, List[CodeIssue]]:
+        if isinstance(index, slice):
+            return [self._materialize(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        return self._materialize(index)
+
+    def __repr__(self) -> str:
+        return f"IssueStore({len(self)} issues)"
+
+    def _string(self, index: int) -> Optional[str]:
+        return None if index < 0 else self._strings[index]
+
+    def _id(self, row: int) -> str:
+        sequence = self._id_sequence[row]
+        if sequence:
+            return f"{_ISSUE_ID_PREFIX}-{sequence}"
+        return self._ids.get(row) or f"{self._id_prefix}-{row}"
+
+    def _timestamp_at(self, row: int) -> datetime:
+        timestamp = self._other_timestamps.get(row)
+        if timestamp is None:
+            timestamp = _EPOCH + timedelta(microseconds=self._timestamp[row])
+        return timestamp
+
+    def _materialize(self, row: int) -> CodeIssue:
+        """物化單行為 CodeIssue 視圖"""
+        return CodeIssue(
+            id=self._id(row),
+            type=self._TYPES[self._type[row]],
+            severity=self._SEVERITIES[self._severity[row]],
+            file=self._strings[self._file[row]],
+            line=self._line[row],
+            column=self._column[row],
+            message=self._strings[self._message[row]],
+            description=self._strings[self._description[row]],
+            suggestion=self._string(self._suggestion[row]),
+            code_snippet=self._snippets.get(row),
+            tags=self._tag_sets[self._tags[row]],
+            confidence=self._confidence[row],
+            repair_difficulty=self._strings[self._difficulty[row]],
+            estimated_repair_time=self._repair_time[row],
+            related_issues=self._related.get(row, ()),
+            timestamp=self._timestamp_at(row)
+        )
+
+    # ---- 聚合（O(1)） ----
+
+    def count(self, severity: SeverityLevel) -> int:
+        """指定嚴重程度的問題數"""
+        return self._severity_counts[self._SEVERITY_CODES[SeverityLevel(severity)]]
+
+    def count_type(self, issue_type: IssueType) -> int:
+        """指定類型的問題數"""
+        return self._type_counts[self._TYPE_CODES[IssueType(issue_type)]]
+
+    def severity_counts(self) -> Dict[str, int]:
+        """各嚴重程度計數"""
+        return {severity.value: count for severity, count in zip(self._SEVERITIES, self._severity_counts)}
+
+    def type_counts(self) -> Dict[str, int]:
+        """各類型計數"""
+        return {issue_type.value: count for issue_type, count in zip(self._TYPES, self._type_counts)}
+
+    @property
+    def total_severity_score(self) -> float:
+        """所有問題 severity_score 之和"""
+        return self._score_sum
+
+    def rows(self,
+             severity: Optional[SeverityLevel] = None,
+             type: Optional[IssueType] = None) -> Iterator[int]:
+        """按嚴重程度/類型篩選行號（只掃描編碼列，不物化問題）"""
+        severity_code = None if severity is None else self._SEVERITY_CODES[SeverityLevel(severity)]
+        type_code = None if type is None else self._TYPE_CODES[IssueType(type)]
+        for row in range(len(self._severity)):
+            if severity_code is not None and self._severity[row] != severity_code:
+                continue
+            if type_code is not None and self._type[row] != type_code:
+                continue
+            yield row
 
 
 @dataclass
@@ -113,7 +484,7 @@ class AnalysisResult:
     analysis_timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     duration: float = 0.0
     strategy: AnalysisStrategy = AnalysisStrategy.STANDARD
-    issues: List[CodeIssue] = field(default_factory=list)
+    issues: IssueStore = field(default_factory=IssueStore)
     metrics: CodeMetrics = field(default_factory=lambda: CodeMetrics(
         lines_of_code=0,
         cyclomatic_complexity=0.0,
@@ -128,13 +499,19 @@ class AnalysisResult:
     languages_detected: Set[str] = field(default_factory=set)
     dependencies: Dict[str, str] = field(default_factory=dict)
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        # 傳入問題列表時轉為列式存儲
+        if name == 'issues' and not isinstance(value, IssueStore):
+            value = IssueStore(value)
+        super().__setattr__(name, value)
+    
     @property
     def total_issues(self) -> int:
         return len(self.issues)
     
     @property
     def critical_issues(self) -> int:
-        return sum(1 for i in self.issues if i.severity == SeverityLevel.CRITICAL)
+        return self.issues.count(SeverityLevel.CRITICAL)
     
     @property
     def quality_score(self) -> float:
@@ -142,18 +519,18 @@ class AnalysisResult:
         if not self.issues:
             return 100.0
         
-        total_severity = sum(issue.severity_score for issue in self.issues)
         max_possible_severity = len(self.issues) * 10.0
         
-        quality = 100.0 * (1 - (total_severity / max_possible_severity))
+        quality = 100.0 * (1 - (self.issues.total_severity_score / max_possible_severity))
         return max(0, min(100, quality))
     
     @property
     def risk_level(self) -> str:
         """計算風險等級"""
-        if self.critical_issues >= 5:
+        critical_issues = self.critical_issues
+        if critical_issues >= 5:
             return "CRITICAL"
-        elif self.critical_issues >= 2:
+        elif critical_issues >= 2:
             return "HIGH"
         elif self.quality_score < 50:
             return "MEDIUM"
@@ -200,8 +577,9 @@ class BaseAnalyzer:
                 self.logger.warning(f"Cache retrieval failed: {e}")
             self.metrics['cache_misses'] += 1
         
-        # 執行分析
-        issues = await self._perform_analysis(code, file_path, strategy)
+        # 執行分析（同一次分析的問題共用一個時間戳）
+        with analysis_clock():
+            issues = await self._perform_analysis(code, file_path, strategy)
         
         # 存儲到緩存
         if self.cache_client:
@@ -239,7 +617,7 @@ class PythonAnalyzer(BaseAnalyzer):
                 message="Missing type hints",
                 description="函數缺少類型註解",
                 suggestion="添加類型註解以提高代碼可讀性",
-                tags=["python", "type-hints"],
+                tags=("python", "type-hints"),
                 confidence=0.90
             ))
         
@@ -263,7 +641,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
                 message="Use of 'var' keyword",
                 description="使用過時的 var 關鍵字",
                 suggestion="使用 let 或 const 替代",
-                tags=["javascript", "es6"],
+                tags=("javascript", "es6"),
                 confidence=0.95
             ))
         
@@ -287,7 +665,7 @@ class GoAnalyzer(BaseAnalyzer):
                 message="Unchecked error",
                 description="錯誤未被檢查",
                 suggestion="添加錯誤處理邏輯",
-                tags=["go", "error-handling"],
+                tags=("go", "error-handling"),
                 confidence=0.85
             ))
         
@@ -311,7 +689,7 @@ class RustAnalyzer(BaseAnalyzer):
                 message="Unsafe code block",
                 description="使用不安全的代碼塊",
                 suggestion="確保 unsafe 代碼的安全性",
-                tags=["rust", "unsafe"],
+                tags=("rust", "unsafe"),
                 confidence=0.99
             ))
         
@@ -335,7 +713,7 @@ class JavaAnalyzer(BaseAnalyzer):
                 message="Potential null pointer",
                 description="可能存在空指針異常",
                 suggestion="添加空值檢查",
-                tags=["java", "null-safety"],
+                tags=("java", "null-safety"),
                 confidence=0.80
             ))
         
@@ -359,7 +737,7 @@ class CppAnalyzer(BaseAnalyzer):
                 message="Raw pointer with new",
                 description="使用原始指針可能導致記憶體洩漏",
                 suggestion="使用智能指針 (std::unique_ptr, std::shared_ptr)",
-                tags=["cpp", "memory-management"],
+                tags=("cpp", "memory-management"),
                 confidence=0.90
             ))
         
@@ -489,11 +867,11 @@ class StaticAnalyzer(BaseAnalyzer):
                         file=file_path,
                         line=line_num,
                         column=1,
-                        message=f"Hardcoded {secret_type} detected",
-                        description=f"代碼中檢測到硬編碼的 {secret_type}，存在安全風險",
+                        message=render_message("Hardcoded {} detected", secret_type),
+                        description=render_message("代碼中檢測到硬編碼的 {}，存在安全風險", secret_type),
                         suggestion="使用環境變量、密鑰管理服務（如 AWS Secrets Manager）或配置文件",
                         code_snippet=line.strip(),
-                        tags=["security", "secrets", "credentials"],
+                        tags=("security", "secrets", "credentials"),
                         confidence=0.98,
                         repair_difficulty="EASY",
                         estimated_repair_time=300
@@ -525,7 +903,7 @@ class StaticAnalyzer(BaseAnalyzer):
                         description="檢測到潛在的 SQL 注入漏洞，使用字符串連接構建 SQL 查詢",
                         suggestion="使用參數化查詢（Prepared Statements）或 ORM 框架",
                         code_snippet=line.strip(),
-                        tags=["security", "sql", "injection"],
+                        tags=("security", "sql", "injection"),
                         confidence=0.85,
                         repair_difficulty="MEDIUM",
                         estimated_repair_time=600
@@ -559,7 +937,7 @@ class StaticAnalyzer(BaseAnalyzer):
                         description="檢測到潛在的跨站腳本 (XSS) 漏洞",
                         suggestion="使用 textContent 而不是 innerHTML，或使用模板引擎進行轉義",
                         code_snippet=line.strip(),
-                        tags=["security", "xss", "web"],
+                        tags=("security", "xss", "web"),
                         confidence=0.90,
                         repair_difficulty="MEDIUM",
                         estimated_repair_time=500
@@ -582,7 +960,7 @@ class StaticAnalyzer(BaseAnalyzer):
                     message="Missing CSRF protection",
                     description="表單缺少 CSRF 令牌保護",
                     suggestion="添加 CSRF 令牌到表單",
-                    tags=["security", "csrf", "web"],
+                    tags=("security", "csrf", "web"),
                     confidence=0.75,
                     repair_difficulty="EASY",
                     estimated_repair_time=300
@@ -614,7 +992,7 @@ class StaticAnalyzer(BaseAnalyzer):
                         description="檢測到不安全的反序列化操作",
                         suggestion="使用安全的序列化方法，避免 eval/exec",
                         code_snippet=line.strip(),
-                        tags=["security", "deserialization"],
+                        tags=("security", "deserialization"),
                         confidence=0.92,
                         repair_difficulty="MEDIUM",
                         estimated_repair_time=400
@@ -641,11 +1019,11 @@ class StaticAnalyzer(BaseAnalyzer):
                         file=file_path,
                         line=line_num,
                         column=1,
-                        message=f"Weak cryptographic algorithm: {crypto_type}",
-                        description=f"使用弱加密算法 {crypto_type}",
+                        message=render_message("Weak cryptographic algorithm: {}", crypto_type),
+                        description=render_message("使用弱加密算法 {}", crypto_type),
                         suggestion="使用更安全的算法 (如 SHA256, bcrypt)",
                         code_snippet=line.strip(),
-                        tags=["security", "cryptography"],
+                        tags=("security", "cryptography"),
                         confidence=0.95,
                         repair_difficulty="EASY",
                         estimated_repair_time=200
@@ -668,7 +1046,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message=f"High cyclomatic complexity: {complexity}",
                 description=f"函數複雜度為 {complexity}，建議值為 10 以下",
                 suggestion="考慮將函數分解為更小的單元",
-                tags=["quality", "complexity"],
+                tags=("quality", "complexity"),
                 confidence=0.88,
                 repair_difficulty="HARD",
                 estimated_repair_time=1800
@@ -685,7 +1063,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message=f"Code duplication: {duplication_ratio*100:.1f}%",
                 description=f"檢測到 {duplication_ratio*100:.1f}% 的代碼重複",
                 suggestion="提取公共代碼到共享模塊",
-                tags=["quality", "duplication"],
+                tags=("quality", "duplication"),
                 confidence=0.70,
                 repair_difficulty="MEDIUM",
                 estimated_repair_time=1200
@@ -707,7 +1085,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message="N+1 query pattern detected",
                 description="檢測到 N+1 查詢模式",
                 suggestion="使用 JOIN 或批量查詢優化",
-                tags=["performance", "database"],
+                tags=("performance", "database"),
                 confidence=0.82,
                 repair_difficulty="MEDIUM",
                 estimated_repair_time=900
@@ -723,7 +1101,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message="Inefficient nested loop",
                 description="檢測到低效的嵌套循環",
                 suggestion="考慮使用哈希表優化",
-                tags=["performance", "algorithm"],
+                tags=("performance", "algorithm"),
                 confidence=0.75,
                 repair_difficulty="MEDIUM",
                 estimated_repair_time=600
@@ -746,7 +1124,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message=f"Long file: {len(lines)} lines",
                 description=f"文件過長 ({len(lines)} 行)",
                 suggestion="考慮將文件拆分為更小的模塊",
-                tags=["maintainability", "file-size"],
+                tags=("maintainability", "file-size"),
                 confidence=0.80,
                 repair_difficulty="HARD",
                 estimated_repair_time=2400
@@ -771,10 +1149,10 @@ class StaticAnalyzer(BaseAnalyzer):
                     severity=SeverityLevel.LOW,
                     file=file_path,
                     line=1,
-                    message=f"Deprecated module: {old_module}",
-                    description=f"使用過時的模塊 {old_module}",
+                    message=render_message("Deprecated module: {}", old_module),
+                    description=render_message("使用過時的模塊 {}", old_module),
                     suggestion=f"使用 {new_module} 替代",
-                    tags=["dependency", "deprecated"],
+                    tags=("dependency", "deprecated"),
                     confidence=0.95,
                     repair_difficulty="EASY",
                     estimated_repair_time=300
@@ -796,7 +1174,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message="Image missing alt attribute",
                 description="圖片缺少 alt 屬性",
                 suggestion="為所有圖片添加描述性的 alt 屬性",
-                tags=["accessibility", "html"],
+                tags=("accessibility", "html"),
                 confidence=0.90,
                 repair_difficulty="EASY",
                 estimated_repair_time=120
@@ -818,7 +1196,7 @@ class StaticAnalyzer(BaseAnalyzer):
                 message="Missing license declaration",
                 description="文件缺少許可證聲明",
                 suggestion="在文件頭部添加許可證聲明",
-                tags=["compliance", "license"],
+                tags=("compliance", "license"),
                 confidence=0.60,
                 repair_difficulty="EASY",
                 estimated_repair_time=180
@@ -856,6 +1234,7 @@ class CodeAnalysisEngine:
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
         self.cache_client = cache_client
+        self.reader = SourceReader(max_size=config.get('max_file_size', MAX_TEXT_SIZE))
         self.analyzers: List[BaseAnalyzer] = [
             StaticAnalyzer(config, cache_client)
         ]
@@ -877,13 +1256,16 @@ class CodeAnalysisEngine:
             List[CodeIssue]: 問題列表
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
+            code = self.reader.read_text(file_path)
+            if code is None:
+                # 二進制、壓縮或超限文件不參與分析
+                return []
             
             all_issues = []
-            for analyzer in self.analyzers:
-                issues = await analyzer.analyze(code, file_path, strategy)
-                all_issues.extend(issues)
+            with analysis_clock():
+                for analyzer in self.analyzers:
+                    issues = await analyzer.analyze(code, file_path, strategy)
+                    all_issues.extend(issues)
             
             return all_issues
         except Exception as e:
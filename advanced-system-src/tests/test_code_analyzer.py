@@ -25,6 +25,8 @@ from services.code_analyzer import (
     CodeMetrics,
     CodeIssue,
     AnalysisResult,
+    IssueStore,
+    analysis_clock,
     StaticAnalyzer,
     PythonAnalyzer,
     JavaScriptAnalyzer,
@@ -158,6 +160,133 @@ class TestDataModels:
         )
         assert low_risk_result.risk_level == "LOW"
 
+    def test_analysis_result_wraps_issue_list(self):
+        """測試問題列表轉為列式存儲"""
+        result = AnalysisResult(issues=[CodeIssue(severity=SeverityLevel.HIGH)])
+        assert isinstance(result.issues, IssueStore)
+        
+        result.issues = [CodeIssue(severity=SeverityLevel.CRITICAL, confidence=1.0)]
+        assert isinstance(result.issues, IssueStore)
+        assert result.critical_issues == 1
+        assert result.quality_score == 0.0
+
+
+    def test_code_issue_ids_and_fingerprint(self):
+        """測試序號 ID 與確定性指紋"""
+        first = CodeIssue(file="a.py", line=1, message="m")
+        second = CodeIssue(file="a.py", line=1, message="m")
+        
+        assert first.id != second.id
+        assert first.fingerprint == second.fingerprint
+        assert CodeIssue(file="a.py", line=2, message="m").fingerprint != first.fingerprint
+        assert not hasattr(first, '__dict__')
+        
+        # 列表標籤轉為共享元組
+        assert CodeIssue(tags=["x", "y"]).tags == ("x", "y")
+
+    def test_analysis_clock_shares_timestamp(self):
+        """測試同一次分析共用時間戳"""
+        with analysis_clock() as now:
+            issues = [CodeIssue() for _ in range(3)]
+            with analysis_clock() as nested:
+                assert nested is now
+        
+        assert all(issue.timestamp is now for issue in issues)
+        assert CodeIssue().timestamp is not now
+
+
+class TestIssueStore:
+    """測試列式問題存儲"""
+
+    def test_round_trip(self):
+        """測試追加與物化"""
+        issue = CodeIssue(
+            type=IssueType.SECURITY,
+            severity=SeverityLevel.HIGH,
+            file="app.py",
+            line=12,
+            column=4,
+            message="Hardcoded Password detected",
+            description="desc",
+            suggestion="use env",
+            code_snippet="password = 'x'",
+            tags=["security", "secrets"],
+            confidence=0.98,
+            repair_difficulty="EASY",
+            estimated_repair_time=300,
+            related_issues=["other"],
+        )
+        store = IssueStore([issue])
+        
+        assert len(store) == 1
+        assert store[0] == issue
+        assert store[-1].id == issue.id
+        assert list(store) == [issue]
+        assert store[:5] == [issue]
+        with pytest.raises(IndexError):
+            store[1]
+
+    def test_add_without_code_issue(self):
+        """測試直接追加（不創建 CodeIssue）"""
+        store = IssueStore()
+        row = store.add(type="PERFORMANCE", severity="LOW", file="a.py", line=3, tags=("perf",))
+        
+        assert row == 0
+        issue = store[0]
+        assert issue.type == IssueType.PERFORMANCE
+        assert issue.severity == SeverityLevel.LOW
+        assert issue.tags == ("perf",)
+        # 未指定 id 時每次物化得到相同 id
+        assert store[0].id == issue.id
+
+    def test_interning(self):
+        """測試文件路徑與消息駐留"""
+        store = IssueStore()
+        for line in range(1000):
+            store.add(file="big.py", line=line, message="Line too long", tags=["style"])
+        
+        assert len(store) == 1000
+        assert len(store._strings) <= 4  # file, message, description, repair difficulty
+        assert len(store._tag_sets) == 1
+
+    def test_ids_and_timestamps_stored_compactly(self):
+        """測試序號 id 與 UTC 時間戳不佔用稀疏字典，其他值原樣保留"""
+        naive = datetime(2024, 1, 1, 12, 0)
+        issues = [CodeIssue(line=line) for line in range(100)]
+        issues.append(CodeIssue(id="custom-id", timestamp=naive))
+        store = IssueStore(issues)
+        
+        assert list(store) == issues
+        assert store._ids == {100: "custom-id"}
+        assert store._other_timestamps == {100: naive}
+        
+        # 未固定分析時鐘時，未指定時間戳的行共用同一時間
+        store.add(line=1)
+        store.add(line=2)
+        assert store[101].timestamp == store[102].timestamp
+        with analysis_clock() as now:
+            store.add(line=3)
+        assert store[103].timestamp == now
+
+    def test_aggregates_match_issue_scan(self):
+        """測試增量聚合與逐個計算一致"""
+        severities = list(SeverityLevel)
+        types = list(IssueType)
+        issues = [
+            CodeIssue(severity=severities[i % len(severities)], type=types[i % len(types)],
+                      confidence=0.5 + (i % 5) / 10)
+            for i in range(200)
+        ]
+        store = IssueStore(issues)
+        
+        assert store.count(SeverityLevel.CRITICAL) == sum(1 for i in issues if i.severity == SeverityLevel.CRITICAL)
+        assert store.count_type(IssueType.SECURITY) == sum(1 for i in issues if i.type == IssueType.SECURITY)
+        assert store.total_severity_score == pytest.approx(sum(i.severity_score for i in issues))
+        assert sum(store.severity_counts().values()) == 200
+        assert sum(store.type_counts().values()) == 200
+        assert [store[row] for row in store.rows(severity=SeverityLevel.HIGH)] == \
+            [i for i in issues if i.severity == SeverityLevel.HIGH]
+
 
 # ============================================================================
 # 測試靜態分析器
@@ -6,10 +6,12 @@ from .static_analyzer import StaticAnalyzer
 from .security_scanner import SecurityScanner
 from .performance_analyzer import PerformanceAnalyzer
 from .architecture_analyzer import ArchitectureAnalyzer
+from .file_discovery import FileDiscovery
 
 __all__ = [
     "StaticAnalyzer",
     "SecurityScanner",
     "PerformanceAnalyzer",
     "ArchitectureAnalyzer",
+    "FileDiscovery",
 ]
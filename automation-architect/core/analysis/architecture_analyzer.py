@@ -3,9 +3,17 @@ Architecture Analyzer - 架構分析器
 分析代碼架構和依賴關係
 """
 
+import ast
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .file_discovery import FileDiscovery
+from .file_reader import MAX_TEXT_SIZE, SourceReader
+from .import_graph import ImportGraph
 
 try:
     from loguru import logger
@@ -24,36 +32,407 @@ class ArchitectureIssue:
     recommendation: Optional[str] = None
 
 
+# 一條原始導入：(相對層級, 模塊名, from 導入的名稱；import 語句為 None)
+RawImport = Tuple[int, str, Optional[Tuple[str, ...]]]
+
+IMPORT_CACHE_VERSION = 1
+# 待解析文件少於此數時不啟動進程池
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNK_SIZE = 32
+MAX_FAN_OUT = 20
+
+_reader: Optional[SourceReader] = None
+
+
+def extract_imports(file_path: str) -> Optional[List[RawImport]]:
+    """
+    從源文件的 AST 中提取導入語句（進程池工作函數）
+
+    Returns:
+        Optional[List[RawImport]]: 導入列表；無法讀取或解析的文件返回 None
+    """
+    global _reader
+    if _reader is None:
+        _reader = SourceReader(max_size=MAX_TEXT_SIZE)
+    try:
+        code = _reader.read_text(file_path)
+    except OSError:
+        return None
+    if code is None:
+        return None
+    if 'import' not in code:
+        return []
+    try:
+        tree = ast.parse(code, filename=file_path)
+    except (SyntaxError, ValueError):
+        return None
+
+    imports: List[RawImport] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, None) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.level, node.module or '', tuple(alias.name for alias in node.names)))
+    return imports
+
+
 class ArchitectureAnalyzer:
     """
     架構分析器
-    
+
     分析代碼架構問題：
     - 循環依賴
     - 耦合度
     - 模塊邊界
     - 依賴關係
+
+    一次遍歷代碼庫構建 Python 模塊導入圖（未命中緩存的文件在進程池中並行
+    解析，導入列表按文件內容哈希緩存），圖以整數節點 ID 和 CSR 數組存儲；
+    在圖上計算強連通分量、扇入 / 扇出 / 不穩定度並檢查分層規則。
+
+    配置：
+    - layers: 自上而下的層列表，每層為模塊前綴或前綴列表；下層不能導入上層
+    - forbidden_dependencies: [[源前綴, 目標前綴], ...] 禁止的依賴
+    - max_fan_out: 傳出依賴數上限（默認 20）
+    - import_cache: 導入緩存文件路徑（不設置時只緩存在內存中）
+    - max_workers: 解析進程數
     """
-    
+
     def __init__(self, config: Optional[Dict] = None):
         """初始化架構分析器"""
         self.config = config or {}
+        self.discovery = FileDiscovery(self.config)
+        self.last_graph: Optional[ImportGraph] = None
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self._import_cache: Dict[str, Optional[List[RawImport]]] = {}
+        self._load_import_cache()
         logger.info('ArchitectureAnalyzer initialized')
-    
+
     async def analyze(self, code_path: str) -> List[ArchitectureIssue]:
         """
         執行架構分析
-        
+
         Args:
             code_path: 代碼路徑
-            
+
         Returns:
             List[ArchitectureIssue]: 架構問題列表
         """
         logger.info(f'Starting architecture analysis for: {code_path}')
-        
+
+        path = Path(code_path)
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = self.discovery.discover(path, {'.py'})
+        else:
+            logger.error(f'Invalid path: {code_path}')
+            raise ValueError(f'Invalid path: {code_path}')
+
+        graph = self.build_graph(files)
+        self.last_graph = graph
+        self.metrics = self._compute_metrics(graph)
+
+        issues = []
+        issues.extend(self._check_cycles(graph))
+        issues.extend(self._check_layers(graph))
+        issues.extend(self._check_fan_out(graph))
+
+        logger.info(
+            f'Architecture analysis completed: {len(graph)} modules, '
+            f'{graph.edge_count} dependencies, {len(issues)} issues'
+        )
+        return issues
+
+    # ---- 構建導入圖 ----
+
+    def build_graph(self, files: Sequence[Path]) -> ImportGraph:
+        """
+        由 Python 文件構建模塊導入圖
+
+        Args:
+            files: Python 文件列表
+
+        Returns:
+            ImportGraph: 導入圖（只包含這些文件對應的模塊）
+        """
+        paths = [os.path.abspath(f) for f in files]
+        names = self._module_names(paths)
+
+        # 同名模塊（不同源碼根目錄）以源碼根目錄區分
+        by_name: Dict[str, List[int]] = {}
+        for node, (name, _, _) in enumerate(names):
+            by_name.setdefault(name, []).append(node)
+        labels = [
+            name if len(by_name[name]) == 1 else f'{name} ({source_root})'
+            for name, source_root, _ in names
+        ]
+
+        imports = self._collect_imports(paths)
+        adjacency = []
+        for node, raw_imports in enumerate(imports):
+            name, source_root, is_package = names[node]
+            targets = set()
+            for raw in raw_imports or ():
+                base, submodules = self._import_targets(raw, name, is_package)
+                # from pkg import mod：mod 為子模塊時依賴子模塊，否則依賴 pkg
+                resolved = [
+                    self._resolve(sub, source_root, by_name, names, exact=True)
+                    for sub in submodules
+                ]
+                if resolved and all(target is not None for target in resolved):
+                    targets.update(resolved)
+                    continue
+                targets.update(target for target in resolved if target is not None)
+                target = self._resolve(base, source_root, by_name, names)
+                if target is not None:
+                    targets.add(target)
+            adjacency.append(targets)
+
+        return ImportGraph(labels, adjacency)
+
+    def _module_names(self, paths: List[str]) -> List[Tuple[str, str, bool]]:
+        """
+        計算每個文件的模塊名
+
+        從文件所在目錄向上，直到不含 __init__.py 的目錄為源碼根目錄；
+        模塊名為相對源碼根目錄的點分路徑。
+
+        Returns:
+            List[Tuple[str, str, bool]]: (模塊名, 源碼根目錄, 是否為包的 __init__)
+        """
+        package_dirs: Dict[str, bool] = {}
+
+        def is_package(directory: str) -> bool:
+            if directory not in package_dirs:
+                package_dirs[directory] = os.path.isfile(os.path.join(directory, '__init__.py'))
+            return package_dirs[directory]
+
+        roots: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        names = []
+        for path in paths:
+            directory, filename = os.path.split(path)
+            if directory not in roots:
+                parts: List[str] = []
+                current = directory
+                while is_package(current):
+                    current, part = os.path.split(current)
+                    parts.append(part)
+                roots[directory] = (current, tuple(reversed(parts)))
+            source_root, package = roots[directory]
+            stem = filename[:-3] if filename.endswith('.py') else filename
+            is_init = stem == '__init__'
+            parts = package if is_init else package + (stem,)
+            names.append(('.'.join(parts) or stem, source_root, is_init))
+        return names
+
+    @staticmethod
+    def _import_targets(raw: RawImport, module: str, is_package: bool) -> Tuple[str, List[str]]:
+        """
+        一條導入指向的模塊名
+
+        Returns:
+            Tuple[str, List[str]]: (被導入的模塊, from 導入的名稱可能對應的子模塊)
+        """
+        level, name, imported = raw
+        if level:
+            package = module.split('.') if is_package else module.split('.')[:-1]
+            if level > 1:
+                if level - 1 > len(package):
+                    return '', []
+                package = package[:len(package) - (level - 1)]
+            base = '.'.join(package + [name] if name else package)
+        else:
+            base = name
+        if not base or imported is None:
+            return base, []
+        return base, [f'{base}.{item}' for item in imported if item != '*']
+
+    @staticmethod
+    def _resolve(
+        target: str,
+        source_root: str,
+        by_name: Dict[str, List[int]],
+        names: List[Tuple[str, str, bool]],
+        exact: bool = False
+    ) -> Optional[int]:
+        """按最長前綴（exact 時只按全名）把模塊名解析為節點，同名時優先同一源碼根目錄"""
+        while target:
+            candidates = by_name.get(target)
+            if not candidates and exact:
+                return None
+            if candidates:
+                if len(candidates) == 1:
+                    return candidates[0]
+                for candidate in candidates:
+                    if names[candidate][1] == source_root:
+                        return candidate
+                return candidates[0]
+            target = target.rpartition('.')[0]
+        return None
+
+    def _collect_imports(self, paths: List[str]) -> List[Optional[List[RawImport]]]:
+        """
+        收集每個文件的導入
+
+        以文件內容哈希（大小與修改時間未變時直接取自文件索引）查緩存，
+        只解析未命中的文件；數量較多時在進程池中並行解析。
+        """
+        index = self.discovery.index
+        hashes = [index.content_hash(path) for path in paths]
+        cache = self._import_cache
+
+        missing: Dict[str, str] = {}
+        for path, digest in zip(paths, hashes):
+            if digest not in cache and digest not in missing:
+                missing[digest] = path
+
+        if missing:
+            todo = list(missing.items())
+            workers = self.config.get('max_workers') or os.cpu_count() or 1
+            if len(todo) < PARALLEL_MIN_FILES or workers <= 1:
+                results = [extract_imports(path) for _, path in todo]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(
+                        extract_imports, [path for _, path in todo], chunksize=PARALLEL_CHUNK_SIZE
+                    ))
+            for (digest, _), imports in zip(todo, results):
+                cache[digest] = imports
+
+        logger.debug(f'Import cache: {len(paths) - len(missing)} hits, {len(missing)} parsed')
+        self._save_import_cache(set(hashes))
+        index.save()
+        return [cache[digest] for digest in hashes]
+
+    # ---- 導入緩存 ----
+
+    def _load_import_cache(self) -> None:
+        """加載持久化的導入緩存"""
+        cache_path = self.config.get('import_cache')
+        if not cache_path or not os.path.isfile(cache_path):
+            return
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != IMPORT_CACHE_VERSION:
+                return
+            self._import_cache = {
+                digest: None if imports is None else [
+                    (level, name, None if imported is None else tuple(imported))
+                    for level, name, imported in imports
+                ]
+                for digest, imports in data.get('entries', {}).items()
+            }
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f'Ignoring unreadable import cache {cache_path}: {e}')
+
+    def _save_import_cache(self, live: set) -> None:
+        """寫回導入緩存（只保留本次仍存在的文件內容）"""
+        cache_path = self.config.get('import_cache')
+        if not cache_path:
+            return
+        entries = {digest: imports for digest, imports in self._import_cache.items() if digest in live}
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        tmp_path = f'{cache_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': IMPORT_CACHE_VERSION, 'entries': entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+
+    # ---- 指標與檢查 ----
+
+    def _compute_metrics(self, graph: ImportGraph) -> Dict[str, Dict[str, float]]:
+        """每個模塊的扇入（Ca）、扇出（Ce）與不穩定度 I = Ce / (Ca + Ce)"""
+        return {
+            name: {
+                'fan_in': graph.fan_in[node],
+                'fan_out': graph.fan_out(node),
+                'instability': round(graph.instability(node), 3)
+            }
+            for node, name in enumerate(graph.modules)
+        }
+
+    def _check_cycles(self, graph: ImportGraph) -> List[ArchitectureIssue]:
+        """檢查循環依賴（每個強連通分量報告一次）"""
+        issues = []
+        for component in graph.cycles():
+            modules = sorted(graph.modules[node] for node in component)
+            cycle = graph.shortest_cycle(component) or []
+            path = ' -> '.join(graph.modules[node] for node in cycle)
+            issues.append(ArchitectureIssue(
+                type='circular-dependency',
+                severity='error',
+                message=f'Circular dependency between {len(component)} modules: {path}',
+                components=modules,
+                recommendation='Break the cycle by moving shared code into a lower-level module or inverting the dependency'
+            ))
+        return issues
+
+    def _check_layers(self, graph: ImportGraph) -> List[ArchitectureIssue]:
+        """檢查分層規則和禁止的依賴"""
+        layers = [
+            [layer] if isinstance(layer, str) else list(layer)
+            for layer in self.config.get('layers', [])
+        ]
+        forbidden = [tuple(rule) for rule in self.config.get('forbidden_dependencies', [])]
+        if not layers and not forbidden:
+            return []
+
+        def matches(name: str, prefix: str) -> bool:
+            return name == prefix or name.startswith(prefix + '.')
+
+        plain_names = [name.split(' (', 1)[0] for name in graph.modules]
+        layer_of = []
+        for name in plain_names:
+            level = -1
+            for position, prefixes in enumerate(layers):
+                if any(matches(name, prefix) for prefix in prefixes):
+                    level = position
+                    break
+            layer_of.append(level)
+
+        issues = []
+        for node, name in enumerate(plain_names):
+            for target in graph.successors(node):
+                target_name = plain_names[target]
+                source_layer, target_layer = layer_of[node], layer_of[target]
+                if 0 <= target_layer < source_layer:
+                    issues.append(ArchitectureIssue(
+                        type='layer-violation',
+                        severity='error',
+                        message=(
+                            f'{graph.modules[node]} (layer {source_layer}) imports '
+                            f'{graph.modules[target]} from higher layer {target_layer}'
+                        ),
+                        components=[graph.modules[node], graph.modules[target]],
+                        recommendation='Lower layers must not depend on higher layers; invert the dependency or move the code'
+                    ))
+                for source_prefix, target_prefix in forbidden:
+                    if matches(name, source_prefix) and matches(target_name, target_prefix):
+                        issues.append(ArchitectureIssue(
+                            type='forbidden-dependency',
+                            severity='error',
+                            message=f'{graph.modules[node]} must not import {graph.modules[target]}',
+                            components=[graph.modules[node], graph.modules[target]],
+                            recommendation=f'Remove the dependency from {source_prefix} on {target_prefix}'
+                        ))
+        return issues
+
+    def _check_fan_out(self, graph: ImportGraph) -> List[ArchitectureIssue]:
+        """檢查傳出依賴過多的模塊"""
+        max_fan_out = self.config.get('max_fan_out', MAX_FAN_OUT)
         issues = []
-        # 這裡可以添加更複雜的架構分析邏輯
-        
-        logger.info(f'Architecture analysis completed')
+        for node, name in enumerate(graph.modules):
+            fan_out = graph.fan_out(node)
+            if fan_out > max_fan_out:
+                issues.append(ArchitectureIssue(
+                    type='high-fan-out',
+                    severity='warning',
+                    message=(
+                        f'{name} depends on {fan_out} modules '
+                        f'(instability {graph.instability(node):.2f})'
+                    ),
+                    components=[name],
+                    recommendation='Split the module or introduce a facade to reduce coupling'
+                ))
         return issues
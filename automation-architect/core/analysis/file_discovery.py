@@ -0,0 +1,445 @@
+"""
+File Discovery - 倉庫文件發現
+遵循 .gitignore / .slasolveignore 列出待分析文件：優先使用 git ls-files，
+否則以 os.scandir 遍歷並剪枝 node_modules、.git、虛擬環境與構建輸出目錄；
+可選持久化文件索引（路徑、大小、修改時間、內容哈希）供後續運行增量使用
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+# 無論 ignore 文件如何都不進入的目錄（依賴、VCS 元數據、虛擬環境、緩存與構建輸出）
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.git', '.hg', '.svn',
+    'node_modules', 'bower_components',
+    '.venv', 'venv', '__pycache__', '.tox', '.nox',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache',
+    'dist', 'build', 'target', '.next', 'coverage', 'htmlcov',
+})
+
+IGNORE_FILES = ('.gitignore', '.slasolveignore')
+
+GIT_TIMEOUT = 30
+INDEX_VERSION = 1
+
+
+# ============================================================================
+# ignore 規則
+# ============================================================================
+
+def _translate_glob(pattern: str) -> str:
+    """把 gitignore 通配模式轉換為正則（不含首尾錨點）"""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """一條 ignore 規則，regex 匹配絕對 POSIX 路徑"""
+    regex: 're.Pattern'
+    negate: bool
+    dir_only: bool
+
+
+def parse_ignore_file(path: Path) -> List[IgnoreRule]:
+    """
+    解析 .gitignore 格式的文件
+
+    規則相對於文件所在目錄；包含 '/' 的模式錨定在該目錄，
+    否則匹配任意層級的文件名。
+    """
+    try:
+        text = path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return []
+
+    base = re.escape(path.parent.as_posix().rstrip('/'))
+    rules = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith(('\\#', '\\!')):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        anchored = '/' in line
+        glob = _translate_glob(line.lstrip('/'))
+        prefix = '/' if anchored else '/(?:.*/)?'
+        rules.append(IgnoreRule(re.compile(f'^{base}{prefix}{glob}$'), negate, dir_only))
+    return rules
+
+
+def is_ignored(rules: Iterable[IgnoreRule], path: str, is_dir: bool) -> bool:
+    """按 gitignore 語義判斷路徑是否被忽略（後出現的規則優先）"""
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.regex.match(path):
+            return not rule.negate
+    return False
+
+
+# ============================================================================
+# 持久化文件索引
+# ============================================================================
+
+@dataclass(slots=True)
+class FileRecord:
+    """索引中的一個文件"""
+    size: int
+    mtime_ns: int
+    hash: Optional[str] = None
+
+
+class FileIndex:
+    """
+    文件索引：絕對路徑 -> (大小, 修改時間, 內容哈希)
+
+    內容哈希按需計算，大小與修改時間未變時直接復用上次的結果。
+    index_path 為 None 時只保存在內存中。
+    """
+
+    def __init__(self, index_path: Optional[str] = None):
+        self.index_path = Path(index_path) if index_path else None
+        self.records: Dict[str, FileRecord] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """從磁盤加載索引（格式不符時忽略）"""
+        if self.index_path is None or not self.index_path.is_file():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return
+            self.records = {
+                path: FileRecord(*record) for path, record in data.get('files', {}).items()
+            }
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f'Ignoring unreadable file index {self.index_path}: {e}')
+
+    def save(self) -> None:
+        """寫回磁盤（原子替換）"""
+        if self.index_path is None or not self._dirty:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        files = {path: [r.size, r.mtime_ns, r.hash] for path, r in self.records.items()}
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': files}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    def update(self, path: str, size: int, mtime_ns: int) -> bool:
+        """
+        記錄文件的當前狀態
+
+        Returns:
+            bool: 相對上次記錄是否有變化（新文件也算變化）
+        """
+        record = self.records.get(path)
+        if record is not None and record.size == size and record.mtime_ns == mtime_ns:
+            return False
+        self.records[path] = FileRecord(size, mtime_ns)
+        self._dirty = True
+        return True
+
+    def prune(self, directory: str, extensions: FrozenSet[str], seen: Set[str]) -> None:
+        """
+        移除 directory 下本次沒有發現的文件
+
+        只考慮本次查找的擴展名：共用索引的其他分析器可能查找了不同的擴展名，
+        它們的記錄不能因本次沒有列出而刪除。
+        """
+        prefix = directory.rstrip('/') + '/'
+        stale = [
+            p for p in self.records
+            if p.startswith(prefix) and p not in seen and os.path.splitext(p)[1] in extensions
+        ]
+        for path in stale:
+            del self.records[path]
+        if stale:
+            self._dirty = True
+
+    def content_hash(self, path: str) -> str:
+        """文件內容的 BLAKE2b 哈希（未變化的文件復用索引中的值）"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        self.update(path, stat.st_size, stat.st_mtime_ns)
+        record = self.records[path]
+        if record.hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            record.hash = digest.hexdigest()
+            self._dirty = True
+        return record.hash
+
+
+# ============================================================================
+# 文件發現
+# ============================================================================
+
+class FileDiscovery:
+    """
+    倉庫文件發現服務
+
+    - 目錄在 git 工作區內且 git 可用時使用 git ls-files（已跟蹤 + 未被忽略的
+      未跟蹤文件），.gitignore 由 git 處理
+    - 否則以 os.scandir 遍歷，沿途解析 .gitignore，被忽略的目錄整棵剪掉
+    - 兩種方式都額外應用 .slasolveignore 和默認排除目錄；
+      含 pyvenv.cfg 的目錄視為虛擬環境跳過
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        初始化文件發現服務
+
+        Args:
+            config: 配置（use_git, exclude_dirs, file_index）
+        """
+        config = config or {}
+        self.use_git = config.get('use_git', True)
+        self.excluded_dirs = DEFAULT_EXCLUDED_DIRS | frozenset(config.get('exclude_dirs', ()))
+        self.index = FileIndex(config.get('file_index'))
+
+    def discover(self, directory: Path, extensions: Iterable[str]) -> List[Path]:
+        """
+        列出目錄下指定擴展名的文件
+
+        Args:
+            directory: 目錄
+            extensions: 擴展名集合（如 {'.py', '.js'}）
+
+        Returns:
+            List[Path]: 文件路徑（以 directory 為前綴，按路徑排序）
+        """
+        directory = Path(directory)
+        extensions = frozenset(extensions)
+
+        entries = None
+        if self.use_git:
+            entries = self._git_files(directory, extensions)
+        if entries is None:
+            entries = self._scan_files(directory, extensions)
+
+        files = []
+        seen = set()
+        for path, stat in entries:
+            key = os.path.abspath(path)
+            self.index.update(key, stat.st_size, stat.st_mtime_ns)
+            seen.add(key)
+            files.append(Path(path))
+
+        self.index.prune(os.path.abspath(directory), extensions, seen)
+        self.index.save()
+        files.sort()
+        logger.debug(f'Discovered {len(files)} files under {directory}')
+        return files
+
+    # ---- git ls-files ----
+
+    def _git_files(
+        self,
+        directory: Path,
+        extensions: frozenset
+    ) -> Optional[List[Tuple[str, os.stat_result]]]:
+        """通過 git ls-files 列出文件；不在 git 工作區或 git 不可用時返回 None"""
+        if shutil.which('git') is None:
+            return None
+        try:
+            result = subprocess.run(
+                ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+                cwd=directory,
+                capture_output=True,
+                timeout=GIT_TIMEOUT
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f'git ls-files unavailable for {directory}: {e}')
+            return None
+        if result.returncode != 0:
+            return None
+
+        relpaths = dict.fromkeys(os.fsdecode(p) for p in result.stdout.split(b'\0') if p)
+        root = os.fspath(directory)
+        excluded = self.excluded_dirs
+
+        # .slasolveignore 本身也在列表中；再加上 directory 之上的祖先目錄中的
+        rules = self._ancestor_rules(directory, ('.slasolveignore',))
+        local = sorted(
+            (p for p in relpaths if p.rsplit('/', 1)[-1] == '.slasolveignore'),
+            key=lambda p: p.count('/')
+        )
+        for relpath in local:
+            rules.extend(parse_ignore_file(Path(root, relpath).absolute()))
+
+        # 未被忽略的虛擬環境
+        venv_dirs = tuple(
+            p[:-len('pyvenv.cfg')] for p in relpaths
+            if p == 'pyvenv.cfg' or p.endswith('/pyvenv.cfg')
+        )
+
+        base = Path(root).absolute().as_posix()
+        dir_ignored: Dict[str, bool] = {}
+        entries = []
+        for relpath in relpaths:
+            if os.path.splitext(relpath)[1] not in extensions:
+                continue
+            parts = relpath.split('/')
+            if not excluded.isdisjoint(parts[:-1]):
+                continue
+            if venv_dirs and relpath.startswith(venv_dirs):
+                continue
+            if rules and self._git_path_ignored(rules, base, parts, dir_ignored):
+                continue
+            path = os.path.join(root, relpath)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # 已跟蹤但在工作區中被刪除
+                continue
+            entries.append((path, stat))
+        return entries
+
+    @staticmethod
+    def _git_path_ignored(
+        rules: List[IgnoreRule],
+        base: str,
+        parts: List[str],
+        dir_ignored: Dict[str, bool]
+    ) -> bool:
+        """依次檢查各級父目錄和文件本身（父目錄被忽略時文件不能被重新包含）"""
+        current = base
+        for part in parts[:-1]:
+            current = f'{current}/{part}'
+            ignored = dir_ignored.get(current)
+            if ignored is None:
+                ignored = dir_ignored[current] = is_ignored(rules, current, True)
+            if ignored:
+                return True
+        return is_ignored(rules, f'{current}/{parts[-1]}', False)
+
+    # ---- os.scandir ----
+
+    def _scan_files(
+        self,
+        directory: Path,
+        extensions: frozenset
+    ) -> List[Tuple[str, os.stat_result]]:
+        """以 os.scandir 遍歷目錄，沿途應用 ignore 規則並剪枝"""
+        excluded = self.excluded_dirs
+        entries = []
+        stack = [(os.fspath(directory), self._ancestor_rules(directory, IGNORE_FILES))]
+
+        while stack:
+            current, rules = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    children = list(it)
+            except OSError as e:
+                logger.debug(f'Cannot scan {current}: {e}')
+                continue
+
+            names = {child.name for child in children}
+            if 'pyvenv.cfg' in names:
+                continue
+            for name in IGNORE_FILES:
+                if name in names:
+                    rules = rules + parse_ignore_file(Path(current, name).absolute())
+
+            base = Path(current).absolute().as_posix()
+            for child in children:
+                try:
+                    if child.is_dir(follow_symlinks=False):
+                        if child.name in excluded:
+                            continue
+                        if rules and is_ignored(rules, f'{base}/{child.name}', True):
+                            continue
+                        stack.append((child.path, rules))
+                    elif child.is_file():
+                        if os.path.splitext(child.name)[1] not in extensions:
+                            continue
+                        if rules and is_ignored(rules, f'{base}/{child.name}', False):
+                            continue
+                        entries.append((child.path, child.stat()))
+                except OSError:
+                    continue
+        return entries
+
+    @staticmethod
+    def _ancestor_rules(directory: Path, names: Tuple[str, ...]) -> List[IgnoreRule]:
+        """
+        directory 之上（直到倉庫根目錄）的 ignore 規則
+
+        只在能找到 .git 的情況下向上查找，規則按從外到內的順序排列。
+        """
+        directory = Path(directory).absolute()
+        ancestors = []
+        for parent in directory.parents:
+            ancestors.append(parent)
+            if (parent / '.git').exists():
+                break
+        else:
+            return []
+
+        rules: List[IgnoreRule] = []
+        for parent in reversed(ancestors):
+            for name in names:
+                ignore_file = parent / name
+                if ignore_file.is_file():
+                    rules.extend(parse_ignore_file(ignore_file))
+        return rules
@@ -0,0 +1,298 @@
+"""
+File Reader - 共用源文件讀取器
+靜態分析、安全掃描與性能分析共用：大文件 mmap 映射、根據文件頭幾 KB
+快速跳過二進制與壓縮（minified）文件、UTF-8 解碼失敗時回退到字符集檢測
+"""
+
+import codecs
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+try:
+    from charset_normalizer import from_bytes as _detect_charset
+    HAS_CHARSET_DETECTION = True
+except ImportError:
+    try:
+        import chardet
+
+        def _detect_charset(data: bytes):
+            return chardet.detect(data).get('encoding')
+        HAS_CHARSET_DETECTION = True
+    except ImportError:
+        _detect_charset = None
+        HAS_CHARSET_DETECTION = False
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+PathLike = Union[str, Path]
+
+# 超過此大小的文件以 mmap 映射，不再整體讀入
+MMAP_THRESHOLD = 1 << 20
+# read_text() 調用方的默認文件大小上限：read_text 把整個文件解碼為一個 str
+MAX_TEXT_SIZE = 16 << 20
+# 判斷二進制 / 壓縮文件時只看文件頭
+SNIFF_SIZE = 8192
+# 文件頭平均行長超過此值視為壓縮文件（文件頭至少 MINIFIED_MIN_SIZE 字節）
+MINIFIED_LINE_LENGTH = 500
+MINIFIED_MIN_SIZE = 4096
+# 文件頭中非文本字節比例超過此值視為二進制文件
+BINARY_RATIO = 0.3
+
+# UTF-32 LE 的 BOM 以 UTF-16 LE 的 BOM 開頭，須先判斷
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# 與 file(1) 相同的文本字節集合：可打印字符、常見控制字符與 8 位字節
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+
+_MINIFIED_NAME = re.compile(r'[.-]min\.[A-Za-z0-9]+$')
+
+_NEWLINE_CHUNK = 1 << 22
+
+
+@dataclass
+class FileSniff:
+    """文件頭探測結果"""
+    __slots__ = ('kind', 'encoding', 'size')
+
+    kind: str  # text, binary, minified
+    encoding: Optional[str]
+    size: int
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    """ASCII 字節在該編碼中是否保持原義（bytes 正則可直接使用）"""
+    name = codecs.lookup(encoding).name
+    return not name.startswith(('utf-16', 'utf-32'))
+
+
+def guess_encoding(data: bytes) -> str:
+    """
+    檢測字節串的字符集
+
+    優先 charset_normalizer，其次 chardet；都不可用或無法判斷時回退 latin-1
+    （任意字節都可解碼）
+    """
+    if _detect_charset is not None and data:
+        result = _detect_charset(bytes(data))
+        if result is not None and not isinstance(result, str):
+            best = result.best()
+            result = best.encoding if best is not None else None
+        if result:
+            try:
+                return codecs.lookup(result).name
+            except LookupError:
+                pass
+    return 'latin-1'
+
+
+def sniff(head: bytes, size: int, name: str = '') -> FileSniff:
+    """
+    根據文件頭判斷文件類型和編碼
+
+    Args:
+        head: 文件頭（最多 SNIFF_SIZE 字節）
+        size: 文件總大小
+        name: 文件名（用於識別 *.min.js 等）
+
+    Returns:
+        FileSniff: kind 為 text / binary / minified；
+                   encoding 為根據 BOM 或文件頭判斷出的編碼（未知時為 None）
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return FileSniff('text', encoding, size)
+
+    if b'\x00' in head:
+        return FileSniff('binary', None, size)
+    if head and len(head.translate(None, _TEXT_BYTES)) > len(head) * BINARY_RATIO:
+        return FileSniff('binary', None, size)
+
+    if _MINIFIED_NAME.search(name):
+        return FileSniff('minified', None, size)
+    if len(head) >= MINIFIED_MIN_SIZE and len(head) > (head.count(b'\n') + 1) * MINIFIED_LINE_LENGTH:
+        return FileSniff('minified', None, size)
+
+    # 文件頭能按 UTF-8 解碼（允許末尾截斷的多字節字符）即先假定為 UTF-8，
+    # 完整解碼失敗時再做字符集檢測
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=len(head) == size)
+        encoding = 'utf-8'
+    except UnicodeDecodeError:
+        encoding = guess_encoding(head)
+    return FileSniff('text', encoding, size)
+
+
+def count_newlines(buffer, start: int = 0, end: Optional[int] = None) -> int:
+    """統計 buffer[start:end] 中的換行數（mmap 沒有 count，按塊切片統計）"""
+    if end is None:
+        end = len(buffer)
+    if isinstance(buffer, bytes):
+        return buffer.count(b'\n', start, end)
+    total = 0
+    for chunk_start in range(start, end, _NEWLINE_CHUNK):
+        total += buffer[chunk_start:min(chunk_start + _NEWLINE_CHUNK, end)].count(b'\n')
+    return total
+
+
+@dataclass
+class SourceBuffer:
+    """
+    源文件的字節視圖
+
+    data 為 bytes 或 mmap，均支持 re 的 bytes 模式直接搜索；
+    編碼與 ASCII 不兼容（UTF-16/32）的文件會先轉為 UTF-8 字節。
+    """
+    path: Path
+    data: object
+    encoding: str
+    size: int
+
+    def line_at(self, offset: int) -> int:
+        """偏移量所在的行號（1 起）"""
+        return count_newlines(self.data, 0, offset) + 1
+
+    def line_bounds(self, offset: int):
+        """偏移量所在行的 [起始, 結束) 範圍（結束位置包含換行符）"""
+        data = self.data
+        start = data.rfind(b'\n', 0, offset) + 1
+        end = data.find(b'\n', offset)
+        return start, (len(data) if end < 0 else end + 1)
+
+    def decode(self, start: int = 0, end: Optional[int] = None) -> str:
+        """解碼一段字節（無法解碼的字節以替換字符表示）"""
+        return str(self.data[start:end], self.encoding, 'replace')
+
+
+class SourceReader:
+    """
+    共用源文件讀取器
+
+    - 先只讀文件頭 SNIFF_SIZE 字節判斷二進制 / 壓縮文件，命中即跳過，
+      不再讀取其餘內容
+    - 超過 mmap_threshold 的文件以只讀 mmap 映射，文本直接從映射解碼，
+      bytes 正則可直接在映射上搜索
+    - 先按 BOM / UTF-8 解碼，失敗時回退到字符集檢測
+
+    跳過的文件按原因計入 skipped。
+    """
+
+    def __init__(
+        self,
+        mmap_threshold: int = MMAP_THRESHOLD,
+        max_size: Optional[int] = None,
+        skip_minified: bool = True
+    ):
+        """
+        初始化讀取器
+
+        Args:
+            mmap_threshold: 使用 mmap 的文件大小下限（字節）
+            max_size: 文件大小上限，超過則跳過（None 表示不限制；
+                      使用 read_text 的調用方默認傳入 MAX_TEXT_SIZE）
+            skip_minified: 是否跳過壓縮文件
+        """
+        self.mmap_threshold = mmap_threshold
+        self.max_size = max_size
+        self.skip_minified = skip_minified
+        self.skipped: Dict[str, int] = {}
+
+    def _skip(self, path: Path, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        logger.debug(f'Skipping {reason} file: {path}')
+
+    def _check(self, path: Path, head: bytes, size: int) -> Optional[FileSniff]:
+        """探測文件頭；應跳過時返回 None"""
+        info = sniff(head, size, path.name)
+        if info.kind == 'binary' or (info.kind == 'minified' and self.skip_minified):
+            self._skip(path, info.kind)
+            return None
+        if info.encoding is None:
+            info.encoding = 'utf-8'
+        return info
+
+    @contextmanager
+    def _open_data(self, path: Path) -> Iterator[tuple]:
+        """
+        打開並探測文件，產出 (探測結果, 全部內容)；應跳過時產出 (None, None)
+
+        超限文件不讀取，其餘文件先只讀文件頭探測，通過後才讀取剩餘內容
+        （大文件改為 mmap 映射）。
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.max_size is not None and size > self.max_size:
+                self._skip(path, 'too-large')
+                yield None, None
+                return
+            head = f.read(SNIFF_SIZE)
+            info = self._check(path, head, size)
+            if info is None:
+                yield None, None
+                return
+            if size < self.mmap_threshold or size == 0:
+                # 文件頭已讀到末尾時無需再讀
+                yield info, (head + f.read() if len(head) == SNIFF_SIZE else head)
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield info, mapped
+
+    @staticmethod
+    def _decode(data, info: FileSniff) -> str:
+        encoding = info.encoding
+        if encoding != 'utf-8':
+            return str(data, encoding, 'replace')
+        try:
+            return str(data, encoding)
+        except UnicodeDecodeError as e:
+            # 文件頭是 UTF-8 但後文不是：以出錯位置附近的字節重新檢測
+            sample = data[max(e.start - SNIFF_SIZE, 0):e.start + SNIFF_SIZE]
+        info.encoding = guess_encoding(sample)
+        return str(data, info.encoding, 'replace')
+
+    def read_text(self, path: PathLike) -> Optional[str]:
+        """
+        讀取文件文本
+
+        Returns:
+            Optional[str]: 文件內容；二進制、壓縮或超限文件返回 None
+        """
+        path = Path(path)
+        with self._open_data(path) as (info, data):
+            if info is None:
+                return None
+            return self._decode(data, info)
+
+    @contextmanager
+    def open_buffer(self, path: PathLike) -> Iterator[Optional[SourceBuffer]]:
+        """
+        以字節視圖打開文件，供 bytes 正則直接搜索
+
+        Yields:
+            Optional[SourceBuffer]: 文件字節視圖；應跳過的文件產出 None
+        """
+        path = Path(path)
+        with self._open_data(path) as (info, data):
+            if info is None:
+                yield None
+                return
+            if not is_ascii_compatible(info.encoding):
+                data = self._decode(data, info).encode('utf-8')
+                info.encoding = 'utf-8'
+            yield SourceBuffer(path, data, info.encoding, info.size)
+
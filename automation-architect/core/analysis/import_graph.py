@@ -0,0 +1,152 @@
+"""
+Import Graph - 模塊導入圖
+整數節點 ID + CSR 鄰接數組存儲的模塊依賴圖：強連通分量（Tarjan）、
+最短環路、扇入 / 扇出與不穩定度
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class ImportGraph:
+    """
+    模塊導入圖
+
+    節點 i 對應 modules[i]；節點 i 的後繼（被 i 導入的模塊）為
+    indices[indptr[i]:indptr[i + 1]]，已排序且不含重複邊和自環。
+    """
+
+    def __init__(self, modules: Sequence[str], adjacency: Sequence[Iterable[int]]):
+        """
+        由鄰接表構建 CSR 數組
+
+        Args:
+            modules: 節點名稱
+            adjacency: 每個節點的後繼 ID 集合
+        """
+        self.modules = list(modules)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.modules)}
+        n = len(self.modules)
+
+        self.indptr = array('q', [0]) * (n + 1)
+        self.indices = array('l')
+        self.fan_in = array('l', [0]) * n
+        fan_in = self.fan_in
+        for node, successors in enumerate(adjacency):
+            targets = sorted(set(successors))
+            if node in targets:
+                targets.remove(node)
+            self.indices.extend(targets)
+            self.indptr[node + 1] = len(self.indices)
+            for target in targets:
+                fan_in[target] += 1
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def successors(self, node: int) -> array:
+        """節點導入的模塊 ID"""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def fan_out(self, node: int) -> int:
+        """傳出依賴數（Ce）"""
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def instability(self, node: int) -> float:
+        """不穩定度 I = Ce / (Ca + Ce)，孤立節點為 0"""
+        fan_out = self.fan_out(node)
+        total = fan_out + self.fan_in[node]
+        return fan_out / total if total else 0.0
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Tarjan 強連通分量（迭代實現，不受遞歸深度限制）
+
+        Returns:
+            List[List[int]]: 所有強連通分量（按逆拓撲序），包含單節點分量
+        """
+        n = len(self.modules)
+        indptr, indices = self.indptr, self.indices
+        order = array('l', [-1]) * n
+        low = array('l', [0]) * n
+        on_stack = bytearray(n)
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, indptr[root])]
+
+            while work:
+                node, pos = work[-1]
+                end = indptr[node + 1]
+                while pos < end:
+                    target = indices[pos]
+                    pos += 1
+                    if order[target] == -1:
+                        work[-1] = (node, pos)
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = 1
+                        work.append((target, indptr[target]))
+                        break
+                    if on_stack[target] and order[target] < low[node]:
+                        low[node] = order[target]
+                else:
+                    work.pop()
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+        return components
+
+    def cycles(self) -> List[List[int]]:
+        """含環的強連通分量（至少兩個節點）"""
+        return [c for c in self.strongly_connected_components() if len(c) > 1]
+
+    def shortest_cycle(self, component: Sequence[int]) -> Optional[List[int]]:
+        """
+        分量內經過其最小 ID 節點的最短環路（BFS）
+
+        Returns:
+            Optional[List[int]]: 環路節點序列（首尾為同一節點）
+        """
+        members = set(component)
+        start = min(component)
+        parents: Dict[int, int] = {}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target in self.successors(node):
+                if target == start:
+                    path = [start]
+                    while node != start:
+                        path.append(node)
+                        node = parents[node]
+                    path.append(start)
+                    return path[::-1]
+                if target in members and target not in parents:
+                    parents[target] = node
+                    queue.append(target)
+        return None
@@ -0,0 +1,103 @@
+"""
+Line Index - 行級索引
+每個文件只切分一次，行長度、行尾空白、註釋等行級信息供風格、指標與
+複雜度檢查共用
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress, count, repeat
+from operator import contains, lt, ne
+from typing import Dict, List, Optional, Tuple
+
+
+class LineIndex:
+    """
+    行級索引
+
+    行的劃分與 code.split('\\n') 一致（'\\r' 屬於行內容，以換行結尾的文件
+    最後有一個空行）。
+
+    逐行判斷都以 map/compress 組合在 C 層迭代完成，Python 代碼只處理
+    命中的行；能用整個緩衝區判斷的先判斷（最長行、子串是否出現），
+    沒有命中時直接跳過逐行掃描。結果按查詢參數緩存。
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.lines: List[str] = code.split('\n')
+        self.line_count = len(self.lines)
+        self.lengths = array('l', map(len, self.lines))
+        self.max_line_length = max(self.lengths)
+        self._stripped: Optional[List[str]] = None
+        self._offsets: Optional[array] = None
+        self._cache: Dict[tuple, object] = {}
+
+    @property
+    def stripped(self) -> List[str]:
+        """去掉首尾空白的各行"""
+        if self._stripped is None:
+            self._stripped = list(map(str.strip, self.lines))
+        return self._stripped
+
+    # ---- 位置 -> 行號 ----
+
+    @property
+    def offsets(self) -> array:
+        """各行行首偏移量"""
+        if self._offsets is None:
+            self._offsets = array('q', accumulate(map((1).__add__, self.lengths[:-1]), initial=0))
+        return self._offsets
+
+    def line_of(self, offset: int) -> int:
+        """偏移量所在的行號（1 起）"""
+        return bisect_right(self.offsets, offset)
+
+    # ---- 行級查詢 ----
+
+    def long_lines(self, max_length: int) -> List[Tuple[int, int]]:
+        """超過 max_length 的行：[(行號, 長度)]"""
+        if self.max_line_length <= max_length:
+            return []
+        lengths = self.lengths
+        rows = compress(count(1), map(lt, repeat(max_length), lengths))
+        return [(line, lengths[line - 1]) for line in rows]
+
+    def trailing_whitespace_lines(self) -> List[int]:
+        """行尾有空白的行號"""
+        key = ('trailing',)
+        if key not in self._cache:
+            self._cache[key] = list(compress(count(1), map(ne, self.lines, map(str.rstrip, self.lines))))
+        return self._cache[key]
+
+    def lines_containing(self, text: str) -> List[int]:
+        """包含子串的行號"""
+        if text not in self.code:
+            return []
+        key = ('contains', text)
+        if key not in self._cache:
+            self._cache[key] = list(compress(count(1), map(contains, self.lines, repeat(text))))
+        return self._cache[key]
+
+    def lines_starting_with(self, *prefixes: str) -> List[int]:
+        """去掉縮進後以任一前綴開頭的行號"""
+        if not any(prefix in self.code for prefix in prefixes):
+            return []
+        key = ('prefix', prefixes)
+        if key not in self._cache:
+            self._cache[key] = list(compress(count(1), map(str.startswith, self.stripped, repeat(prefixes))))
+        return self._cache[key]
+
+    def count_lines_starting_with(self, *prefixes: str) -> int:
+        """去掉縮進後以任一前綴開頭的行數"""
+        if not any(prefix in self.code for prefix in prefixes):
+            return 0
+        key = ('count-prefix', prefixes)
+        if key not in self._cache:
+            self._cache[key] = sum(map(str.startswith, self.stripped, repeat(prefixes)))
+        return self._cache[key]
+
+    @property
+    def blank_line_count(self) -> int:
+        """空行（含只有空白的行）數"""
+        return self.stripped.count('')
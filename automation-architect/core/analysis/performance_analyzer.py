@@ -3,9 +3,19 @@ Performance Analyzer - 性能分析器
 分析代碼性能問題和優化機會
 """
 
-from dataclasses import dataclass
+import ast
+import asyncio
+import os
+import pstats
+import re
+import shlex
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from .file_discovery import FileDiscovery
+from .file_reader import MAX_TEXT_SIZE, SourceReader
 
 try:
     from loguru import logger
@@ -23,6 +33,447 @@ class PerformanceIssue:
     file: str
     line: int
     suggestion: Optional[str] = None
+    cumulative_time: Optional[float] = None  # 剖析模式下所在函數的累計耗時（秒）
+
+
+@dataclass
+class ProfileResult:
+    """一次運行時剖析的結果"""
+    command: List[str]
+    exit_code: int
+    total_time: float
+    stats_path: str
+    folded_path: str
+    hotspots: List[PerformanceIssue] = field(default_factory=list)
+    # (文件, 函數首行) -> (函數名, 調用次數, 自身耗時, 累計耗時)，只含 code_path 內的函數
+    functions: Dict[Tuple[str, int], Tuple[str, int, float, float]] = field(default_factory=dict)
+
+
+# 循環內調用即可能構成 N+1 查詢的方法（DB-API 游標、SQLAlchemy 會話、MongoDB 集合等）；
+# find / query 等名稱很常見（str.find），接收者必須看起來是數據庫句柄
+QUERY_METHODS = frozenset({
+    'execute', 'query', 'raw', 'fetchone', 'fetchall', 'fetchmany',
+    'scalar', 'scalars', 'find', 'find_one', 'count_documents',
+})
+# 接收者自身的名稱（按 _ 拆分後的最後一個詞）屬於這些詞即視為數據庫句柄，
+# 如 cursor、self.db_session、users_collection；db_url、conn_str 只是字符串
+DB_HANDLE_WORDS = frozenset({
+    'cursor', 'cur', 'session', 'sess', 'conn', 'connection', 'db', 'database',
+    'collection', 'engine', 'tx', 'transaction',
+})
+# Django 管理器 / QuerySet 上發出查詢的方法，只在 <Model>.objects 上計入
+DJANGO_QUERY_METHODS = frozenset({
+    'all', 'filter', 'exclude', 'get', 'count', 'exists', 'first', 'last', 'latest', 'earliest',
+    'values', 'values_list', 'aggregate', 'annotate', 'order_by', 'distinct', 'only', 'defer',
+    'select_related', 'prefetch_related', 'in_bulk', 'iterator', 'raw',
+    'create', 'get_or_create', 'update_or_create', 'update', 'delete', 'bulk_create', 'bulk_update',
+})
+# 返回值為數據庫句柄的調用，如 c = sqlite3.connect(path)、s = Session()
+DB_HANDLE_FACTORIES = frozenset({
+    'connect', 'cursor', 'Session', 'sessionmaker', 'scoped_session', 'create_engine', 'MongoClient',
+})
+
+PROFILE_RUNNER = str(Path(__file__).with_name('profile_runner.py'))
+PROFILE_TIMEOUT = 300
+PROFILE_TOP = 20
+# 累計耗時佔總運行時間的比例：不低於 HOTSPOT_ERROR_SHARE 為 error，不低於 HOTSPOT_WARNING_SHARE 為 warning
+HOTSPOT_ERROR_SHARE = 0.2
+HOTSPOT_WARNING_SHARE = 0.05
+HOTSPOT_MIN_SHARE = 0.01
+
+
+def _value_kind(node: ast.AST) -> Optional[str]:
+    """賦值右側的值類型（只識別 list、str 與數據庫句柄 db），無法判斷時返回 None"""
+    if isinstance(node, (ast.List, ast.ListComp)):
+        return 'list'
+    if isinstance(node, ast.JoinedStr):
+        return 'str'
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return 'str'
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ('list', 'str', 'sorted'):
+        return 'str' if node.func.id == 'str' else 'list'
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult)):
+        return _value_kind(node.left) or _value_kind(node.right)
+    if isinstance(node, ast.Call):
+        names = _receiver_chain(node.func)
+        if names and names[-1] in DB_HANDLE_FACTORIES:
+            return 'db'
+    elif isinstance(node, (ast.Attribute, ast.Subscript)) and _is_db_name(_receiver_chain(node)):
+        return 'db'
+    return None
+
+
+def _is_db_name(names: List[str]) -> bool:
+    """接收者自身的名稱（鏈的最後一個）是否以 DB_HANDLE_WORDS 中的詞結尾"""
+    return bool(names) and names[-1].lower().rsplit('_', 1)[-1] in DB_HANDLE_WORDS
+
+
+def _is_django_manager(names: List[str]) -> bool:
+    """接收者鏈是否經過 <Model>.objects，如 User.objects、User.objects.filter(...)"""
+    return any(
+        name == 'objects' and index and names[index - 1][:1].isupper()
+        for index, name in enumerate(names)
+    )
+
+
+def _receiver_chain(node: ast.AST) -> List[str]:
+    """
+    屬性調用的接收者鏈，如 User.objects.filter -> ['User', 'objects']
+
+    穿過調用和下標：conn.cursor().execute -> ['conn', 'cursor']，db['users'].find -> ['db']
+    """
+    chain = []
+    while isinstance(node, (ast.Attribute, ast.Call, ast.Subscript)):
+        if isinstance(node, ast.Attribute):
+            chain.append(node.attr)
+            node = node.value
+        elif isinstance(node, ast.Call):
+            node = node.func
+        else:
+            node = node.value
+    if isinstance(node, ast.Name):
+        chain.append(node.id)
+    return chain[::-1]
+
+
+class _PythonPerformanceVisitor(ast.NodeVisitor):
+    """
+    Python 性能問題檢測（每個文件只遍歷一次 AST）
+
+    按函數作用域維護循環深度和已知的 list / str 綁定：
+    - 嵌套循環：每個循環嵌套報告一次，給出實際最大深度
+    - 循環內對 list 的 in / not in 成員測試、list.index 查找
+    - 循環內字符串 +=
+    - 循環內的數據庫查詢調用（N+1 查詢）
+    """
+
+    def __init__(self, file_path: str):
+        self.file = file_path
+        self.issues: List['PerformanceIssue'] = []
+        self._reported = set()
+        self.loop_depth = 0
+        self.nest_max = 0
+        self.bindings: Dict[str, str] = {}
+
+    # ---- 遍歷 ----
+    # NodeVisitor 每個節點都要按名字查找 visit_ 方法並逐字段 isinstance；
+    # 這裡按類型查表分派，並直接跳過名字、常量、運算符與上下文等葉子節點
+
+    def visit(self, node: ast.AST) -> None:
+        handler = _VISIT_DISPATCH.get(node.__class__, _PythonPerformanceVisitor.generic_visit)
+        if handler is not None:
+            handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if value.__class__ is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+
+    def _report(self, node: ast.AST, issue_type: str, severity: str, message: str, suggestion: str) -> None:
+        key = (issue_type, node.lineno)
+        if key in self._reported:
+            return
+        self._reported.add(key)
+        self.issues.append(PerformanceIssue(
+            type=issue_type,
+            severity=severity,
+            message=message,
+            file=self.file,
+            line=node.lineno,
+            suggestion=suggestion
+        ))
+
+    # ---- 作用域 ----
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        saved = (self.loop_depth, self.nest_max, self.bindings)
+        self.loop_depth, self.nest_max, self.bindings = 0, 0, {}
+        self.generic_visit(node)
+        self.loop_depth, self.nest_max, self.bindings = saved
+
+    visit_FunctionDef = _visit_scope
+    visit_AsyncFunctionDef = _visit_scope
+    visit_Lambda = _visit_scope
+    visit_ClassDef = _visit_scope
+
+    # ---- 循環 ----
+
+    def _enter_loop(self, node: ast.AST, levels: int, visit) -> None:
+        outermost = self.loop_depth == 0
+        if outermost:
+            self.nest_max = 0
+        self.loop_depth += levels
+        self.nest_max = max(self.nest_max, self.loop_depth)
+        visit()
+        self.loop_depth -= levels
+        if outermost and self.nest_max >= 2:
+            depth = self.nest_max
+            self._report(
+                node, 'nested-loops', 'error' if depth >= 3 else 'warning',
+                f'Nested loops (depth {depth}) - potential O(n^{depth}) complexity',
+                'Consider using more efficient algorithms, e.g. index the inner collection in a dict or set'
+            )
+
+    def _visit_loop(self, node: ast.AST) -> None:
+        # 迭代對象只求值一次，不計入本循環
+        header = node.test if isinstance(node, ast.While) else node.iter
+        if not isinstance(node, ast.While):
+            self.visit(header)
+            self.visit(node.target)
+            self._unbind(node.target)
+
+        def body():
+            if isinstance(node, ast.While):
+                self.visit(header)
+            for stmt in node.body:
+                self.visit(stmt)
+        self._enter_loop(node, 1, body)
+        for stmt in node.orelse:
+            self.visit(stmt)
+
+    visit_For = _visit_loop
+    visit_AsyncFor = _visit_loop
+    visit_While = _visit_loop
+
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        generators = node.generators
+        self.visit(generators[0].iter)
+        # 推導式的目標變量只在推導式內遮蔽外層同名綁定
+        outer_bindings = self.bindings
+        self.bindings = dict(outer_bindings)
+
+        def body():
+            for index, generator in enumerate(generators):
+                if index:
+                    self.visit(generator.iter)
+                self.visit(generator.target)
+                self._unbind(generator.target)
+                for condition in generator.ifs:
+                    self.visit(condition)
+            for field in ('elt', 'key', 'value'):
+                child = getattr(node, field, None)
+                if child is not None:
+                    self.visit(child)
+        self._enter_loop(node, len(generators), body)
+        self.bindings = outer_bindings
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    # ---- 綁定 ----
+
+    def _bind(self, target: ast.AST, value: Optional[ast.AST]) -> None:
+        if isinstance(target, ast.Name):
+            kind = _value_kind(value) if value is not None else None
+            if kind is None:
+                self.bindings.pop(target.id, None)
+            else:
+                self.bindings[target.id] = kind
+
+    def _unbind(self, target: ast.AST) -> None:
+        # for x in ... / for i, (a, b) in ...：目標變量的類型未知
+        for child in ast.walk(target):
+            if isinstance(child, ast.Name):
+                self.bindings.pop(child.id, None)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.generic_visit(node)
+        for target in node.targets:
+            self._bind(target, node.value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self.generic_visit(node)
+        self._bind(node.target, node.value)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self.generic_visit(node)
+        target = node.target
+        if self.loop_depth and isinstance(node.op, ast.Add) and isinstance(target, ast.Name):
+            if self.bindings.get(target.id) == 'str' or _value_kind(node.value) == 'str':
+                self._report(
+                    node, 'string-concat-in-loop', 'warning',
+                    f"String '{target.id}' built with += inside a loop - O(n^2) copying",
+                    "Collect the parts in a list and ''.join() them after the loop"
+                )
+
+    # ---- 循環內的查找與查詢 ----
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        self.generic_visit(node)
+        if not self.loop_depth:
+            return
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)) and self._is_list(right):
+                name = right.id if isinstance(right, ast.Name) else 'list'
+                self._report(
+                    node, 'list-membership-in-loop', 'warning',
+                    f"Membership test on list '{name}' inside a loop - O(n) per lookup",
+                    'Convert the list to a set (or dict) once before the loop'
+                )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        if not self.loop_depth or not isinstance(node.func, ast.Attribute):
+            return
+        method = node.func.attr
+        receiver = node.func.value
+        if method == 'index' and self._is_list(receiver):
+            name = receiver.id if isinstance(receiver, ast.Name) else 'list'
+            self._report(
+                node, 'repeated-list-index', 'warning',
+                f"list.index() on '{name}' inside a loop - O(n) per lookup",
+                'Build a value -> position dict once before the loop'
+            )
+        elif ((method in QUERY_METHODS and self._is_db_handle(receiver))
+              or (method in DJANGO_QUERY_METHODS and _is_django_manager(_receiver_chain(receiver)))):
+            self._report(
+                node, 'n-plus-one-query', 'error',
+                f'Query call .{method}() inside a loop - N+1 queries',
+                'Fetch all rows in one query (IN clause, join, select_related/prefetch_related) before the loop'
+            )
+
+    def _is_list(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Name):
+            return self.bindings.get(node.id) == 'list'
+        return isinstance(node, ast.ListComp)
+
+    def _is_db_handle(self, node: ast.AST) -> bool:
+        chain = _receiver_chain(node)
+        if not chain:
+            return False
+        return self.bindings.get(chain[0]) == 'db' or _is_db_name(chain)
+
+
+_LEAF_NODES = (ast.Name, ast.Constant, ast.expr_context, ast.operator, ast.unaryop, ast.cmpop, ast.boolop, ast.alias)
+
+_VISIT_DISPATCH = {
+    leaf: None
+    for base in _LEAF_NODES
+    for leaf in (base, *base.__subclasses__())
+}
+_VISIT_DISPATCH.update(
+    (getattr(ast, name[len('visit_'):]), method)
+    for name, method in vars(_PythonPerformanceVisitor).items()
+    if name.startswith('visit_') and hasattr(ast, name[len('visit_'):])
+)
+
+
+# Python：跳過註釋和字符串統計循環與 in 關鍵字，決定文件是否值得解析。
+# f-string 中可能有表達式，其中的關鍵字照常計入（寧可多解析）
+_PY_TOKEN = re.compile(r"""
+    (?=[\#'"rRbBuUfFwi])  # 先按首字符排除絕大多數位置
+    (?:
+    (?P<skip>\#[^\n]*
+      | (?:(?<!\w)(?P<prefix>[rRbBuUfF]{1,2}))?
+        (?:'{3}[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'{3}
+          | "{3}[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"{3}
+          | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+          | "[^"\\\n]*(?:\\.[^"\\\n]*)*"))
+  | (?P<keyword>\b(?:for|while|in)\b)
+    )
+""", re.VERBOSE | re.DOTALL)
+_PY_KEYWORD = re.compile(r'\b(?:for|while|in)\b')
+# 只有一個循環時，只有這些寫法可能產生報告（成員測試另按 in 的數量判斷）
+_SINGLE_LOOP_HINT = re.compile(
+    r'\+=|\.\s*index\b|\bobjects\b|\.\s*(?:' + '|'.join(sorted(QUERY_METHODS)) + r')\b'
+)
+
+
+def _worth_parsing(code: str) -> bool:
+    """
+    Python 文件中是否可能有性能問題
+
+    所有檢查都以循環為前提，每個循環（含推導式）至少貢獻一個 for / while；
+    只有一個循環時不可能嵌套，成員測試需要比 for 頭部多出的 in。
+    """
+    if 'for' not in code and 'while' not in code:
+        return False
+    counts = {'for': 0, 'while': 0, 'in': 0}
+    for match in _PY_TOKEN.finditer(code):
+        keyword = match.group('keyword')
+        if keyword is not None:
+            counts[keyword] += 1
+        elif match.group('prefix') and 'f' in match.group('prefix').lower():
+            for inner in _PY_KEYWORD.findall(match.group()):
+                counts[inner] += 1
+    loops = counts['for'] + counts['while']
+    if loops != 1:
+        return loops > 1
+    return counts['in'] > counts['for'] or _SINGLE_LOOP_HINT.search(code) is not None
+
+
+# 花括號語言：去掉字符串和註釋後按詞法記號追蹤循環塊的嵌套深度
+_BRACED_TOKEN_TEMPLATE = r"""
+    (?P<skip>//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|{char}|`(?:\\.|[^`\\])*`)
+  | (?P<loop>\b(?:for|while|loop)\b)
+  | (?P<char>[{{}}();\n])
+"""
+_BRACED_TOKEN = re.compile(
+    _BRACED_TOKEN_TEMPLATE.format(char=r"'(?:\\.|[^'\\\n])*'"), re.VERBOSE | re.DOTALL
+)
+# Rust 的單引號只用於字符字面量，不能吞掉生命週期標註（&'a str）
+_RUST_TOKEN = re.compile(
+    _BRACED_TOKEN_TEMPLATE.format(char=r"'(?:\\[^'\n]{1,8}|[^'\\\n])'"), re.VERBOSE | re.DOTALL
+)
+
+
+def _braced_loop_nests(code: str, rust: bool = False) -> List[Tuple[int, int]]:
+    """
+    花括號語言中的循環嵌套
+
+    Returns:
+        List[Tuple[int, int]]: 每個最外層循環的 (行號, 最大嵌套深度)
+    """
+    nests = []
+    line = 1
+    paren = 0
+    pending: Optional[int] = None  # 等待循環體 '{' 的循環所在行
+    blocks: List[bool] = []        # 每個打開的 '{' 是否為循環體
+    loop_depth = 0
+    nest: Optional[List[int]] = None
+
+    for match in (_RUST_TOKEN if rust else _BRACED_TOKEN).finditer(code):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'skip':
+            line += text.count('\n')
+        elif kind == 'loop':
+            if text != 'loop' or rust:
+                pending = line
+        elif text == '\n':
+            line += 1
+        elif text == '(':
+            paren += 1
+        elif text == ')':
+            paren = max(paren - 1, 0)
+        elif text == ';':
+            # 無花括號的單語句循環或 do {...} while (...);
+            if paren == 0:
+                pending = None
+        elif text == '{':
+            is_loop = pending is not None and paren == 0
+            blocks.append(is_loop)
+            if is_loop:
+                if loop_depth == 0:
+                    nest = [pending, 0]
+                loop_depth += 1
+                nest[1] = max(nest[1], loop_depth)
+                pending = None
+        elif text == '}' and blocks:
+            if blocks.pop():
+                loop_depth -= 1
+                if loop_depth == 0 and nest is not None:
+                    nests.append((nest[0], nest[1]))
+                    nest = None
+    return nests
 
 
 class PerformanceAnalyzer:
@@ -39,6 +490,9 @@ class PerformanceAnalyzer:
     def __init__(self, config: Optional[Dict] = None):
         """初始化性能分析器"""
         self.config = config or {}
+        self.reader = SourceReader(max_size=self.config.get('max_file_size', MAX_TEXT_SIZE))
+        self.discovery = FileDiscovery(self.config)
+        self.last_profile: Optional[ProfileResult] = None
         logger.info('PerformanceAnalyzer initialized')
     
     async def analyze(
@@ -51,7 +505,7 @@ class PerformanceAnalyzer:
         
         Args:
             code_path: 代碼路徑
-            profiling: 是否執行性能分析
+            profiling: 是否同時運行時剖析（見 profile），靜態問題與熱點交叉排序
             
         Returns:
             List[PerformanceIssue]: 性能問題列表
@@ -67,42 +521,267 @@ class PerformanceAnalyzer:
             for file_path in self._get_code_files(path):
                 issues.extend(await self._analyze_file(file_path))
         
+        if profiling:
+            result = await self.profile(code_path)
+            if result is not None:
+                issues = self._rank_by_profile(issues, result)
+        
         logger.info(f'Performance analysis completed. Found {len(issues)} issues')
         return issues
     
+    async def profile(
+        self,
+        code_path: str,
+        command: Optional[Union[str, List[str]]] = None
+    ) -> Optional[ProfileResult]:
+        """
+        在子進程中以 cProfile 運行目標並找出熱點函數
+        
+        目標按 command、config['profile_command'] 的順序確定，寫法與 python
+        命令行參數相同（如 ['-m', 'pytest', '-q'] 或 'app.py --fast'）；都未指定時
+        code_path 為 .py 文件則運行該腳本，為目錄則運行 pytest。
+        pstats 與 folded stacks 寫入 config['profile_output_dir']（默認 reports/performance）。
+        
+        Args:
+            code_path: 代碼路徑（熱點只統計此路徑內的函數）
+            command: 剖析目標
+            
+        Returns:
+            Optional[ProfileResult]: 剖析結果；目標無法運行或超時時返回 None
+        """
+        path = Path(code_path).resolve()
+        root = path if path.is_dir() else path.parent
+        target = self._profile_target(path, command or self.config.get('profile_command'))
+        
+        output_dir = Path(self.config.get('profile_output_dir', 'reports/performance')).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stats_path = output_dir / 'profile.prof'
+        folded_path = output_dir / 'profile.folded'
+        for stale in (stats_path, folded_path):
+            stale.unlink(missing_ok=True)
+        
+        cmd = [
+            sys.executable, PROFILE_RUNNER,
+            '--stats', str(stats_path),
+            '--folded', str(folded_path),
+            '--interval', str(self.config.get('profile_interval', 0.005)),
+        ] + target
+        timeout = self.config.get('profile_timeout', PROFILE_TIMEOUT)
+        logger.info(f'Profiling {" ".join(target)} in {root}')
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(root),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error(f'Profiling timed out after {timeout}s')
+            return None
+        
+        if not stats_path.exists():
+            logger.error(f'Profiling failed: {stderr.decode(errors="replace")[-2000:]}')
+            return None
+        if process.returncode:
+            logger.warning(f'Profiled command exited with code {process.returncode}')
+        
+        result = self._load_profile(stats_path, root)
+        result.command = target
+        result.exit_code = process.returncode
+        result.folded_path = str(folded_path)
+        self.last_profile = result
+        
+        logger.info(
+            f'Profiling completed in {result.total_time:.3f}s, '
+            f'{len(result.hotspots)} hotspots, folded stacks: {folded_path}'
+        )
+        return result
+    
+    @staticmethod
+    def _profile_target(path: Path, command: Optional[Union[str, List[str]]]) -> List[str]:
+        """把 python 命令行參數轉換為 profile_runner 的參數"""
+        if isinstance(command, str):
+            command = shlex.split(command)
+        if not command:
+            if path.is_file():
+                return ['--', str(path)]
+            return ['-m', 'pytest', '--', '-q', '-p', 'no:cacheprovider']
+        if command[0] == '-m':
+            return ['-m', command[1], '--'] + list(command[2:])
+        return ['--'] + list(command)
+    
+    def _load_profile(self, stats_path: Path, root: Path) -> ProfileResult:
+        """讀取 pstats，按累計耗時排出 root 內的熱點函數"""
+        stats = pstats.Stats(str(stats_path))
+        total = stats.total_tt or 1e-9
+        excluded = self.discovery.excluded_dirs | {'site-packages'}
+        prefix = str(root) + os.sep
+        
+        functions = {}
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            # '~' 為內置函數，'<...>' 為 exec/frozen 代碼
+            if filename == '~' or filename.startswith('<') or name == '<module>':
+                continue
+            # 子進程工作目錄為 root，相對路徑以 root 為基準
+            filename = os.path.normpath(os.path.join(root, filename))
+            if not filename.startswith(prefix) or not excluded.isdisjoint(filename[len(prefix):].split(os.sep)):
+                continue
+            functions[(filename, line)] = (name, calls, own, cumulative)
+        
+        top = self.config.get('profile_top', PROFILE_TOP)
+        ranked = sorted(functions.items(), key=lambda item: item[1][3], reverse=True)
+        hotspots = []
+        for (filename, line), (name, calls, own, cumulative) in ranked[:top]:
+            share = cumulative / total
+            if share < HOTSPOT_MIN_SHARE:
+                break
+            if share >= HOTSPOT_ERROR_SHARE:
+                severity = 'error'
+            elif share >= HOTSPOT_WARNING_SHARE:
+                severity = 'warning'
+            else:
+                severity = 'info'
+            hotspots.append(PerformanceIssue(
+                type='hotspot',
+                severity=severity,
+                message=(
+                    f'{name}() took {cumulative:.3f}s cumulative ({share:.1%} of runtime), '
+                    f'{calls} calls, {own:.3f}s own time'
+                ),
+                file=filename,
+                line=line,
+                suggestion='Measured hotspot - optimise here first (see folded stacks for callers)',
+                cumulative_time=cumulative
+            ))
+        
+        return ProfileResult(
+            command=[],
+            exit_code=0,
+            total_time=stats.total_tt,
+            stats_path=str(stats_path),
+            folded_path='',
+            hotspots=hotspots,
+            functions=functions
+        )
+    
+    def _rank_by_profile(
+        self,
+        issues: List[PerformanceIssue],
+        result: ProfileResult
+    ) -> List[PerformanceIssue]:
+        """
+        靜態問題與實測熱點交叉引用
+        
+        落在被執行函數內的靜態問題標註該函數（最內層）的累計耗時；
+        返回熱點與靜態問題按累計耗時降序排列，未被執行的問題排在最後。
+        """
+        by_file: Dict[str, Dict[int, Tuple[str, float]]] = {}
+        for (filename, line), (name, _, _, cumulative) in result.functions.items():
+            by_file.setdefault(filename, {})[line] = (name, cumulative)
+        
+        spans_cache: Dict[str, List[Tuple[int, int, Tuple[str, float]]]] = {}
+        total = result.total_time or 1e-9
+        for issue in issues:
+            filename = os.path.abspath(issue.file)
+            measured = by_file.get(filename)
+            if not measured:
+                continue
+            if filename not in spans_cache:
+                spans_cache[filename] = self._function_spans(filename, measured)
+            containing = [
+                (end - start, timing) for start, end, timing in spans_cache[filename]
+                if start <= issue.line <= end
+            ]
+            if not containing:
+                continue
+            name, cumulative = min(containing, key=lambda item: item[0])[1]
+            issue.cumulative_time = cumulative
+            issue.message += f' [measured: {name}() {cumulative:.3f}s cumulative, {cumulative / total:.1%} of runtime]'
+        
+        ranked = result.hotspots + issues
+        ranked.sort(key=lambda issue: -(issue.cumulative_time or 0.0))
+        return ranked
+    
+    def _function_spans(
+        self,
+        filename: str,
+        measured: Dict[int, Tuple[str, float]]
+    ) -> List[Tuple[int, int, Tuple[str, float]]]:
+        """文件中被剖析到的函數的行範圍 (起始行, 結束行, (函數名, 累計耗時))"""
+        code = self.reader.read_text(filename)
+        if code is None:
+            return []
+        try:
+            tree = ast.parse(code, filename=filename)
+        except SyntaxError:
+            return []
+        
+        spans = []
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            # co_firstlineno 對有裝飾器的函數指向第一個裝飾器所在行
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            timing = measured.get(first) or measured.get(node.lineno)
+            if timing is not None:
+                spans.append((first, node.end_lineno, timing))
+        return spans
+    
     async def _analyze_file(self, file_path: Path) -> List[PerformanceIssue]:
         """分析單個文件"""
         issues = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            code = self.reader.read_text(file_path)
+            if code is None:
+                return issues
             
-            for line_num, line in enumerate(lines, 1):
-                # 檢查常見性能問題
-                if 'for' in line and 'for' in lines[line_num] if line_num < len(lines) else False:
-                    issues.append(PerformanceIssue(
-                        type='nested-loops',
-                        severity='warning',
-                        message='Nested loops detected - potential O(n²) complexity',
-                        file=str(file_path),
-                        line=line_num,
-                        suggestion='Consider using more efficient algorithms'
-                    ))
+            if file_path.suffix == '.py':
+                issues.extend(self._analyze_python(code, str(file_path)))
+            else:
+                issues.extend(self._analyze_braced(code, str(file_path), file_path.suffix == '.rs'))
         
         except Exception as e:
             logger.error(f'Error analyzing file {file_path}: {e}')
         
         return issues
     
+    def _analyze_python(self, code: str, file_path: str) -> List[PerformanceIssue]:
+        """基於 AST 的 Python 性能檢查（一次遍歷）"""
+        if not _worth_parsing(code):
+            return []
+        
+        try:
+            tree = ast.parse(code, filename=file_path)
+        except SyntaxError as e:
+            logger.debug(f'Skipping performance checks for {file_path}: {e}')
+            return []
+        
+        visitor = _PythonPerformanceVisitor(file_path)
+        visitor.visit(tree)
+        return sorted(visitor.issues, key=lambda issue: issue.line)
+    
+    def _analyze_braced(self, code: str, file_path: str, rust: bool = False) -> List[PerformanceIssue]:
+        """花括號語言（JS/TS/Go/Rust/Java）的循環嵌套檢查"""
+        issues = []
+        for line, depth in _braced_loop_nests(code, rust):
+            if depth < 2:
+                continue
+            issues.append(PerformanceIssue(
+                type='nested-loops',
+                severity='error' if depth >= 3 else 'warning',
+                message=f'Nested loops (depth {depth}) - potential O(n^{depth}) complexity',
+                file=file_path,
+                line=line,
+                suggestion='Consider using more efficient algorithms, e.g. index the inner collection in a map or set'
+            ))
+        return issues
+    
     def _get_code_files(self, directory: Path) -> List[Path]:
-        """獲取代碼文件"""
+        """獲取代碼文件（遵循 .gitignore / .slasolveignore）"""
         extensions = {'.py', '.js', '.ts', '.go', '.rs', '.java'}
-        files = []
-        import os
-        for root, _, filenames in os.walk(directory):
-            for filename in filenames:
-                file_path = Path(root) / filename
-                if file_path.suffix in extensions:
-                    files.append(file_path)
-        return files
+        return self.discovery.discover(directory, extensions)
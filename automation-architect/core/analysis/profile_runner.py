@@ -0,0 +1,115 @@
+"""
+Profile Runner - 性能剖析子進程入口
+在子進程中以 cProfile 運行目標腳本或模塊，同時按固定間隔採樣調用棧，
+輸出 pstats 文件和 flamegraph 兼容的 folded stacks
+
+只依賴標準庫，由 PerformanceAnalyzer 以腳本方式啟動：
+    python profile_runner.py --stats out.prof --folded out.folded [-m module] -- [script] [args...]
+"""
+
+import argparse
+import cProfile
+import os
+import runpy
+import signal
+import sys
+from collections import Counter
+from typing import List, Optional
+
+_EXCLUDED_FILES = {__file__, runpy.__file__, '<frozen runpy>'}
+
+
+class StackSampler:
+    """
+    基於 ITIMER_PROF 的調用棧採樣器
+
+    按進程 CPU 時間觸發 SIGPROF，在信號處理函數中沿 f_back 收集當前棧；
+    平台不支持 setitimer 時不採樣。
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.enabled = hasattr(signal, 'setitimer') and hasattr(signal, 'SIGPROF')
+
+    def _sample(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename not in _EXCLUDED_FILES:
+                stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+            frame = frame.f_back
+        if stack:
+            self.counts[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        if self.enabled:
+            signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        if self.enabled:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def write(self, path: str) -> None:
+        """寫出 folded stacks：每行 'frame;frame;frame count'"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run a script or module under cProfile with stack sampling')
+    parser.add_argument('--stats', required=True, help='pstats output file')
+    parser.add_argument('--folded', required=True, help='folded stacks output file')
+    parser.add_argument('--interval', type=float, default=0.005, help='sampling interval in seconds')
+    parser.add_argument('-m', dest='module', help='run a module (like python -m)')
+
+    # '--' 之後的參數原樣交給目標（腳本路徑及其參數，或模塊參數）
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if '--' in argv:
+        split = argv.index('--')
+        argv, target = argv[:split], argv[split + 1:]
+    else:
+        target = []
+    args = parser.parse_args(argv)
+
+    # 與直接運行目標時一致：sys.path[0] 為腳本所在目錄（-m 時為當前目錄），
+    # 而不是本文件所在目錄
+    if args.module:
+        sys.argv = [args.module] + target
+        sys.path[0] = os.getcwd()
+    elif target:
+        sys.argv = target
+        sys.path[0] = os.path.dirname(os.path.abspath(target[0]))
+    else:
+        parser.error('a script or -m module is required')
+
+    sampler = StackSampler(args.interval)
+    profiler = cProfile.Profile()
+    exit_code = 0
+
+    sampler.start()
+    profiler.enable()
+    try:
+        if args.module:
+            runpy.run_module(args.module, run_name='__main__', alter_sys=True)
+        else:
+            runpy.run_path(sys.argv[0], run_name='__main__')
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exit_code = e.code
+        elif e.code is not None:
+            exit_code = 1
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(args.stats)
+        sampler.write(args.folded)
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
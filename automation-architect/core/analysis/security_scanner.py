@@ -8,6 +8,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from .file_discovery import FileDiscovery
+from .file_reader import SourceBuffer, SourceReader, count_newlines
+
 try:
     from loguru import logger
 except ImportError:
@@ -48,6 +51,8 @@ class SecurityScanner:
             config: 掃描配置
         """
         self.config = config or {}
+        self.reader = SourceReader(max_size=self.config.get('max_file_size'))
+        self.discovery = FileDiscovery(self.config)
         self._init_patterns()
         logger.info('SecurityScanner initialized')
     
@@ -88,6 +93,17 @@ class SecurityScanner:
             (r'open\s*\([^)]*\.\./[^)]*\)', 'path-traversal', 'Potential path traversal vulnerability'),
             (r'file\s*\([^)]*\.\./[^)]*\)', 'path-traversal', 'Potential path traversal vulnerability'),
         ]
+        
+        # 所有模式合併為一個 bytes 正則，直接在文件緩衝區（bytes 或 mmap）上搜索。
+        # 逐行能命中的位置在整個緩衝區上也必然命中，因此沒有命中的文件和行
+        # 都不必解碼、逐行檢查
+        ignore_case = (
+            self.secret_patterns + self.sql_injection_patterns
+            + self.xss_patterns + self.crypto_patterns
+        )
+        alternatives = [f'(?i:{pattern})' for pattern, _, _ in ignore_case]
+        alternatives += [f'(?:{pattern})' for pattern, _, _ in self.path_traversal_patterns]
+        self._candidate_pattern = re.compile('|'.join(alternatives).encode())
     
     async def scan(
         self,
@@ -136,30 +152,60 @@ class SecurityScanner:
         issues = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for line_num, line in enumerate(lines, 1):
-                # 檢查硬編碼密鑰
-                issues.extend(self._check_secrets(line, file_path, line_num))
-                
-                # 檢查 SQL 注入
-                issues.extend(self._check_sql_injection(line, file_path, line_num))
-                
-                # 檢查 XSS
-                issues.extend(self._check_xss(line, file_path, line_num))
-                
-                # 檢查不安全的加密
-                issues.extend(self._check_crypto(line, file_path, line_num))
-                
-                # 檢查路徑遍歷
-                issues.extend(self._check_path_traversal(line, file_path, line_num))
+            with self.reader.open_buffer(file_path) as source:
+                if source is not None:
+                    issues.extend(self._scan_buffer(source, file_path))
         
         except Exception as e:
             logger.error(f'Error scanning file {file_path}: {e}')
         
         return issues
     
+    def _scan_buffer(self, source: SourceBuffer, file_path: Path) -> List[SecurityIssue]:
+        """
+        在文件緩衝區上定位候選行並逐行檢查
+        
+        每次從上一候選行之後繼續搜索，命中位置所在的行即候選行；
+        行號按兩個候選行之間的換行數累加。
+        """
+        issues = []
+        data = source.data
+        search = self._candidate_pattern.search
+        pos = 0
+        line_num = 1
+        
+        match = search(data)
+        while match is not None:
+            start, end = source.line_bounds(match.start())
+            line_num += count_newlines(data, pos, start)
+            issues.extend(self._check_line(source.decode(start, end), file_path, line_num))
+            pos = end
+            line_num += 1
+            match = search(data, pos)
+        
+        return issues
+    
+    def _check_line(self, line: str, file_path: Path, line_num: int) -> List[SecurityIssue]:
+        """對單行執行全部檢查"""
+        issues = []
+        
+        # 檢查硬編碼密鑰
+        issues.extend(self._check_secrets(line, file_path, line_num))
+        
+        # 檢查 SQL 注入
+        issues.extend(self._check_sql_injection(line, file_path, line_num))
+        
+        # 檢查 XSS
+        issues.extend(self._check_xss(line, file_path, line_num))
+        
+        # 檢查不安全的加密
+        issues.extend(self._check_crypto(line, file_path, line_num))
+        
+        # 檢查路徑遍歷
+        issues.extend(self._check_path_traversal(line, file_path, line_num))
+        
+        return issues
+    
     def _check_secrets(
         self,
         line: str,
@@ -279,21 +325,13 @@ class SecurityScanner:
         return issues
     
     def _get_scannable_files(self, directory: Path) -> List[Path]:
-        """獲取可掃描的文件"""
+        """獲取可掃描的文件（遵循 .gitignore / .slasolveignore）"""
         scannable_extensions = {
             '.py', '.js', '.ts', '.java', '.go', '.rs',
             '.cpp', '.c', '.php', '.rb', '.cs'
         }
         
-        files = []
-        import os
-        for root, _, filenames in os.walk(directory):
-            for filename in filenames:
-                file_path = Path(root) / filename
-                if file_path.suffix in scannable_extensions:
-                    files.append(file_path)
-        
-        return files
+        return self.discovery.discover(directory, scannable_extensions)
     
     def generate_report(self, issues: List[SecurityIssue]) -> Dict:
         """
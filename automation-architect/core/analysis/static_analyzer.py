@@ -4,10 +4,15 @@ Static Analyzer - 靜態代碼分析器
 """
 
 import ast
-import os
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .file_discovery import FileDiscovery
+from .file_reader import MAX_TEXT_SIZE, SourceReader
+from .line_index import LineIndex
 
 try:
     from loguru import logger
@@ -16,11 +21,50 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class StaticIssue(Mapping):
+    """
+    靜態分析問題
+
+    輕量問題對象（無實例 __dict__）。同時實現只讀映射接口，
+    issue['type'] / issue.get('severity') / dict(issue) 與原先的字典問題用法一致。
+    """
+    type: str
+    severity: str
+    message: str
+    file: str
+    line: int
+
+    def __getitem__(self, key: str):
+        if key not in _STATIC_ISSUE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_STATIC_ISSUE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_STATIC_ISSUE_FIELDS)
+
+    def to_dict(self) -> Dict:
+        """轉換為字典（JSON 序列化）"""
+        return {name: getattr(self, name) for name in _STATIC_ISSUE_FIELDS}
+
+
+_STATIC_ISSUE_FIELDS = tuple(f.name for f in fields(StaticIssue))
+
+
+@lru_cache(maxsize=1024)
+def _line_too_long_message(length: int, max_length: int) -> str:
+    """行長度問題消息（相同長度共用一個字符串）"""
+    return f'Line too long: {length} characters (max: {max_length})'
+
+
 @dataclass
 class AnalysisResult:
     """分析結果數據類"""
     file_path: str
-    issues: List[Dict]
+    issues: List[StaticIssue]
     metrics: Dict
     severity_counts: Dict[str, int]
     analysis_time_ms: float
@@ -57,6 +101,8 @@ class StaticAnalyzer:
         """
         self.config = config or {}
         self.supported_extensions = {'.py', '.js', '.ts', '.go', '.rs', '.java', '.cpp'}
+        self.reader = SourceReader(max_size=self.config.get('max_file_size', MAX_TEXT_SIZE))
+        self.discovery = FileDiscovery(self.config)
         logger.info('StaticAnalyzer initialized')
     
     async def analyze(
@@ -88,12 +134,14 @@ class StaticAnalyzer:
         if path.is_file():
             file_issues, file_metrics = await self._analyze_file(path, language)
             issues.extend(file_issues)
-            all_metrics[str(path)] = file_metrics
+            if file_metrics is not None:
+                all_metrics[str(path)] = file_metrics
         elif path.is_dir():
             for file_path in self._get_code_files(path):
                 file_issues, file_metrics = await self._analyze_file(file_path, language)
                 issues.extend(file_issues)
-                all_metrics[str(file_path)] = file_metrics
+                if file_metrics is not None:
+                    all_metrics[str(file_path)] = file_metrics
         else:
             logger.error(f'Invalid path: {code_path}')
             raise ValueError(f'Invalid path: {code_path}')
@@ -120,7 +168,7 @@ class StaticAnalyzer:
         self,
         file_path: Path,
         language: Optional[str] = None
-    ) -> Tuple[List[Dict], CodeMetrics]:
+    ) -> Tuple[List[StaticIssue], Optional[CodeMetrics]]:
         """
         分析單個文件
         
@@ -129,7 +177,7 @@ class StaticAnalyzer:
             language: 編程語言
             
         Returns:
-            Tuple[List[Dict], CodeMetrics]: 問題列表和代碼指標
+            Tuple[List[StaticIssue], Optional[CodeMetrics]]: 問題列表和代碼指標（跳過的文件指標為 None）
         """
         issues = []
         
@@ -140,54 +188,60 @@ class StaticAnalyzer:
         logger.debug(f'Analyzing file: {file_path} (language: {language})')
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
+            code = self.reader.read_text(file_path)
+            if code is None:
+                # 二進制、壓縮或超限文件不參與分析
+                return issues, None
+            
+            # 行級索引：指標、風格與語言檢查共用
+            index = LineIndex(code)
             
             # 計算代碼指標
-            metrics = self._calculate_metrics(code, language)
+            metrics = self._calculate_metrics(code, language, index)
             
             # 執行各種檢查
             if language == 'python':
                 issues.extend(self._check_python_code(code, file_path))
             elif language in ['javascript', 'typescript']:
-                issues.extend(self._check_javascript_code(code, file_path))
+                issues.extend(self._check_javascript_code(code, file_path, index))
             
             # 通用檢查
             issues.extend(self._check_complexity(code, metrics, file_path))
-            issues.extend(self._check_style(code, language, file_path))
+            issues.extend(self._check_style(code, language, file_path, index))
             
         except Exception as e:
             logger.error(f'Error analyzing file {file_path}: {e}')
-            issues.append({
-                'type': 'analysis-error',
-                'severity': 'error',
-                'message': f'Failed to analyze file: {str(e)}',
-                'file': str(file_path),
-                'line': 0
-            })
+            issues.append(StaticIssue(
+                type='analysis-error',
+                severity='error',
+                message=f'Failed to analyze file: {str(e)}',
+                file=str(file_path),
+                line=0
+            ))
             metrics = CodeMetrics(0, 0, 0.0, 0.0, 0, 0)
         
         return issues, metrics
     
-    def _calculate_metrics(self, code: str, language: str) -> CodeMetrics:
+    def _calculate_metrics(self, code: str, language: str, index: Optional[LineIndex] = None) -> CodeMetrics:
         """
         計算代碼指標
         
         Args:
             code: 源代碼
             language: 編程語言
+            index: 行級索引（可選，未提供時新建）
             
         Returns:
             CodeMetrics: 代碼指標
         """
-        lines = code.split('\n')
-        loc = len([line for line in lines if line.strip() and not line.strip().startswith('#')])
+        index = index or LineIndex(code)
+        loc = index.line_count - index.blank_line_count - index.count_lines_starting_with('#')
         
         # 簡化的循環複雜度計算
         complexity = self._calculate_cyclomatic_complexity(code, language)
         
         # 註釋比例
-        comment_lines = len([line for line in lines if line.strip().startswith('#') or line.strip().startswith('//')])
+        comment_lines = index.count_lines_starting_with('#', '//')
         comment_ratio = comment_lines / max(loc, 1)
         
         # 函數和類計數 (Python)
@@ -233,7 +287,7 @@ class StaticAnalyzer:
         
         return complexity
     
-    def _check_python_code(self, code: str, file_path: Path) -> List[Dict]:
+    def _check_python_code(self, code: str, file_path: Path) -> List[StaticIssue]:
         """
         檢查 Python 代碼
         
@@ -242,7 +296,7 @@ class StaticAnalyzer:
             file_path: 文件路徑
             
         Returns:
-            List[Dict]: 問題列表
+            List[StaticIssue]: 問題列表
         """
         issues = []
         
@@ -254,73 +308,72 @@ class StaticAnalyzer:
                 if isinstance(node, ast.FunctionDef):
                     func_lines = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
                     if func_lines > 50:
-                        issues.append({
-                            'type': 'long-function',
-                            'severity': 'warning',
-                            'message': f'Function "{node.name}" is too long ({func_lines} lines)',
-                            'file': str(file_path),
-                            'line': node.lineno
-                        })
+                        issues.append(StaticIssue(
+                            type='long-function',
+                            severity='warning',
+                            message=f'Function "{node.name}" is too long ({func_lines} lines)',
+                            file=str(file_path),
+                            line=node.lineno
+                        ))
                 
                 # 檢查過多參數
                 if isinstance(node, ast.FunctionDef):
                     param_count = len(node.args.args)
                     if param_count > 5:
-                        issues.append({
-                            'type': 'too-many-parameters',
-                            'severity': 'info',
-                            'message': f'Function "{node.name}" has too many parameters ({param_count})',
-                            'file': str(file_path),
-                            'line': node.lineno
-                        })
+                        issues.append(StaticIssue(
+                            type='too-many-parameters',
+                            severity='info',
+                            message=f'Function "{node.name}" has too many parameters ({param_count})',
+                            file=str(file_path),
+                            line=node.lineno
+                        ))
         
         except SyntaxError as e:
-            issues.append({
-                'type': 'syntax-error',
-                'severity': 'critical',
-                'message': f'Syntax error: {str(e)}',
-                'file': str(file_path),
-                'line': e.lineno or 0
-            })
+            issues.append(StaticIssue(
+                type='syntax-error',
+                severity='critical',
+                message=f'Syntax error: {str(e)}',
+                file=str(file_path),
+                line=e.lineno or 0
+            ))
         
         return issues
     
-    def _check_javascript_code(self, code: str, file_path: Path) -> List[Dict]:
+    def _check_javascript_code(
+        self,
+        code: str,
+        file_path: Path,
+        index: Optional[LineIndex] = None
+    ) -> List[StaticIssue]:
         """
         檢查 JavaScript/TypeScript 代碼
         
         Args:
             code: 源代碼
             file_path: 文件路徑
+            index: 行級索引（可選，未提供時新建）
             
         Returns:
-            List[Dict]: 問題列表
+            List[StaticIssue]: 問題列表
         """
-        issues = []
-        
-        # 簡單檢查
-        lines = code.split('\n')
-        for i, line in enumerate(lines, 1):
-            # 檢查 console.log
-            if 'console.log' in line:
-                issues.append({
-                    'type': 'console-log',
-                    'severity': 'info',
-                    'message': 'Remove console.log before production',
-                    'file': str(file_path),
-                    'line': i
-                })
-            
-            # 檢查 var 使用
-            if line.strip().startswith('var '):
-                issues.append({
-                    'type': 'use-const-let',
-                    'severity': 'warning',
-                    'message': 'Use "const" or "let" instead of "var"',
-                    'file': str(file_path),
-                    'line': i
-                })
-        
+        index = index or LineIndex(code)
+        file_name = str(file_path)
+        
+        # 檢查 console.log
+        console_lines = index.lines_containing('console.log')
+        # 檢查 var 使用
+        var_lines = index.lines_starting_with('var ')
+        
+        issues = [
+            StaticIssue('console-log', 'info', 'Remove console.log before production', file_name, line)
+            for line in console_lines
+        ]
+        issues.extend(
+            StaticIssue('use-const-let', 'warning', 'Use "const" or "let" instead of "var"', file_name, line)
+            for line in var_lines
+        )
+        # 保持按行排序（同一行 console-log 在前）
+        issues.sort(key=lambda issue: issue.line)
         return issues
     
     def _check_complexity(
@@ -328,7 +381,7 @@ class StaticAnalyzer:
         code: str,
         metrics: CodeMetrics,
         file_path: Path
-    ) -> List[Dict]:
+    ) -> List[StaticIssue]:
         """
         檢查代碼複雜度
         
@@ -338,30 +391,30 @@ class StaticAnalyzer:
             file_path: 文件路徑
             
         Returns:
-            List[Dict]: 問題列表
+            List[StaticIssue]: 問題列表
         """
         issues = []
         
         # 檢查循環複雜度
         threshold = self.config.get('complexity_threshold', 10)
         if metrics.cyclomatic_complexity > threshold:
-            issues.append({
-                'type': 'high-complexity',
-                'severity': 'warning',
-                'message': f'High cyclomatic complexity: {metrics.cyclomatic_complexity} (threshold: {threshold})',
-                'file': str(file_path),
-                'line': 0
-            })
+            issues.append(StaticIssue(
+                type='high-complexity',
+                severity='warning',
+                message=f'High cyclomatic complexity: {metrics.cyclomatic_complexity} (threshold: {threshold})',
+                file=str(file_path),
+                line=0
+            ))
         
         # 檢查可維護性
         if metrics.maintainability_index < 60:
-            issues.append({
-                'type': 'low-maintainability',
-                'severity': 'warning',
-                'message': f'Low maintainability index: {metrics.maintainability_index:.2f}',
-                'file': str(file_path),
-                'line': 0
-            })
+            issues.append(StaticIssue(
+                type='low-maintainability',
+                severity='warning',
+                message=f'Low maintainability index: {metrics.maintainability_index:.2f}',
+                file=str(file_path),
+                line=0
+            ))
         
         return issues
     
@@ -369,8 +422,9 @@ class StaticAnalyzer:
         self,
         code: str,
         language: str,
-        file_path: Path
-    ) -> List[Dict]:
+        file_path: Path,
+        index: Optional[LineIndex] = None
+    ) -> List[StaticIssue]:
         """
         檢查代碼風格
         
@@ -378,35 +432,32 @@ class StaticAnalyzer:
             code: 源代碼
             language: 編程語言
             file_path: 文件路徑
+            index: 行級索引（可選，未提供時新建）
             
         Returns:
-            List[Dict]: 問題列表
+            List[StaticIssue]: 問題列表
         """
-        issues = []
-        
-        lines = code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # 檢查行長度
-            if len(line) > 100:
-                issues.append({
-                    'type': 'line-too-long',
-                    'severity': 'info',
-                    'message': f'Line too long: {len(line)} characters (max: 100)',
-                    'file': str(file_path),
-                    'line': i
-                })
-            
-            # 檢查尾部空格
-            if line.rstrip() != line:
-                issues.append({
-                    'type': 'trailing-whitespace',
-                    'severity': 'info',
-                    'message': 'Trailing whitespace',
-                    'file': str(file_path),
-                    'line': i
-                })
-        
+        index = index or LineIndex(code)
+        file_name = str(file_path)  # 同一文件的問題共用路徑字符串
+        max_length = self.config.get('max_line_length', 100)
+        
+        # 檢查行長度
+        issues = [
+            StaticIssue('line-too-long', 'info', _line_too_long_message(length, max_length), file_name, line)
+            for line, length in index.long_lines(max_length)
+        ]
+        
+        # 檢查尾部空格
+        trailing = [
+            StaticIssue('trailing-whitespace', 'info', 'Trailing whitespace', file_name, line)
+            for line in index.trailing_whitespace_lines()
+        ]
+        
+        # 合併為按行排序（同一行 line-too-long 在前）
+        if issues and trailing:
+            issues = sorted(issues + trailing, key=lambda issue: issue.line)
+        else:
+            issues = issues or trailing
         return issues
     
     def _detect_language(self, file_path: Path) -> str:
@@ -436,7 +487,7 @@ class StaticAnalyzer:
     
     def _get_code_files(self, directory: Path) -> List[Path]:
         """
-        獲取目錄中的所有代碼文件
+        獲取目錄中的所有代碼文件（遵循 .gitignore / .slasolveignore）
         
         Args:
             directory: 目錄路徑
@@ -444,13 +495,7 @@ class StaticAnalyzer:
         Returns:
             List[Path]: 代碼文件路徑列表
         """
-        code_files = []
-        for root, _, files in os.walk(directory):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix in self.supported_extensions:
-                    code_files.append(file_path)
-        return code_files
+        return self.discovery.discover(directory, self.supported_extensions)
     
     def _count_severities(self, issues: List[Dict]) -> Dict[str, int]:
         """
@@ -17,7 +17,8 @@ from ..analysis import (
     StaticAnalyzer,
     SecurityScanner,
     PerformanceAnalyzer,
-    ArchitectureAnalyzer
+    ArchitectureAnalyzer,
+    FileDiscovery
 )
 from ..repair import RuleEngine, ASTTransformer, RepairVerifier
 
@@ -61,6 +62,16 @@ class AnalysisPipeline:
         self.performance_analyzer = PerformanceAnalyzer(config)
         self.architecture_analyzer = ArchitectureAnalyzer(config)
         
+        # 各分析器共用一個文件發現服務（及其文件索引）
+        self.file_discovery = FileDiscovery(config)
+        for analyzer in (
+            self.static_analyzer,
+            self.security_scanner,
+            self.performance_analyzer,
+            self.architecture_analyzer
+        ):
+            analyzer.discovery = self.file_discovery
+        
         # 初始化修復工具
         self.rule_engine = RuleEngine(config)
         self.ast_transformer = ASTTransformer(config)
@@ -196,8 +207,9 @@ class AnalysisPipeline:
         """執行性能分析"""
         logger.debug('Running performance analysis')
         try:
-            issues = await self.performance_analyzer.analyze(code_path)
-            return {
+            profiling = self.config.get('profiling', False)
+            issues = await self.performance_analyzer.analyze(code_path, profiling=profiling)
+            result = {
                 'status': 'completed',
                 'issues_count': len(issues),
                 'issues': [
@@ -206,11 +218,22 @@ class AnalysisPipeline:
                         'severity': issue.severity,
                         'message': issue.message,
                         'file': issue.file,
-                        'line': issue.line
+                        'line': issue.line,
+                        'cumulative_time': issue.cumulative_time
                     }
                     for issue in issues
                 ]
             }
+            profile = self.performance_analyzer.last_profile
+            if profiling and profile is not None:
+                result['profile'] = {
+                    'command': profile.command,
+                    'exit_code': profile.exit_code,
+                    'total_time': profile.total_time,
+                    'stats_path': profile.stats_path,
+                    'folded_path': profile.folded_path
+                }
+            return result
         except Exception as e:
             logger.error(f'Performance analysis failed: {e}')
             return {
@@ -223,9 +246,21 @@ class AnalysisPipeline:
         logger.debug('Running architecture analysis')
         try:
             issues = await self.architecture_analyzer.analyze(code_path)
+            graph = self.architecture_analyzer.last_graph
             return {
                 'status': 'completed',
-                'issues_count': len(issues)
+                'issues_count': len(issues),
+                'modules': len(graph),
+                'dependencies': graph.edge_count,
+                'issues': [
+                    {
+                        'type': issue.type,
+                        'severity': issue.severity,
+                        'message': issue.message,
+                        'components': issue.components
+                    }
+                    for issue in issues
+                ]
             }
         except Exception as e:
             logger.error(f'Architecture analysis failed: {e}')
@@ -0,0 +1,109 @@
+"""
+Unit tests for ArchitectureAnalyzer
+架構分析器單元測試
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.analysis.architecture_analyzer import ArchitectureAnalyzer, ArchitectureIssue
+from core.analysis.import_graph import ImportGraph
+
+
+@pytest.fixture
+def layered_project(tmp_path):
+    """創建分層項目：db 反向導入 api，形成循環"""
+    files = {
+        'app/__init__.py': '',
+        'app/api/__init__.py': '',
+        'app/api/views.py': 'from ..core import service\nfrom app.db.models import Model\n',
+        'app/core/__init__.py': '',
+        'app/core/service.py': 'from . import helpers\nimport app.db.models\nimport os\n',
+        'app/core/helpers.py': 'def helper():\n    from app.core.service import run\n',
+        'app/db/__init__.py': '',
+        'app/db/models.py': 'from app.api import views\n',
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def _edges(graph):
+    return {
+        (graph.modules[node], graph.modules[target])
+        for node in range(len(graph))
+        for target in graph.successors(node)
+    }
+
+
+@pytest.mark.asyncio
+async def test_build_import_graph(layered_project):
+    """測試模塊命名、相對導入和子模塊解析"""
+    analyzer = ArchitectureAnalyzer({'use_git': False})
+    await analyzer.analyze(str(layered_project))
+    graph = analyzer.last_graph
+
+    assert _edges(graph) == {
+        ('app.api.views', 'app.core.service'),
+        ('app.api.views', 'app.db.models'),
+        ('app.core.service', 'app.core.helpers'),
+        ('app.core.service', 'app.db.models'),
+        ('app.core.helpers', 'app.core.service'),
+        ('app.db.models', 'app.api.views'),
+    }
+    assert analyzer.metrics['app.core.service'] == {'fan_in': 2, 'fan_out': 2, 'instability': 0.5}
+
+
+@pytest.mark.asyncio
+async def test_detect_cycles_and_layer_violations(layered_project, tmp_path):
+    """測試循環依賴、分層規則、禁止依賴和導入緩存"""
+    config = {
+        'use_git': False,
+        'layers': ['app.api', 'app.core', 'app.db'],
+        'forbidden_dependencies': [['app.api', 'app.db']],
+        'import_cache': str(tmp_path / 'cache' / 'imports.json'),
+    }
+    issues = await ArchitectureAnalyzer(config).analyze(str(layered_project))
+
+    assert all(isinstance(issue, ArchitectureIssue) for issue in issues)
+    assert [issue.type for issue in issues] == [
+        'circular-dependency', 'forbidden-dependency', 'layer-violation'
+    ]
+    cycle = issues[0]
+    assert cycle.components == ['app.api.views', 'app.core.helpers', 'app.core.service', 'app.db.models']
+    assert 'app.api.views -> app.db.models -> app.api.views' in cycle.message
+    assert issues[2].components == ['app.db.models', 'app.api.views']
+
+    # 第二次運行全部命中緩存，結果不變
+    cached = ArchitectureAnalyzer(config)
+    assert len(cached._import_cache) == 5
+    assert await cached.analyze(str(layered_project)) == issues
+
+
+def test_import_graph_csr_and_scc():
+    """測試 CSR 存儲（去重、去自環）和 Tarjan 強連通分量"""
+    graph = ImportGraph(
+        ['a', 'b', 'c', 'd', 'e'],
+        [[1, 1, 0], [2], [0, 3], [4], [3]]
+    )
+
+    assert list(graph.indptr) == [0, 1, 2, 4, 5, 6]
+    assert list(graph.indices) == [1, 2, 0, 3, 4, 3]
+    assert list(graph.fan_in) == [1, 1, 1, 2, 1]
+    assert graph.instability(2) == pytest.approx(2 / 3)
+    assert sorted(sorted(c) for c in graph.cycles()) == [[0, 1, 2], [3, 4]]
+    assert graph.shortest_cycle([0, 1, 2]) == [0, 1, 2, 0]
+
+    # 深鏈不受遞歸深度限制
+    n = 20000
+    chain = ImportGraph([str(i) for i in range(n)], [[(i + 1) % n] for i in range(n)])
+    assert [len(c) for c in chain.cycles()] == [n]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,128 @@
+"""
+Unit tests for SourceReader
+源文件讀取器單元測試
+"""
+
+import builtins
+import mmap
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.analysis import file_reader
+from core.analysis.file_reader import SNIFF_SIZE, SourceReader
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """記錄 SourceReader 從文件讀取的字節數"""
+    counts = []
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def read(self, size=-1):
+            data = self._f.read(size)
+            counts.append(len(data))
+            return data
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._f.close()
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+    monkeypatch.setattr(file_reader, 'open', lambda *args: CountingFile(builtins.open(*args)), raising=False)
+    return counts
+
+
+def test_small_binary_skipped_after_sniff(tmp_path, reads):
+    """測試小於 mmap 閾值的二進制文件只讀文件頭"""
+    path = tmp_path / 'image.py'
+    path.write_bytes(b'\x89PNG\r\n\x1a\n\x00' + bytes(range(256)) * 400)
+    reader = SourceReader()
+
+    assert reader.read_text(path) is None
+    assert reads == [SNIFF_SIZE]
+    assert reader.skipped == {'binary': 1}
+
+
+def test_minified_and_too_large_skipped(tmp_path, reads):
+    """測試壓縮文件按文件頭跳過，超限文件不讀取"""
+    minified = tmp_path / 'bundle.js'
+    minified.write_text('var a=1;' * 5000)
+    named = tmp_path / 'lib.min.js'
+    named.write_text('var a = 1;\n')
+    large = tmp_path / 'large.py'
+    large.write_text('x = 1\n' * 1000)
+    reader = SourceReader(max_size=1024)
+
+    assert reader.read_text(named) is None
+    assert SourceReader().read_text(minified) is None
+    assert reader.read_text(large) is None
+    assert reads == [len(named.read_bytes()), SNIFF_SIZE]
+    assert reader.skipped == {'minified': 1, 'too-large': 1}
+    assert SourceReader(skip_minified=False).read_text(minified) == minified.read_text()
+
+
+def test_text_read_in_full(tmp_path):
+    """測試文件頭之後的內容完整讀入"""
+    path = tmp_path / 'app.py'
+    text = ''.join(f'line_{i} = {i}\n' for i in range(2000))
+    path.write_text(text)
+
+    assert len(text) > SNIFF_SIZE
+    assert SourceReader().read_text(path) == text
+    empty = tmp_path / 'empty.py'
+    empty.touch()
+    assert SourceReader().read_text(empty) == ''
+
+
+def test_non_utf8_encodings(tmp_path):
+    """測試 BOM、非 UTF-8 文件頭以及文件頭之後才出現的非 UTF-8 字節"""
+    latin = tmp_path / 'latin.py'
+    # 只用 latin-1 與 cp1250 等相近字符集中編碼相同的字符，結果不依賴檢測庫的選擇
+    latin.write_bytes("name = 'café façade résumé'\n".encode('latin-1') * 3)
+    utf16 = tmp_path / 'utf16.py'
+    utf16.write_text('x = "héllo"\n', encoding='utf-16')
+    late = tmp_path / 'late.py'
+    late.write_bytes(b'x = 1\n' * 2000 + "s = 'résumé'\n".encode('latin-1'))
+    reader = SourceReader()
+
+    assert reader.read_text(latin) == "name = 'café façade résumé'\n" * 3
+    assert reader.read_text(utf16) == 'x = "héllo"\n'
+    # 文件頭是 UTF-8，後文按檢測出的字符集解碼，不丟行
+    text = reader.read_text(late)
+    assert text.startswith('x = 1\n') and text.count('\n') == 2001
+    assert text.splitlines()[-1].startswith("s = 'r")
+    with reader.open_buffer(utf16) as source:
+        assert source.encoding == 'utf-8'
+        assert source.decode() == 'x = "héllo"\n'
+
+
+def test_large_file_mapped(tmp_path):
+    """測試超過 mmap 閾值的文件以 mmap 映射並可按行定位"""
+    path = tmp_path / 'big.py'
+    text = ''.join(f'value_{i} = {i}\n' for i in range(1000))
+    path.write_text(text)
+    reader = SourceReader(mmap_threshold=1024)
+
+    assert reader.read_text(path) == text
+    with reader.open_buffer(path) as source:
+        assert isinstance(source.data, mmap.mmap)
+        assert source.size == len(text)
+        offset = source.data.find(b'value_500 ')
+        assert source.line_at(offset) == 501
+        start, end = source.line_bounds(offset)
+        assert source.decode(start, end) == 'value_500 = 500\n'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,112 @@
+"""
+Unit tests for LineIndex
+行級索引單元測試：與逐行 code.split('\\n') 的結果逐項對照
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.analysis.line_index import LineIndex
+
+SAMPLES = {
+    'empty': '',
+    'lf': 'import os\n\ndef main():\n    # run\n    return os.getcwd()  \n',
+    'no-final-newline': 'x = 1\ny = 2',
+    'crlf': 'import os\r\n\r\ndef main():\r\n    # run \r\n    return 1\r\n',
+    'bare-cr': 'a = 1\rb = 2\n# c\r\n',
+    # \u2028 / \x0c / \x1c 等被 str.splitlines() 當作換行，但不是行分隔符
+    'unicode-whitespace': 'name = "a\u2028b"\n\u3000# 全角縮進\nvalue = 1\xa0\n\x0cpass\x1c\n\t\n',
+    'long': 'short = 1\n' + 'x = "' + 'y' * 120 + '"\n' + '#' * 80 + '\n',
+}
+
+
+def split_lines(code):
+    return code.split('\n')
+
+
+@pytest.fixture(params=sorted(SAMPLES))
+def code(request):
+    return SAMPLES[request.param]
+
+
+def test_lines_match_split(code):
+    """測試行劃分、行長與空行數與 split('\\n') 一致"""
+    lines = split_lines(code)
+    index = LineIndex(code)
+
+    assert index.lines == lines
+    assert index.line_count == len(lines)
+    assert list(index.lengths) == [len(line) for line in lines]
+    assert index.max_line_length == max(len(line) for line in lines)
+    assert index.stripped == [line.strip() for line in lines]
+    assert index.blank_line_count == sum(1 for line in lines if not line.strip())
+
+
+def test_line_queries_match_split(code):
+    """測試各行級查詢與逐行判斷一致"""
+    lines = split_lines(code)
+    index = LineIndex(code)
+
+    assert index.trailing_whitespace_lines() == [
+        i for i, line in enumerate(lines, 1) if line != line.rstrip()]
+    for max_length in (0, 10, 79, 200):
+        assert index.long_lines(max_length) == [
+            (i, len(line)) for i, line in enumerate(lines, 1) if len(line) > max_length]
+    for text in ('os', '#', '\r', '\u3000', 'missing'):
+        assert index.lines_containing(text) == [i for i, line in enumerate(lines, 1) if text in line]
+    for prefixes in (('#',), ('def ', 'import '), ('return',), ('nothing',)):
+        expected = [i for i, line in enumerate(lines, 1) if line.strip().startswith(prefixes)]
+        assert index.lines_starting_with(*prefixes) == expected
+        assert index.count_lines_starting_with(*prefixes) == len(expected)
+
+
+def test_line_of_matches_split(code):
+    """測試每個偏移量（含換行符與文件末尾）映射到其所在行"""
+    index = LineIndex(code)
+    line = 1
+    for offset, char in enumerate(code):
+        assert index.line_of(offset) == line, offset
+        if char == '\n':
+            line += 1
+    assert index.line_of(len(code)) == index.line_count
+
+
+def test_crlf_and_unicode_whitespace():
+    """測試 '\\r' 計入行長並視為行尾空白；全角與不換行空格按 str.strip 處理"""
+    crlf = LineIndex(SAMPLES['crlf'])
+    assert crlf.lengths[0] == len('import os\r')
+    assert crlf.trailing_whitespace_lines() == [1, 2, 3, 4, 5]
+    assert crlf.lines_starting_with('#') == [4]
+    assert crlf.blank_line_count == 2
+
+    unicode = LineIndex(SAMPLES['unicode-whitespace'])
+    assert unicode.line_count == 6
+    assert unicode.lines_starting_with('#') == [2]
+    assert unicode.lines_starting_with('pass') == [4]
+    assert unicode.trailing_whitespace_lines() == [3, 4, 5]
+    assert unicode.blank_line_count == 2
+
+
+def test_early_exit_skips_line_scan():
+    """測試整體判斷未命中時不做逐行掃描，也不建立緩存"""
+    index = LineIndex(SAMPLES['lf'] * 50)
+
+    assert index.lines_containing('TODO') == []
+    assert index.lines_starting_with('class ', 'async ') == []
+    assert index.count_lines_starting_with('from ') == 0
+    assert index.long_lines(index.max_line_length) == []
+    assert index._stripped is None
+    assert index._cache == {}
+
+    assert index.lines_containing('os') == index.lines_containing('os')
+    assert ('contains', 'os') in index._cache
+    assert index.count_lines_starting_with('#') == 50
+    assert index._stripped is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
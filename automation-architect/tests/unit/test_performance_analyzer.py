@@ -0,0 +1,210 @@
+"""
+Unit tests for PerformanceAnalyzer
+性能分析器單元測試
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.analysis.performance_analyzer import PerformanceAnalyzer, PerformanceIssue
+
+
+@pytest.fixture
+def analyzer():
+    """創建分析器實例"""
+    return PerformanceAnalyzer({'use_git': False})
+
+
+@pytest.fixture
+def slow_python_file(tmp_path):
+    """創建包含性能問題的 Python 文件"""
+    source = tmp_path / 'slow.py'
+    source.write_text('''
+# for each row: format the output
+def report(rows, cursor):
+    seen = []
+    text = ""
+    for row in rows:
+        if row in seen:
+            continue
+        seen.append(row)
+        position = seen.index(row)
+        text += "{}".format(row)
+        cursor.execute("SELECT * FROM t WHERE id = %s", (row,))
+        for cell in row:
+            for char in cell:
+                pass
+    seen = set(seen)
+    for row in rows:
+        if row in seen:
+            pass
+    return [a for a in rows for b in rows]
+''')
+    return source
+
+
+def _found(issues):
+    return [(issue.line, issue.type) for issue in issues]
+
+
+@pytest.mark.asyncio
+async def test_detect_python_patterns(analyzer, slow_python_file):
+    """測試基於 AST 的循環與二次方模式檢測"""
+    issues = await analyzer.analyze(str(slow_python_file))
+
+    assert all(isinstance(issue, PerformanceIssue) for issue in issues)
+    assert _found(issues) == [
+        (6, 'nested-loops'),
+        (7, 'list-membership-in-loop'),
+        (10, 'repeated-list-index'),
+        (11, 'string-concat-in-loop'),
+        (12, 'n-plus-one-query'),
+        (20, 'nested-loops'),
+    ]
+    assert issues[0].severity == 'error'
+    assert 'depth 3' in issues[0].message
+    assert issues[-1].severity == 'warning'
+
+
+@pytest.mark.asyncio
+async def test_no_false_positives_from_text(analyzer, tmp_path):
+    """測試註釋、字符串和 format 等詞不會被當成循環"""
+    source = tmp_path / 'plain.py'
+    source.write_text('# for x in a:\n# for y in b:\nname = "for {}".format(1)\nfor i in range(3):\n    pass\n')
+
+    assert await analyzer.analyze(str(source)) == []
+
+
+@pytest.mark.asyncio
+async def test_query_methods_need_db_receiver(analyzer, tmp_path):
+    """測試 find / query 等方法只在數據庫句柄上才算 N+1 查詢"""
+    source = tmp_path / 'parse.py'
+    source.write_text('''
+import sqlite3
+def parse(lines, path, db):
+    conn = sqlite3.connect(path)
+    for line in lines:
+        i = line.find('=')
+        token = line.strip().query
+        conn.execute("SELECT 1")
+        db['users'].find_one({'name': line})
+''')
+
+    issues = await analyzer.analyze(str(source))
+
+    assert _found(issues) == [(8, 'n-plus-one-query'), (9, 'n-plus-one-query')]
+
+
+@pytest.mark.asyncio
+async def test_handle_words_and_objects_need_real_receiver(analyzer, tmp_path):
+    """測試 db_url / conn_str 等字符串與 self.objects 列表不算查詢，<Model>.objects 才算"""
+    source = tmp_path / 'store.py'
+    source.write_text('''
+class Store:
+    def load(self, items, db_url, conn_str, db_session):
+        for item in items:
+            scheme = db_url.find(':')
+            key = conn_str.find('=')
+            self.objects.append(item)
+            self.objects.get(item)
+            User.objects.filter(name=item).first()
+            db_session.query(User)
+''')
+
+    issues = await analyzer.analyze(str(source))
+
+    assert _found(issues) == [(9, 'n-plus-one-query'), (10, 'n-plus-one-query')]
+
+
+@pytest.mark.asyncio
+async def test_loop_targets_rebind_names(analyzer, tmp_path):
+    """測試循環與推導式的目標變量不再沿用之前的 list 綁定"""
+    source = tmp_path / 'rebind.py'
+    source.write_text('''
+def f(items, rows):
+    x = []
+    for x in items:
+        if 3 in x:
+            pass
+    y = []
+    flags = [3 in y for y in rows]
+    for row in rows:
+        if row in y:
+            pass
+''')
+
+    issues = await analyzer.analyze(str(source))
+
+    assert _found(issues) == [(10, 'list-membership-in-loop')]
+
+
+@pytest.mark.asyncio
+async def test_detect_braced_nesting(analyzer, tmp_path):
+    """測試花括號語言的循環嵌套深度"""
+    source = tmp_path / 'loops.js'
+    source.write_text('''// for (a) { for (b) {} }
+function f(a) {
+  const s = "for (x) { while (y) {";
+  for (let i = 0; i < a.length; i++) {
+    while (ok) {
+      a.forEach(x => x);
+    }
+  }
+  do { n++ } while (n < 3);
+  for (;;) n++;
+}
+''')
+
+    issues = await analyzer.analyze(str(source))
+
+    assert _found(issues) == [(4, 'nested-loops')]
+    assert 'depth 2' in issues[0].message
+
+
+@pytest.mark.asyncio
+async def test_profiling_ranks_measured_issues(tmp_path):
+    """測試運行時剖析：熱點按累計耗時排序並與靜態問題交叉引用"""
+    source = tmp_path / 'app.py'
+    source.write_text('''
+def lookup(values, keys):
+    items = list(values)
+    return sum(1 for k in keys if k in items)
+
+def never_called(rows):
+    text = ""
+    for row in rows:
+        text += str(row)
+    return text
+
+if __name__ == '__main__':
+    lookup(range(4000), range(2000))
+''')
+    analyzer = PerformanceAnalyzer({
+        'use_git': False,
+        'profile_output_dir': str(tmp_path / 'profile'),
+        'profile_interval': 0.001,
+    })
+
+    issues = await analyzer.analyze(str(source), profiling=True)
+    profile = analyzer.last_profile
+
+    assert profile is not None and profile.exit_code == 0
+    assert Path(profile.stats_path).exists()
+    assert Path(profile.folded_path).exists()
+    assert issues[0].type == 'hotspot'
+    assert issues[0].line == 2
+    assert 'lookup()' in issues[0].message
+
+    membership = next(i for i in issues if i.type == 'list-membership-in-loop')
+    assert membership.cumulative_time is not None
+    assert '[measured: lookup()' in membership.message
+    # 沒有被執行的代碼中的問題排在最後
+    assert issues[-1].type == 'string-concat-in-loop'
+    assert issues[-1].cumulative_time is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -162,5 +162,43 @@ def test_get_critical_files(scanner):
     assert 'file2.py' not in critical_files
 
 
+@pytest.mark.asyncio
+async def test_skip_binary_and_minified_files(scanner, tmp_path):
+    """測試跳過二進制與壓縮文件"""
+    binary_file = tmp_path / 'blob.py'
+    binary_file.write_bytes(b'\x00\x01password = "secret123"\n')
+    minified_file = tmp_path / 'bundle.min.js'
+    minified_file.write_text('eval(x);')
+    
+    assert await scanner.scan(str(tmp_path)) == []
+    assert scanner.reader.skipped == {'binary': 1, 'minified': 1}
+
+
+@pytest.mark.asyncio
+async def test_scan_non_utf8_file(scanner, tmp_path):
+    """測試非 UTF-8 文件回退到字符集檢測"""
+    source = tmp_path / 'legacy.py'
+    source.write_bytes('# caf\xe9\nx = 1\npassword = "secret123"\n'.encode('cp1252'))
+    
+    issues = await scanner.scan(str(source))
+    
+    assert [(i.type, i.line) for i in issues] == [('hardcoded-password', 3)]
+
+
+@pytest.mark.asyncio
+async def test_scan_mmap_line_numbers(scanner, tmp_path):
+    """測試 mmap 映射的大文件行號"""
+    scanner.reader.mmap_threshold = 1024
+    source = tmp_path / 'large.py'
+    source.write_text('x = 1\n' * 5000 + 'eval(data)\n' + 'y = 2\n' * 10 + 'api_key = "k"\n')
+    
+    issues = await scanner.scan(str(source))
+    
+    assert [(i.type, i.line) for i in issues] == [
+        ('eval-usage', 5001),
+        ('hardcoded-api-key', 5012),
+    ]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -11,7 +11,7 @@ import sys
 # 添加父目錄到路徑
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from core.analysis.static_analyzer import StaticAnalyzer, AnalysisResult
+from core.analysis.static_analyzer import StaticAnalyzer, AnalysisResult, StaticIssue
 
 
 @pytest.fixture
@@ -155,5 +155,72 @@ def test_count_severities():
     assert counts['info'] == 3
 
 
+
+def test_style_issues():
+    """測試風格問題（輕量問題對象，兼容字典用法）"""
+    analyzer = StaticAnalyzer()
+    code = 'x = 1   \n' + 'y = ' + '1' * 120 + '\n' + 'z = ' + '2' * 120 + '\n'
+    
+    issues = analyzer._check_style(code, 'python', Path('style.py'))
+    
+    assert [i['type'] for i in issues] == ['trailing-whitespace', 'line-too-long', 'line-too-long']
+    assert all(isinstance(i, StaticIssue) for i in issues)
+    assert issues[1].get('severity') == 'info'
+    assert dict(issues[0]) == issues[0].to_dict() == {
+        'type': 'trailing-whitespace',
+        'severity': 'info',
+        'message': 'Trailing whitespace',
+        'file': 'style.py',
+        'line': 1,
+    }
+    # 相同長度的行共用消息與路徑字符串
+    assert issues[1].message is issues[2].message
+    assert issues[1].file is issues[2].file
+    assert not hasattr(issues[0], '__dict__')
+
+
+def test_get_code_files_honours_ignores(tmp_path):
+    """測試文件發現遵循 ignore 文件並跳過依賴目錄"""
+    for relpath in [
+        'app.py', 'lib/util.js', 'lib/gen_model.py', 'lib/keep_gen.py',
+        'node_modules/pkg/index.js', 'out/bundle.js', 'vendor/lib.go',
+        '.venv-custom/lib/site.py',
+    ]:
+        (tmp_path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relpath).write_text('x = 1\n')
+    (tmp_path / '.venv-custom' / 'pyvenv.cfg').write_text('')
+    (tmp_path / '.gitignore').write_text('/out/\ngen_*.py\n')
+    (tmp_path / 'lib' / '.gitignore').write_text('!keep_gen.py\n')
+    (tmp_path / '.slasolveignore').write_text('vendor/\n')
+
+    analyzer = StaticAnalyzer({'use_git': False})
+    files = analyzer._get_code_files(tmp_path)
+
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == [
+        'app.py', 'lib/keep_gen.py', 'lib/util.js',
+    ]
+
+
+def test_file_index_kept_across_extension_sets(tmp_path):
+    """測試共用文件索引時，只查找 .py 不會刪除其他擴展名的記錄"""
+    from core.analysis.file_discovery import FileDiscovery
+
+    project = tmp_path / 'project'
+    for relpath in ['app.py', 'web/main.js', 'web/util.ts', 'old.py']:
+        (project / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (project / relpath).write_text('x = 1\n')
+    index_path = tmp_path / 'index.json'
+    discovery = FileDiscovery({'use_git': False, 'file_index': str(index_path)})
+
+    discovery.discover(project, {'.py', '.js', '.ts'})
+    (project / 'old.py').unlink()
+    discovery.discover(project, {'.py'})
+
+    reloaded = FileDiscovery({'use_git': False, 'file_index': str(index_path)})
+    assert sorted(Path(p).relative_to(project).as_posix() for p in reloaded.index.records) == [
+        'app.py', 'web/main.js', 'web/util.ts',
+    ]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
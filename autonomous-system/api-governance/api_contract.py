@@ -5,10 +5,13 @@ API 規格與治理邊界定義
 - 提供自動化驗證
 """
 
+from bisect import bisect_left
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
 import json
+import time
 
 class ModuleRole(Enum):
     """模組責任分類"""
@@ -37,11 +40,358 @@ class APIContract:
     error_handling: Dict[ErrorCategory, str]
     dependencies: List[str]
 
+# 校驗函數：通過返回 None，失敗返回錯誤描述
+Validator = Callable[[Any], Optional[str]]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, (list, tuple)),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def compile_schema(schema: Dict, path: str = "$") -> Validator:
+    """
+    將 JSON schema 子集編譯為閉包校驗函數
+
+    只在載入契約時遍歷一次 schema；調用時不查字典、不建臨時集合，
+    成功路徑不分配對象。支援 type / properties / required / items /
+    enum / minimum / maximum，其餘關鍵字忽略。
+    object 未聲明 required 時，所有 properties 皆為必填（與原契約語義一致）。
+    """
+    checks: List[Validator] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        names = expected if isinstance(expected, list) else [expected]
+        type_checks = tuple(_TYPE_CHECKS[name] for name in names)
+        type_label = "|".join(names)
+
+        def check_type(value, type_checks=type_checks):
+            for type_check in type_checks:
+                if type_check(value):
+                    return None
+            return f"{path}: expected {type_label}, got {type(value).__name__}"
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+
+        def check_enum(value):
+            if value in allowed:
+                return None
+            return f"{path}: {value!r} not in {list(allowed)}"
+        checks.append(check_enum)
+
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    if minimum is not None or maximum is not None:
+        def check_range(value):
+            if not isinstance(value, (int, float)):
+                return None
+            if minimum is not None and value < minimum:
+                return f"{path}: {value} is less than minimum {minimum}"
+            if maximum is not None and value > maximum:
+                return f"{path}: {value} is greater than maximum {maximum}"
+            return None
+        checks.append(check_range)
+
+    properties = schema.get("properties")
+    if properties is not None:
+        required = tuple(schema.get("required", properties.keys()))
+        fields = tuple(
+            (name, compile_schema(sub_schema, f"{path}.{name}"))
+            for name, sub_schema in properties.items()
+        )
+
+        def check_properties(value):
+            if not isinstance(value, dict):
+                return None
+            for name in required:
+                if name not in value:
+                    missing = {key for key in required if key not in value}
+                    return f"Missing required fields: {missing}"
+            for name, field_validator in fields:
+                if name in value:
+                    error = field_validator(value[name])
+                    if error is not None:
+                        return error
+            return None
+        checks.append(check_properties)
+
+    items = schema.get("items")
+    if isinstance(items, dict):
+        item_validator = compile_schema(items, f"{path}[]")
+
+        def check_items(value):
+            if not isinstance(value, (list, tuple)):
+                return None
+            for index, item in enumerate(value):
+                error = item_validator(item)
+                if error is not None:
+                    return error.replace(f"{path}[]", f"{path}[{index}]", 1)
+            return None
+        checks.append(check_items)
+
+    if not checks:
+        return lambda value: None
+    if len(checks) == 1:
+        return checks[0]
+    checks_tuple = tuple(checks)
+
+    def validate(value):
+        for check in checks_tuple:
+            error = check(value)
+            if error is not None:
+                return error
+        return None
+    return validate
+
+
+class LatencyHistogram:
+    """
+    模組調用延遲直方圖
+
+    固定對數桶（1 µs 至 1 s），記錄一次為 O(log 桶數)，不保存原始樣本。
+    進程內調用常在數微秒內完成，因此桶從 1 µs 起；百分位在桶內線性插值。
+    """
+
+    BUCKET_BOUNDS_MS = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0
+    )
+
+    def __init__(self, budget_ms: float):
+        self.budget_ms = budget_ms
+        self.counts = [0] * (len(self.BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.violations = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> bool:
+        """記錄一次調用，返回是否超出延遲預算"""
+        self.counts[bisect_left(self.BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if elapsed_ms > self.budget_ms:
+            self.violations += 1
+            return True
+        return False
+
+    def percentile(self, p: float) -> float:
+        """估算百分位延遲（毫秒）：在目標所在桶內線性插值，並以實測最小/最大值收窄桶邊界"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.BUCKET_BOUNDS_MS + (self.max_ms,), self.counts):
+            if bucket_count and seen + bucket_count >= target:
+                low = max(lower, self.min_ms)
+                high = min(bound, self.max_ms)
+                return low + (high - low) * (target - seen) / bucket_count
+            seen += bucket_count
+            lower = bound
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        """報告用摘要"""
+        buckets = {f"<={bound}ms": n for bound, n in zip(self.BUCKET_BOUNDS_MS, self.counts) if n}
+        if self.counts[-1]:
+            buckets[f">{self.BUCKET_BOUNDS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "budget_ms": self.budget_ms,
+            "calls": self.count,
+            "violations": self.violations,
+            "violation_rate": self.violations / self.count if self.count else 0.0,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "buckets": buckets
+        }
+
+
+class DependencyGraph:
+    """
+    模組依賴圖
+
+    由契約一次性構建（邊：模組 -> 其依賴），以迭代式 Tarjan 算法在 O(V+E)
+    內求強連通分量。Tarjan 按「依賴先於被依賴者」的順序輸出分量，
+    因此無環時該順序即拓撲序。依賴鏈問題（循環、未知依賴）及關鍵路徑延遲
+    沿縮點後的 DAG 動態規劃傳播，構建後的查詢均為 O(1)。
+    """
+
+    def __init__(self, contracts: Dict[str, APIContract]):
+        self.edges: Dict[str, List[str]] = {}
+        self.missing: Dict[str, List[str]] = {}
+        for name, contract in contracts.items():
+            self.edges[name] = [dep for dep in contract.dependencies if dep in contracts]
+            unknown = [dep for dep in contract.dependencies if dep not in contracts]
+            if unknown:
+                self.missing[name] = unknown
+        self.latency_ms = {name: contract.max_latency_ms for name, contract in contracts.items()}
+
+        self.components: List[List[str]] = self._tarjan()
+        self.component_of: Dict[str, int] = {
+            name: index for index, component in enumerate(self.components) for name in component
+        }
+        self._chain_errors = self._propagate_chain_errors()
+        # 關鍵路徑及其延遲在首次查詢時一次算出
+        self._critical_paths: Optional[Dict[str, List[str]]] = None
+        self._critical_latency: Dict[str, float] = {}
+        self._critical_start: Optional[str] = None
+
+    def _tarjan(self) -> List[List[str]]:
+        """迭代式 Tarjan 強連通分量（避免深依賴鏈觸發遞歸上限）"""
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self.edges:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.edges[root]))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index_of:
+                        index_of[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges[child])))
+                        break
+                    if child in on_stack and index_of[child] < lowlink[node]:
+                        lowlink[node] = index_of[child]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if lowlink[node] < lowlink[parent]:
+                            lowlink[parent] = lowlink[node]
+                    if lowlink[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component[::-1])
+
+        return components
+
+    def _is_cyclic(self, component: List[str]) -> bool:
+        return len(component) > 1 or component[0] in self.edges[component[0]]
+
+    def _cycle_path(self, component: List[str]) -> List[str]:
+        """在強連通分量內沿邊行走，得到一條實際的循環路徑"""
+        members = set(component)
+        path, seen = [component[0]], {component[0]: 0}
+        while True:
+            node = next(dep for dep in self.edges[path[-1]] if dep in members)
+            if node in seen:
+                return path[seen[node]:] + [node]
+            seen[node] = len(path)
+            path.append(node)
+
+    def _propagate_chain_errors(self) -> List[Optional[str]]:
+        """每個分量依賴鏈上的第一個問題（分量已按依賴先行排序）"""
+        errors: List[Optional[str]] = []
+        for index, component in enumerate(self.components):
+            error = None
+            if self._is_cyclic(component):
+                error = f"Circular dependency detected: {' -> '.join(self._cycle_path(component))}"
+            else:
+                name = component[0]
+                if name in self.missing:
+                    error = f"Unknown dependency: {self.missing[name][0]} (required by {name})"
+                else:
+                    for dep in self.edges[name]:
+                        error = errors[self.component_of[dep]]
+                        if error:
+                            break
+            errors.append(error)
+        return errors
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """所有循環依賴（強連通分量）"""
+        return [component for component in self.components if self._is_cyclic(component)]
+
+    def chain_error(self, module_name: str) -> Optional[str]:
+        """模組依賴鏈上的問題，無問題返回 None"""
+        return self._chain_errors[self.component_of[module_name]]
+
+    def topological_order(self) -> List[str]:
+        """依賴先於被依賴者的模組順序"""
+        if self.cycles:
+            raise ValueError(self._chain_errors[self.component_of[self.cycles[0][0]]])
+        return [component[0] for component in self.components]
+
+    def critical_path(self, module_name: Optional[str] = None) -> Dict:
+        """
+        沿最長依賴鏈的延遲總和（max_latency_ms 之和）
+
+        Args:
+            module_name: 起點模組，默認取全圖最長鏈
+
+        Returns:
+            {"latency_ms": 總延遲, "modules": 從起點到最深依賴的模組列表}
+        """
+        if self._critical_paths is None:
+            latency: Dict[str, float] = {}
+            next_hop: Dict[str, Optional[str]] = {}
+            for name in self.topological_order():
+                best = max(self.edges[name], key=lambda dep: latency[dep], default=None)
+                latency[name] = self.latency_ms[name] + (latency[best] if best else 0.0)
+                next_hop[name] = best
+            self._critical_paths = {}
+            for name in latency:
+                path, hop = [], name
+                while hop is not None:
+                    path.append(hop)
+                    hop = next_hop[hop]
+                self._critical_paths[name] = path
+            self._critical_latency = latency
+            self._critical_start = max(latency, key=latency.__getitem__, default=None)
+
+        if module_name is None:
+            module_name = self._critical_start
+            if module_name is None:
+                return {"latency_ms": 0.0, "modules": []}
+        return {"latency_ms": self._critical_latency[module_name],
+                "modules": list(self._critical_paths[module_name])}
+
+
 class GovernanceValidator:
     """治理邊界驗證器"""
     
     def __init__(self):
         self.contracts: Dict[str, APIContract] = {}
+        self.input_validators: Dict[str, Validator] = {}
+        self.output_validators: Dict[str, Validator] = {}
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self._graph: Optional[DependencyGraph] = None
         self.load_contracts()
     
     def load_contracts(self):
@@ -119,39 +469,100 @@ class GovernanceValidator:
             )
         }
         
-        for name, contract in contracts_data.items():
-            self.contracts[name] = contract
+        for contract in contracts_data.values():
+            self.register_contract(contract)
+    
+    def register_contract(self, contract: APIContract):
+        """註冊契約並預編譯其輸入/輸出校驗器"""
+        name = contract.module_name
+        self.contracts[name] = contract
+        self.input_validators[name] = compile_schema(contract.input_schema)
+        self.output_validators[name] = compile_schema(contract.output_schema)
+        self.latency[name] = LatencyHistogram(contract.max_latency_ms)
+        self._graph = None
+    
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """依賴圖（契約變更後首次訪問時重建）"""
+        if self._graph is None:
+            self._graph = DependencyGraph(self.contracts)
+        return self._graph
     
     def validate_api_call(self, module_name: str, input_data: Dict) -> bool:
         """驗證 API 調用是否符合契約"""
-        if module_name not in self.contracts:
+        validator = self.input_validators.get(module_name)
+        if validator is None:
             raise ValueError(f"Unknown module: {module_name}")
         
-        contract = self.contracts[module_name]
+        # 驗證輸入 schema（字段存在及類型）
+        error = validator(input_data)
+        if error is not None:
+            raise ValueError(error)
         
-        # 驗證輸入 schema
-        required_keys = set(contract.input_schema.get("properties", {}).keys())
-        provided_keys = set(input_data.keys())
+        return True
+    
+    def validate_api_response(self, module_name: str, output_data: Dict) -> bool:
+        """驗證 API 返回值是否符合契約"""
+        validator = self.output_validators.get(module_name)
+        if validator is None:
+            raise ValueError(f"Unknown module: {module_name}")
         
-        if not required_keys.issubset(provided_keys):
-            missing = required_keys - provided_keys
-            raise ValueError(f"Missing required fields: {missing}")
+        error = validator(output_data)
+        if error is not None:
+            raise ValueError(error)
         
         return True
     
-    def validate_dependency_chain(self, module_name: str, visited: set = None) -> bool:
-        """驗證模組依賴鏈是否存在循環"""
-        if visited is None:
-            visited = set()
+    def enforce_contract(self, module_name: str, validate_output: bool = False) -> Callable:
+        """
+        裝飾器：校驗模組調用輸入並按 max_latency_ms 計時
         
-        if module_name in visited:
-            raise ValueError(f"Circular dependency detected: {module_name}")
+        每次調用的耗時記錄到該模組的延遲直方圖，超出預算計為違規；
+        超時不拋出異常，避免中斷控制迴路。被裝飾函數的第一個參數為輸入數據。
+        """
+        if module_name not in self.contracts:
+            raise ValueError(f"Unknown module: {module_name}")
         
-        visited.add(module_name)
-        contract = self.contracts[module_name]
+        input_validator = self.input_validators[module_name]
+        output_validator = self.output_validators[module_name]
+        histogram = self.latency[module_name]
+        clock = time.perf_counter_ns
         
-        for dep in contract.dependencies:
-            self.validate_dependency_chain(dep, visited.copy())
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(input_data, *args, **kwargs):
+                start = clock()
+                error = input_validator(input_data)
+                if error is not None:
+                    raise ValueError(error)
+                try:
+                    result = func(input_data, *args, **kwargs)
+                    if validate_output:
+                        error = output_validator(result)
+                        if error is not None:
+                            raise ValueError(error)
+                    return result
+                finally:
+                    histogram.record((clock() - start) / 1e6)
+            return wrapper
+        return decorator
+    
+    def get_latency_report(self) -> Dict[str, Dict]:
+        """各模組的延遲直方圖摘要（僅包含有調用記錄的模組）"""
+        return {
+            name: histogram.to_dict()
+            for name, histogram in self.latency.items()
+            if histogram.count
+        }
+    
+    def validate_dependency_chain(self, module_name: str) -> bool:
+        """驗證模組依賴鏈是否存在循環或未知依賴"""
+        if module_name not in self.contracts:
+            raise ValueError(f"Unknown module: {module_name}")
+        
+        error = self.dependency_graph.chain_error(module_name)
+        if error:
+            raise ValueError(error)
         
         return True
     
@@ -170,6 +581,18 @@ class GovernanceValidator:
                 "error_categories": [e.value for e in contract.error_handling.keys()]
             }
         
+        graph = self.dependency_graph
+        cycles = graph.cycles
+        report["dependency_graph"] = {
+            "cycles": cycles,
+            "topological_order": None if cycles else graph.topological_order(),
+            "critical_path": None if cycles else graph.critical_path()
+        }
+        
+        latency = self.get_latency_report()
+        if latency:
+            report["latency"] = latency
+        
         return json.dumps(report, indent=2, ensure_ascii=False)
 
 # 使用範例
@@ -186,6 +609,26 @@ if __name__ == "__main__":
     except ValueError as e:
         print(f"✗ API validation failed: {e}")
     
+    # 類型錯誤同樣會被拒絕
+    try:
+        validator.validate_api_call("flight_controller", {
+            "target_altitude": "10",
+            "target_velocity": [1.0, 2.0, 3.0]
+        })
+    except ValueError as e:
+        print(f"✓ Invalid API call rejected: {e}")
+    
+    # 按 max_latency_ms 計時模組調用
+    @validator.enforce_contract("flight_controller", validate_output=True)
+    def flight_step(command):
+        return {"motor_commands": [0.5, 0.5, 0.5, 0.5], "status": "ok"}
+    
+    for _ in range(1000):
+        flight_step({"target_altitude": 10.0, "target_velocity": [1.0, 0.0, 0.0]})
+    stats = validator.get_latency_report()["flight_controller"]
+    print(f"✓ flight_controller p99 {stats['p99_ms']:.3f}ms, "
+          f"{stats['violations']} budget violations in {stats['calls']} calls")
+    
     # 驗證依賴鏈
     try:
         validator.validate_dependency_chain("flight_controller")
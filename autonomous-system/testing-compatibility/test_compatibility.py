@@ -5,12 +5,21 @@
 - 生成測試報告
 """
 
+import gc
+import os
+import time
 import unittest
 import yaml
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 @dataclass
 class TestResult:
     test_name: str
@@ -125,6 +134,253 @@ compatibility_matrix:
             {"action": "land", "duration_ms": 5000}
         ]
 
+# 被測函數 -> 測試配置中對應的測試用例（取其 timeout_ms 作為延遲預算）
+SWEEP_BUDGET_CASES = {
+    "fuse_imu_data": "test_imu_data_fusion",
+    "compute_altitude_control": "test_altitude_control",
+    "trigger_emergency_landing": "test_emergency_landing",
+}
+
+# 緊急著陸動作編碼（向量化比對用）
+LANDING_ACTIONS = ("reduce_thrust", "stabilize", "land")
+
+
+class PropertySweepHarness:
+    """
+    向量化屬性測試框架
+    
+    以 NumPy 批量生成感測器/狀態輸入（含高斯、重尾分佈及邊界值），
+    用向量化參考實現一次算出整批期望輸出，與逐樣本函數的結果比對，
+    並逐次計時報告延遲百分位與預算違規數。
+    按批處理以限制記憶體，每批計時期間暫停循環垃圾回收（同 timeit），
+    避免回收停頓被計入個別調用而在尾部延遲中造成假陽性。
+    """
+    
+    def __init__(self, cases: int, seed: int = 0, budgets_ms: Optional[Dict[str, float]] = None,
+                 chunk_size: int = 65536):
+        self.cases = cases
+        self.rng = np.random.default_rng(seed)
+        self.budgets_ms = budgets_ms or {}
+        self.chunk_size = chunk_size
+    
+    # ---- 輸入生成 ----
+    
+    def _heavy_tailed(self, shape, scale: float) -> "np.ndarray":
+        """學生 t 分佈（自由度 2）：尾部樣本遠多於高斯分佈"""
+        return self.rng.standard_t(2.0, size=shape) * scale
+    
+    def generate_imu(self, n: int) -> Dict[str, "np.ndarray"]:
+        """IMU 批量輸入：重力附近的加速度 + 角速度，含重尾擾動"""
+        acceleration = self.rng.normal([0.0, 0.0, 9.81], 0.5, size=(n, 3))
+        acceleration[::10] += self._heavy_tailed((len(acceleration[::10]), 3), 5.0)
+        angular_velocity = self._heavy_tailed((n, 3), 0.05)
+        return {"acceleration": acceleration, "angular_velocity": angular_velocity}
+    
+    def generate_altitudes(self, n: int) -> Dict[str, "np.ndarray"]:
+        """目標/當前高度：均勻分佈 + 推力飽和邊界及極端值"""
+        target = self.rng.uniform(-50.0, 500.0, size=n)
+        current = self.rng.uniform(-50.0, 500.0, size=n)
+        
+        # 誤差恰好落在推力飽和邊界 (0.5 ± 0.1 * 5) 附近
+        edges = np.array([-5.0, -5.0 - 1e-9, -5.0 + 1e-9, 0.0, 5.0 - 1e-9, 5.0, 5.0 + 1e-9, 1e6, -1e6])
+        k = min(n, len(edges) * 64)
+        current[:k] = self.rng.uniform(0.0, 100.0, size=k)
+        target[:k] = current[:k] + np.resize(edges, k)
+        return {"target": target, "current": current}
+    
+    def generate_states(self, n: int) -> Dict[str, "np.ndarray"]:
+        """飛行狀態：高度（含 0 與極高）與速度向量"""
+        altitude = np.abs(self._heavy_tailed(n, 50.0))
+        altitude[:min(n, 16)] = 0.0
+        velocity = self.rng.normal(0.0, 2.0, size=(n, 3))
+        return {"altitude": altitude, "velocity": velocity}
+    
+    # ---- 向量化參考實現 ----
+    
+    @staticmethod
+    def reference_fusion(imu: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """參考融合結果：單位四元數姿態 + 零速度，形狀 (n, 7)"""
+        expected = np.zeros((len(imu["acceleration"]), 7))
+        expected[:, 3] = 1.0
+        return expected
+    
+    @staticmethod
+    def reference_altitude_control(inputs: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """參考比例控制：推力限制在 [0, 1]，四個電機相同，形狀 (n, 4)"""
+        thrust = np.clip(0.5 + 0.1 * (inputs["target"] - inputs["current"]), 0.0, 1.0)
+        return np.repeat(thrust[:, None], 4, axis=1)
+    
+    @staticmethod
+    def reference_landing(states: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """參考著陸序列編碼：每步 (動作編號, 參數)，展平為形狀 (n, 6)"""
+        step = np.array([0, 0.1, 1, 500.0, 2, 5000.0])
+        return np.broadcast_to(step, (len(states["altitude"]), 6))
+    
+    # ---- 逐樣本輸入/輸出轉換 ----
+    
+    @staticmethod
+    def _fusion_args(imu: Dict[str, "np.ndarray"]):
+        return [({"acceleration": a, "angular_velocity": w},)
+                for a, w in zip(imu["acceleration"].tolist(), imu["angular_velocity"].tolist())]
+    
+    @staticmethod
+    def _fusion_row(output: Dict) -> List[float]:
+        orientation, velocity = output.get("orientation") or (), output.get("velocity") or ()
+        if len(orientation) != 4 or len(velocity) != 3:
+            return [np.nan] * 7
+        return [*orientation, *velocity]
+    
+    @staticmethod
+    def _altitude_args(inputs: Dict[str, "np.ndarray"]):
+        return list(zip(inputs["target"].tolist(), inputs["current"].tolist()))
+    
+    @staticmethod
+    def _altitude_row(commands: List[float]) -> List[float]:
+        if len(commands) != 4 or not all(0.0 <= cmd <= 1.0 for cmd in commands):
+            return [np.nan] * 4
+        return commands
+    
+    @staticmethod
+    def _landing_args(states: Dict[str, "np.ndarray"]):
+        return [({"altitude": h, "velocity": v},)
+                for h, v in zip(states["altitude"].tolist(), states["velocity"].tolist())]
+    
+    _ACTION_CODES = {action: code for code, action in enumerate(LANDING_ACTIONS)}
+    
+    @classmethod
+    def _landing_row(cls, sequence: List[Dict]) -> List[float]:
+        if len(sequence) != 3:
+            return [np.nan] * 6
+        row = []
+        for step in sequence:
+            row.append(cls._ACTION_CODES.get(step.get("action"), np.nan))
+            row.append(step.get("rate", step.get("duration_ms", np.nan)))
+        return row
+    
+    # ---- 掃描 ----
+    
+    def _sweep(self, name: str, func: Callable, generate: Callable, to_args: Callable,
+               to_row: Callable, reference: Callable, tolerance: float = 1e-9) -> Dict:
+        """
+        分批執行：生成輸入 -> 逐樣本調用並計時 -> 向量化比對
+        
+        Returns:
+            不一致數、最大偏差、延遲百分位、預算違規數及最差輸入
+        """
+        clock = time.perf_counter_ns
+        latencies = []
+        mismatches = 0
+        max_divergence = 0.0
+        worst_case = None
+        worst_divergence = -1.0
+        
+        for offset in range(0, self.cases, self.chunk_size):
+            n = min(self.chunk_size, self.cases - offset)
+            inputs = generate(n)
+            args_list = to_args(inputs)
+            outputs = [None] * n
+            elapsed = [0] * n
+            
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                for i, args in enumerate(args_list):
+                    start = clock()
+                    outputs[i] = func(*args)
+                    elapsed[i] = clock() - start
+                actual = np.array([to_row(output) for output in outputs], dtype=np.float64)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            latencies.append(np.array(elapsed, dtype=np.float64) / 1e6)
+            
+            # NaN（結構錯誤或違反性質）視為無窮大偏差
+            divergence = np.nan_to_num(np.abs(actual - reference(inputs)).max(axis=1), nan=np.inf)
+            mismatched = divergence > tolerance
+            mismatches += int(mismatched.sum())
+            max_divergence = max(max_divergence, float(divergence.max()))
+            if mismatched.any():
+                worst = int(np.argmax(divergence))
+                if divergence[worst] > worst_divergence:
+                    worst_divergence = float(divergence[worst])
+                    worst_case = {key: np.asarray(value[worst]).tolist() for key, value in inputs.items()}
+        
+        latency_ms = np.concatenate(latencies) if latencies else np.zeros(1)
+        p50, p99, p999 = np.percentile(latency_ms, [50, 99, 99.9])
+        budget = self.budgets_ms.get(name)
+        return {
+            "function": name,
+            "cases": self.cases,
+            "mismatches": mismatches,
+            "max_divergence": max_divergence,
+            "latency_ms": {
+                "p50": float(p50),
+                "p99": float(p99),
+                "p99.9": float(p999),
+                "max": float(latency_ms.max())
+            },
+            "budget_ms": budget,
+            "budget_violations": int((latency_ms > budget).sum()) if budget is not None else 0,
+            "worst_case": worst_case
+        }
+    
+    def sweep_fusion(self, func: Callable[[Dict], Dict]) -> Dict:
+        return self._sweep("fuse_imu_data", func, self.generate_imu,
+                           self._fusion_args, self._fusion_row, self.reference_fusion)
+    
+    def sweep_altitude_control(self, func: Callable[[float, float], List[float]]) -> Dict:
+        return self._sweep("compute_altitude_control", func, self.generate_altitudes,
+                           self._altitude_args, self._altitude_row, self.reference_altitude_control)
+    
+    def sweep_emergency_landing(self, func: Callable[[Dict], List[Dict]]) -> Dict:
+        return self._sweep("trigger_emergency_landing", func, self.generate_states,
+                           self._landing_args, self._landing_row, self.reference_landing)
+    
+    def run(self, suite=None) -> List[Dict]:
+        """對三個被測函數執行完整掃描"""
+        suite = suite or CompatibilityTestSuite
+        return [
+            self.sweep_fusion(suite.fuse_imu_data),
+            self.sweep_altitude_control(suite.compute_altitude_control),
+            self.sweep_emergency_landing(suite.trigger_emergency_landing),
+        ]
+
+
+def sweep_budgets(config: Dict) -> Dict[str, float]:
+    """從測試配置讀取各被測函數的延遲預算（timeout_ms）"""
+    timeouts = {
+        case["name"]: case["timeout_ms"]
+        for suite in config.get("test_suites", [])
+        for case in suite.get("test_cases", [])
+    }
+    return {func: timeouts[case] for func, case in SWEEP_BUDGET_CASES.items() if case in timeouts}
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is required for property sweeps")
+class PropertySweepTests(unittest.TestCase):
+    """向量化屬性掃描（樣本數由 COMPAT_SWEEP_CASES 環境變量控制）"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cases = int(os.environ.get("COMPAT_SWEEP_CASES", "100000"))
+        seed = int(os.environ.get("COMPAT_SWEEP_SEED", "0"))
+        budgets = sweep_budgets(CompatibilityTestSuite.load_test_config())
+        cls.harness = PropertySweepHarness(cases, seed=seed, budgets_ms=budgets)
+    
+    def assertSweepPassed(self, report: Dict):
+        self.assertEqual(report["mismatches"], 0, f"Divergence from reference: {report}")
+        self.assertEqual(report["budget_violations"], 0, f"Latency budget exceeded: {report}")
+    
+    def test_fusion_sweep(self):
+        self.assertSweepPassed(self.harness.sweep_fusion(CompatibilityTestSuite.fuse_imu_data))
+    
+    def test_altitude_control_sweep(self):
+        self.assertSweepPassed(self.harness.sweep_altitude_control(CompatibilityTestSuite.compute_altitude_control))
+    
+    def test_emergency_landing_sweep(self):
+        self.assertSweepPassed(self.harness.sweep_emergency_landing(CompatibilityTestSuite.trigger_emergency_landing))
+
+
 class TestReportGenerator:
     """測試報告生成器"""
     
@@ -167,6 +423,7 @@ class TestReportGenerator:
 if __name__ == "__main__":
     # 執行測試
     suite = unittest.TestLoader().loadTestsFromTestCase(CompatibilityTestSuite)
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(PropertySweepTests))
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     
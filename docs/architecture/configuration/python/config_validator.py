@@ -4,24 +4,701 @@
 import yaml
 import json
 import os
-from typing import Dict, List, Tuple, Optional
+import sys
+import concurrent.futures
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional
 from datetime import datetime
 import fnmatch
 
+try:
+    from jsonschema.validators import validator_for
+    HAS_JSONSCHEMA = True
+except ImportError:
+    HAS_JSONSCHEMA = False
+
+# 共用 YAML 載入工具（倉庫 tools/yaml_loader.py）：優先 libyaml CSafeLoader，
+# 多文檔流式解析，錯誤帶行列號。單獨複製本文件使用時退回 PyYAML。
+_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'tools'))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+try:
+    from yaml_loader import load_file as load_yaml_file, iter_documents as iter_yaml_documents, YAMLLoadError
+except ImportError:
+    _SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    YAMLLoadError = yaml.YAMLError
+
+    def load_yaml_file(path):
+        with open(path, 'rb') as f:
+            return yaml.load(f, Loader=_SafeLoader)
+
+    def iter_yaml_documents(path):
+        with open(path, 'rb') as f:
+            yield from yaml.load_all(f, Loader=_SafeLoader)
+
+
+# 排除常見的依賴目錄
+EXCLUDED_DIRS = {
+    'node_modules', '.git', '__pycache__',
+    '.venv', 'venv', 'dist', 'build'
+}
+
+# 文件類別路由: category -> filename patterns
+FILE_ROUTES = {
+    'yaml': ['*.yml', '*.yaml'],
+    'json': ['*.json'],
+    'env': ['.env*'],
+}
+
+# Kubernetes manifest 目錄（相對於項目根目錄）
+K8S_DIRECTORIES = ['k8s', 'kubernetes', '.kube']
+
+# 少於此數量的文件時不啟動進程池
+MIN_PARALLEL_FILES = 32
+
+CACHE_VERSION = 3
+
+
+# ---------------------------------------------------------------------------
+# Kubernetes per-kind schemas
+# ---------------------------------------------------------------------------
+
+_STRING_MAP = {'type': 'object', 'additionalProperties': {'type': 'string'}}
+_PORT = {'type': 'integer', 'minimum': 1, 'maximum': 65535}
+_INT_OR_STRING = {'type': ['integer', 'string']}
+_LABEL_SELECTOR = {
+    'type': 'object',
+    'properties': {
+        'matchLabels': _STRING_MAP,
+        'matchExpressions': {'type': 'array', 'items': {'type': 'object', 'required': ['key', 'operator']}}
+    }
+}
+
+_METADATA = {
+    'type': 'object',
+    'anyOf': [{'required': ['name']}, {'required': ['generateName']}],
+    'properties': {
+        'name': {'type': 'string', 'minLength': 1, 'maxLength': 253},
+        'namespace': {'type': 'string', 'minLength': 1, 'maxLength': 63},
+        'labels': _STRING_MAP,
+        'annotations': _STRING_MAP
+    }
+}
+
+_CONTAINER = {
+    'type': 'object',
+    'required': ['name', 'image'],
+    'properties': {
+        'name': {'type': 'string', 'minLength': 1},
+        'image': {'type': 'string', 'minLength': 1},
+        'ports': {
+            'type': 'array',
+            'items': {'type': 'object', 'required': ['containerPort'], 'properties': {'containerPort': _PORT}}
+        },
+        'env': {'type': 'array', 'items': {'type': 'object', 'required': ['name']}},
+        'envFrom': {'type': 'array', 'items': {'type': 'object'}}
+    }
+}
+
+_POD_SPEC = {
+    'type': 'object',
+    'required': ['containers'],
+    'properties': {
+        'containers': {'type': 'array', 'minItems': 1, 'items': _CONTAINER},
+        'initContainers': {'type': 'array', 'items': _CONTAINER},
+        'volumes': {'type': 'array', 'items': {'type': 'object', 'required': ['name']}},
+        'serviceAccountName': {'type': 'string'}
+    }
+}
+
+_POD_TEMPLATE = {
+    'type': 'object',
+    'required': ['spec'],
+    'properties': {
+        'metadata': {'type': 'object', 'properties': {'labels': _STRING_MAP, 'annotations': _STRING_MAP}},
+        'spec': _POD_SPEC
+    }
+}
+
+
+def _workload_spec(*required: str) -> Dict:
+    return {
+        'type': 'object',
+        'required': ['selector', 'template', *required],
+        'properties': {
+            'replicas': {'type': 'integer', 'minimum': 0},
+            'selector': _LABEL_SELECTOR,
+            'template': _POD_TEMPLATE
+        }
+    }
+
+
+_JOB_SPEC = {'type': 'object', 'required': ['template'], 'properties': {'template': _POD_TEMPLATE}}
+
+# kind -> JSON schema of the kind-specific top-level fields
+K8S_KIND_SCHEMAS: Dict[str, Dict] = {
+    'Deployment': {'required': ['spec'], 'properties': {'spec': _workload_spec()}},
+    'StatefulSet': {'required': ['spec'], 'properties': {'spec': _workload_spec()}},
+    'DaemonSet': {'required': ['spec'], 'properties': {'spec': _workload_spec()}},
+    'Job': {'required': ['spec'], 'properties': {'spec': _JOB_SPEC}},
+    'CronJob': {
+        'required': ['spec'],
+        'properties': {'spec': {
+            'type': 'object',
+            'required': ['schedule', 'jobTemplate'],
+            'properties': {
+                'schedule': {'type': 'string', 'minLength': 1},
+                'jobTemplate': {'type': 'object', 'required': ['spec'], 'properties': {'spec': _JOB_SPEC}}
+            }
+        }}
+    },
+    'Service': {
+        'properties': {'spec': {
+            'type': 'object',
+            'properties': {
+                'type': {'enum': ['ClusterIP', 'NodePort', 'LoadBalancer', 'ExternalName']},
+                'selector': _STRING_MAP,
+                'ports': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'required': ['port'],
+                        'properties': {
+                            'port': _PORT,
+                            'targetPort': _INT_OR_STRING,
+                            'protocol': {'enum': ['TCP', 'UDP', 'SCTP']}
+                        }
+                    }
+                }
+            }
+        }}
+    },
+    'ConfigMap': {'properties': {'data': _STRING_MAP, 'binaryData': _STRING_MAP}},
+    'Secret': {'properties': {'data': _STRING_MAP, 'stringData': _STRING_MAP, 'type': {'type': 'string'}}},
+    'PersistentVolumeClaim': {
+        'required': ['spec'],
+        'properties': {'spec': {
+            'type': 'object',
+            'required': ['accessModes'],
+            'properties': {'accessModes': {'type': 'array', 'minItems': 1, 'items': {'type': 'string'}}}
+        }}
+    },
+    'HorizontalPodAutoscaler': {
+        'required': ['spec'],
+        'properties': {'spec': {
+            'type': 'object',
+            'required': ['scaleTargetRef', 'maxReplicas'],
+            'properties': {
+                'scaleTargetRef': {'type': 'object', 'required': ['kind', 'name']},
+                'minReplicas': {'type': 'integer', 'minimum': 1},
+                'maxReplicas': {'type': 'integer', 'minimum': 1}
+            }
+        }}
+    },
+    'Ingress': {'properties': {'spec': {'type': 'object', 'properties': {'rules': {'type': 'array'}}}}},
+    'NetworkPolicy': {
+        'required': ['spec'],
+        'properties': {'spec': {'type': 'object', 'required': ['podSelector'], 'properties': {'podSelector': _LABEL_SELECTOR}}}
+    },
+    'PodDisruptionBudget': {
+        'required': ['spec'],
+        'properties': {'spec': {'type': 'object', 'required': ['selector'], 'properties': {'selector': _LABEL_SELECTOR}}}
+    },
+    'RoleBinding': {'required': ['roleRef'], 'properties': {'roleRef': {'type': 'object', 'required': ['kind', 'name']}}},
+    'ClusterRoleBinding': {'required': ['roleRef'], 'properties': {'roleRef': {'type': 'object', 'required': ['kind', 'name']}}},
+}
+
+# kustomize 構建文件：不是集群資源，沒有 metadata
+K8S_BUILD_KINDS = {'Kustomization', 'Component'}
+
+# 不屬於任何 namespace 的資源
+K8S_CLUSTER_SCOPED_KINDS = {
+    'Namespace', 'ClusterRole', 'ClusterRoleBinding', 'StorageClass', 'PersistentVolume',
+    'PodSecurityPolicy', 'ClusterIssuer', 'CustomResourceDefinition', 'PriorityClass'
+}
+
+K8S_WORKLOAD_KINDS = {'Deployment', 'StatefulSet', 'DaemonSet', 'ReplicaSet', 'Job', 'CronJob', 'Pod'}
+
+# 集群自動提供、清單中不會出現的引用目標
+K8S_IMPLICIT_REFS = {('ServiceAccount', 'default'), ('ConfigMap', 'kube-root-ca.crt')}
+
+MAX_SCHEMA_ERRORS_PER_DOCUMENT = 10
+
+
+def _k8s_schema(kind: str) -> Dict:
+    """組合通用字段與指定 kind 的 schema"""
+    if kind in K8S_BUILD_KINDS:
+        return {'type': 'object', 'required': ['apiVersion', 'kind']}
+    
+    kind_schema = K8S_KIND_SCHEMAS.get(kind, {})
+    return {
+        'type': 'object',
+        'required': ['apiVersion', 'kind', 'metadata', *kind_schema.get('required', [])],
+        'properties': {
+            'apiVersion': {'type': 'string', 'minLength': 1},
+            'kind': {'type': 'string', 'minLength': 1},
+            'metadata': _METADATA,
+            **kind_schema.get('properties', {})
+        }
+    }
+
+
+@lru_cache(maxsize=None)
+def _k8s_validator(kind: str):
+    """每個 kind 只編譯一次 schema（每個工作進程各自緩存）"""
+    schema = _k8s_schema(kind)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def _schema_errors(manifest: Dict) -> List[str]:
+    """按 kind 的 schema 驗證文檔，返回錯誤信息"""
+    validator = _k8s_validator(str(manifest.get('kind', '')))
+    errors = []
+    for error in validator.iter_errors(manifest):
+        location = '.'.join(str(part) for part in error.absolute_path) or '<root>'
+        errors.append(f'{location}: {error.message}')
+        if len(errors) >= MAX_SCHEMA_ERRORS_PER_DOCUMENT:
+            break
+    return errors
+
+
+def _pod_template(manifest: Dict) -> Optional[Dict]:
+    """工作負載的 Pod 模板（Pod 本身返回自身）"""
+    kind = manifest.get('kind')
+    spec = manifest.get('spec')
+    if not isinstance(spec, dict):
+        return None
+    if kind == 'Pod':
+        return manifest
+    if kind == 'CronJob':
+        spec = (spec.get('jobTemplate') or {}).get('spec') or {}
+    template = spec.get('template')
+    return template if isinstance(template, dict) else None
+
+
+def _iter_pod_refs(pod_spec: Dict, claim_templates: set) -> Iterator[Tuple[str, str]]:
+    """Pod spec 中引用的 (kind, name)，忽略 optional 引用"""
+    def named(ref, kind, key='name'):
+        if isinstance(ref, dict) and ref.get(key) and not ref.get('optional'):
+            yield kind, ref[key]
+    
+    if pod_spec.get('serviceAccountName'):
+        yield 'ServiceAccount', pod_spec['serviceAccountName']
+    for ref in pod_spec.get('imagePullSecrets') or []:
+        yield from named(ref, 'Secret')
+    
+    for container in (pod_spec.get('containers') or []) + (pod_spec.get('initContainers') or []):
+        if not isinstance(container, dict):
+            continue
+        for source in container.get('envFrom') or []:
+            if isinstance(source, dict):
+                yield from named(source.get('configMapRef'), 'ConfigMap')
+                yield from named(source.get('secretRef'), 'Secret')
+        for env in container.get('env') or []:
+            value_from = env.get('valueFrom') if isinstance(env, dict) else None
+            if isinstance(value_from, dict):
+                yield from named(value_from.get('configMapKeyRef'), 'ConfigMap')
+                yield from named(value_from.get('secretKeyRef'), 'Secret')
+    
+    for volume in pod_spec.get('volumes') or []:
+        if not isinstance(volume, dict):
+            continue
+        yield from named(volume.get('configMap'), 'ConfigMap')
+        yield from named(volume.get('secret'), 'Secret', 'secretName')
+        claim = volume.get('persistentVolumeClaim')
+        if isinstance(claim, dict) and claim.get('claimName') not in claim_templates:
+            yield from named(claim, 'PersistentVolumeClaim', 'claimName')
+        for source in (volume.get('projected') or {}).get('sources') or []:
+            if isinstance(source, dict):
+                yield from named(source.get('configMap'), 'ConfigMap')
+                yield from named(source.get('secret'), 'Secret')
+
+
+def _summarize_k8s_resource(manifest: Dict, document: int) -> Optional[Dict]:
+    """
+    提取交叉引用檢查所需的資源摘要（體積小，可緩存並跨進程傳遞）
+    
+    Returns:
+        {kind, name, namespace, document, labels, selector, refs} 或 None
+    """
+    kind = manifest.get('kind')
+    metadata = manifest.get('metadata')
+    if not isinstance(kind, str) or not isinstance(metadata, dict) or not metadata.get('name'):
+        return None
+    
+    namespace = None if kind in K8S_CLUSTER_SCOPED_KINDS else metadata.get('namespace')
+    spec = manifest.get('spec') if isinstance(manifest.get('spec'), dict) else {}
+    summary = {
+        'kind': kind,
+        'name': str(metadata['name']),
+        'namespace': namespace,
+        'document': document,
+        'labels': None,
+        'selector': None,
+        'refs': []
+    }
+    refs = set()
+    
+    if kind in K8S_WORKLOAD_KINDS:
+        template = _pod_template(manifest) or {}
+        labels = (template.get('metadata') or {}).get('labels')
+        if isinstance(labels, dict):
+            summary['labels'] = {str(k): str(v) for k, v in labels.items()}
+        pod_spec = template.get('spec')
+        if isinstance(pod_spec, dict):
+            claim_templates = {
+                (claim.get('metadata') or {}).get('name')
+                for claim in spec.get('volumeClaimTemplates') or [] if isinstance(claim, dict)
+            }
+            refs.update(_iter_pod_refs(pod_spec, claim_templates))
+    
+    elif kind == 'Service':
+        selector = spec.get('selector')
+        if isinstance(selector, dict) and selector:
+            summary['selector'] = {str(k): str(v) for k, v in selector.items()}
+    
+    elif kind == 'HorizontalPodAutoscaler':
+        target = spec.get('scaleTargetRef')
+        if isinstance(target, dict) and target.get('kind') and target.get('name'):
+            refs.add((target['kind'], target['name']))
+    
+    elif kind == 'Ingress':
+        backends = [spec.get('defaultBackend')]
+        for rule in spec.get('rules') or []:
+            paths = ((rule or {}).get('http') or {}).get('paths') or []
+            backends.extend(path.get('backend') for path in paths if isinstance(path, dict))
+        for backend in backends:
+            service = (backend or {}).get('service')
+            if isinstance(service, dict) and service.get('name'):
+                refs.add(('Service', service['name']))
+    
+    elif kind in ('RoleBinding', 'ClusterRoleBinding'):
+        role_ref = manifest.get('roleRef')
+        if isinstance(role_ref, dict) and role_ref.get('kind') and role_ref.get('name'):
+            refs.add((role_ref['kind'], role_ref['name']))
+        for subject in manifest.get('subjects') or []:
+            if isinstance(subject, dict) and subject.get('kind') == 'ServiceAccount' and subject.get('name'):
+                summary['refs'].append(['ServiceAccount', str(subject['name']), subject.get('namespace') or namespace])
+    
+    summary['refs'].extend(
+        [ref_kind, str(ref_name), namespace] for ref_kind, ref_name in sorted(refs, key=str)
+    )
+    return summary
+
+
+def _yaml_error_details(error: Exception) -> Dict:
+    """YAML錯誤信息及行列號"""
+    if hasattr(error, 'to_dict'):
+        details = error.to_dict()
+        return {'error': details['error'], 'line': details['line'], 'column': details['column']}
+    return {'error': str(error), 'line': None, 'column': None}
+
+
+def _check_yaml_file(path: str) -> Dict:
+    """解析單個YAML文件（可在工作進程中執行）"""
+    try:
+        for _ in iter_yaml_documents(path):
+            pass
+        return {'ok': True}
+    except YAMLLoadError as e:
+        return {'ok': False, **_yaml_error_details(e)}
+    except OSError as e:
+        return {'ok': False, 'error': str(e), 'line': None, 'column': None}
+
+
+def _check_json_file(path: str) -> Dict:
+    """解析單個JSON文件（可在工作進程中執行）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            json.load(f)
+        return {'ok': True}
+    except json.JSONDecodeError as e:
+        return {'ok': False, 'error': str(e)}
+    except (OSError, UnicodeDecodeError) as e:
+        return {'ok': False, 'error': str(e)}
+
+
+def _check_k8s_file(path: str) -> Dict:
+    """
+    檢查單個Kubernetes manifest文件（可在工作進程中執行）
+    
+    除結構檢查外按 kind 的 schema 驗證，並返回資源摘要供跨文件索引
+    """
+    required_fields = {
+        'apiVersion': str,
+        'kind': str,
+        'metadata': dict
+    }
+    
+    result = {'valid': 0, 'invalid': 0, 'errors': [], 'resources': []}
+    
+    try:
+        # 流式逐個文檔檢查，大型多文檔 bundle 無需整體載入
+        for index, manifest in enumerate(iter_yaml_documents(path)):
+            if not manifest:
+                continue
+            
+            if not isinstance(manifest, dict):
+                result['errors'].append({'error': 'Manifest must be a mapping', 'document': index})
+                result['invalid'] += 1
+                continue
+            
+            if manifest.get('kind') in K8S_BUILD_KINDS:
+                result['valid'] += 1
+                continue
+            
+            # 檢查必需字段
+            for field, field_type in required_fields.items():
+                if field not in manifest:
+                    result['errors'].append({'error': f'Missing required field: {field}', 'document': index})
+                    result['invalid'] += 1
+                    break
+                
+                if not isinstance(manifest[field], field_type):
+                    result['errors'].append({
+                        'error': f'Field {field} must be of type {field_type.__name__}',
+                        'document': index
+                    })
+                    result['invalid'] += 1
+                    break
+            else:
+                schema_errors = _schema_errors(manifest) if HAS_JSONSCHEMA else []
+                for message in schema_errors:
+                    result['errors'].append({'error': f"{manifest['kind']} {message}", 'document': index})
+                if schema_errors:
+                    result['invalid'] += 1
+                else:
+                    result['valid'] += 1
+                
+                summary = _summarize_k8s_resource(manifest, index)
+                if summary:
+                    result['resources'].append(summary)
+    
+    except YAMLLoadError as e:
+        result['errors'].append(_yaml_error_details(e))
+        result['invalid'] += 1
+    except Exception as e:
+        result['errors'].append({'error': str(e)})
+        result['invalid'] += 1
+    
+    return result
+
+
+FILE_CHECKERS: Dict[str, Callable[[str], Dict]] = {
+    'yaml': _check_yaml_file,
+    'json': _check_json_file,
+    'k8s': _check_k8s_file,
+}
+
+
+class K8sResourceIndex:
+    """
+    跨文件的Kubernetes資源索引
+    
+    按 (kind, namespace, name) 及 Pod 模板標籤建立哈希索引，
+    交叉引用檢查每次查找為 O(1)，不需對所有清單做嵌套掃描。
+    未聲明 namespace 的資源（由 kustomize 等注入）可匹配任意 namespace。
+    """
+    
+    def __init__(self):
+        self.resources: Dict[Tuple[str, Optional[str], str], List[Dict]] = defaultdict(list)
+        self._namespaces: Dict[Tuple[str, str], set] = defaultdict(set)
+        self._label_index: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+    
+    def add(self, resource: Dict, file: str):
+        """加入一個資源摘要"""
+        resource = {**resource, 'file': file}
+        kind, namespace, name = resource['kind'], resource['namespace'], resource['name']
+        self.resources[(kind, namespace, name)].append(resource)
+        self._namespaces[(kind, name)].add(namespace)
+        for label in (resource['labels'] or {}).items():
+            self._label_index[label].append(resource)
+    
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.resources.values())
+    
+    def resolve(self, kind: str, name: str, namespace: Optional[str]) -> bool:
+        """引用目標是否存在於索引中"""
+        namespaces = self._namespaces.get((kind, name))
+        if not namespaces:
+            return False
+        if namespace is None or kind in K8S_CLUSTER_SCOPED_KINDS:
+            return True
+        return namespace in namespaces or None in namespaces
+    
+    def select_workloads(self, selector: Dict[str, str], namespace: Optional[str]) -> List[Dict]:
+        """Service selector 匹配的工作負載（從最小的標籤桶開始求交集）"""
+        buckets = [self._label_index.get(label, ()) for label in selector.items()]
+        if not all(buckets):
+            return []
+        smallest = min(buckets, key=len)
+        matches = []
+        for workload in smallest:
+            labels = workload['labels']
+            if all(labels.get(key) == value for key, value in selector.items()) and (
+                    namespace is None or workload['namespace'] in (namespace, None)):
+                matches.append(workload)
+        return matches
+    
+    def check_references(self) -> List[Dict]:
+        """檢查所有交叉引用及重複定義，返回警告列表"""
+        warnings = []
+        
+        for (kind, namespace, name), entries in self.resources.items():
+            if len(entries) > 1:
+                warnings.append({
+                    'file': entries[0]['file'],
+                    'document': entries[0]['document'],
+                    'message': f'{kind} {namespace or "-"}/{name} defined {len(entries)} times',
+                    'locations': [f"{entry['file']}#{entry['document']}" for entry in entries]
+                })
+            
+            for resource in entries:
+                if resource['selector'] and not self.select_workloads(resource['selector'], namespace):
+                    warnings.append({
+                        'file': resource['file'],
+                        'document': resource['document'],
+                        'message': f'Service {name} selector {resource["selector"]} matches no workload'
+                    })
+                
+                for ref_kind, ref_name, ref_namespace in resource['refs']:
+                    if (ref_kind, ref_name) in K8S_IMPLICIT_REFS:
+                        continue
+                    if not self.resolve(ref_kind, ref_name, ref_namespace):
+                        warnings.append({
+                            'file': resource['file'],
+                            'document': resource['document'],
+                            'message': f'{kind} {name} references missing {ref_kind} {ref_name}'
+                        })
+        
+        return warnings
+
 
 class ConfigValidator:
     """配置文件驗證器"""
     
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, workers: Optional[int] = None, use_cache: bool = True):
+        """
+        Args:
+            project_path: 項目根目錄
+            workers: 解析文件的工作進程數（默認CPU數）
+            use_cache: 是否使用按 path + mtime + size 的增量緩存
+        """
         self.project_path = project_path
         self.reports_dir = os.path.join(project_path, 'reports', 'config')
         os.makedirs(self.reports_dir, exist_ok=True)
         self.errors = []
         self.warnings = []
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_file = os.path.join(self.reports_dir, '.validation-cache.json')
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._file_index: Optional[Dict[str, List[str]]] = None
+        self._cache: Dict[str, Dict] = self._load_cache() if use_cache else {}
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        """加載增量驗證緩存"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+    
+    def _save_cache(self):
+        """保存增量驗證緩存（只保留本次仍存在的文件）"""
+        if not self.use_cache:
+            return
+        indexed = {path for paths in self._index().values() for path in paths}
+        files = {path: entry for path, entry in self._cache.items() if path in indexed}
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': files}, f)
+    
+    def _index(self) -> Dict[str, List[str]]:
+        """單次遍歷項目目錄，按模式將文件路由到各類別"""
+        if self._file_index is not None:
+            return self._file_index
+        
+        index = {category: [] for category in FILE_ROUTES}
+        index['k8s'] = []
+        
+        for root, dirs, files in os.walk(self.project_path):
+            # 跳過依賴目錄及本工具的報告目錄（報告與緩存文件本身不需驗證）
+            dirs[:] = [
+                d for d in dirs
+                if d not in EXCLUDED_DIRS and os.path.join(root, d) != self.reports_dir
+            ]
+            
+            rel_root = os.path.relpath(root, self.project_path)
+            top_dir = rel_root.split(os.sep, 1)[0]
+            in_k8s_dir = top_dir in K8S_DIRECTORIES
+            
+            for filename in files:
+                path = os.path.join(root, filename)
+                for category, patterns in FILE_ROUTES.items():
+                    if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                        index[category].append(path)
+                        if category == 'yaml' and in_k8s_dir:
+                            index['k8s'].append(path)
+        
+        self._file_index = index
+        return index
+    
+    def _check_files(self, category: str, paths: List[str]) -> Dict[str, Dict]:
+        """
+        檢查一組文件，未變更的文件直接使用緩存結果
+        
+        Returns:
+            path -> 檢查結果（保持輸入順序）
+        """
+        results: Dict[str, Dict] = {}
+        pending: List[Tuple[str, int, int]] = []
+        
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                pending.append((path, 0, 0))
+                continue
+            
+            entry = self._cache.get(path)
+            if (entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size
+                    and category in entry['results']):
+                results[path] = entry['results'][category]
+                self.cache_stats['hits'] += 1
+            else:
+                pending.append((path, st.st_mtime_ns, st.st_size))
+        
+        self.cache_stats['misses'] += len(pending)
+        checker = FILE_CHECKERS[category]
+        pending_paths = [path for path, _, _ in pending]
+        
+        if self.workers > 1 and len(pending_paths) >= MIN_PARALLEL_FILES:
+            chunksize = max(1, len(pending_paths) // (self.workers * 4))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+                checked = list(executor.map(checker, pending_paths, chunksize=chunksize))
+        else:
+            checked = [checker(path) for path in pending_paths]
+        
+        for (path, mtime_ns, size), result in zip(pending, checked):
+            results[path] = result
+            entry = self._cache.get(path)
+            if not entry or entry['mtime_ns'] != mtime_ns or entry['size'] != size:
+                entry = {'mtime_ns': mtime_ns, 'size': size, 'results': {}}
+                self._cache[path] = entry
+            entry['results'][category] = result
+        
+        return {path: results[path] for path in paths}
     
     def validate_yaml_files(self) -> Dict:
         """驗證所有YAML文件"""
-        yaml_files = self._find_files(['*.yml', '*.yaml'])
+        yaml_files = self._index()['yaml']
         
         results = {
             'total_files': len(yaml_files),
@@ -30,23 +707,24 @@ class ConfigValidator:
             'errors': []
         }
         
-        for yaml_file in yaml_files:
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    yaml.safe_load(f)
+        for yaml_file, checked in self._check_files('yaml', yaml_files).items():
+            if checked['ok']:
                 results['valid_files'] += 1
-            except yaml.YAMLError as e:
+            else:
                 results['invalid_files'] += 1
                 results['errors'].append({
                     'file': yaml_file,
-                    'error': str(e)
+                    'error': checked['error'],
+                    'line': checked['line'],
+                    'column': checked['column']
                 })
         
         return results
     
     def validate_json_files(self) -> Dict:
         """驗證所有JSON文件"""
-        json_files = self._find_files(['*.json'])
+        # node_modules 和 .venv 在遍歷時已被排除
+        json_files = self._index()['json']
         
         results = {
             'total_files': len(json_files),
@@ -55,20 +733,14 @@ class ConfigValidator:
             'errors': []
         }
         
-        for json_file in json_files:
-            # 跳過node_modules和其他依賴目錄
-            if 'node_modules' in json_file or '.venv' in json_file:
-                continue
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
+        for json_file, checked in self._check_files('json', json_files).items():
+            if checked['ok']:
                 results['valid_files'] += 1
-            except json.JSONDecodeError as e:
+            else:
                 results['invalid_files'] += 1
                 results['errors'].append({
                     'file': json_file,
-                    'error': str(e)
+                    'error': checked['error']
                 })
         
         return results
@@ -96,8 +768,7 @@ class ConfigValidator:
             results['files_checked'].append(filename)
             
             try:
-                with open(filepath, 'r') as f:
-                    config = yaml.safe_load(f)
+                config = load_yaml_file(filepath)
                 
                 # 檢查版本
                 if 'version' not in config:
@@ -143,8 +814,7 @@ class ConfigValidator:
     
     def validate_kubernetes_manifests(self) -> Dict:
         """驗證Kubernetes配置"""
-        k8s_files = self._find_files(['*.yaml', '*.yml'], 
-                                     directories=['k8s', 'kubernetes', '.kube'])
+        k8s_files = self._index()['k8s']
         
         results = {
             'total_files': len(k8s_files),
@@ -154,53 +824,25 @@ class ConfigValidator:
             'warnings': []
         }
         
-        required_fields = {
-            'apiVersion': str,
-            'kind': str,
-            'metadata': dict
-        }
+        index = K8sResourceIndex()
+        for k8s_file, checked in self._check_files('k8s', k8s_files).items():
+            results['valid_files'] += checked['valid']
+            results['invalid_files'] += checked['invalid']
+            for error in checked['errors']:
+                results['errors'].append({'file': k8s_file, **error})
+            for resource in checked['resources']:
+                index.add(resource, k8s_file)
         
-        for k8s_file in k8s_files:
-            try:
-                with open(k8s_file, 'r') as f:
-                    manifests = list(yaml.safe_load_all(f))
-                
-                for manifest in manifests:
-                    if not manifest:
-                        continue
-                    
-                    # 檢查必需字段
-                    for field, field_type in required_fields.items():
-                        if field not in manifest:
-                            results['errors'].append({
-                                'file': k8s_file,
-                                'error': f'Missing required field: {field}'
-                            })
-                            results['invalid_files'] += 1
-                            break
-                        
-                        if not isinstance(manifest[field], field_type):
-                            results['errors'].append({
-                                'file': k8s_file,
-                                'error': f'Field {field} must be of type {field_type.__name__}'
-                            })
-                            results['invalid_files'] += 1
-                            break
-                    else:
-                        results['valid_files'] += 1
-            
-            except Exception as e:
-                results['errors'].append({
-                    'file': k8s_file,
-                    'error': str(e)
-                })
-                results['invalid_files'] += 1
+        # 交叉引用在全部文件索引完成後檢查（集群外部提供的資源只產生警告）
+        results['resources_indexed'] = len(index)
+        results['schema_validation'] = HAS_JSONSCHEMA
+        results['warnings'].extend(index.check_references())
         
         return results
     
     def validate_env_files(self) -> Dict:
         """驗證環境變量文件"""
-        env_files = self._find_files(['.env*'])
+        env_files = self._index()['env']
         
         results = {
             'total_files': len(env_files),
@@ -271,10 +913,7 @@ class ConfigValidator:
             
             for root, dirs, files in os.walk(full_search_dir):
                 # 排除常見的依賴目錄
-                dirs[:] = [d for d in dirs if d not in [
-                    'node_modules', '.git', '__pycache__', 
-                    '.venv', 'venv', 'dist', 'build'
-                ]]
+                dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
                 
                 for pattern in patterns:
                     for filename in fnmatch.filter(files, pattern):
@@ -308,6 +947,10 @@ class ConfigValidator:
         
         # 生成總體摘要
         results['summary'] = self._generate_validation_summary(results['validations'])
+        results['cache'] = dict(self.cache_stats)
+        
+        # 保存增量緩存
+        self._save_cache()
         
         # 保存報告
         report_file = os.path.join(self.reports_dir, 'validation-report.json')
@@ -343,10 +986,16 @@ class ConfigValidator:
 
 
 if __name__ == "__main__":
+    import argparse
     import sys
     
-    project_path = sys.argv[1] if len(sys.argv) > 1 else '.'
-    validator = ConfigValidator(project_path)
+    parser = argparse.ArgumentParser(description='Configuration file validation tool')
+    parser.add_argument('project_path', nargs='?', default='.', help='Project root directory')
+    parser.add_argument('--workers', type=int, help='Parser worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every file')
+    args = parser.parse_args()
+    
+    validator = ConfigValidator(args.project_path, workers=args.workers, use_cache=not args.no_cache)
     results = validator.run_all_validations()
     
     print("\n" + "="*60)
@@ -354,6 +1003,7 @@ if __name__ == "__main__":
     print("="*60)
     print(f"Total Errors: {results['summary']['total_errors']}")
     print(f"Total Warnings: {results['summary']['total_warnings']}")
+    print(f"Cache: {results['cache']['hits']} unchanged, {results['cache']['misses']} parsed")
     print(f"Status: {'✅ PASSED' if results['summary']['passed'] else '❌ FAILED'}")
     
     sys.exit(0 if results['summary']['passed'] else 1)
@@ -1,247 +1,497 @@
 #!/usr/bin/env python3
 # security_scanner.py - Comprehensive security scanning tool
 
+import asyncio
+import hashlib
 import subprocess
 import json
 import os
-from typing import Dict, List, Optional
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 
+# 源碼掃描時排除的目錄
+SOURCE_EXCLUDED_DIRS = {'venv', '.venv', 'node_modules', '.git'}
+
+# 依賴鎖文件：內容變更時才重新執行依賴掃描
+PYTHON_LOCKFILES = (
+    'requirements.txt', 'requirements-dev.txt', 'Pipfile', 'Pipfile.lock',
+    'poetry.lock', 'pyproject.toml', 'setup.py', 'setup.cfg'
+)
+NODE_LOCKFILES = ('package.json', 'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml')
+
+# 各工具超時（秒）
+TOOL_TIMEOUTS = {
+    'bandit': 600,
+    'safety': 300,
+    'npm_audit': 300,
+    'snyk': 600,
+}
+
+# 漏洞數據庫會更新：依賴掃描結果即使鎖文件未變也只緩存一天
+DEPENDENCY_RESULT_TTL = 24 * 3600
+
+CACHE_VERSION = 1
+
+# 共用 SARIF 輸出工具（倉庫 tools/sarif_report.py）
+_TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'tools'))
+
+
+@dataclass
+class ScanTool:
+    """一個安全掃描工具的執行描述"""
+    key: str                                   # results['scans'] 中的鍵
+    name: str                                  # 摘要中的 'tool' 名稱
+    label: str                                 # 進度信息
+    command: List[str]
+    summarize: Callable[[int, str], Dict]      # (returncode, stdout) -> 摘要
+    fingerprint: Callable[[], str]             # 輸入內容指紋（緩存鍵）
+    timeout: float
+    ttl: Optional[float] = None                # 緩存有效期，None 表示只看指紋
+
+
 class SecurityScanner:
     """安全掃描器 - 整合多種安全工具"""
-    
-    def __init__(self, project_path: str):
+
+    def __init__(self, project_path: str, use_cache: bool = True):
+        """
+        Args:
+            project_path: 項目根目錄
+            use_cache: 輸入（源碼/鎖文件）未變更時重用上次的掃描結果
+        """
         self.project_path = project_path
         self.reports_dir = os.path.join(project_path, 'reports', 'security')
         os.makedirs(self.reports_dir, exist_ok=True)
-    
-    def run_bandit_scan(self) -> Dict:
-        """執行Bandit Python安全掃描"""
-        cmd = [
-            'bandit', 
-            '-r', self.project_path,
-            '-f', 'json',
-            '-o', os.path.join(self.reports_dir, 'bandit-report.json'),
-            '--exclude', '*/test*,*/venv/*,*/.git/*'
-        ]
-        
+        self.use_cache = use_cache
+        self.cache_file = os.path.join(self.reports_dir, '.scan-cache.json')
+        self._fingerprints: Dict[str, str] = {}
+
+    # ---- 工具定義 ----
+
+    def _bandit_tool(self) -> ScanTool:
+        return ScanTool(
+            key='bandit',
+            name='bandit',
+            label='🐍 Bandit',
+            command=[
+                'bandit',
+                '-r', self.project_path,
+                '-f', 'json',
+                '-o', os.path.join(self.reports_dir, 'bandit-report.json'),
+                '--exclude', '*/test*,*/venv/*,*/.git/*'
+            ],
+            summarize=self._summarize_bandit,
+            fingerprint=self._python_sources_fingerprint,
+            timeout=TOOL_TIMEOUTS['bandit']
+        )
+
+    def _safety_tool(self) -> ScanTool:
+        return ScanTool(
+            key='safety',
+            name='safety',
+            label='🛡️ Safety',
+            command=['safety', 'check', '--json'],
+            summarize=self._summarize_safety,
+            fingerprint=lambda: self._lockfiles_fingerprint(PYTHON_LOCKFILES),
+            timeout=TOOL_TIMEOUTS['safety'],
+            ttl=DEPENDENCY_RESULT_TTL
+        )
+
+    def _npm_audit_tool(self) -> ScanTool:
+        return ScanTool(
+            key='npm_audit',
+            name='npm-audit',
+            label='📦 npm audit',
+            command=['npm', 'audit', '--json'],
+            summarize=self._summarize_npm_audit,
+            fingerprint=lambda: self._lockfiles_fingerprint(NODE_LOCKFILES),
+            timeout=TOOL_TIMEOUTS['npm_audit'],
+            ttl=DEPENDENCY_RESULT_TTL
+        )
+
+    def _snyk_tool(self) -> ScanTool:
+        return ScanTool(
+            key='snyk',
+            name='snyk',
+            label='🔍 Snyk',
+            command=['snyk', 'test', '--json'],
+            summarize=self._summarize_snyk,
+            fingerprint=lambda: self._lockfiles_fingerprint(NODE_LOCKFILES + PYTHON_LOCKFILES),
+            timeout=TOOL_TIMEOUTS['snyk'],
+            ttl=DEPENDENCY_RESULT_TTL
+        )
+
+    # ---- 結果摘要 ----
+
+    def _summarize_bandit(self, returncode: int, stdout: str) -> Dict:
+        # 讀取報告
+        report_path = os.path.join(self.reports_dir, 'bandit-report.json')
+        if os.path.exists(report_path):
+            with open(report_path, 'r') as f:
+                report = json.load(f)
+        else:
+            return {'tool': 'bandit', 'error': 'Report file not created'}
+
+        # 生成摘要
+        return {
+            'tool': 'bandit',
+            'timestamp': datetime.now().isoformat(),
+            'total_issues': len(report.get('results', [])),
+            'high_severity': len([r for r in report.get('results', [])
+                                if r.get('issue_severity') == 'HIGH']),
+            'medium_severity': len([r for r in report.get('results', [])
+                                  if r.get('issue_severity') == 'MEDIUM']),
+            'low_severity': len([r for r in report.get('results', [])
+                               if r.get('issue_severity') == 'LOW']),
+            'metrics': report.get('metrics', {})
+        }
+
+    def _summarize_safety(self, returncode: int, stdout: str) -> Dict:
+        # 解析輸出
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # 讀取報告
-            report_path = os.path.join(self.reports_dir, 'bandit-report.json')
-            if os.path.exists(report_path):
-                with open(report_path, 'r') as f:
-                    report = json.load(f)
-            else:
-                return {'tool': 'bandit', 'error': 'Report file not created'}
-            
-            # 生成摘要
-            summary = {
-                'tool': 'bandit',
-                'timestamp': datetime.now().isoformat(),
-                'total_issues': len(report.get('results', [])),
-                'high_severity': len([r for r in report.get('results', []) 
-                                    if r.get('issue_severity') == 'HIGH']),
-                'medium_severity': len([r for r in report.get('results', []) 
-                                      if r.get('issue_severity') == 'MEDIUM']),
-                'low_severity': len([r for r in report.get('results', []) 
-                                   if r.get('issue_severity') == 'LOW']),
-                'metrics': report.get('metrics', {})
-            }
-            
-            return summary
-            
+            report = json.loads(stdout) if stdout else []
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse Safety output: {e}")
+            return {'tool': 'safety', 'error': f'Invalid JSON output: {str(e)}'}
+
+        # 保存報告
+        with open(os.path.join(self.reports_dir, 'safety-report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        vulnerabilities = report if isinstance(report, list) else []
+
+        return {
+            'tool': 'safety',
+            'timestamp': datetime.now().isoformat(),
+            'total_vulnerabilities': len(vulnerabilities),
+            'packages_affected': len(set([v.get('package', '') for v in vulnerabilities])),
+            'vulnerabilities': vulnerabilities
+        }
+
+    def _summarize_npm_audit(self, returncode: int, stdout: str) -> Dict:
+        report = json.loads(stdout) if stdout else {}
+
+        # 保存報告
+        with open(os.path.join(self.reports_dir, 'npm-audit.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        vulnerabilities = report.get('metadata', {}).get('vulnerabilities', {})
+        return {
+            'tool': 'npm-audit',
+            'timestamp': datetime.now().isoformat(),
+            'total_vulnerabilities': vulnerabilities.get('total', 0),
+            'critical': vulnerabilities.get('critical', 0),
+            'high': vulnerabilities.get('high', 0),
+            'moderate': vulnerabilities.get('moderate', 0),
+            'low': vulnerabilities.get('low', 0)
+        }
+
+    def _summarize_snyk(self, returncode: int, stdout: str) -> Dict:
+        report = json.loads(stdout) if stdout else {}
+
+        # 保存報告
+        with open(os.path.join(self.reports_dir, 'snyk-report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+
+        vulnerabilities = report.get('vulnerabilities', [])
+        return {
+            'tool': 'snyk',
+            'timestamp': datetime.now().isoformat(),
+            'total_vulnerabilities': len(vulnerabilities),
+            'unique_count': report.get('uniqueCount', 0),
+            'critical': len([v for v in vulnerabilities if v.get('severity') == 'critical']),
+            'high': len([v for v in vulnerabilities if v.get('severity') == 'high']),
+            'medium': len([v for v in vulnerabilities if v.get('severity') == 'medium']),
+            'low': len([v for v in vulnerabilities if v.get('severity') == 'low'])
+        }
+
+    # ---- 單工具執行（同步） ----
+
+    def _run_tool(self, tool: ScanTool) -> Dict:
+        """以阻塞方式執行單個工具"""
+        try:
+            result = subprocess.run(tool.command, capture_output=True, text=True,
+                                    cwd=self.project_path, timeout=tool.timeout)
+            return tool.summarize(result.returncode, result.stdout)
+        except subprocess.TimeoutExpired:
+            return {'tool': tool.name, 'error': f'Timed out after {tool.timeout}s'}
         except Exception as e:
-            print(f"Bandit scan failed: {e}")
-            return {'tool': 'bandit', 'error': str(e)}
-    
+            print(f"{tool.label} scan failed: {e}")
+            return {'tool': tool.name, 'error': str(e)}
+
+    def run_bandit_scan(self) -> Dict:
+        """執行Bandit Python安全掃描"""
+        return self._run_tool(self._bandit_tool())
+
     def run_safety_scan(self) -> Dict:
         """執行Safety依賴檢查"""
-        cmd = ['safety', 'check', '--json']
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_path)
-            
-            # 解析輸出
-            try:
-                report = json.loads(result.stdout) if result.stdout else []
-            except json.JSONDecodeError as e:
-                print(f"Failed to parse Safety output: {e}")
-                return {'tool': 'safety', 'error': f'Invalid JSON output: {str(e)}'}
-            
-            # 保存報告
-            with open(os.path.join(self.reports_dir, 'safety-report.json'), 'w') as f:
-                json.dump(report, f, indent=2)
-            
-            vulnerabilities = report if isinstance(report, list) else []
-            
-            summary = {
-                'tool': 'safety',
-                'timestamp': datetime.now().isoformat(),
-                'total_vulnerabilities': len(vulnerabilities),
-                'packages_affected': len(set([v.get('package', '') for v in vulnerabilities])),
-                'vulnerabilities': vulnerabilities
-            }
-            
-            return summary
-            
-        except Exception as e:
-            print(f"Safety scan failed: {e}")
-            return {'tool': 'safety', 'error': str(e)}
-    
+        return self._run_tool(self._safety_tool())
+
     def run_npm_audit(self) -> Dict:
         """執行npm audit掃描"""
         if not os.path.exists(os.path.join(self.project_path, 'package.json')):
             return {'tool': 'npm-audit', 'skipped': 'No package.json found'}
-        
-        cmd = ['npm', 'audit', '--json']
-        
-        try:
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True,
-                cwd=self.project_path
-            )
-            
-            report = json.loads(result.stdout) if result.stdout else {}
-            
-            # 保存報告
-            with open(os.path.join(self.reports_dir, 'npm-audit.json'), 'w') as f:
-                json.dump(report, f, indent=2)
-            
-            summary = {
-                'tool': 'npm-audit',
-                'timestamp': datetime.now().isoformat(),
-                'total_vulnerabilities': report.get('metadata', {}).get('vulnerabilities', {}).get('total', 0),
-                'critical': report.get('metadata', {}).get('vulnerabilities', {}).get('critical', 0),
-                'high': report.get('metadata', {}).get('vulnerabilities', {}).get('high', 0),
-                'moderate': report.get('metadata', {}).get('vulnerabilities', {}).get('moderate', 0),
-                'low': report.get('metadata', {}).get('vulnerabilities', {}).get('low', 0)
-            }
-            
-            return summary
-            
-        except Exception as e:
-            print(f"npm audit failed: {e}")
-            return {'tool': 'npm-audit', 'error': str(e)}
-    
+        return self._run_tool(self._npm_audit_tool())
+
     def run_snyk_scan(self) -> Dict:
         """執行Snyk安全掃描"""
         if not self._check_command_exists('snyk'):
             return {'tool': 'snyk', 'skipped': 'Snyk not installed'}
-        
-        cmd = ['snyk', 'test', '--json']
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.project_path
-            )
-            
-            report = json.loads(result.stdout) if result.stdout else {}
-            
-            # 保存報告
-            with open(os.path.join(self.reports_dir, 'snyk-report.json'), 'w') as f:
-                json.dump(report, f, indent=2)
-            
-            summary = {
-                'tool': 'snyk',
-                'timestamp': datetime.now().isoformat(),
-                'total_vulnerabilities': len(report.get('vulnerabilities', [])),
-                'unique_count': report.get('uniqueCount', 0),
-                'critical': len([v for v in report.get('vulnerabilities', []) 
-                               if v.get('severity') == 'critical']),
-                'high': len([v for v in report.get('vulnerabilities', []) 
-                           if v.get('severity') == 'high']),
-                'medium': len([v for v in report.get('vulnerabilities', []) 
-                             if v.get('severity') == 'medium']),
-                'low': len([v for v in report.get('vulnerabilities', []) 
-                          if v.get('severity') == 'low'])
-            }
-            
-            return summary
-            
-        except Exception as e:
-            print(f"Snyk scan failed: {e}")
-            return {'tool': 'snyk', 'error': str(e)}
-    
+        return self._run_tool(self._snyk_tool())
+
     def _check_command_exists(self, command: str) -> bool:
         """檢查命令是否存在"""
         from shutil import which
         return which(command) is not None
-    
+
+    # ---- 並行編排 ----
+
+    def _applicable_tools(self) -> Tuple[List[ScanTool], Dict[str, Dict]]:
+        """
+        按項目內容選擇工具
+
+        Returns:
+            (需執行的工具, 已確定跳過的結果)
+        """
+        tools: List[ScanTool] = []
+        skipped: Dict[str, Dict] = {}
+
+        # Python安全掃描
+        if self._has_python_files():
+            tools += [self._bandit_tool(), self._safety_tool()]
+
+        # Node.js安全掃描
+        if os.path.exists(os.path.join(self.project_path, 'package.json')):
+            tools.append(self._npm_audit_tool())
+            if self._check_command_exists('snyk'):
+                tools.append(self._snyk_tool())
+            else:
+                skipped['snyk'] = {'tool': 'snyk', 'skipped': 'Snyk not installed'}
+
+        return tools, skipped
+
+    async def _run_tool_async(self, tool: ScanTool) -> Dict:
+        """以異步子進程執行單個工具，超時即終止"""
+        print(f"  {tool.label} started")
+        started = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *tool.command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.project_path
+            )
+        except OSError as e:
+            print(f"{tool.label} scan failed: {e}")
+            return {'tool': tool.name, 'error': str(e)}
+
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=tool.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            print(f"  {tool.label} timed out after {tool.timeout}s")
+            return {'tool': tool.name, 'error': f'Timed out after {tool.timeout}s'}
+
+        try:
+            summary = tool.summarize(process.returncode, stdout.decode('utf-8', errors='replace'))
+        except Exception as e:
+            print(f"{tool.label} scan failed: {e}")
+            summary = {'tool': tool.name, 'error': str(e)}
+        print(f"  {tool.label} finished in {time.monotonic() - started:.1f}s")
+        return summary
+
+    async def run_scans_async(self, tools: List[ScanTool]) -> Dict[str, Dict]:
+        """
+        並行執行工具
+
+        每次最多四個工具，其中只有 bandit 在本地佔用 CPU，其餘主要等待網絡，
+        因此全部同時啟動，總耗時約等於最慢的工具。
+        """
+        summaries = await asyncio.gather(*(self._run_tool_async(tool) for tool in tools))
+        return {tool.key: summary for tool, summary in zip(tools, summaries)}
+
+    # ---- 結果緩存 ----
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('tools', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self, cache: Dict[str, Dict]):
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'tools': cache}, f)
+
+    def _cache_key(self, tool: ScanTool) -> str:
+        """工具命令 + 輸入指紋"""
+        digest = hashlib.sha256(json.dumps(tool.command).encode('utf-8'))
+        digest.update(tool.fingerprint().encode('utf-8'))
+        return digest.hexdigest()
+
+    def _cached_summary(self, cache: Dict[str, Dict], tool: ScanTool, key: str) -> Optional[Dict]:
+        entry = cache.get(tool.key)
+        if not entry or entry.get('key') != key:
+            return None
+        if tool.ttl is not None and time.time() - entry.get('finished_at', 0) > tool.ttl:
+            return None
+        return {**entry['summary'], 'cached': True}
+
+    def _python_sources_fingerprint(self) -> str:
+        """所有 .py 文件的路徑、大小與修改時間指紋"""
+        if 'python_sources' in self._fingerprints:
+            return self._fingerprints['python_sources']
+
+        digest = hashlib.sha256()
+        for path in sorted(self._iter_python_files()):
+            st = os.stat(path)
+            digest.update(f"{os.path.relpath(path, self.project_path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8'))
+        self._fingerprints['python_sources'] = digest.hexdigest()
+        return self._fingerprints['python_sources']
+
+    def _lockfiles_fingerprint(self, names) -> str:
+        """依賴鎖文件內容指紋"""
+        digest = hashlib.sha256()
+        for name in names:
+            path = os.path.join(self.project_path, name)
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(name.encode('utf-8') + b'\0' + hashlib.sha256(f.read()).digest())
+            except OSError:
+                continue
+        return digest.hexdigest()
+
+    # ---- 全部掃描 ----
+
     def run_all_scans(self) -> Dict:
-        """執行所有安全掃描"""
+        """執行所有安全掃描（並行）"""
+        return asyncio.run(self.run_all_scans_async())
+
+    async def run_all_scans_async(self) -> Dict:
+        """執行所有安全掃描：輸入未變更的工具直接使用緩存結果"""
         results = {
             'timestamp': datetime.now().isoformat(),
             'project_path': self.project_path,
             'scans': {}
         }
-        
+
         print("🔒 Starting comprehensive security scans...")
-        
-        # Python安全掃描
-        if self._has_python_files():
-            print("  🐍 Running Bandit...")
-            results['scans']['bandit'] = self.run_bandit_scan()
-            
-            print("  🛡️ Running Safety...")
-            results['scans']['safety'] = self.run_safety_scan()
-        
-        # Node.js安全掃描
-        if os.path.exists(os.path.join(self.project_path, 'package.json')):
-            print("  📦 Running npm audit...")
-            results['scans']['npm_audit'] = self.run_npm_audit()
-            
-            print("  🔍 Running Snyk...")
-            results['scans']['snyk'] = self.run_snyk_scan()
-        
+
+        tools, skipped = self._applicable_tools()
+        cache = self._load_cache() if self.use_cache else {}
+        scans: Dict[str, Dict] = dict(skipped)
+
+        pending: List[ScanTool] = []
+        keys: Dict[str, str] = {}
+        for tool in tools:
+            keys[tool.key] = self._cache_key(tool)
+            cached = self._cached_summary(cache, tool, keys[tool.key]) if self.use_cache else None
+            if cached is not None:
+                print(f"  {tool.label} unchanged, using cached result")
+                scans[tool.key] = cached
+            else:
+                pending.append(tool)
+
+        started = time.monotonic()
+        fresh = await self.run_scans_async(pending)
+        scans.update(fresh)
+        results['duration_seconds'] = round(time.monotonic() - started, 3)
+
+        # 只緩存成功的結果
+        for tool in pending:
+            summary = fresh[tool.key]
+            if 'error' not in summary:
+                cache[tool.key] = {'key': keys[tool.key], 'finished_at': time.time(), 'summary': summary}
+        if self.use_cache:
+            self._save_cache(cache)
+
+        # 保持固定的輸出順序
+        order = ['bandit', 'safety', 'npm_audit', 'snyk']
+        results['scans'] = {key: scans[key] for key in order if key in scans}
+
         # 生成總體摘要
         results['summary'] = self._generate_summary(results['scans'])
-        
+
         # 保存總體報告
         summary_file = os.path.join(self.reports_dir, 'security-summary.json')
         with open(summary_file, 'w') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
-        
+
         print(f"\n✅ Security scans completed. Report saved to {summary_file}")
-        
+
         return results
-    
+
+    def write_sarif(self, output_path: str, extra_reports: Optional[List[str]] = None) -> Dict:
+        """
+        將各工具原始報告合併為 SARIF 2.1.0（流式寫入，按指紋去重）
+
+        Args:
+            output_path: SARIF 輸出路徑
+            extra_reports: 其他分析器輸出的 JSON/JSONL 問題列表
+
+        Returns:
+            寫入統計
+        """
+        if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+            sys.path.insert(0, _TOOLS_DIR)
+        from sarif_report import SarifWriter, iter_issue_file, iter_security_reports
+
+        with SarifWriter(output_path, root=self.project_path) as writer:
+            writer.extend(iter_security_reports(self.reports_dir))
+            for report in extra_reports or []:
+                writer.extend(iter_issue_file(report), tool=os.path.splitext(os.path.basename(report))[0])
+
+        print(f"📄 SARIF written to {output_path} "
+              f"({writer.stats['results']} results, {writer.stats['duplicates']} duplicates suppressed)")
+        return writer.stats
+
+    def _iter_python_files(self):
+        """以 scandir 遍歷項目中的 .py 文件（排除依賴目錄）"""
+        stack = [self.project_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SOURCE_EXCLUDED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.py'):
+                            yield entry.path
+            except OSError:
+                continue
+
     def _has_python_files(self) -> bool:
-        """檢查項目是否包含Python文件"""
-        for root, dirs, files in os.walk(self.project_path):
-            # 排除常見的依賴目錄
-            dirs[:] = [d for d in dirs if d not in ['venv', '.venv', 'node_modules', '.git']]
-            if any(f.endswith('.py') for f in files):
-                return True
-        return False
-    
+        """檢查項目是否包含Python文件（找到第一個即停止）"""
+        return next(self._iter_python_files(), None) is not None
+
     def _generate_summary(self, scans: Dict) -> Dict:
         """生成總體摘要"""
         total_issues = 0
         critical_count = 0
         high_count = 0
-        
+
         for scan_name, scan_result in scans.items():
             if 'error' in scan_result or 'skipped' in scan_result:
                 continue
-            
+
             if 'total_vulnerabilities' in scan_result:
                 total_issues += scan_result['total_vulnerabilities']
             elif 'total_issues' in scan_result:
                 total_issues += scan_result['total_issues']
-            
+
             if 'critical' in scan_result:
                 critical_count += scan_result['critical']
             if 'high' in scan_result or 'high_severity' in scan_result:
                 high_count += scan_result.get('high', scan_result.get('high_severity', 0))
-        
+
         return {
             'total_issues': total_issues,
             'critical': critical_count,
@@ -251,12 +501,21 @@ class SecurityScanner:
 
 
 if __name__ == "__main__":
-    import sys
-    
-    project_path = sys.argv[1] if len(sys.argv) > 1 else '.'
-    scanner = SecurityScanner(project_path)
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Comprehensive security scanning tool')
+    parser.add_argument('project_path', nargs='?', default='.', help='Project root directory')
+    parser.add_argument('--no-cache', action='store_true', help='Re-run every tool')
+    parser.add_argument('--sarif', metavar='PATH', help='Also write all findings as one SARIF 2.1.0 log')
+    parser.add_argument('--merge-issues', action='append', default=[], metavar='FILE',
+                        help='Extra JSON/JSONL issue list to merge into the SARIF log')
+    args = parser.parse_args()
+
+    scanner = SecurityScanner(args.project_path, use_cache=not args.no_cache)
     results = scanner.run_all_scans()
-    
+    if args.sarif:
+        scanner.write_sarif(args.sarif, args.merge_issues)
+
     # 打印摘要
     print("\n" + "="*60)
     print("Security Scan Summary")
@@ -265,5 +524,5 @@ if __name__ == "__main__":
     print(f"Critical: {results['summary']['critical']}")
     print(f"High: {results['summary']['high']}")
     print(f"Status: {'✅ PASSED' if results['summary']['passed'] else '❌ FAILED'}")
-    
+
     sys.exit(0 if results['summary']['passed'] else 1)
@@ -0,0 +1,322 @@
+"""
+Tests for config_validator.py
+配置驗證器測試：Kubernetes 按 kind 的 schema、跨文件資源索引、增量驗證緩存
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config_validator
+from config_validator import ConfigValidator, K8sResourceIndex, _summarize_k8s_resource
+
+# 多文檔清單：web 工作負載引用一個存在的 ConfigMap、一個缺失的 Secret，
+# 以及可選（optional）的缺失 ConfigMap；另有 Service / HPA 的正反例
+APP_MANIFEST = '''
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+  namespace: app
+spec:
+  selector:
+    matchLabels: {app: web}
+  template:
+    metadata:
+      labels: {app: web, tier: frontend}
+    spec:
+      serviceAccountName: default
+      containers:
+        - name: web
+          image: nginx:1.27
+          envFrom:
+            - configMapRef: {name: app-config}
+            - secretRef: {name: db-credentials}
+          env:
+            - name: FEATURE
+              valueFrom:
+                configMapKeyRef: {name: feature-flags, key: flag, optional: true}
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: app-config
+  namespace: app
+data:
+  LOG_LEVEL: info
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+  namespace: app
+spec:
+  selector: {app: web}
+  ports:
+    - port: 80
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+  namespace: other
+spec:
+  selector: {app: web}
+  ports:
+    - port: 80
+---
+apiVersion: autoscaling/v2
+kind: HorizontalPodAutoscaler
+metadata:
+  name: api
+  namespace: app
+spec:
+  scaleTargetRef: {kind: Deployment, name: api}
+  maxReplicas: 3
+'''
+
+INVALID_MANIFEST = '''
+apiVersion: v1
+kind: Service
+metadata:
+  name: bad-port
+spec:
+  ports:
+    - port: 70000
+---
+apiVersion: batch/v1
+kind: CronJob
+metadata:
+  name: nightly
+spec:
+  jobTemplate:
+    spec:
+      template:
+        spec:
+          containers:
+            - name: job
+              image: busybox
+---
+- not
+- a mapping
+---
+apiVersion: v1
+kind: ConfigMap
+data:
+  key: value
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    """包含 k8s/ 清單目錄的項目"""
+    root = tmp_path / 'project'
+    (root / 'k8s').mkdir(parents=True)
+    (root / 'k8s' / 'app.yaml').write_text(APP_MANIFEST)
+    return root
+
+
+def summary(kind, name, namespace=None, labels=None, selector=None, refs=()):
+    return {
+        'kind': kind, 'name': name, 'namespace': namespace, 'document': 0,
+        'labels': labels, 'selector': selector, 'refs': [list(ref) for ref in refs],
+    }
+
+
+def test_resolve_by_namespace():
+    """測試引用按 namespace 解析；未聲明 namespace 的資源匹配任意 namespace"""
+    index = K8sResourceIndex()
+    index.add(summary('ConfigMap', 'settings', 'app'), 'a.yaml')
+    index.add(summary('Secret', 'shared'), 'b.yaml')
+    index.add(summary('ClusterRole', 'reader'), 'c.yaml')
+
+    assert index.resolve('ConfigMap', 'settings', 'app')
+    assert not index.resolve('ConfigMap', 'settings', 'other')
+    assert index.resolve('ConfigMap', 'settings', None)
+    assert index.resolve('Secret', 'shared', 'anywhere')
+    assert index.resolve('ClusterRole', 'reader', 'app')
+    assert not index.resolve('Secret', 'missing', 'app')
+    assert len(index) == 3
+
+
+def test_select_workloads_matches_all_labels():
+    """測試 Service selector 須匹配全部標籤且 namespace 一致"""
+    index = K8sResourceIndex()
+    web = summary('Deployment', 'web', 'app', labels={'app': 'web', 'tier': 'frontend'})
+    worker = summary('Deployment', 'worker', 'app', labels={'app': 'web', 'tier': 'backend'})
+    index.add(web, 'a.yaml')
+    index.add(worker, 'a.yaml')
+
+    assert [w['name'] for w in index.select_workloads({'app': 'web'}, 'app')] == ['web', 'worker']
+    assert [w['name'] for w in index.select_workloads({'app': 'web', 'tier': 'backend'}, 'app')] == ['worker']
+    assert index.select_workloads({'app': 'web', 'tier': 'db'}, 'app') == []
+    assert index.select_workloads({'app': 'web'}, 'other') == []
+
+
+def test_summary_collects_pod_references():
+    """測試 Pod 模板中的 ConfigMap / Secret / PVC 引用，optional 與 claim 模板除外"""
+    manifest = {
+        'apiVersion': 'apps/v1', 'kind': 'StatefulSet',
+        'metadata': {'name': 'db', 'namespace': 'data'},
+        'spec': {
+            'volumeClaimTemplates': [{'metadata': {'name': 'storage'}}],
+            'template': {
+                'metadata': {'labels': {'app': 'db'}},
+                'spec': {
+                    'imagePullSecrets': [{'name': 'registry'}],
+                    'containers': [{'name': 'db', 'image': 'postgres', 'env': [
+                        {'name': 'PASSWORD', 'valueFrom': {'secretKeyRef': {'name': 'db-secret', 'key': 'pw'}}},
+                    ]}],
+                    'volumes': [
+                        {'name': 'storage', 'persistentVolumeClaim': {'claimName': 'storage'}},
+                        {'name': 'backup', 'persistentVolumeClaim': {'claimName': 'backup'}},
+                        {'name': 'config', 'configMap': {'name': 'db-config', 'optional': True}},
+                        {'name': 'tls', 'secret': {'secretName': 'db-tls'}},
+                    ],
+                },
+            },
+        },
+    }
+
+    result = _summarize_k8s_resource(manifest, 2)
+
+    assert result['labels'] == {'app': 'db'}
+    assert result['document'] == 2
+    assert sorted(tuple(ref) for ref in result['refs']) == [
+        ('PersistentVolumeClaim', 'backup', 'data'),
+        ('Secret', 'db-secret', 'data'),
+        ('Secret', 'db-tls', 'data'),
+        ('Secret', 'registry', 'data'),
+    ]
+
+
+def test_manifest_cross_references(project):
+    """測試多文檔清單的缺失引用與不匹配的 selector 產生警告"""
+    results = ConfigValidator(str(project), workers=1, use_cache=False).validate_kubernetes_manifests()
+
+    assert results['errors'] == []
+    assert results['valid_files'] == 5
+    assert results['resources_indexed'] == 5
+    assert sorted(warning['message'] for warning in results['warnings']) == [
+        'Deployment web references missing Secret db-credentials',
+        'HorizontalPodAutoscaler api references missing Deployment api',
+        "Service web selector {'app': 'web'} matches no workload",
+    ]
+    other = next(w for w in results['warnings'] if 'selector' in w['message'])
+    assert other['document'] == 3
+
+
+@pytest.mark.skipif(not config_validator.HAS_JSONSCHEMA, reason='jsonschema not installed')
+def test_per_kind_schema_errors(project):
+    """測試按 kind 的 schema 錯誤帶字段路徑與文檔序號"""
+    (project / 'k8s' / 'invalid.yaml').write_text(INVALID_MANIFEST)
+
+    results = ConfigValidator(str(project), workers=1, use_cache=False).validate_kubernetes_manifests()
+    errors = [(error['document'], error['error']) for error in results['errors']]
+
+    assert errors == [
+        (0, 'Service spec.ports.0.port: 70000 is greater than the maximum of 65535'),
+        (1, "CronJob spec: 'schedule' is a required property"),
+        (2, 'Manifest must be a mapping'),
+        (3, 'Missing required field: metadata'),
+    ]
+    assert all(error['file'].endswith('invalid.yaml') for error in results['errors'])
+    assert results['invalid_files'] == 4
+
+
+@pytest.fixture
+def checked(monkeypatch):
+    """記錄各類別實際解析的文件（workers=1 時在本進程內執行）"""
+    calls = []
+    for category, checker in list(config_validator.FILE_CHECKERS.items()):
+        def spy(path, category=category, checker=checker):
+            calls.append((category, os.path.basename(path)))
+            return checker(path)
+        monkeypatch.setitem(config_validator.FILE_CHECKERS, category, spy)
+    return calls
+
+
+@pytest.fixture
+def walks(monkeypatch):
+    """記錄目錄遍歷次數"""
+    roots = []
+    real_walk = os.walk
+
+    def walk(top, *args, **kwargs):
+        roots.append(top)
+        return real_walk(top, *args, **kwargs)
+    monkeypatch.setattr(config_validator.os, 'walk', walk)
+    return roots
+
+
+@pytest.fixture
+def config_project(project):
+    """YAML / JSON / env / k8s 文件各若干"""
+    (project / 'settings.yaml').write_text('debug: false\n')
+    (project / 'broken.yaml').write_text('key: [unclosed\n')
+    (project / 'package.json').write_text('{"name": "app"}\n')
+    (project / '.env').write_text('API_URL=http://localhost\n')
+    return project
+
+
+def run(project):
+    validator = ConfigValidator(str(project), workers=1)
+    return validator, validator.run_all_validations()
+
+
+def test_second_run_served_from_cache(config_project, checked, walks):
+    """測試單次遍歷；第二次運行所有文件命中緩存，結果不變（報告目錄不被索引）"""
+    _, first = run(config_project)
+    first_checked = list(checked)
+    _, second = run(config_project)
+
+    assert walks == [str(config_project)] * 2
+    assert sorted(first_checked) == [
+        ('json', 'package.json'), ('k8s', 'app.yaml'),
+        ('yaml', 'app.yaml'), ('yaml', 'broken.yaml'), ('yaml', 'settings.yaml'),
+    ]
+    assert checked == first_checked
+    assert first['cache'] == {'hits': 0, 'misses': 5}
+    assert second['cache'] == {'hits': 5, 'misses': 0}
+    assert second['validations']['yaml'] == first['validations']['yaml']
+    assert second['validations']['kubernetes'] == first['validations']['kubernetes']
+    assert first['validations']['yaml']['invalid_files'] == 1
+
+
+def test_touched_file_reparsed_alone(config_project, checked):
+    """測試只有 mtime 或大小變化的文件被重新解析"""
+    run(config_project)
+    checked.clear()
+
+    settings = config_project / 'settings.yaml'
+    stat = settings.stat()
+    os.utime(settings, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    (config_project / 'broken.yaml').write_text('key: [closed]\n')
+    _, results = run(config_project)
+
+    assert sorted(checked) == [('yaml', 'broken.yaml'), ('yaml', 'settings.yaml')]
+    assert results['cache'] == {'hits': 3, 'misses': 2}
+    assert results['validations']['yaml']['invalid_files'] == 0
+
+
+def test_cache_version_bump_invalidates(config_project, checked, monkeypatch):
+    """測試 CACHE_VERSION 變化後舊緩存整體失效"""
+    validator, _ = run(config_project)
+    with open(validator.cache_file, encoding='utf-8') as f:
+        assert json.load(f)['version'] == config_validator.CACHE_VERSION
+    checked.clear()
+
+    monkeypatch.setattr(config_validator, 'CACHE_VERSION', config_validator.CACHE_VERSION + 1)
+    _, results = run(config_project)
+
+    assert len(checked) == 5
+    assert results['cache'] == {'hits': 0, 'misses': 5}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
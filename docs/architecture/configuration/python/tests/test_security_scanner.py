@@ -0,0 +1,128 @@
+"""
+Tests for security_scanner.py
+安全掃描器測試：PATH 上放置樁 bandit / safety / npm / snyk 可執行文件
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import security_scanner
+from security_scanner import SecurityScanner
+
+# 樁工具：記錄調用和 PID，按環境變量休眠，輸出最小的合法 JSON 報告
+STUB_TEMPLATE = '''#!{python}
+import json, os, sys, time
+name = {name!r}
+log_dir = os.environ['STUB_LOG_DIR']
+with open(os.path.join(log_dir, name + '.calls'), 'a') as f:
+    f.write(str(os.getpid()) + '\\n')
+time.sleep(float(os.environ.get('STUB_SLEEP_' + name.upper(), '0')))
+if name == 'bandit':
+    with open(sys.argv[sys.argv.index('-o') + 1], 'w') as f:
+        json.dump({{'results': [{{'issue_severity': 'HIGH'}}], 'metrics': {{}}}}, f)
+elif name == 'safety':
+    print(json.dumps([{{'package': 'django'}}]))
+elif name == 'npm':
+    print(json.dumps({{'metadata': {{'vulnerabilities': {{'total': 1, 'high': 1}}}}}}))
+else:
+    print(json.dumps({{'vulnerabilities': [{{'severity': 'low'}}], 'uniqueCount': 1}}))
+'''
+
+TOOLS = ('bandit', 'safety', 'npm', 'snyk')
+
+
+@pytest.fixture
+def stub_tools(tmp_path, monkeypatch):
+    """在 PATH 最前面放置樁工具，返回調用記錄目錄"""
+    bin_dir = tmp_path / 'bin'
+    log_dir = tmp_path / 'calls'
+    bin_dir.mkdir()
+    log_dir.mkdir()
+    for name in TOOLS:
+        path = bin_dir / name
+        path.write_text(STUB_TEMPLATE.format(python=sys.executable, name=name))
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv('PATH', f'{bin_dir}{os.pathsep}{os.environ["PATH"]}')
+    monkeypatch.setenv('STUB_LOG_DIR', str(log_dir))
+    return log_dir
+
+
+@pytest.fixture
+def project(tmp_path):
+    """同時包含 Python 源碼和 package.json 的項目"""
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / 'app.py').write_text('import os\n')
+    (root / 'requirements.txt').write_text('django==3.2\n')
+    (root / 'package.json').write_text('{"name": "app"}\n')
+    return root
+
+
+def calls(log_dir, name):
+    path = log_dir / f'{name}.calls'
+    return [int(pid) for pid in path.read_text().split()] if path.exists() else []
+
+
+def test_all_tools_run_in_parallel(stub_tools, project, monkeypatch):
+    """測試工具並行執行：總耗時約等於最慢的工具而非總和"""
+    sleeps = {'bandit': 0.6, 'safety': 0.4, 'npm': 0.4, 'snyk': 0.8}
+    for name, seconds in sleeps.items():
+        monkeypatch.setenv(f'STUB_SLEEP_{name.upper()}', str(seconds))
+
+    started = time.monotonic()
+    results = SecurityScanner(str(project), use_cache=False).run_all_scans()
+    elapsed = time.monotonic() - started
+
+    assert list(results['scans']) == ['bandit', 'safety', 'npm_audit', 'snyk']
+    assert all('error' not in scan for scan in results['scans'].values())
+    assert results['summary']['total_issues'] == 4
+    assert max(sleeps.values()) <= results['duration_seconds'] < sum(sleeps.values())
+    assert elapsed < sum(sleeps.values())
+
+
+def test_timeout_kills_tool(stub_tools, project, monkeypatch):
+    """測試超時的工具被終止，其餘工具結果不受影響"""
+    monkeypatch.setenv('STUB_SLEEP_SNYK', '60')
+    monkeypatch.setitem(security_scanner.TOOL_TIMEOUTS, 'snyk', 0.5)
+
+    started = time.monotonic()
+    results = SecurityScanner(str(project), use_cache=False).run_all_scans()
+
+    assert time.monotonic() - started < 10
+    assert results['scans']['snyk'] == {'tool': 'snyk', 'error': 'Timed out after 0.5s'}
+    assert results['scans']['npm_audit']['total_vulnerabilities'] == 1
+    (pid,) = calls(stub_tools, 'snyk')
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_second_run_served_from_cache(stub_tools, project):
+    """測試輸入未變更時第二次運行從 .scan-cache.json 取結果，不再啟動工具"""
+    first = SecurityScanner(str(project)).run_all_scans()
+    cache_file = project / 'reports' / 'security' / '.scan-cache.json'
+    second = SecurityScanner(str(project)).run_all_scans()
+
+    assert cache_file.exists()
+    assert set(json.loads(cache_file.read_text())['tools']) == {'bandit', 'safety', 'npm_audit', 'snyk'}
+    assert all(len(calls(stub_tools, name)) == 1 for name in TOOLS)
+    assert all(scan.get('cached') for scan in second['scans'].values())
+    assert second['summary'] == first['summary']
+
+    # 只有鎖文件變更影響的依賴掃描重新執行
+    (project / 'requirements.txt').write_text('django==4.2\n')
+    third = SecurityScanner(str(project)).run_all_scans()
+
+    assert [len(calls(stub_tools, name)) for name in TOOLS] == [1, 2, 1, 2]
+    assert third['scans']['bandit'].get('cached') and not third['scans']['safety'].get('cached')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
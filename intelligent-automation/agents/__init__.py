@@ -3,15 +3,38 @@ Intelligent Agents Module
 智能體模組
 
 Contains all specialized agents for autonomous code analysis and fixing.
+Agent modules are imported lazily on first attribute access.
 """
 
-from .task_executor import task_executor, TaskExecutor
-from .recognition_server import RecognitionServer
-from .visualization_agent import VisualizationAgent
+import importlib
+
+# Public name -> defining submodule
+_LAZY_EXPORTS = {
+    "task_executor": ".task_executor",
+    "TaskExecutor": ".task_executor",
+    "CodeChecker": ".code_checker",
+    "RecognitionServer": ".recognition_server",
+    "VisualizationAgent": ".visualization_agent",
+}
 
 __all__ = [
     "task_executor",
     "TaskExecutor",
+    "CodeChecker",
     "RecognitionServer",
     "VisualizationAgent",
 ]
+
+
+def __getattr__(name):
+    """Import the defining submodule on first access"""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,252 @@
+"""
+Code Checker - Single-Pass Token-Based Security and Performance Checks
+單次掃描代碼檢查器 - 基於詞法分析的安全與性能檢查
+
+Core capabilities for autonomous systems:
+- One tokenizer pass for all security and performance checks
+- Exact line and column for every finding
+- Real loop nesting depth (statements and comprehensions)
+- Incremental processing of large editor buffers line by line
+
+Adapted for: Real-time code review of multi-thousand-line buffers
+"""
+
+import io
+import logging
+import tokenize
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CodeChecker:
+    """
+    單次掃描代碼檢查器
+
+    Token-based checker that scans source code exactly once.
+    Detects:
+    - Dangerous code execution (eval/exec calls)
+    - Hardcoded credentials (credential names assigned string literals)
+    - Deeply nested loops by actual nesting depth
+    """
+
+    CATEGORY_SECURITY = "security"
+    CATEGORY_PERFORMANCE = "performance"
+
+    # Names whose call is treated as dynamic code execution
+    DANGEROUS_CALLS = frozenset({"eval", "exec"})
+
+    # Identifier fragments that mark a credential
+    CREDENTIAL_MARKERS = ("password", "passwd", "secret", "api_key", "apikey")
+
+    # Token types that do not affect statement structure
+    _SKIPPED_TOKENS = frozenset({tokenize.COMMENT, tokenize.NL, tokenize.ENCODING})
+
+    def __init__(self, max_loop_depth: int = 1):
+        """
+        Initialize code checker
+
+        Args:
+            max_loop_depth: Deepest loop nesting allowed before reporting
+                (default 1: every loop nested inside another is reported)
+        """
+        self.max_loop_depth = max_loop_depth
+
+    def check(self,
+              source: Union[str, Iterable[str]],
+              categories: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Check source code and collect all issues
+
+        Args:
+            source: Source code string or iterable of lines (e.g. open file)
+            categories: Issue categories to report (default: all)
+
+        Returns:
+            List of issues ordered by position
+        """
+        return list(self.iter_issues(source, categories))
+
+    def iter_issues(self,
+                    source: Union[str, Iterable[str]],
+                    categories: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield issues while tokenizing the source incrementally
+
+        Args:
+            source: Source code string or iterable of lines (e.g. open file)
+            categories: Issue categories to report (default: all)
+
+        Yields:
+            Issues in source order
+        """
+        if categories is None:
+            categories = (self.CATEGORY_SECURITY, self.CATEGORY_PERFORMANCE)
+        check_security = self.CATEGORY_SECURITY in categories
+        check_performance = self.CATEGORY_PERFORMANCE in categories
+
+        if isinstance(source, str):
+            readline = io.StringIO(source).readline
+        else:
+            readline = iter(source).__next__
+
+        indent = 0                # Current block indentation level
+        brackets = []             # Open brackets: [own comprehension loops, deepest closed inner comprehension]
+        loop_stack = []           # Indentation levels of enclosing loop statements
+        line_start = True         # Next significant token starts a statement
+        prev = None               # Previous significant token
+        prev2 = None              # Token before previous
+
+        try:
+            for tok in tokenize.generate_tokens(_safe_readline(readline)):
+                tok_type = tok.type
+                if tok_type in self._SKIPPED_TOKENS:
+                    continue
+
+                if tok_type == tokenize.NEWLINE:
+                    line_start = True
+                    brackets.clear()
+                    prev = prev2 = None
+                    continue
+                if tok_type == tokenize.INDENT:
+                    indent += 1
+                    continue
+                if tok_type == tokenize.DEDENT:
+                    indent -= 1
+                    while loop_stack and loop_stack[-1] >= indent:
+                        loop_stack.pop()
+                    continue
+
+                string = tok.string
+                if tok_type == tokenize.OP:
+                    if string in ("(", "[", "{"):
+                        brackets.append([0, 0])
+                    elif string in (")", "]", "}") and brackets:
+                        loops, inner = brackets.pop()
+                        # [[x for x in r] for r in rows]: the inner comprehension
+                        # closes before the enclosing one's "for" is seen
+                        if loops and brackets:
+                            brackets[-1][1] = max(brackets[-1][1], loops + inner)
+
+                if check_security:
+                    issue = self._security_issue(tok, prev, prev2)
+                    if issue:
+                        yield issue
+
+                if tok_type == tokenize.NAME and string in ("for", "while"):
+                    depth = None
+                    if line_start and not brackets:
+                        while loop_stack and loop_stack[-1] >= indent:
+                            loop_stack.pop()
+                        loop_stack.append(indent)
+                        depth = len(loop_stack)
+                    elif string == "for" and brackets:
+                        # Only comprehensions in enclosing brackets nest this one;
+                        # sibling comprehensions on the same line do not
+                        brackets[-1][0] += 1
+                        depth = len(loop_stack) + sum(b[0] for b in brackets) + brackets[-1][1]
+
+                    if check_performance and depth and depth > self.max_loop_depth:
+                        yield self._nested_loop_issue(tok, depth)
+
+                # "async for" keeps the statement-start position for "for"
+                line_start = tok_type == tokenize.NAME and string == "async" and line_start
+                prev2, prev = prev, tok
+        except (tokenize.TokenError, IndentationError, SyntaxError) as e:
+            # Incomplete editor buffers: keep everything found so far
+            logger.debug(f"Tokenization stopped early: {e}")
+
+    def _security_issue(self,
+                        tok: tokenize.TokenInfo,
+                        prev: Optional[tokenize.TokenInfo],
+                        prev2: Optional[tokenize.TokenInfo]) -> Optional[Dict[str, Any]]:
+        """
+        Check the token window ending at tok for security issues
+
+        Args:
+            tok: Current token
+            prev: Previous significant token
+            prev2: Token before previous
+
+        Returns:
+            Issue dict or None
+        """
+        if prev is None:
+            return None
+
+        # eval(...) / exec(...) but not obj.eval(...)
+        if (tok.type == tokenize.OP and tok.string == "("
+                and prev.type == tokenize.NAME and prev.string in self.DANGEROUS_CALLS
+                and not (prev2 and prev2.type == tokenize.OP and prev2.string == ".")):
+            return self._issue(
+                prev,
+                category=self.CATEGORY_SECURITY,
+                severity="critical",
+                description=f"Dangerous code execution detected ({prev.string})",
+                recommendation="Remove eval/exec and use safe alternatives"
+            )
+
+        # password = "..." / password: "..." / {"password": "..."}
+        if (tok.type == tokenize.STRING and prev2 is not None
+                and prev.type == tokenize.OP and prev.string in ("=", ":")
+                and prev2.type in (tokenize.NAME, tokenize.STRING)
+                and self._is_credential_name(prev2.string)
+                and not _is_empty_literal(tok.string)):
+            return self._issue(
+                prev2,
+                category=self.CATEGORY_SECURITY,
+                severity="high",
+                description="Potential hardcoded credentials",
+                recommendation="Use environment variables or secure vault"
+            )
+
+        return None
+
+    def _is_credential_name(self, name: str) -> bool:
+        """Check if identifier or string key names a credential"""
+        name_lower = name.lower()
+        return any(marker in name_lower for marker in self.CREDENTIAL_MARKERS)
+
+    def _nested_loop_issue(self, tok: tokenize.TokenInfo, depth: int) -> Dict[str, Any]:
+        """Build nested loop issue for loop token at given depth"""
+        return self._issue(
+            tok,
+            category=self.CATEGORY_PERFORMANCE,
+            severity="medium",
+            description=f"Nested loops detected (depth {depth}) - potential O(n^{depth}) complexity",
+            recommendation="Consider optimization or algorithm improvement"
+        )
+
+    @staticmethod
+    def _issue(tok: tokenize.TokenInfo,
+               category: str,
+               severity: str,
+               description: str,
+               recommendation: str) -> Dict[str, Any]:
+        """Build issue dict anchored at token position"""
+        return {
+            "type": category,
+            "severity": severity,
+            "description": description,
+            "line": tok.start[0],
+            "column": tok.start[1],
+            "recommendation": recommendation
+        }
+
+
+def _is_empty_literal(literal: str) -> bool:
+    """Check if a string literal token has no content"""
+    body = literal.lstrip("bBrRuUfF")
+    quote_len = 3 if body[:3] in ('"""', "'''") else 1
+    return len(body) <= 2 * quote_len
+
+
+def _safe_readline(readline):
+    """Wrap readline so exhausted iterators signal EOF to tokenize"""
+    def wrapper() -> str:
+        try:
+            return readline()
+        except StopIteration:
+            return ""
+    return wrapper
@@ -16,6 +16,10 @@ import json
 import logging
 import asyncio
 from typing import Optional, Dict, Any, AsyncGenerator
+try:
+    from .code_checker import CodeChecker
+except ImportError:
+    from code_checker import CodeChecker
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -43,6 +47,7 @@ class TaskExecutor:
         self.problem_content = ""  # Current problem/issue context
         self.editor_code = ""      # Code under analysis
         self.context_history = []   # Conversation/analysis history
+        self.code_checker = CodeChecker()  # Single-pass token-based checks
         self._initialized = False
         logger.info("TaskExecutor initialized for autonomous code analysis")
     
@@ -94,14 +99,15 @@ class TaskExecutor:
             "metrics": {}
         }
         
-        # Safety-critical checks for autonomous systems
+        # Safety-critical checks for autonomous systems (one pass over the code)
+        categories = []
         if analysis_type in ["comprehensive", "security"]:
-            security_issues = await self._check_security(code)
-            results["issues"].extend(security_issues)
-        
+            categories.append(CodeChecker.CATEGORY_SECURITY)
         if analysis_type in ["comprehensive", "performance"]:
-            performance_issues = await self._check_performance(code)
-            results["issues"].extend(performance_issues)
+            categories.append(CodeChecker.CATEGORY_PERFORMANCE)
+        
+        if categories:
+            results["issues"].extend(self.code_checker.check(code, categories))
         
         # Generate automated fix recommendations
         if results["issues"]:
@@ -122,28 +128,7 @@ class TaskExecutor:
         - Concurrency issues
         - Authentication/Authorization
         """
-        issues = []
-        
-        # Basic security pattern detection
-        if "eval(" in code or "exec(" in code:
-            issues.append({
-                "type": "security",
-                "severity": "critical",
-                "description": "Dangerous code execution detected (eval/exec)",
-                "line": None,
-                "recommendation": "Remove eval/exec and use safe alternatives"
-            })
-        
-        if "password" in code.lower() and ("=" in code or ":" in code):
-            issues.append({
-                "type": "security",
-                "severity": "high",
-                "description": "Potential hardcoded credentials",
-                "line": None,
-                "recommendation": "Use environment variables or secure vault"
-            })
-        
-        return issues
+        return self.code_checker.check(code, [CodeChecker.CATEGORY_SECURITY])
     
     async def _check_performance(self, code: str) -> list:
         """
@@ -155,19 +140,7 @@ class TaskExecutor:
         - Blocking operations
         - Resource leaks
         """
-        issues = []
-        
-        # Basic performance pattern detection
-        if code.count("for") > 3 and code.count("for") < 10:
-            issues.append({
-                "type": "performance",
-                "severity": "medium",
-                "description": "Nested loops detected - potential O(n^x) complexity",
-                "line": None,
-                "recommendation": "Consider optimization or algorithm improvement"
-            })
-        
-        return issues
+        return self.code_checker.check(code, [CodeChecker.CATEGORY_PERFORMANCE])
     
     async def _generate_recommendations(self, issues: list) -> list:
         """
@@ -12,13 +12,108 @@ Adapted for: Training and debugging autonomous systems
 """
 
 import logging
-from typing import Dict, Any, AsyncGenerator
+import time
+from collections import OrderedDict
+from typing import Dict, Any, AsyncGenerator, Hashable, Optional, Tuple
 import asyncio
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+class ExplanationCache:
+    """
+    解釋結果快取 - LRU + TTL
+    
+    Bounded LRU cache with per-entry time-to-live for explanation results.
+    Tracks hit/miss/eviction counters for pipeline statistics.
+    """
+    
+    def __init__(self, max_size: int = 256, ttl: float = 3600.0):
+        """
+        Initialize cache
+        
+        Args:
+            max_size: Maximum number of entries (0 disables caching)
+            ttl: Entry time-to-live in seconds (0 or less means no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value, refreshing its LRU position
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value or None on miss/expiry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        stored_at, value = entry
+        if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store value, evicting the least recently used entry when full
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.max_size <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)"""
+        self._entries.clear()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Cache counters and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced_requests": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.hits / lookups * 100) if lookups else 0.0
+        }
+
+
 class VisualizationAgent:
     """
     可視化智能體 - 生成易懂的概念解釋
@@ -31,9 +126,17 @@ class VisualizationAgent:
     - Knowledge transfer
     """
     
-    def __init__(self):
-        """Initialize visualization agent"""
+    def __init__(self, cache_size: int = 256, cache_ttl: float = 3600.0):
+        """
+        Initialize visualization agent
+        
+        Args:
+            cache_size: Maximum cached explanations (0 disables caching)
+            cache_ttl: Cached explanation time-to-live in seconds
+        """
         self.explanation_history = []
+        self.cache = ExplanationCache(max_size=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future"] = {}
         logger.info("VisualizationAgent initialized")
     
     async def generate_explanation(self,
@@ -56,17 +159,17 @@ class VisualizationAgent:
         # Analyze query topic
         topic = self._identify_topic(query)
         
-        # Generate explanation
-        explanation = await self._create_explanation(topic, query)
-        
-        # Generate follow-up questions
-        follow_ups = self._generate_follow_up_questions(topic, query)
+        # Generate (or reuse) explanation and follow-up questions
+        explanation, follow_ups = await self._get_or_build(topic, query)
         
         result = {
             "query": query,
             "topic": topic,
-            "explanation": explanation,
-            "follow_up_questions": follow_ups,
+            "explanation": {
+                **explanation,
+                "key_points": list(explanation["key_points"])
+            },
+            "follow_up_questions": list(follow_ups),
             "has_context": {
                 "problem": bool(problem_content),
                 "code": bool(editor_code)
@@ -79,6 +182,74 @@ class VisualizationAgent:
         logger.info(f"Explanation generated for topic: {topic}")
         return result
     
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """
+        Normalize query for cache lookup
+        
+        Args:
+            query: User query
+            
+        Returns:
+            Lower-cased query with collapsed whitespace
+        """
+        return " ".join(query.lower().split())
+    
+    async def _get_or_build(self, topic: str, query: str) -> Tuple[Dict[str, Any], list]:
+        """
+        Get explanation parts from cache or build them once
+        
+        Concurrent identical requests share a single in-flight build.
+        
+        Args:
+            topic: Topic category
+            query: Original query
+            
+        Returns:
+            Tuple of (explanation, follow-up questions)
+        """
+        key = (self._normalize_query(query), topic)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.cache.coalesced += 1
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            explanation = await self._create_explanation(topic, query)
+            follow_ups = self._generate_follow_up_questions(topic, query)
+            value = (explanation, follow_ups)
+            self.cache.put(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Get explanation cache statistics
+        
+        Returns:
+            Cache counters and hit rate
+        """
+        stats = self.cache.get_statistics()
+        stats["inflight"] = len(self._inflight)
+        return stats
+    
     def _identify_topic(self, query: str) -> str:
         """
         Identify the main topic of the query
@@ -8,24 +8,32 @@ When a dependency is missing, upgrade the environment instead of degrading funct
 當缺少依賴時，自動升級系統環境配置，而非降級功能
 
 Enhanced Features:
-- Parallel installation of multiple dependencies
+- Up-front dependency resolution with a single batched pip install
+- Offline installation from a local wheel cache (--find-links)
 - Dependency version conflict detection
 - Caching of installed dependencies
+- Import-free dependency probing with a cached distribution index
 - Support for config file-based dependencies
 - Intelligent recommendation of related dependencies
 """
 
+import os
 import sys
+import time
 import subprocess
 import importlib
+import importlib.util
+import importlib.metadata
 import logging
 import json
+import site
+import sysconfig
 import asyncio
-import concurrent.futures
 from typing import List, Dict, Optional, Tuple, Set
 from pathlib import Path
 from packaging import version
 from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
 import hashlib
 
 # Configure logging
@@ -76,21 +84,34 @@ class AutoUpgradeEnvironment:
         },
     }
     
-    def __init__(self, auto_install: bool = True, cache_dir: Optional[Path] = None):
+    # Reserved cache entry holding the installed distribution index
+    DISTRIBUTIONS_CACHE_KEY = '_distributions'
+    
+    def __init__(self,
+                 auto_install: bool = True,
+                 cache_dir: Optional[Path] = None,
+                 wheel_dir: Optional[Path] = None,
+                 offline: bool = False):
         """
         Initialize auto upgrade environment
         
         Args:
             auto_install: Whether to automatically install missing dependencies
             cache_dir: Directory for caching installation status
+            wheel_dir: Local wheel directory passed to pip as --find-links
+            offline: Install only from wheel_dir (pip --no-index)
         """
         self.auto_install = auto_install
+        self.offline = offline
         self.missing_deps = []
         self.installed_deps = []
         self.cache_dir = cache_dir or Path.home() / '.cache' / 'auto_upgrade_env'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / 'installed_packages.json'
+        env_wheel_dir = os.environ.get('AUTO_UPGRADE_WHEEL_DIR')
+        self.wheel_dir = wheel_dir or (Path(env_wheel_dir) if env_wheel_dir else self.cache_dir / 'wheels')
         self.conflict_log = []
+        self._dist_versions: Optional[Dict[str, str]] = None
         
         # Load cache
         self._load_cache()
@@ -119,9 +140,17 @@ class AutoUpgradeEnvironment:
         """Generate cache key for a package"""
         return hashlib.md5(package.encode()).hexdigest()
     
+    def _record_install(self, pip_package: str):
+        """Record a successful installation in the cache (caller saves)"""
+        self.cache[self._get_cache_key(pip_package)] = {
+            'package': pip_package,
+            'success': True,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
     def check_dependency(self, import_name: str) -> bool:
         """
-        Check if a dependency is available
+        Check if a dependency is available without importing it
         
         Args:
             import_name: Name to use in import statement
@@ -130,11 +159,71 @@ class AutoUpgradeEnvironment:
             True if dependency is available, False otherwise
         """
         try:
-            importlib.import_module(import_name)
-            return True
-        except ImportError:
+            return importlib.util.find_spec(import_name) is not None
+        except (ImportError, ValueError):
             return False
     
+    def _site_packages_fingerprint(self) -> str:
+        """
+        Fingerprint the environment's site-packages directories
+        
+        Installing, upgrading or removing a distribution adds or renames its
+        metadata directory, which updates the directory mtime.
+        
+        Returns:
+            Fingerprint string of site-packages paths and mtimes
+        """
+        paths = {sysconfig.get_paths()['purelib'], sysconfig.get_paths()['platlib']}
+        try:
+            paths.update(site.getsitepackages())
+        except AttributeError:
+            pass  # Old virtualenv site module
+        if site.ENABLE_USER_SITE:
+            paths.add(site.getusersitepackages())
+        
+        parts = [sys.prefix]
+        for path in sorted(paths):
+            try:
+                parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+            except OSError:
+                continue
+        return '|'.join(parts)
+    
+    def _distribution_versions(self) -> Dict[str, str]:
+        """
+        Get installed distribution versions from one metadata scan
+        
+        The index is stored in the installation cache and reused while the
+        site-packages fingerprint is unchanged.
+        
+        Returns:
+            Dictionary mapping canonical distribution names to versions
+        """
+        if self._dist_versions is not None:
+            return self._dist_versions
+        
+        fingerprint = self._site_packages_fingerprint()
+        cached = self.cache.get(self.DISTRIBUTIONS_CACHE_KEY)
+        
+        if isinstance(cached, dict) and cached.get('fingerprint') == fingerprint:
+            self._dist_versions = cached.get('versions', {})
+            return self._dist_versions
+        
+        versions = {}
+        for dist in importlib.metadata.distributions():
+            name = dist.metadata['Name']
+            if name:
+                # First match on sys.path wins, as for imports
+                versions.setdefault(canonicalize_name(name), dist.version)
+        
+        self._dist_versions = versions
+        self.cache[self.DISTRIBUTIONS_CACHE_KEY] = {
+            'fingerprint': fingerprint,
+            'versions': versions
+        }
+        self._save_cache()
+        return versions
+    
     def get_installed_version(self, package_name: str) -> Optional[str]:
         """
         Get installed version of a package
@@ -145,20 +234,7 @@ class AutoUpgradeEnvironment:
         Returns:
             Version string or None if not installed
         """
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'pip', 'show', package_name],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('Version:'):
-                        return line.split(':', 1)[1].strip()
-        except Exception:
-            pass
-        return None
+        return self._distribution_versions().get(canonicalize_name(package_name))
     
     def detect_version_conflicts(self, packages: List[str]) -> List[Dict[str, str]]:
         """
@@ -221,6 +297,9 @@ class AutoUpgradeEnvironment:
         """
         Install a package using pip with caching support
         
+        Goes through install_packages_batch so the wheel cache and offline
+        settings apply to single installs as well.
+        
         Args:
             pip_package: Package specification for pip (e.g., 'loguru>=0.7.2')
             use_cache: Whether to use cache for installation status
@@ -228,82 +307,178 @@ class AutoUpgradeEnvironment:
         Returns:
             Tuple of (success, message)
         """
-        cache_key = self._get_cache_key(pip_package)
+        return self.install_packages_batch([pip_package], use_cache=use_cache)[pip_package]
+    
+    def _pip_source_args(self) -> List[str]:
+        """
+        Build pip package source arguments
+        
+        Returns:
+            --find-links for the local wheel cache and --no-index when offline
+        """
+        args = []
+        if self.wheel_dir.is_dir():
+            args += ['--find-links', str(self.wheel_dir)]
+        if self.offline:
+            args.append('--no-index')
+        return args
+    
+    def install_packages_batch(self, packages: List[str], use_cache: bool = True) -> Dict[str, Tuple[bool, str]]:
+        """
+        Install multiple packages with a single pip invocation
         
-        # Check cache
-        if use_cache and cache_key in self.cache:
-            cached = self.cache[cache_key]
-            if cached.get('success'):
-                logger.info(f"✓ 使用緩存 Using cache: {pip_package}")
-                return True, f"Installed from cache: {pip_package}"
+        pip resolves all specifications together, so there is one resolver
+        run and no concurrent writers to site-packages.
         
-        try:
-            logger.info(f"正在安裝 Installing: {pip_package}")
+        Args:
+            packages: List of package specifications
+            use_cache: Whether to skip packages cached as installed
             
-            # Use subprocess to install
+        Returns:
+            Dictionary mapping package specifications to (success, message) tuples
+        """
+        results = {}
+        pending = []
+        
+        for pkg in dict.fromkeys(packages):
+            cached = self.cache.get(self._get_cache_key(pkg), {})
+            if use_cache and cached.get('success'):
+                logger.info(f"✓ 使用緩存 Using cache: {pkg}")
+                results[pkg] = (True, f"Installed from cache: {pkg}")
+            else:
+                pending.append(pkg)
+        
+        if not pending:
+            return results
+        
+        cmd = [sys.executable, '-m', 'pip', 'install', '--quiet', *self._pip_source_args(), *pending]
+        logger.info(f"批量安裝 Batch installation: {' '.join(pending)}")
+        
+        try:
             result = subprocess.run(
-                [sys.executable, '-m', 'pip', 'install', pip_package, '--quiet'],
+                cmd,
                 capture_output=True,
                 text=True,
-                timeout=120
+                timeout=120 + 30 * len(pending)
             )
-            
-            success = result.returncode == 0
-            
-            if success:
-                logger.info(f"✓ 安裝成功 Installed: {pip_package}")
-                # Update cache
-                self.cache[cache_key] = {
-                    'package': pip_package,
-                    'success': True,
-                    'timestamp': subprocess.check_output(
-                        ['date', '+%Y-%m-%d %H:%M:%S'], text=True
-                    ).strip() if sys.platform != 'win32' else 'now'
-                }
-                self._save_cache()
-                return True, f"Successfully installed {pip_package}"
-            else:
-                logger.error(f"✗ 安裝失敗 Failed: {pip_package}\n{result.stderr}")
-                return False, f"Failed to install {pip_package}: {result.stderr}"
-                
         except subprocess.TimeoutExpired:
-            logger.error(f"✗ 安裝超時 Timeout: {pip_package}")
-            return False, f"Installation timeout for {pip_package}"
+            logger.error(f"✗ 批量安裝超時 Batch timeout: {len(pending)} packages")
+            results.update({pkg: (False, f"Installation timeout for {pkg}") for pkg in pending})
+            return results
+        except Exception as e:
+            logger.error(f"✗ 批量安裝錯誤 Batch error: {str(e)}")
+            results.update({pkg: (False, f"Installation error: {str(e)}") for pkg in pending})
+            return results
+        
+        if result.returncode == 0:
+            logger.info(f"✓ 批量安裝成功 Installed {len(pending)} packages")
+            for pkg in pending:
+                self._record_install(pkg)
+                results[pkg] = (True, f"Successfully installed {pkg}")
+            self._save_cache()
+            # Make newly installed packages visible to find_spec and the version index
+            importlib.invalidate_caches()
+            self._dist_versions = None
+        else:
+            logger.error(f"✗ 批量安裝失敗 Batch failed:\n{result.stderr}")
+            results.update({
+                pkg: (False, f"Failed to install {pkg}: {result.stderr}") for pkg in pending
+            })
+        
+        return results
+    
+    def download_wheels(self, packages: List[str]) -> Tuple[bool, str]:
+        """
+        Populate the local wheel cache for later offline installs
+        
+        Args:
+            packages: List of package specifications
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        self.wheel_dir.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            sys.executable, '-m', 'pip', 'download', '--quiet',
+            '--dest', str(self.wheel_dir), *self._pip_source_args(), *packages
+        ]
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120 + 30 * len(packages))
         except Exception as e:
-            logger.error(f"✗ 安裝錯誤 Error: {str(e)}")
-            return False, f"Installation error: {str(e)}"
+            return False, f"Wheel download error: {str(e)}"
+        
+        if result.returncode != 0:
+            return False, f"Failed to download wheels: {result.stderr}"
+        return True, f"Downloaded {len(packages)} packages to {self.wheel_dir}"
     
     def install_packages_parallel(self, packages: List[str], max_workers: int = 3) -> Dict[str, Tuple[bool, str]]:
         """
-        Install multiple packages in parallel
+        Install multiple packages together
+        
+        Kept for compatibility: concurrent pip processes race on the same
+        site-packages, so this delegates to a single batched pip install.
         
         Args:
             packages: List of package specifications
-            max_workers: Maximum number of parallel installations
+            max_workers: Unused, retained for API compatibility
             
         Returns:
             Dictionary mapping package names to (success, message) tuples
         """
-        logger.info(f"並行安裝 Parallel installation: {len(packages)} packages with {max_workers} workers")
+        logger.info(f"並行安裝 Parallel installation: {len(packages)} packages (batched)")
+        return self.install_packages_batch(packages)
+    
+    def _probe(self, dep_name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Probe a mapped dependency without importing it
         
-        results = {}
+        Args:
+            dep_name: Dependency name from DEPENDENCY_MAP
+            
+        Returns:
+            Tuple of (importable, installed version or None)
+        """
+        dep_info = self.DEPENDENCY_MAP[dep_name]
+        if not self.check_dependency(dep_info['import_name']):
+            return False, None
+        return True, self.get_installed_version(dep_info['package'])
+    
+    def resolve_dependencies(self, dependencies: List[str]) -> Dict[str, Dict]:
+        """
+        Plan the whole dependency set before installing anything
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_pkg = {
-                executor.submit(self.install_package, pkg): pkg 
-                for pkg in packages
-            }
+        Args:
+            dependencies: List of dependency names to check
             
-            for future in concurrent.futures.as_completed(future_to_pkg):
-                pkg = future_to_pkg[future]
-                try:
-                    success, message = future.result()
-                    results[pkg] = (success, message)
-                except Exception as e:
-                    logger.error(f"並行安裝異常 Parallel install error for {pkg}: {e}")
-                    results[pkg] = (False, str(e))
+        Returns:
+            Plan with 'satisfied' (name -> version), 'install' (name -> pip spec)
+            and 'unknown' (name -> None) entries
+        """
+        plan = {'satisfied': {}, 'install': {}, 'unknown': {}}
         
-        return results
+        for dep_name in dependencies:
+            if dep_name not in self.DEPENDENCY_MAP:
+                plan['unknown'][dep_name] = None
+                continue
+            
+            pip_spec = self.DEPENDENCY_MAP[dep_name]['pip_install']
+            importable, installed = self._probe(dep_name)
+            
+            if importable and (installed is None or self._satisfies(installed, pip_spec)):
+                plan['satisfied'][dep_name] = installed
+            else:
+                plan['install'][dep_name] = pip_spec
+        
+        return plan
+    
+    @staticmethod
+    def _satisfies(installed: str, pip_spec: str) -> bool:
+        """Check if an installed version satisfies a pip specification"""
+        try:
+            return Requirement(pip_spec).specifier.contains(installed, prereleases=True)
+        except Exception:
+            return True
     
     def check_and_upgrade(self, dependencies: List[str]) -> Dict[str, bool]:
         """
@@ -316,29 +491,30 @@ class AutoUpgradeEnvironment:
             Dictionary mapping dependency names to availability status
         """
         results = {}
+        plan = self.resolve_dependencies(dependencies)
         
-        for dep_name in dependencies:
-            if dep_name not in self.DEPENDENCY_MAP:
-                logger.warning(f"未知依賴 Unknown dependency: {dep_name}")
-                results[dep_name] = False
-                continue
-            
-            dep_info = self.DEPENDENCY_MAP[dep_name]
-            import_name = dep_info['import_name']
+        for dep_name in plan['unknown']:
+            logger.warning(f"未知依賴 Unknown dependency: {dep_name}")
+            results[dep_name] = False
+        
+        for dep_name in plan['satisfied']:
+            logger.info(f"✓ 依賴可用 Available: {dep_name}")
+            results[dep_name] = True
+        
+        to_install = plan['install']
+        
+        # Install everything missing in one pip run
+        if to_install and self.auto_install:
+            for dep_name in to_install:
+                logger.info(f"⚠ 缺少依賴 Missing dependency: {dep_name}")
+                logger.info(f"   {self.DEPENDENCY_MAP[dep_name]['description']}")
+            logger.info(f"   正在自動升級環境... Auto-upgrading environment...")
             
-            # Check if already available
-            if self.check_dependency(import_name):
-                logger.info(f"✓ 依賴可用 Available: {dep_name}")
-                results[dep_name] = True
-                continue
+            # The plan is authoritative, so stale cache entries must not skip installs
+            install_results = self.install_packages_batch(list(to_install.values()), use_cache=False)
             
-            # If not available and auto_install is enabled
-            if self.auto_install:
-                logger.info(f"⚠ 缺少依賴 Missing dependency: {dep_name}")
-                logger.info(f"   {dep_info['description']}")
-                logger.info(f"   正在自動升級環境... Auto-upgrading environment...")
-                
-                success, message = self.install_package(dep_info['pip_install'])
+            for dep_name, pip_spec in to_install.items():
+                success, message = install_results[pip_spec]
                 
                 if success:
                     self.installed_deps.append(dep_name)
@@ -348,16 +524,17 @@ class AutoUpgradeEnvironment:
                     self.missing_deps.append(dep_name)
                     results[dep_name] = False
                     
-                    if not dep_info.get('optional', False):
+                    if not self.DEPENDENCY_MAP[dep_name].get('optional', False):
                         logger.error(f"✗ 必需依賴安裝失敗 Required dependency failed: {dep_name}")
                     else:
                         logger.warning(f"⚠ 可選依賴安裝失敗 Optional dependency failed: {dep_name}")
-            else:
+        else:
+            for dep_name in to_install:
                 self.missing_deps.append(dep_name)
                 results[dep_name] = False
                 logger.warning(f"⚠ 缺少依賴（自動安裝已禁用）Missing: {dep_name}")
         
-        return results
+        return {dep_name: results[dep_name] for dep_name in dict.fromkeys(dependencies)}
     
     def upgrade_all_optional(self) -> Dict[str, bool]:
         """
@@ -544,9 +721,10 @@ class AutoUpgradeEnvironment:
                 summary += f"  - {conflict['package']}: {conflict['existing']} ⇄ {conflict['new']}\n"
         
         # Cache statistics
-        if hasattr(self, 'cache') and self.cache:
+        cached_packages = [key for key in getattr(self, 'cache', {}) if not key.startswith('_')]
+        if cached_packages:
             summary += f"\n📦 緩存信息 Cache Info:\n"
-            summary += f"  - 已緩存包 Cached packages: {len(self.cache)}\n"
+            summary += f"  - 已緩存包 Cached packages: {len(cached_packages)}\n"
             summary += f"  - 緩存位置 Cache location: {self.cache_file}\n"
         
         if not self.installed_deps and not self.missing_deps:
@@ -604,7 +782,22 @@ if __name__ == "__main__":
     parser.add_argument(
         '--parallel',
         action='store_true',
-        help='Use parallel installation (default: True for config files)'
+        help='Install all config packages in one batched pip run'
+    )
+    parser.add_argument(
+        '--wheel-dir',
+        type=str,
+        help='Local wheel directory used as pip --find-links'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Install only from the local wheel directory (pip --no-index)'
+    )
+    parser.add_argument(
+        '--download-wheels',
+        action='store_true',
+        help='Download wheels for the selected dependencies into the wheel directory'
     )
     parser.add_argument(
         '--detect-conflicts',
@@ -625,7 +818,11 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     # Create upgrader
-    upgrader = AutoUpgradeEnvironment(auto_install=not args.check_only)
+    upgrader = AutoUpgradeEnvironment(
+        auto_install=not args.check_only,
+        wheel_dir=Path(args.wheel_dir) if args.wheel_dir else None,
+        offline=args.offline
+    )
     
     print("=== 智能環境升級系統 - 企業版 Intelligent Environment Upgrade System - Enterprise ===\n")
     
@@ -650,6 +847,20 @@ if __name__ == "__main__":
         print()
         sys.exit(0)
     
+    # Handle wheel cache population
+    if args.download_wheels:
+        if args.from_config:
+            specs = upgrader.load_dependencies_from_config(Path(args.from_config))
+        else:
+            deps = args.deps or ['dotenv', 'loguru']
+            specs = [
+                AutoUpgradeEnvironment.DEPENDENCY_MAP[dep]['pip_install']
+                for dep in deps if dep in AutoUpgradeEnvironment.DEPENDENCY_MAP
+            ]
+        success, message = upgrader.download_wheels(specs)
+        print(f"{'✓' if success else '✗'} {message}\n")
+        sys.exit(0 if success else 1)
+    
     # Handle from config
     if args.from_config:
         config_path = Path(args.from_config)
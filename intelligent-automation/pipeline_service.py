@@ -10,14 +10,21 @@ Core capabilities:
 - Real-time streaming responses
 - Context-aware routing
 - Safety-critical validation
-- Auto environment upgrade (自動環境升級)
+- Auto environment upgrade (自動環境升級, explicit - never at import)
+- Lazy agent loading for fast cold starts (延遲加載)
 """
 
 import os
+import re
+import sys
 import json
+import time
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import importlib
+import importlib.util
+import subprocess
+from typing import Dict, Any, List, Optional, Sequence
 
 # Configure logging
 logging.basicConfig(
@@ -26,27 +33,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Auto-upgrade environment if needed
-# 自動升級環境（如果需要）
-try:
-    from auto_upgrade_env import AutoUpgradeEnvironment
-    _upgrader = AutoUpgradeEnvironment(auto_install=True)
-    _upgrade_results = _upgrader.check_and_upgrade(['dotenv', 'loguru'])
-    if _upgrader.installed_deps:
-        logger.info(f"已自動升級環境 Auto-upgraded: {', '.join(_upgrader.installed_deps)}")
-except Exception as e:
-    logger.warning(f"環境升級檢查跳過 Auto-upgrade skipped: {e}")
+# Agent loaders: attribute -> (module, symbol, construct)
+# Agents are imported and constructed on first use, not at import time
+AGENT_LOADERS = {
+    "recognition_server": ("agents.recognition_server", "RecognitionServer", True),
+    "task_executor": ("agents.task_executor", "task_executor", False),
+    "visualization_agent": ("agents.visualization_agent", "VisualizationAgent", True),
+}
 
-# Import agents
-try:
-    from agents.task_executor import task_executor
-    from agents.recognition_server import RecognitionServer
-    from agents.visualization_agent import VisualizationAgent
-except ImportError:
-    logger.warning("Running in standalone mode - agents not available")
-    task_executor = None
-    RecognitionServer = None
-    VisualizationAgent = None
+
+def upgrade_environment(dependencies: Sequence[str] = ("dotenv", "loguru")) -> Dict[str, bool]:
+    """
+    Check and auto-upgrade optional dependencies
+    自動升級環境（顯式調用，不在導入時執行）
+    
+    Runs pip only when called explicitly, never on the import path.
+    
+    Args:
+        dependencies: Dependency names known to AutoUpgradeEnvironment
+        
+    Returns:
+        Dictionary mapping dependency names to availability status
+    """
+    try:
+        from auto_upgrade_env import AutoUpgradeEnvironment
+        upgrader = AutoUpgradeEnvironment(auto_install=True)
+        results = upgrader.check_and_upgrade(list(dependencies))
+        if upgrader.installed_deps:
+            logger.info(f"已自動升級環境 Auto-upgraded: {', '.join(upgrader.installed_deps)}")
+        return results
+    except Exception as e:
+        logger.warning(f"環境升級檢查跳過 Auto-upgrade skipped: {e}")
+        return {}
 
 
 class PipelineService:
@@ -61,14 +79,117 @@ class PipelineService:
     - Error handling and recovery
     """
     
-    def __init__(self):
-        """Initialize pipeline service with all agents"""
-        self.recognition_server = RecognitionServer() if RecognitionServer else None
-        self.task_executor = task_executor
-        self.visualization_agent = VisualizationAgent() if VisualizationAgent else None
+    def __init__(self, preload: bool = False):
+        """
+        Initialize pipeline service
+        
+        Agents are loaded lazily on first use.
+        
+        Args:
+            preload: Load all agents immediately instead of on first use
+        """
+        self._agents: Dict[str, Any] = {}
         self.request_count = 0
+        if preload:
+            self.warm_up()
         logger.info("PipelineService initialized")
     
+    def _load_agent(self, name: str) -> Any:
+        """
+        Import and construct an agent on first use
+        
+        Args:
+            name: Agent attribute name from AGENT_LOADERS
+            
+        Returns:
+            Agent instance or None if unavailable
+        """
+        if name in self._agents:
+            return self._agents[name]
+        
+        module_name, symbol, construct = AGENT_LOADERS[name]
+        agent = None
+        try:
+            module = self._import_agent_module(module_name)
+            target = getattr(module, symbol)
+            agent = target() if construct else target
+        except ImportError:
+            logger.warning(f"Running in standalone mode - {name} not available")
+        
+        self._agents[name] = agent
+        return agent
+    
+    @staticmethod
+    def _import_agent_module(module_name: str):
+        """Import agent module as top-level or package-relative module"""
+        try:
+            return importlib.import_module(module_name)
+        except ImportError:
+            if not __package__:
+                raise
+            return importlib.import_module(f".{module_name}", __package__)
+    
+    def _agent_available(self, name: str) -> bool:
+        """
+        Check agent availability without loading it
+        
+        Args:
+            name: Agent attribute name from AGENT_LOADERS
+            
+        Returns:
+            True if loaded, or not yet loaded but importable
+        """
+        if name in self._agents:
+            return self._agents[name] is not None
+        
+        module_name = AGENT_LOADERS[name][0]
+        candidates = [module_name]
+        if __package__:
+            candidates.append(f"{__package__}.{module_name}")
+        for candidate in candidates:
+            try:
+                if importlib.util.find_spec(candidate) is not None:
+                    return True
+            except (ImportError, ValueError):
+                continue
+        return False
+    
+    def warm_up(self) -> Dict[str, bool]:
+        """
+        Load all agents now (e.g. before serving traffic)
+        
+        Returns:
+            Dictionary mapping agent names to availability
+        """
+        return {name: self._load_agent(name) is not None for name in AGENT_LOADERS}
+    
+    @property
+    def recognition_server(self):
+        """Recognition server agent (loaded on first use)"""
+        return self._load_agent("recognition_server")
+    
+    @recognition_server.setter
+    def recognition_server(self, agent):
+        self._agents["recognition_server"] = agent
+    
+    @property
+    def task_executor(self):
+        """Task executor agent (loaded on first use)"""
+        return self._load_agent("task_executor")
+    
+    @task_executor.setter
+    def task_executor(self, agent):
+        self._agents["task_executor"] = agent
+    
+    @property
+    def visualization_agent(self):
+        """Visualization agent (loaded on first use)"""
+        return self._load_agent("visualization_agent")
+    
+    @visualization_agent.setter
+    def visualization_agent(self, agent):
+        self._agents["visualization_agent"] = agent
+    
     async def process_request(self,
                              query: str,
                              problem_content: str = "",
@@ -304,18 +425,24 @@ class PipelineService:
         Returns:
             Pipeline statistics and metrics
         """
+        # Statistics never force agents to load
         stats = {
             "total_requests": self.request_count,
             "agents_available": {
-                "recognition_server": self.recognition_server is not None,
-                "task_executor": self.task_executor is not None,
-                "visualization_agent": self.visualization_agent is not None
-            }
+                name: self._agent_available(name) for name in AGENT_LOADERS
+            },
+            "agents_loaded": sorted(
+                name for name, agent in self._agents.items() if agent is not None
+            )
         }
         
         # Add recognition server stats
-        if self.recognition_server:
-            stats["recognition_stats"] = self.recognition_server.get_statistics()
+        if self._agents.get("recognition_server"):
+            stats["recognition_stats"] = self._agents["recognition_server"].get_statistics()
+        
+        # Add explanation cache stats
+        if self._agents.get("visualization_agent"):
+            stats["explanation_cache"] = self._agents["visualization_agent"].get_cache_statistics()
         
         return stats
     
@@ -337,12 +464,72 @@ class PipelineService:
         }
 
 
-# Global singleton instance
+# Global singleton instance (cheap: agents load on first use)
 pipeline_service = PipelineService()
 
 
+# Line format of `python -X importtime`:
+# "import time:       self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def profile_startup(preload: bool = True, top: int = 20) -> Dict[str, Any]:
+    """
+    Profile cold start in a fresh interpreter
+    啟動耗時分析
+    
+    Imports this module under `python -X importtime`, optionally loads all
+    agents, and reports per-module import cost plus import-to-ready time.
+    
+    Args:
+        preload: Also load all agents (first-request readiness)
+        top: Number of most expensive modules to report
+        
+    Returns:
+        Startup profile with import_to_ready_ms and per-module costs
+    """
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        "import time, sys\n"
+        f"sys.path.insert(0, {module_dir!r})\n"
+        "start = time.perf_counter()\n"
+        "import pipeline_service\n"
+        f"pipeline_service.PipelineService(preload={preload!r})\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup profiling failed: {result.stderr[-2000:]}")
+    
+    modules: List[Dict[str, Any]] = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2
+            })
+    
+    modules.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+    return {
+        "import_to_ready_ms": float(result.stdout.strip().splitlines()[-1]),
+        "preload": preload,
+        "module_count": len(modules),
+        "modules": modules[:top]
+    }
+
+
 async def main():
     """Example usage and testing"""
+    upgrade_environment()
     service = PipelineService()
     
     print("=== Pipeline Service Test ===\n")
@@ -390,4 +577,7 @@ def unsafe_function(user_input):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if "--profile-startup" in sys.argv:
+        print(json.dumps(profile_startup(preload="--no-preload" not in sys.argv), indent=2))
+    else:
+        asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Tests for AutoUpgradeEnvironment
+測試自動升級環境
+"""
+
+import importlib.metadata
+import json
+import subprocess
+import pytest
+from auto_upgrade_env import AutoUpgradeEnvironment
+
+
+class FakeRun:
+    """Record pip invocations instead of running them"""
+    
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.calls = []
+    
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, self.returncode, stdout="", stderr="boom")
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Replace subprocess.run for pip calls"""
+    runner = FakeRun()
+    monkeypatch.setattr(subprocess, "run", runner)
+    return runner
+
+
+@pytest.fixture
+def upgrader(tmp_path):
+    """Create upgrader with isolated cache"""
+    return AutoUpgradeEnvironment(auto_install=True, cache_dir=tmp_path)
+
+
+def test_resolve_dependencies_plans_without_installing(upgrader, fake_run, monkeypatch):
+    """Test resolver classifies dependencies up front"""
+    monkeypatch.setattr(
+        upgrader, "_probe",
+        lambda dep: {"dotenv": (True, "1.2.0"), "loguru": (False, None)}[dep]
+    )
+    
+    plan = upgrader.resolve_dependencies(["dotenv", "loguru", "nope"])
+    
+    assert plan["satisfied"] == {"dotenv": "1.2.0"}
+    assert plan["install"] == {"loguru": "loguru>=0.7.2"}
+    assert list(plan["unknown"]) == ["nope"]
+    assert fake_run.calls == []
+
+
+def test_resolve_dependencies_upgrades_outdated(upgrader, monkeypatch):
+    """Test installed versions below the spec are planned for upgrade"""
+    monkeypatch.setattr(upgrader, "_probe", lambda dep: (True, "0.1.0"))
+    
+    plan = upgrader.resolve_dependencies(["loguru"])
+    
+    assert plan["install"] == {"loguru": "loguru>=0.7.2"}
+
+
+def test_check_and_upgrade_single_batched_pip_call(upgrader, fake_run, monkeypatch):
+    """Test all missing dependencies are installed in one pip run"""
+    monkeypatch.setattr(upgrader, "_probe", lambda dep: (False, None))
+    
+    results = upgrader.check_and_upgrade(["dotenv", "loguru"])
+    
+    assert results == {"dotenv": True, "loguru": True}
+    assert len(fake_run.calls) == 1
+    assert fake_run.calls[0][-2:] == ["python-dotenv>=1.0.0", "loguru>=0.7.2"]
+    assert upgrader.installed_deps == ["dotenv", "loguru"]
+
+
+def test_batch_install_uses_local_wheels_offline(tmp_path, fake_run):
+    """Test wheel cache is passed as --find-links with --no-index offline"""
+    wheel_dir = tmp_path / "wheels"
+    wheel_dir.mkdir()
+    upgrader = AutoUpgradeEnvironment(cache_dir=tmp_path, wheel_dir=wheel_dir, offline=True)
+    
+    upgrader.install_packages_batch(["loguru>=0.7.2"])
+    
+    cmd = fake_run.calls[0]
+    assert cmd[cmd.index("--find-links") + 1] == str(wheel_dir)
+    assert "--no-index" in cmd
+
+
+def test_single_install_and_sequential_config_use_local_wheels(tmp_path, fake_run):
+    """Test install_package and upgrade_from_config(parallel=False) honour --offline/--wheel-dir"""
+    wheel_dir = tmp_path / "wheels"
+    wheel_dir.mkdir()
+    config = tmp_path / "requirements.txt"
+    config.write_text("loguru>=0.7.2\nrequests>=2.31\n")
+    upgrader = AutoUpgradeEnvironment(cache_dir=tmp_path, wheel_dir=wheel_dir, offline=True)
+    
+    assert upgrader.install_package("pyyaml>=6.0") == (True, "Successfully installed pyyaml>=6.0")
+    assert upgrader.upgrade_from_config(config, parallel=False) == {"loguru": True, "requests": True}
+    
+    assert [cmd[-1] for cmd in fake_run.calls] == ["pyyaml>=6.0", "loguru>=0.7.2", "requests>=2.31"]
+    for cmd in fake_run.calls:
+        assert cmd[cmd.index("--find-links") + 1] == str(wheel_dir)
+        assert "--no-index" in cmd
+
+
+def test_batch_install_failure_marks_all_failed(upgrader, fake_run):
+    """Test failed batch reports every pending package"""
+    fake_run.returncode = 1
+    
+    results = upgrader.install_packages_batch(["a>=1", "b>=2"])
+    
+    assert [success for success, _ in results.values()] == [False, False]
+    assert upgrader.cache == {}
+
+
+def test_check_dependency_does_not_import(upgrader):
+    """Test probing uses find_spec instead of importing"""
+    import sys
+    
+    sys.modules.pop("this", None)
+    assert upgrader.check_dependency("this") is True
+    assert "this" not in sys.modules
+    assert upgrader.check_dependency("definitely_not_a_module_xyz") is False
+
+
+def test_installed_versions_cached_by_site_packages(tmp_path, monkeypatch):
+    """Test distribution index is scanned once and reused from disk"""
+    first = AutoUpgradeEnvironment(auto_install=False, cache_dir=tmp_path)
+    version = first.get_installed_version("PyTest")
+    
+    assert version == importlib.metadata.version("pytest")
+    stored = json.loads((tmp_path / "installed_packages.json").read_text())
+    assert stored[AutoUpgradeEnvironment.DISTRIBUTIONS_CACHE_KEY]["versions"]["pytest"] == version
+    
+    def no_scan():
+        raise AssertionError("distributions() should not be rescanned")
+    
+    monkeypatch.setattr(importlib.metadata, "distributions", no_scan)
+    second = AutoUpgradeEnvironment(auto_install=False, cache_dir=tmp_path)
+    assert second.get_installed_version("pytest") == version
+    assert second.get_installed_version("not-installed-pkg") is None
+    
+    monkeypatch.setattr(second, "_site_packages_fingerprint", lambda: "changed")
+    second._dist_versions = None
+    with pytest.raises(AssertionError):
+        second.get_installed_version("pytest")
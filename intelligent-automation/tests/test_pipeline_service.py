@@ -0,0 +1,80 @@
+"""
+Tests for PipelineService
+測試管線服務
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pipeline_service import PipelineService, AGENT_LOADERS
+
+MODULE_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def service():
+    """Create PipelineService instance for testing"""
+    return PipelineService()
+
+
+def test_import_is_lazy_and_never_upgrades():
+    """Test importing the service loads no agents and never touches pip"""
+    script = (
+        "import sys, json\n"
+        "import pipeline_service\n"
+        "pipeline_service.pipeline_service.get_statistics()\n"
+        "print(json.dumps(sorted(m for m in sys.modules "
+        "if m.startswith(('agents.', 'auto_upgrade_env', 'pip.')) or m == 'pip')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=MODULE_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_agents_load_on_first_use(service):
+    """Test agents are constructed on first access only"""
+    assert service.get_statistics()["agents_loaded"] == []
+    
+    executor = service.task_executor
+    
+    assert executor is not None
+    assert service.task_executor is executor
+    assert service.get_statistics()["agents_loaded"] == ["task_executor"]
+
+
+def test_warm_up_loads_all_agents(service):
+    """Test warm up preloads every agent"""
+    assert service.warm_up() == {name: True for name in AGENT_LOADERS}
+    
+    stats = service.get_statistics()
+    assert stats["agents_loaded"] == sorted(AGENT_LOADERS)
+    assert "recognition_stats" in stats
+    assert "explanation_cache" in stats
+
+
+def test_agent_override(service):
+    """Test agents can be replaced explicitly"""
+    service.visualization_agent = None
+    
+    assert service.health_check()["agents"]["visualization_agent"] == "unavailable"
+    assert service.get_statistics()["agents_available"]["visualization_agent"] is False
+
+
+@pytest.mark.asyncio
+async def test_explanation_request_uses_lazy_agents(service):
+    """Test request routing through lazily loaded agents"""
+    result = await service.process_request(query="explain what is recursion")
+    
+    assert result["status"] == "success"
+    assert result["action"] == "visualize"
+    assert result["result"]["explanation"]["topic"] == "algorithm"
@@ -4,6 +4,7 @@ Tests for TaskExecutor
 """
 
 import pytest
+from agents.code_checker import CodeChecker
 from agents.task_executor import TaskExecutor
 
 
@@ -141,5 +142,100 @@ def complex_function(user_input):
     assert len(issue_types) > 0
 
 
+@pytest.mark.asyncio
+async def test_security_issues_report_exact_position(executor):
+    """Test security issues carry line and column"""
+    code = """
+def handler(model, user_input):
+    model.eval()
+    # eval( in a comment is fine
+    message = "do not eval(this)"
+    password = "hardcoded123"
+    return eval(user_input)
+"""
+    
+    result = await executor.analyze_code(code, "security")
+    positions = {(i["severity"], i["line"], i["column"]) for i in result["issues"]}
+    
+    assert positions == {("high", 6, 4), ("critical", 7, 11)}
+
+
+@pytest.mark.asyncio
+async def test_nested_loops_by_real_depth(executor):
+    """Test nested loops are detected by nesting depth, not keyword count"""
+    flat_code = """
+for a in range(3):
+    pass
+for b in range(3):
+    pass
+for c in range(3):
+    pass
+for d in range(3):
+    print("for for for")
+"""
+    nested_code = """
+def slow(data):
+    for i in data:
+        while i:
+            rows = [x for x in i]
+"""
+    
+    flat = await executor.analyze_code(flat_code, "performance")
+    nested = await executor.analyze_code(nested_code, "performance")
+    
+    assert flat["issues"] == []
+    assert [i["line"] for i in nested["issues"]] == [4, 5]
+    assert "depth 2" in nested["issues"][0]["description"]
+    assert "depth 3" in nested["issues"][1]["description"]
+
+
+@pytest.mark.asyncio
+async def test_two_level_nested_loop_reported(executor):
+    """Test a plain double loop (O(n^2)) is reported on the inner loop"""
+    code = """
+def pairs(items):
+    for a in items:
+        for b in items:
+            yield a, b
+"""
+    
+    result = await executor.analyze_code(code, "performance")
+    
+    assert [(i["line"], i["column"]) for i in result["issues"]] == [(4, 8)]
+    assert "depth 2" in result["issues"][0]["description"]
+    assert CodeChecker(max_loop_depth=2).check(code) == []
+
+
+def test_sibling_comprehensions_not_nested():
+    """Test comprehensions side by side on one line are not counted as nested"""
+    checker = CodeChecker()
+    
+    assert checker.check("x = [a for a in b] + [c for c in d]\n") == []
+    assert checker.check("f([a for a in b], {c: 1 for c in d})\n") == []
+    
+    nested = checker.check("y = [[x for x in r] for r in rows]\n")
+    assert [(i["line"], i["column"]) for i in nested] == [(1, 20)]
+    assert "depth 2" in nested[0]["description"]
+
+
+def test_code_checker_incremental_lines(executor):
+    """Test checker accepts an iterable of lines and tolerates incomplete code"""
+    lines = iter([
+        "for i in a:\n",
+        "    for j in b:\n",
+        "        for k in c:\n",
+        "            exec(k)\n",
+        "call(\n",
+    ])
+    
+    issues = executor.code_checker.check(lines)
+    
+    assert [(i["type"], i["line"]) for i in issues] == [
+        ("performance", 2),
+        ("performance", 3),
+        ("security", 4),
+    ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
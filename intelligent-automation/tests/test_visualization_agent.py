@@ -0,0 +1,95 @@
+"""
+Tests for VisualizationAgent
+測試可視化智能體
+"""
+
+import asyncio
+import pytest
+from agents.visualization_agent import VisualizationAgent, ExplanationCache
+
+
+@pytest.fixture
+def agent():
+    """Create VisualizationAgent instance for testing"""
+    return VisualizationAgent()
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_served_from_cache(agent):
+    """Test normalized repeated queries hit the cache"""
+    first = await agent.generate_explanation("What is Recursion?")
+    second = await agent.generate_explanation("  what is   recursion? ")
+    
+    assert first["topic"] == second["topic"] == "algorithm"
+    assert first["explanation"] == second["explanation"]
+    assert second["query"] == "  what is   recursion? "
+    
+    stats = agent.get_cache_statistics()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+    assert len(agent.explanation_history) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_result_not_shared_with_callers(agent):
+    """Test mutating a returned result does not corrupt the cache"""
+    first = await agent.generate_explanation("sort algorithm")
+    first["explanation"]["key_points"].append("mutated")
+    first["follow_up_questions"].clear()
+    
+    second = await agent.generate_explanation("sort algorithm")
+    assert "mutated" not in second["explanation"]["key_points"]
+    assert second["follow_up_questions"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_coalesced(agent):
+    """Test concurrent identical requests share one build"""
+    calls = 0
+    original = agent._create_explanation
+    
+    async def slow_create(topic, query):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return await original(topic, query)
+    
+    agent._create_explanation = slow_create
+    results = await asyncio.gather(
+        *(agent.generate_explanation("thread safety") for _ in range(5))
+    )
+    
+    assert calls == 1
+    assert all(r["topic"] == results[0]["topic"] for r in results)
+    assert agent.get_cache_statistics()["coalesced_requests"] == 4
+    assert agent.get_cache_statistics()["inflight"] == 0
+
+
+def test_cache_lru_eviction_and_ttl():
+    """Test LRU eviction and TTL expiry"""
+    cache = ExplanationCache(max_size=2, ttl=3600.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+    
+    expired = ExplanationCache(max_size=2, ttl=-1)
+    expired.put("a", 1)
+    assert expired.get("a") == 1
+    
+    expired.ttl = 1e-9
+    assert expired.get("a") is None
+    assert expired.expirations == 1
+
+
+def test_cache_disabled():
+    """Test zero-sized cache stores nothing"""
+    cache = ExplanationCache(max_size=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.get_statistics()["hit_rate"] == 0.0
@@ -5,31 +5,163 @@ Secret Pattern Management Script
 """
 
 import requests
+import hashlib
 import json
 import os
 import sys
+import time
 import argparse
-from typing import Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 同步比對的模式字段（其餘字段由 GitHub 生成）
+PATTERN_FIELDS = ('name', 'regex', 'secret_type')
+
+ENTERPRISE_PATTERNS = [
+    {
+        "name": "Enterprise Database Password",
+        "regex": r"(?i)enterprise_db_pass_[a-zA-Z0-9]{24}",
+        "secret_type": "enterprise_database_password"
+    },
+    {
+        "name": "Internal Service Token",
+        "regex": r"int_svc_[0-9a-f]{48}",
+        "secret_type": "internal_service_token"
+    },
+    {
+        "name": "Enterprise API Key",
+        "regex": r"ent_api_[A-Za-z0-9]{40}",
+        "secret_type": "enterprise_api_key"
+    },
+    {
+        "name": "Master Encryption Key",
+        "regex": r"emk_[0-9A-Fa-f]{128}",
+        "secret_type": "encryption_master_key"
+    },
+    {
+        "name": "JWT Signing Secret",
+        "regex": r"jwt_secret_[A-Za-z0-9_-]{43}",
+        "secret_type": "jwt_signing_secret"
+    }
+]
+
+
+def pattern_data(pattern: Dict) -> Dict:
+    """只保留可寫入的模式字段"""
+    return {field: pattern.get(field) for field in PATTERN_FIELDS}
+
+
+def pattern_hash(pattern: Dict) -> str:
+    """模式內容雜湊（字段順序無關）"""
+    canonical = json.dumps(pattern_data(pattern), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def plan_reconcile(existing: List[Dict], desired: List[Dict], prune: bool = False) -> Dict[str, List]:
+    """
+    以名稱為鍵比對現有與期望模式
+    
+    Args:
+        existing: 組織中現有的模式（含 id）
+        desired: 期望的模式
+        prune: 是否刪除不在期望清單中的模式
+    
+    Returns:
+        {'create': [模式], 'update': [(id, 模式)], 'delete': [現有模式], 'unchanged': [名稱]}
+    """
+    current = {pattern.get('name'): pattern for pattern in existing}
+    plan = {'create': [], 'update': [], 'delete': [], 'unchanged': []}
+    wanted = set()
+    
+    for pattern in desired:
+        name = pattern.get('name')
+        wanted.add(name)
+        found = current.get(name)
+        if found is None:
+            plan['create'].append(pattern_data(pattern))
+        elif pattern_hash(found) != pattern_hash(pattern):
+            plan['update'].append((found['id'], pattern_data(pattern)))
+        else:
+            plan['unchanged'].append(name)
+    
+    if prune:
+        plan['delete'] = [pattern for name, pattern in current.items() if name not in wanted]
+    
+    return plan
 
 
 class SecretPatternManager:
     """管理 GitHub Secret Scanning 自定義模式"""
     
-    def __init__(self, token: str, base_url: str = "https://api.github.com"):
+    def __init__(self, token: str, base_url: str = "https://api.github.com",
+                 max_workers: int = 8, retries: int = 5, backoff: float = 0.5, timeout: float = 30.0):
         self.token = token
-        self.base_url = base_url
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max(1, max_workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github+json',
             'X-GitHub-Api-Version': '2022-11-28'
         }
+        
+        # 共用連線池；冪等請求在 429/502/503/504 及連線錯誤時以指數退避重試
+        # （遵守 Retry-After）。POST 不在此重試：閘道錯誤時伺服器可能已建立模式，
+        # 由 create_custom_pattern 重新列出後再決定是否重送
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'PATCH', 'DELETE'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """重試等待秒數：優先使用 Retry-After，否則指數退避"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt)
+    
+    def _find_created(self, org: str, pattern_data: Dict) -> Optional[Dict]:
+        """閘道錯誤後確認模式是否已建立（名稱與內容皆相同）"""
+        patterns = self._fetch_patterns(org) or []
+        for pattern in patterns:
+            if pattern.get('name') == pattern_data.get('name') and pattern_hash(pattern) == pattern_hash(pattern_data):
+                return pattern
+        return None
     
     def create_custom_pattern(self, org: str, pattern_data: Dict) -> Optional[Dict]:
-        """建立自定義秘密掃描模式"""
+        """
+        建立自定義秘密掃描模式
+        
+        POST 不是冪等的：429 表示請求被拒絕，可直接重送；502/503/504 時伺服器
+        可能已經建立了模式，先重新列出現有模式，確認未建立後才重送，避免重複。
+        """
         url = f'{self.base_url}/orgs/{org}/secret-scanning/custom-patterns'
         
         try:
-            response = requests.post(url, headers=self.headers, json=pattern_data)
+            for attempt in range(self.retries + 1):
+                response = self.session.post(url, json=pattern_data, timeout=self.timeout)
+                if response.status_code not in (429, 502, 503, 504) or attempt == self.retries:
+                    break
+                time.sleep(self._retry_delay(response, attempt))
+                if response.status_code != 429:
+                    created = self._find_created(org, pattern_data)
+                    if created is not None:
+                        print(f"✅ Custom pattern '{pattern_data['name']}' created successfully")
+                        return created
             
             if response.status_code == 201:
                 print(f"✅ Custom pattern '{pattern_data['name']}' created successfully")
@@ -47,7 +179,7 @@ class SecretPatternManager:
         url = f'{self.base_url}/orgs/{org}/secret-scanning/custom-patterns/{pattern_id}'
         
         try:
-            response = requests.patch(url, headers=self.headers, json=pattern_data)
+            response = self.session.patch(url, json=pattern_data, timeout=self.timeout)
             
             if response.status_code == 200:
                 print(f"✅ Pattern {pattern_id} updated successfully")
@@ -65,11 +197,15 @@ class SecretPatternManager:
         url = f'{self.base_url}/orgs/{org}/secret-scanning/custom-patterns/{pattern_id}'
         
         try:
-            response = requests.delete(url, headers=self.headers)
+            response = self.session.delete(url, timeout=self.timeout)
             
             if response.status_code == 204:
                 print(f"✅ Pattern {pattern_id} deleted successfully")
                 return True
+            elif response.status_code == 404:
+                # 重試的 DELETE 可能在先前的嘗試中已生效
+                print(f"✅ Pattern {pattern_id} already deleted")
+                return True
             else:
                 print(f"❌ Failed to delete pattern: {response.status_code}")
                 return False
@@ -79,29 +215,39 @@ class SecretPatternManager:
     
     def list_custom_patterns(self, org: str) -> List[Dict]:
         """列出所有自定義模式"""
+        patterns = self._fetch_patterns(org)
+        if patterns is None:
+            return []
+        print(f"✅ Found {len(patterns)} custom patterns")
+        return patterns
+    
+    def _fetch_patterns(self, org: str) -> Optional[List[Dict]]:
+        """抓取組織的全部模式（沿 Link header 翻頁）；失敗時返回 None"""
         url = f'{self.base_url}/orgs/{org}/secret-scanning/custom-patterns'
+        params = {'per_page': 100}
+        patterns = []
         
         try:
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code == 200:
-                patterns = response.json()
-                print(f"✅ Found {len(patterns)} custom patterns")
-                return patterns
-            else:
-                print(f"❌ Failed to list patterns: {response.status_code}")
-                print(f"   Response: {response.text}")
-                return []
+            while url:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code != 200:
+                    print(f"❌ Failed to list patterns: {response.status_code}")
+                    print(f"   Response: {response.text}")
+                    return None
+                patterns.extend(response.json())
+                url = response.links.get('next', {}).get('url')
+                params = None
+            return patterns
         except Exception as e:
             print(f"❌ Error listing patterns: {str(e)}")
-            return []
+            return None
     
     def get_pattern(self, org: str, pattern_id: int) -> Optional[Dict]:
         """獲取特定模式詳情"""
         url = f'{self.base_url}/orgs/{org}/secret-scanning/custom-patterns/{pattern_id}'
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=self.timeout)
             
             if response.status_code == 200:
                 return response.json()
@@ -112,47 +258,87 @@ class SecretPatternManager:
             print(f"❌ Error getting pattern: {str(e)}")
             return None
     
-    def deploy_enterprise_patterns(self, org: str) -> None:
-        """部署企業級模式"""
-        patterns = [
-            {
-                "name": "Enterprise Database Password",
-                "regex": r"(?i)enterprise_db_pass_[a-zA-Z0-9]{24}",
-                "secret_type": "enterprise_database_password"
-            },
-            {
-                "name": "Internal Service Token",
-                "regex": r"int_svc_[0-9a-f]{48}",
-                "secret_type": "internal_service_token"
-            },
-            {
-                "name": "Enterprise API Key",
-                "regex": r"ent_api_[A-Za-z0-9]{40}",
-                "secret_type": "enterprise_api_key"
-            },
-            {
-                "name": "Master Encryption Key",
-                "regex": r"emk_[0-9A-Fa-f]{128}",
-                "secret_type": "encryption_master_key"
-            },
-            {
-                "name": "JWT Signing Secret",
-                "regex": r"jwt_secret_[A-Za-z0-9_-]{43}",
-                "secret_type": "jwt_signing_secret"
-            }
-        ]
+    def reconcile(self, orgs: List[str], desired: List[Dict], prune: bool = False,
+                  dry_run: bool = False) -> Dict[str, Dict]:
+        """
+        將多個組織的模式同步到期望狀態（冪等）
         
-        print(f"Deploying {len(patterns)} enterprise patterns to {org}...")
+        每個組織只抓取一次現有模式，按名稱與內容雜湊計算 create/update/delete，
+        所有組織的變更在同一個有界線程池中並行套用。
         
-        success_count = 0
-        for pattern in patterns:
-            result = self.create_custom_pattern(org, pattern)
-            if result:
-                success_count += 1
+        Args:
+            orgs: 組織名稱清單
+            desired: 期望的模式清單
+            prune: 刪除不在期望清單中的模式
+            dry_run: 只計算並顯示變更
+        
+        Returns:
+            org -> {'create', 'update', 'delete', 'unchanged', 'failed'} 計數（抓取失敗時為 {'error': ...}）
+        """
+        duplicates = {name for name, count in Counter(p.get('name') for p in desired).items() if count > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate pattern names: {sorted(duplicates)}")
         
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            existing = dict(zip(orgs, executor.map(self._fetch_patterns, orgs)))
+            
+            plans: Dict[str, Dict] = {}
+            operations: List[Tuple[str, str, tuple]] = []
+            for org in orgs:
+                if existing[org] is None:
+                    continue
+                plan = plans[org] = plan_reconcile(existing[org], desired, prune)
+                operations += [(org, 'create', (org, pattern)) for pattern in plan['create']]
+                operations += [(org, 'update', (org, pattern_id, pattern)) for pattern_id, pattern in plan['update']]
+                operations += [(org, 'delete', (org, pattern['id'])) for pattern in plan['delete']]
+                print(f"{org}: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+                      f"{len(plan['delete'])} to delete, {len(plan['unchanged'])} unchanged")
+            
+            if dry_run:
+                outcomes = []
+            else:
+                actions = {
+                    'create': self.create_custom_pattern,
+                    'update': self.update_custom_pattern,
+                    'delete': self.delete_custom_pattern
+                }
+                outcomes = list(executor.map(lambda op: bool(actions[op[1]](*op[2])), operations))
+        
+        summary = {}
+        for org in orgs:
+            if org not in plans:
+                summary[org] = {'error': 'failed to list existing patterns'}
+                continue
+            summary[org] = {kind: len(plans[org][kind]) for kind in ('create', 'update', 'delete', 'unchanged')}
+            summary[org]['failed'] = 0
+        for (org, _, _), ok in zip(operations, outcomes):
+            if not ok:
+                summary[org]['failed'] += 1
+        
+        return summary
+    
+    @staticmethod
+    def print_reconcile_summary(summary: Dict[str, Dict], dry_run: bool = False):
+        failed = 0
         print(f"\n{'='*50}")
-        print(f"✅ Successfully deployed {success_count}/{len(patterns)} patterns")
+        for org, counts in summary.items():
+            if 'error' in counts:
+                failed += 1
+                print(f"❌ {org}: {counts['error']}")
+                continue
+            failed += counts['failed']
+            status = '📝' if dry_run else ('❌' if counts['failed'] else '✅')
+            print(f"{status} {org}: {counts['create']} created, {counts['update']} updated, "
+                  f"{counts['delete']} deleted, {counts['unchanged']} unchanged"
+                  + (f", {counts['failed']} failed" if counts['failed'] else ''))
         print(f"{'='*50}")
+        return failed
+    
+    def deploy_enterprise_patterns(self, org: str) -> None:
+        """部署企業級模式（已存在且內容相同的模式不重複建立）"""
+        print(f"Deploying {len(ENTERPRISE_PATTERNS)} enterprise patterns to {org}...")
+        summary = self.reconcile([org], ENTERPRISE_PATTERNS)
+        self.print_reconcile_summary(summary)
     
     def export_patterns(self, org: str, output_file: str) -> None:
         """導出所有自定義模式到 JSON 文件"""
@@ -174,20 +360,9 @@ class SecretPatternManager:
             
             print(f"Importing {len(patterns)} patterns from {input_file}...")
             
-            success_count = 0
-            for pattern in patterns:
-                # Remove fields that shouldn't be in create request
-                pattern_data = {
-                    'name': pattern.get('name'),
-                    'regex': pattern.get('regex'),
-                    'secret_type': pattern.get('secret_type')
-                }
-                
-                result = self.create_custom_pattern(org, pattern_data)
-                if result:
-                    success_count += 1
-            
-            print(f"✅ Successfully imported {success_count}/{len(patterns)} patterns")
+            # 以名稱比對：已存在的模式更新而非重複建立
+            summary = self.reconcile([org], patterns)
+            self.print_reconcile_summary(summary)
         except Exception as e:
             print(f"❌ Error importing patterns: {str(e)}")
 
@@ -197,15 +372,22 @@ def main():
         description='Manage GitHub Secret Scanning custom patterns'
     )
     parser.add_argument('action', 
-                       choices=['list', 'create', 'update', 'delete', 'deploy', 'export', 'import'],
+                       choices=['list', 'create', 'update', 'delete', 'deploy', 'export', 'import', 'reconcile'],
                        help='Action to perform')
-    parser.add_argument('--org', required=True, help='GitHub organization name')
+    parser.add_argument('--org', required=True,
+                       help='GitHub organization name (comma-separated list for reconcile)')
     parser.add_argument('--token', help='GitHub token (or set GITHUB_TOKEN env var)')
     parser.add_argument('--pattern-id', type=int, help='Pattern ID for update/delete/get')
     parser.add_argument('--file', help='File path for export/import')
     parser.add_argument('--name', help='Pattern name for create')
     parser.add_argument('--regex', help='Pattern regex for create')
     parser.add_argument('--secret-type', help='Secret type for create')
+    parser.add_argument('--prune', action='store_true',
+                       help='Reconcile: delete patterns that are not in the desired set')
+    parser.add_argument('--dry-run', action='store_true', help='Reconcile: only show the planned changes')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent API requests (default: 8)')
+    parser.add_argument('--api-url', default=os.getenv('GITHUB_API_URL', 'https://api.github.com'),
+                       help='GitHub API base URL')
     
     args = parser.parse_args()
     
@@ -215,7 +397,7 @@ def main():
         print("❌ Error: GitHub token required. Set GITHUB_TOKEN env var or use --token")
         sys.exit(1)
     
-    manager = SecretPatternManager(token)
+    manager = SecretPatternManager(token, base_url=args.api_url, max_workers=args.workers)
     
     try:
         if args.action == 'list':
@@ -274,6 +456,20 @@ def main():
                 sys.exit(1)
             
             manager.import_patterns(args.org, args.file)
+        
+        elif args.action == 'reconcile':
+            # 期望狀態：--file 中的模式，未指定時使用企業級模式集
+            if args.file:
+                with open(args.file, 'r') as f:
+                    desired = json.load(f)
+            else:
+                desired = ENTERPRISE_PATTERNS
+            orgs = [org.strip() for org in args.org.split(',') if org.strip()]
+            
+            print(f"Reconciling {len(desired)} patterns across {len(orgs)} organization(s)...")
+            summary = manager.reconcile(orgs, desired, prune=args.prune, dry_run=args.dry_run)
+            if manager.print_reconcile_summary(summary, dry_run=args.dry_run):
+                sys.exit(1)
     
     except KeyboardInterrupt:
         print("\n⚠️  Operation cancelled by user")
@@ -0,0 +1,123 @@
+"""
+Shared fixtures for script tests
+腳本測試共用夾具：本地樁 HTTP 服務器與按文件路徑加載腳本
+"""
+
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_script(filename: str):
+    """按文件名加載腳本模塊（腳本文件名含連字符，不能直接 import）"""
+    path = SCRIPTS_DIR / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubServer:
+    """
+    本地樁 HTTP 服務器
+
+    routes: (方法, 路徑) -> handler(request) -> (狀態碼, 標頭, JSON 內容)；
+    以 '/' 結尾的路徑匹配其下所有子路徑。
+    request 為 {'method', 'path', 'query', 'headers', 'body'}。
+    所有請求按順序記錄在 requests 中。
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                request = {
+                    'method': self.command,
+                    'path': parts.path,
+                    'query': parts.query,
+                    'headers': dict(self.headers),
+                    'body': json.loads(body) if body else None,
+                }
+                with stub._lock:
+                    stub.requests.append(request)
+                route = stub.match(self.command, parts.path)
+                if route is None:
+                    status, headers, payload = 404, {}, {'message': 'Not Found'}
+                else:
+                    status, headers, payload = route(request)
+
+                data = b'' if payload is None or status == 304 else json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if data:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+
+    def match(self, method: str, path: str):
+        """查找路由：完全匹配優先，其次為最長的前綴路由"""
+        route = self.routes.get((method, path))
+        if route is not None:
+            return route
+        prefixes = [
+            prefix for (route_method, prefix) in self.routes
+            if route_method == method and prefix.endswith('/') and path.startswith(prefix)
+        ]
+        return self.routes[(method, max(prefixes, key=len))] if prefixes else None
+
+    def route(self, method: str, path: str):
+        """註冊路由處理函數（裝飾器）"""
+        def register(handler):
+            self.routes[(method, path)] = handler
+            return handler
+        return register
+
+    def calls(self, method: str, path: str = None):
+        """指定方法（及路徑）的已記錄請求"""
+        return [
+            r for r in self.requests
+            if r['method'] == method and (path is None or r['path'] == path)
+        ]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """啟動本地樁 HTTP 服務器，測試結束後關閉"""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,161 @@
+"""
+Tests for manage-secret-patterns.py
+自定義秘密掃描模式同步測試（本地樁 HTTP 服務器）
+"""
+
+import pytest
+from conftest import load_script
+
+patterns_script = load_script('manage-secret-patterns.py')
+plan_reconcile = patterns_script.plan_reconcile
+
+ORG_PATH = '/orgs/{org}/secret-scanning/custom-patterns'
+
+
+class FakeCustomPatterns:
+    """內存中的 custom-patterns API（每頁 2 個，Link 翻頁）"""
+
+    PAGE_SIZE = 2
+
+    def __init__(self, server, orgs):
+        self.server = server
+        self.patterns = {org: {} for org in orgs}
+        self.next_id = 1
+        # 依序注入的 POST 回應狀態碼（模擬閘道錯誤等）；None 為正常處理
+        self.post_faults = []
+        for org in orgs:
+            path = ORG_PATH.format(org=org)
+            server.routes[('GET', path)] = lambda r, org=org: self.list(org, r)
+            server.routes[('POST', path)] = lambda r, org=org: self.create(org, r)
+            server.routes[('PATCH', path + '/')] = lambda r, org=org: self.update(org, r)
+            server.routes[('DELETE', path + '/')] = lambda r, org=org: self.delete(org, r)
+
+    def add(self, org, **pattern):
+        pattern['id'] = self.next_id
+        self.next_id += 1
+        self.patterns[org][pattern['id']] = pattern
+        return pattern
+
+    def list(self, org, request):
+        page = int(dict(p.split('=') for p in request['query'].split('&') if p).get('page', 1))
+        items = sorted(self.patterns[org].values(), key=lambda p: p['id'])
+        start = (page - 1) * self.PAGE_SIZE
+        headers = {}
+        if start + self.PAGE_SIZE < len(items):
+            headers['Link'] = f'<{self.server.url}{request["path"]}?page={page + 1}>; rel="next"'
+        return 200, headers, items[start:start + self.PAGE_SIZE]
+
+    def create(self, org, request):
+        fault = self.post_faults.pop(0) if self.post_faults else None
+        if fault == 429:
+            return 429, {'Retry-After': '0'}, {'message': 'secondary rate limit'}
+        created = self.add(org, **request['body'])
+        if fault is not None:
+            # 已提交但閘道返回錯誤
+            return fault, {}, {'message': 'Bad Gateway'}
+        return 201, {}, created
+
+    def update(self, org, request):
+        pattern_id = int(request['path'].rsplit('/', 1)[1])
+        if pattern_id not in self.patterns[org]:
+            return 404, {}, {'message': 'Not Found'}
+        self.patterns[org][pattern_id].update(request['body'])
+        return 200, {}, self.patterns[org][pattern_id]
+
+    def delete(self, org, request):
+        pattern_id = int(request['path'].rsplit('/', 1)[1])
+        if self.patterns[org].pop(pattern_id, None) is None:
+            return 404, {}, {'message': 'Not Found'}
+        return 204, {}, None
+
+    def names(self, org):
+        return sorted(p['name'] for p in self.patterns[org].values())
+
+
+DESIRED = [
+    {'name': 'Alpha', 'regex': 'alpha_[0-9]{8}', 'secret_type': 'alpha'},
+    {'name': 'Beta', 'regex': 'beta_[0-9]{8}', 'secret_type': 'beta'},
+    {'name': 'Gamma', 'regex': 'gamma_[0-9]{8}', 'secret_type': 'gamma'},
+]
+
+
+@pytest.fixture
+def github(stub_server):
+    """兩個組織：org-a 有過時和多餘的模式，org-b 為空"""
+    fake = FakeCustomPatterns(stub_server, ['org-a', 'org-b'])
+    fake.add('org-a', name='Alpha', regex='alpha_[0-9]{8}', secret_type='alpha')
+    fake.add('org-a', name='Beta', regex='beta_old', secret_type='beta')
+    fake.add('org-a', name='Legacy', regex='legacy', secret_type='legacy')
+    return fake
+
+
+@pytest.fixture
+def manager(stub_server, monkeypatch):
+    monkeypatch.setattr(patterns_script.time, 'sleep', lambda seconds: None)
+    return patterns_script.SecretPatternManager('token', base_url=stub_server.url, max_workers=4, backoff=0)
+
+
+def test_plan_reconcile():
+    """測試按名稱與內容雜湊計算 create/update/delete"""
+    existing = [
+        {'id': 1, 'name': 'Alpha', 'secret_type': 'alpha', 'regex': 'alpha_[0-9]{8}', 'scope': 'org'},
+        {'id': 2, 'name': 'Beta', 'regex': 'beta_old', 'secret_type': 'beta'},
+        {'id': 3, 'name': 'Legacy', 'regex': 'legacy', 'secret_type': 'legacy'},
+    ]
+
+    plan = plan_reconcile(existing, DESIRED, prune=True)
+
+    assert plan['create'] == [DESIRED[2]]
+    assert plan['update'] == [(2, DESIRED[1])]
+    assert [p['id'] for p in plan['delete']] == [3]
+    assert plan['unchanged'] == ['Alpha']
+    assert plan_reconcile(existing, DESIRED)['delete'] == []
+
+
+def test_reconcile_applies_changes_then_is_idempotent(stub_server, github, manager):
+    """測試多組織同步套用變更，第二次運行不產生任何寫入"""
+    summary = manager.reconcile(['org-a', 'org-b'], DESIRED, prune=True)
+
+    assert summary['org-a'] == {'create': 1, 'update': 1, 'delete': 1, 'unchanged': 1, 'failed': 0}
+    assert summary['org-b'] == {'create': 3, 'update': 0, 'delete': 0, 'unchanged': 0, 'failed': 0}
+    for org in ('org-a', 'org-b'):
+        assert github.names(org) == ['Alpha', 'Beta', 'Gamma']
+    beta = next(p for p in github.patterns['org-a'].values() if p['name'] == 'Beta')
+    assert beta['regex'] == 'beta_[0-9]{8}'
+
+    writes = len([r for r in stub_server.requests if r['method'] != 'GET'])
+    second = manager.reconcile(['org-a', 'org-b'], DESIRED, prune=True)
+
+    assert second['org-a'] == second['org-b'] == {
+        'create': 0, 'update': 0, 'delete': 0, 'unchanged': 3, 'failed': 0
+    }
+    assert len([r for r in stub_server.requests if r['method'] != 'GET']) == writes
+
+
+def test_dry_run_makes_no_writes(stub_server, github, manager):
+    """測試 dry_run 只計算變更"""
+    summary = manager.reconcile(['org-a'], DESIRED, prune=True, dry_run=True)
+
+    assert summary['org-a']['create'] == 1
+    assert stub_server.calls('POST') == stub_server.calls('PATCH') == stub_server.calls('DELETE') == []
+
+
+def test_create_not_duplicated_after_gateway_error(stub_server, github, manager):
+    """測試 POST 已提交但回應 502 時不重送，429 時重送"""
+    github.post_faults = [502]
+    assert manager.create_custom_pattern('org-b', DESIRED[0])['name'] == 'Alpha'
+    assert github.names('org-b') == ['Alpha']
+    assert len(stub_server.calls('POST')) == 1
+
+    github.post_faults = [429]
+    assert manager.create_custom_pattern('org-b', DESIRED[1])['name'] == 'Beta'
+    assert github.names('org-b') == ['Alpha', 'Beta']
+    assert len(stub_server.calls('POST')) == 3
+
+
+def test_unknown_org_reports_error(stub_server, github, manager):
+    """測試無法列出模式的組織報告錯誤且不影響其他組織"""
+    summary = manager.reconcile(['org-b', 'missing'], DESIRED)
+
+    assert summary['missing'] == {'error': 'failed to list existing patterns'}
+    assert summary['org-b']['create'] == 3
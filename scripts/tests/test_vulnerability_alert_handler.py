@@ -0,0 +1,152 @@
+"""
+Tests for GitHubFetcher in vulnerability-alert-handler.py
+GitHub 分頁抓取器測試（本地樁 HTTP 服務器）
+"""
+
+import time
+
+import pytest
+from conftest import load_script
+
+handler = load_script('vulnerability-alert-handler.py')
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    """使用臨時磁碟快取的抓取器"""
+    return handler.GitHubFetcher({'Authorization': 'token test'}, cache_dir=str(tmp_path / 'cache'),
+                                 max_workers=4)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """記錄速率限制等待時間，不實際睡眠"""
+    delays = []
+    monkeypatch.setattr(handler.time, 'sleep', delays.append)
+    return delays
+
+
+def paged_route(server, path, pages, etag=None):
+    """註冊按 ?page=N 分頁的路由，非末頁帶 Link rel="next" """
+    def respond(request):
+        page = int(dict(p.split('=') for p in request['query'].split('&') if p).get('page', 1))
+        headers = {}
+        if page < len(pages):
+            headers['Link'] = f'<{server.url}{path}?page={page + 1}>; rel="next", <{server.url}{path}?page={len(pages)}>; rel="last"'
+        if etag:
+            tag = f'"{etag}-{page}"'
+            if request['headers'].get('If-None-Match') == tag:
+                return 304, {'ETag': tag}, None
+            headers['ETag'] = tag
+        return 200, headers, pages[page - 1]
+    server.routes[('GET', path)] = respond
+
+
+def test_follows_link_pagination(stub_server, fetcher):
+    """測試沿 Link header 的 rel="next" 翻頁"""
+    paged_route(stub_server, '/items', [[{'n': 1}, {'n': 2}], [{'n': 3}], [{'n': 4}]])
+
+    items, status = fetcher.get_paginated(f'{stub_server.url}/items', {'per_page': 2})
+
+    assert status is None
+    assert [item['n'] for item in items] == [1, 2, 3, 4]
+    assert [r['query'] for r in stub_server.requests] == ['per_page=2', 'page=2', 'page=3']
+
+
+def test_not_modified_served_from_disk_cache(stub_server, fetcher, tmp_path):
+    """測試 304 回應使用磁碟快取（新的抓取器實例同樣命中）"""
+    paged_route(stub_server, '/alerts', [[{'n': 1}], [{'n': 2}]], etag='v1')
+    url = f'{stub_server.url}/alerts'
+
+    first, _ = fetcher.get_paginated(url)
+    second_fetcher = handler.GitHubFetcher({}, cache_dir=str(tmp_path / 'cache'))
+    second, status = second_fetcher.get_paginated(url)
+
+    assert status is None
+    assert first == second == [{'n': 1}, {'n': 2}]
+    assert second_fetcher.stats['not_modified'] == 2
+    conditional = stub_server.requests[2:]
+    assert [r['headers'].get('If-None-Match') for r in conditional] == ['"v1-1"', '"v1-2"']
+
+
+def test_waits_for_rate_limit_reset(stub_server, fetcher, sleeps):
+    """測試 X-RateLimit-Remaining: 0 時等待至重置時間後再請求"""
+    reset = int(time.time()) + 30
+    remaining = iter(['0', '4999'])
+
+    @stub_server.route('GET', '/limited')
+    def limited(request):
+        headers = {'X-RateLimit-Remaining': next(remaining), 'X-RateLimit-Reset': str(reset)}
+        if request['query'] != 'page=2':
+            headers['Link'] = f'<{stub_server.url}/limited?page=2>; rel="next"'
+        return 200, headers, [{'n': len(stub_server.requests)}]
+
+    items, status = fetcher.get_paginated(f'{stub_server.url}/limited')
+
+    assert status is None and len(items) == 2
+    assert len(sleeps) == 1 and 29 <= sleeps[0] <= 32
+    assert fetcher.stats['rate_limit_waits'] == 1
+
+
+def test_retries_rate_limited_response(stub_server, fetcher, sleeps):
+    """測試 403 + X-RateLimit-Remaining: 0 回應等待重置後重試"""
+    reset = int(time.time()) + 10
+    responses = iter([
+        (403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}, {'message': 'rate limited'}),
+        (200, {'X-RateLimit-Remaining': '4999'}, [{'n': 1}]),
+    ])
+    stub_server.routes[('GET', '/retry')] = lambda request: next(responses)
+
+    items, status = fetcher.get_paginated(f'{stub_server.url}/retry')
+
+    assert status is None and items == [{'n': 1}]
+    assert len(stub_server.requests) == 2
+    assert sleeps and 9 <= sleeps[-1] <= 12
+
+
+def test_map_paginated_several_repos(stub_server, fetcher):
+    """測試多倉庫並行抓取：各自翻頁、停止條件與 404"""
+    for repo in ('a', 'b', 'c'):
+        paged_route(stub_server, f'/repos/org/{repo}/alerts',
+                    [[{'repo': repo, 'n': 1}, {'repo': repo, 'n': 2}], [{'repo': repo, 'n': 3}]])
+    urls = [f'{stub_server.url}/repos/org/{repo}/alerts' for repo in ('a', 'b', 'c', 'missing')]
+
+    results = fetcher.map_paginated(urls, {'per_page': 2}, stop_when={urls[1]: lambda item: item['n'] == 2})
+
+    assert list(results) == urls
+    assert [item['n'] for item in results[urls[0]][0]] == [1, 2, 3]
+    assert results[urls[1]] == ([{'repo': 'b', 'n': 1}], None)
+    assert [item['n'] for item in results[urls[2]][0]] == [1, 2, 3]
+    assert results[urls[3]] == ([], 404)
+    # 停止條件命中後不再請求下一頁
+    assert len(stub_server.calls('GET', '/repos/org/b/alerts')) == 1
+
+
+def _alert(number, updated_at, severity='high'):
+    return {
+        'number': number,
+        'state': 'open',
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': updated_at,
+        'dependency': {'package': {'name': f'pkg{number}'}, 'manifest_path': 'package.json'},
+        'security_advisory': {'severity': severity, 'vulnerabilities': []},
+        'repository': {'full_name': 'org/app'},
+    }
+
+
+def test_sync_refetches_alerts_at_sync_point(stub_server, tmp_path):
+    """測試與同步點同一秒更新的告警在下次增量同步時被抓到"""
+    alerts = [_alert(1, '2024-05-01T10:00:00Z'), _alert(2, '2024-04-01T10:00:00Z')]
+    stub_server.routes[('GET', '/orgs/org/dependabot/alerts')] = lambda request: (200, {}, list(alerts))
+    manager = handler.VulnerabilityManager('token', 'org', api_url=stub_server.url, cache_dir=None)
+    store = handler.AlertStore(str(tmp_path / 'alerts.db'))
+
+    first = manager.sync_alerts(store)
+    # 同步後同一秒內又有告警更新
+    alerts.insert(0, _alert(3, '2024-05-01T10:00:00Z'))
+    second = manager.sync_alerts(store)
+    store.close()
+
+    assert [a.id for a in first['new']] == ['1', '2']
+    assert [a.id for a in second['new']] == ['3']
+    assert second['resolved'] == second['escalated'] == []
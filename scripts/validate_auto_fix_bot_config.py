@@ -6,16 +6,18 @@
 """
 
 import sys
-import yaml
 import json
 from pathlib import Path
 from typing import Dict, List, Any
 
+# 共用 YAML 載入工具位於 tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from yaml_loader import load_file
+
 def load_yaml(file_path: Path) -> Dict[str, Any]:
-    """載入 YAML 配置檔案"""
+    """載入 YAML 配置檔案（優先使用 libyaml CSafeLoader）"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_file(file_path)
     except Exception as e:
         print(f"❌ 無法載入 YAML 檔案: {e}")
         sys.exit(1)
@@ -7,10 +7,20 @@ Vulnerability Alert Handler
 import requests
 import json
 import argparse
+import hashlib
+import os
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, List, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+
+DEFAULT_API_URL = 'https://api.github.com'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'vulnerability-alert-handler')
 
 
 @dataclass
@@ -25,6 +35,8 @@ class VulnerabilityAlert:
     repository: str
     created_at: str
     manifest_path: str
+    state: str = 'open'
+    updated_at: Optional[str] = None
     
     def age_days(self) -> int:
         """計算告警存在天數"""
@@ -32,6 +44,407 @@ class VulnerabilityAlert:
         return (datetime.now(created.tzinfo) - created).days
 
 
+class GitHubFetcher:
+    """
+    GitHub REST API 分頁抓取器
+    
+    - 共用連線池的 requests.Session，多倉庫以有界線程池並行抓取
+    - 依 Link header 的 rel="next" 翻頁
+    - 依 X-RateLimit-Remaining / X-RateLimit-Reset 在配額將盡時等待重置
+    - 磁碟上的條件請求快取（ETag / Last-Modified）：未變更頁面回應 304，
+      直接使用快取內容，且不消耗 GitHub 速率配額
+    """
+    
+    def __init__(self, headers: Dict[str, str], cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_workers: int = 8, min_rate_remaining: int = 10, max_rate_wait: float = 900.0,
+                 timeout: float = 30.0):
+        self.cache_dir = cache_dir
+        self.max_workers = max(1, max_workers)
+        self.min_rate_remaining = min_rate_remaining
+        self.max_rate_wait = max_rate_wait
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'not_modified': 0, 'rate_limit_waits': 0}
+        
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        self._lock = threading.Lock()
+        self._rate_remaining: Optional[int] = None
+        self._rate_reset: float = 0.0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    # ---- 條件請求快取 ----
+    
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+    
+    def _load_cached(self, url: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cached(self, url: str, response: requests.Response, data: Any):
+        if not self.cache_dir:
+            return
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        if not any(validators.values()):
+            return
+        entry = {**validators, 'next': response.links.get('next', {}).get('url'), 'data': data}
+        path = self._cache_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    
+    # ---- 速率限制 ----
+    
+    def _update_rate_limit(self, response: requests.Response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None:
+            return
+        with self._lock:
+            self._rate_remaining = int(remaining)
+            if reset:
+                self._rate_reset = float(reset)
+    
+    def _wait_for_rate_limit(self):
+        """配額低於 min_rate_remaining 時等待至重置時間（所有工作線程共用）"""
+        with self._lock:
+            if self._rate_remaining is None or self._rate_remaining > self.min_rate_remaining:
+                return
+            delay = min(max(self._rate_reset - time.time(), 0.0) + 1.0, self.max_rate_wait)
+            # 等待後重新以回應標頭為準
+            self._rate_remaining = None
+            self.stats['rate_limit_waits'] += 1
+        print(f"Rate limit nearly exhausted, waiting {delay:.0f}s for reset...")
+        time.sleep(delay)
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """主要/次要速率限制回應（403/429）需等待的秒數"""
+        if response.status_code not in (403, 429):
+            return None
+        if response.headers.get('Retry-After'):
+            return float(response.headers['Retry-After'])
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            return max(float(response.headers.get('X-RateLimit-Reset', 0)) - time.time(), 0.0) + 1.0
+        return None
+    
+    # ---- 請求 ----
+    
+    def _get(self, url: str, params: Optional[Dict] = None, max_attempts: int = 3) -> Tuple[requests.Response, Optional[Dict]]:
+        """發送（條件）GET 請求，返回 (回應, 命中的快取項)"""
+        cache_key = requests.Request('GET', url, params=params).prepare().url
+        cached = self._load_cached(cache_key)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        for attempt in range(max_attempts):
+            self._wait_for_rate_limit()
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            with self._lock:
+                self.stats['requests'] += 1
+            self._update_rate_limit(response)
+            
+            delay = self._retry_after(response)
+            if delay is None or attempt == max_attempts - 1:
+                break
+            with self._lock:
+                self.stats['rate_limit_waits'] += 1
+            print(f"Rate limited ({response.status_code}), retrying in {min(delay, self.max_rate_wait):.0f}s...")
+            time.sleep(min(delay, self.max_rate_wait))
+        
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.stats['not_modified'] += 1
+            return response, cached
+        if response.status_code == 200 and self.cache_dir:
+            self._store_cached(cache_key, response, response.json())
+        return response, None
+    
+    def get_paginated(self, url: str, params: Optional[Dict] = None,
+                      stop_when: Optional[Callable[[Dict], bool]] = None) -> Tuple[List[Dict], Optional[int]]:
+        """
+        沿 Link header 抓取所有分頁
+        
+        Args:
+            url: 首頁 URL
+            params: 首頁查詢參數
+            stop_when: 遇到滿足條件的項目即停止翻頁（該項目不返回），
+                用於按 updated 排序的增量同步
+        
+        Returns:
+            (所有項目, 首個非 200/304 的狀態碼；全部成功時為 None)
+        """
+        items: List[Dict] = []
+        next_url, next_params = url, params
+        
+        while next_url:
+            response, cached = self._get(next_url, next_params)
+            if cached is not None:
+                data, next_url = cached['data'], cached.get('next')
+            elif response.status_code == 200:
+                data, next_url = response.json(), response.links.get('next', {}).get('url')
+            else:
+                if response.status_code != 404:
+                    print(f"Error fetching {next_url}: {response.status_code}")
+                    print(f"Response: {response.text}")
+                return items, response.status_code
+            
+            if not data:
+                break
+            if stop_when is not None:
+                for index, item in enumerate(data):
+                    if stop_when(item):
+                        items.extend(data[:index])
+                        return items, None
+            items.extend(data)
+            # next 連結已包含查詢參數
+            next_params = None
+        
+        return items, None
+    
+    def map_paginated(self, urls: List[str], params: Optional[Dict] = None,
+                      stop_when: Optional[Dict[str, Callable[[Dict], bool]]] = None
+                      ) -> Dict[str, Tuple[List[Dict], Optional[int]]]:
+        """以有界線程池並行抓取多個分頁資源（stop_when: url -> 停止條件）"""
+        stop_when = stop_when or {}
+        
+        def fetch(url):
+            try:
+                return self.get_paginated(url, params, stop_when.get(url))
+            except requests.exceptions.RequestException as e:
+                print(f"Request error for {url}: {e}")
+                return [], -1
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(urls, executor.map(fetch, urls)))
+
+
+ALERT_CATEGORIES = ('critical_immediate', 'high_urgent', 'moderate_scheduled', 'low_routine')
+
+# 與 VulnerabilityManager.categorize_alerts 相同的分類規則
+_CATEGORY_SQL = """
+    CASE
+        WHEN severity = 'critical' THEN 'critical_immediate'
+        WHEN severity = 'high' OR (severity = 'moderate' AND age_days > 7) THEN 'high_urgent'
+        WHEN severity IN ('moderate', 'medium') OR age_days > 30 THEN 'moderate_scheduled'
+        ELSE 'low_routine'
+    END
+"""
+
+
+class AlertStore:
+    """
+    本地 SQLite 告警狀態庫
+    
+    告警以 (repo, number) 為主鍵 upsert，severity_rank 與 created_at 建有索引。
+    每個同步範圍（組織或倉庫）記錄最後一次同步的 updated_at，
+    後續只需抓取此後更新過的告警；報告與修復計畫直接由索引查詢產生。
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS alerts (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            severity_rank INTEGER NOT NULL,
+            package_name TEXT NOT NULL,
+            affected_version TEXT,
+            fixed_version TEXT,
+            cve_id TEXT,
+            manifest_path TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            PRIMARY KEY (repo, number)
+        );
+        CREATE INDEX IF NOT EXISTS idx_alerts_state_severity ON alerts (state, severity_rank);
+        CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts (created_at);
+        CREATE TABLE IF NOT EXISTS sync_state (
+            scope TEXT PRIMARY KEY,
+            last_updated_at TEXT NOT NULL,
+            synced_at TEXT NOT NULL
+        );
+    """
+    
+    ALERT_COLUMNS = ('number', 'severity', 'package_name', 'affected_version', 'fixed_version',
+                     'cve_id', 'repo', 'created_at', 'manifest_path', 'state', 'updated_at')
+    
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    # ---- 同步狀態 ----
+    
+    def last_sync(self, scope: str) -> Optional[str]:
+        """範圍內已同步告警的最大 updated_at"""
+        row = self.conn.execute('SELECT last_updated_at FROM sync_state WHERE scope = ?', (scope,)).fetchone()
+        return row['last_updated_at'] if row else None
+    
+    def mark_synced(self, scope: str, alerts: List[VulnerabilityAlert]):
+        """以本次抓到的最大 updated_at 推進同步點（伺服器時間，不受本地時鐘偏差影響）"""
+        latest = max((a.updated_at for a in alerts if a.updated_at), default=None)
+        previous = self.last_sync(scope)
+        if latest is None or (previous and previous >= latest):
+            return
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO sync_state (scope, last_updated_at, synced_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (scope) DO UPDATE SET last_updated_at = excluded.last_updated_at, '
+                'synced_at = excluded.synced_at',
+                (scope, latest, datetime.utcnow().isoformat() + 'Z')
+            )
+    
+    # ---- 寫入 ----
+    
+    def upsert(self, alerts: Iterable[VulnerabilityAlert]) -> Dict[str, List[VulnerabilityAlert]]:
+        """
+        寫入告警並計算變化
+        
+        Returns:
+            {'new': 新出現或重新開啟, 'resolved': 由開啟轉為已修復/忽略,
+             'escalated': 嚴重度上升} 三類告警
+        """
+        deltas = {'new': [], 'resolved': [], 'escalated': []}
+        now = datetime.utcnow().isoformat() + 'Z'
+        rows = []
+        
+        for alert in alerts:
+            number = int(alert.id)
+            rank = VulnerabilityManager.SEVERITY_ORDER.get(alert.severity, 0)
+            previous = self.conn.execute(
+                'SELECT state, severity_rank FROM alerts WHERE repo = ? AND number = ?',
+                (alert.repository, number)
+            ).fetchone()
+            
+            if alert.state == 'open':
+                if previous is None or previous['state'] != 'open':
+                    deltas['new'].append(alert)
+                elif rank > previous['severity_rank']:
+                    deltas['escalated'].append(alert)
+            elif previous is not None and previous['state'] == 'open':
+                deltas['resolved'].append(alert)
+            
+            rows.append((
+                alert.repository, number, alert.state, alert.severity, rank, alert.package_name,
+                alert.affected_version, alert.fixed_version, alert.cve_id, alert.manifest_path,
+                alert.created_at, alert.updated_at, now, now
+            ))
+        
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO alerts (repo, number, state, severity, severity_rank, package_name,
+                                    affected_version, fixed_version, cve_id, manifest_path,
+                                    created_at, updated_at, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (repo, number) DO UPDATE SET
+                    state = excluded.state,
+                    severity = excluded.severity,
+                    severity_rank = excluded.severity_rank,
+                    package_name = excluded.package_name,
+                    affected_version = excluded.affected_version,
+                    fixed_version = excluded.fixed_version,
+                    cve_id = excluded.cve_id,
+                    manifest_path = excluded.manifest_path,
+                    updated_at = excluded.updated_at,
+                    last_seen = excluded.last_seen
+            """, rows)
+        
+        return deltas
+    
+    # ---- 查詢 ----
+    
+    def _to_alert(self, row: sqlite3.Row) -> VulnerabilityAlert:
+        return VulnerabilityAlert(
+            id=str(row['number']),
+            severity=row['severity'],
+            package_name=row['package_name'],
+            affected_version=row['affected_version'],
+            fixed_version=row['fixed_version'],
+            cve_id=row['cve_id'],
+            repository=row['repo'],
+            created_at=row['created_at'],
+            manifest_path=row['manifest_path'],
+            state=row['state'],
+            updated_at=row['updated_at']
+        )
+    
+    def _select(self, where: str = '', params: Tuple = (), order: str = 'severity_rank DESC, created_at',
+                limit: Optional[int] = None, min_rank: int = 0) -> List[VulnerabilityAlert]:
+        sql = f"SELECT * FROM alerts WHERE state = 'open' AND severity_rank >= ? {where} ORDER BY {order}"
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [self._to_alert(row) for row in self.conn.execute(sql, (min_rank, *params))]
+    
+    def open_alerts(self, min_rank: int = 0) -> List[VulnerabilityAlert]:
+        """所有開啟中的告警（依嚴重度排序）"""
+        return self._select(min_rank=min_rank)
+    
+    def categorized(self, min_rank: int = 0) -> Dict[str, List[VulnerabilityAlert]]:
+        """依 SLA 分類開啟中的告警，分類在 SQL 中完成"""
+        categories = {category: [] for category in ALERT_CATEGORIES}
+        rows = self.conn.execute(f"""
+            SELECT *, {_CATEGORY_SQL} AS category FROM (
+                SELECT *, CAST(julianday('now') - julianday(created_at) AS INTEGER) AS age_days
+                FROM alerts WHERE state = 'open' AND severity_rank >= ?
+            ) ORDER BY severity_rank DESC, created_at
+        """, (min_rank,))
+        for row in rows:
+            categories[row['category']].append(self._to_alert(row))
+        return categories
+    
+    def advisory_summary(self, min_rank: int = 0) -> Dict:
+        """安全建議報告所需的統計（聚合查詢，不載入全部告警）"""
+        base = "FROM alerts WHERE state = 'open' AND severity_rank >= ?"
+        severity_counts = {
+            row['severity']: row['count']
+            for row in self.conn.execute(f'SELECT severity, COUNT(*) AS count {base} GROUP BY severity', (min_rank,))
+        }
+        top_packages = [
+            (row['package_name'], row['count'])
+            for row in self.conn.execute(
+                f'SELECT package_name, COUNT(*) AS count {base} GROUP BY package_name '
+                f'ORDER BY count DESC, MIN(rowid) LIMIT 10', (min_rank,))
+        ]
+        cve_total = self.conn.execute(f'SELECT COUNT(*) {base} AND cve_id IS NOT NULL', (min_rank,)).fetchone()[0]
+        return {
+            'total': sum(severity_counts.values()),
+            'severity_counts': severity_counts,
+            'top_packages': top_packages,
+            'cve_total': cve_total,
+            'cve_alerts': self._select('AND cve_id IS NOT NULL', order='rowid', limit=10, min_rank=min_rank),
+            'critical_alerts': self._select("AND severity = 'critical'", order='rowid', limit=5, min_rank=min_rank),
+            'high_count': severity_counts.get('high', 0)
+        }
+
+
 class VulnerabilityManager:
     """漏洞管理器"""
     
@@ -43,76 +456,139 @@ class VulnerabilityManager:
         'low': 1
     }
     
-    def __init__(self, token: str, org: str):
+    def __init__(self, token: str, org: str, api_url: str = DEFAULT_API_URL,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_workers: int = 8):
         self.token = token
         self.org = org
+        self.api_url = api_url.rstrip('/')
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github+json',
             'X-GitHub-Api-Version': '2022-11-28'
         }
+        self.fetcher = GitHubFetcher(self.headers, cache_dir=cache_dir, max_workers=max_workers)
+    
+    def _alerts_url(self, repo: Optional[str] = None) -> str:
+        if repo:
+            return f'{self.api_url}/repos/{self.org}/{repo}/dependabot/alerts'
+        return f'{self.api_url}/orgs/{self.org}/dependabot/alerts'
+    
+    def _parse_alert(self, alert_data: Dict, repo: Optional[str] = None) -> VulnerabilityAlert:
+        """將 API 回應轉為 VulnerabilityAlert"""
+        # Extract fixed version from vulnerabilities
+        fixed_version = None
+        vulnerabilities = alert_data.get('security_advisory', {}).get('vulnerabilities', [])
+        if vulnerabilities:
+            fixed_version = vulnerabilities[0].get('patched_versions', 'N/A')
         
+        return VulnerabilityAlert(
+            id=str(alert_data['number']),
+            severity=alert_data['security_advisory']['severity'].lower(),
+            package_name=alert_data['dependency']['package']['name'],
+            affected_version=alert_data['dependency'].get('manifest_path', 'N/A'),
+            fixed_version=fixed_version,
+            cve_id=alert_data['security_advisory'].get('cve_id'),
+            repository=alert_data.get('repository', {}).get('full_name', f"{self.org}/{repo}"),
+            created_at=alert_data['created_at'],
+            manifest_path=alert_data['dependency'].get('manifest_path', 'N/A'),
+            state=alert_data.get('state', 'open'),
+            updated_at=alert_data.get('updated_at')
+        )
+    
     def get_vulnerability_alerts(self, repo: Optional[str] = None, 
                                 state: str = 'open') -> List[VulnerabilityAlert]:
         """取得漏洞告警清單"""
-        if repo:
-            url = f'https://api.github.com/repos/{self.org}/{repo}/dependabot/alerts'
-        else:
-            url = f'https://api.github.com/orgs/{self.org}/dependabot/alerts'
-            
-        alerts = []
-        page = 1
-        
+        url = self._alerts_url(repo)
         print(f"Fetching vulnerability alerts from {url}...")
         
-        while True:
-            try:
-                response = requests.get(
-                    f"{url}?state={state}&per_page=100&page={page}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 404:
-                    print(f"Warning: Repository or organization not found or Dependabot not enabled")
-                    break
-                elif response.status_code != 200:
-                    print(f"Error fetching alerts: {response.status_code}")
-                    print(f"Response: {response.text}")
-                    break
-                    
-                data = response.json()
-                if not data:
-                    break
-                    
-                for alert_data in data:
-                    # Extract fixed version from vulnerabilities
-                    fixed_version = None
-                    vulnerabilities = alert_data.get('security_advisory', {}).get('vulnerabilities', [])
-                    if vulnerabilities:
-                        fixed_version = vulnerabilities[0].get('patched_versions', 'N/A')
-                    
-                    alert = VulnerabilityAlert(
-                        id=str(alert_data['number']),
-                        severity=alert_data['security_advisory']['severity'].lower(),
-                        package_name=alert_data['dependency']['package']['name'],
-                        affected_version=alert_data['dependency'].get('manifest_path', 'N/A'),
-                        fixed_version=fixed_version,
-                        cve_id=alert_data['security_advisory'].get('cve_id'),
-                        repository=alert_data.get('repository', {}).get('full_name', f"{self.org}/{repo}"),
-                        created_at=alert_data['created_at'],
-                        manifest_path=alert_data['dependency'].get('manifest_path', 'N/A')
-                    )
-                    alerts.append(alert)
-                    
-                page += 1
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Request error: {e}")
-                break
-            
+        try:
+            data, status = self.fetcher.get_paginated(url, {'state': state, 'per_page': 100})
+        except requests.exceptions.RequestException as e:
+            print(f"Request error: {e}")
+            return []
+        
+        if status == 404:
+            print(f"Warning: Repository or organization not found or Dependabot not enabled")
+        
+        return [self._parse_alert(alert_data, repo) for alert_data in data]
+    
+    def list_repositories(self, include_archived: bool = False) -> List[str]:
+        """列出組織內的倉庫名稱"""
+        try:
+            data, _ = self.fetcher.get_paginated(f'{self.api_url}/orgs/{self.org}/repos',
+                                                 {'type': 'all', 'per_page': 100})
+        except requests.exceptions.RequestException as e:
+            print(f"Request error: {e}")
+            return []
+        return [repo['name'] for repo in data if include_archived or not repo.get('archived')]
+    
+    def get_alerts_for_repositories(self, repos: List[str], state: str = 'open') -> List[VulnerabilityAlert]:
+        """並行取得多個倉庫的漏洞告警（Dependabot 未啟用的倉庫略過）"""
+        print(f"Fetching vulnerability alerts from {len(repos)} repositories "
+              f"({self.fetcher.max_workers} concurrent)...")
+        urls = {self._alerts_url(repo): repo for repo in repos}
+        results = self.fetcher.map_paginated(list(urls), {'state': state, 'per_page': 100})
+        
+        alerts = []
+        for url, (data, status) in results.items():
+            if status == 404:
+                print(f"Warning: {urls[url]}: not found or Dependabot not enabled")
+            alerts.extend(self._parse_alert(alert_data, urls[url]) for alert_data in data)
+        
+        stats = self.fetcher.stats
+        print(f"  {stats['requests']} requests, {stats['not_modified']} unchanged pages served from cache")
         return alerts
     
+    def sync_alerts(self, store: AlertStore, repos: Optional[List[str]] = None,
+                    full: bool = False) -> Dict[str, List[VulnerabilityAlert]]:
+        """
+        增量同步告警到狀態庫
+        
+        依 updated 降序抓取所有狀態的告警，遇到早於上次同步點的告警即停止翻頁，
+        因此只傳輸自上次同步以來新增、修復、忽略或變更的告警。
+        
+        Args:
+            store: 告警狀態庫
+            repos: 逐倉庫同步的倉庫清單；None 時使用組織級端點
+            full: 忽略同步點，完整重新同步
+        
+        Returns:
+            new / resolved / escalated 變化
+        """
+        scopes = {self._alerts_url(repo): repo for repo in (repos or [None])}
+        params = {'sort': 'updated', 'direction': 'desc', 'per_page': 100}
+        stop_when = {}
+        for url, repo in scopes.items():
+            since = None if full else store.last_sync(self._sync_scope(repo))
+            if since:
+                # 嚴格早於同步點才停止：與同步點同一秒更新的告警可能尚未抓到，
+                # 重新抓取邊界上的告警無害（upsert 冪等）
+                stop_when[url] = lambda item, since=since: (item.get('updated_at') or '') < since
+        
+        print(f"Syncing vulnerability alerts from {len(scopes)} endpoint(s) "
+              f"({len(stop_when)} incremental)...")
+        results = self.fetcher.map_paginated(list(scopes), params, stop_when)
+        
+        deltas = {'new': [], 'resolved': [], 'escalated': []}
+        for url, (data, status) in results.items():
+            repo = scopes[url]
+            if status == 404:
+                print(f"Warning: {repo or self.org}: not found or Dependabot not enabled")
+            if status is not None:
+                continue
+            alerts = [self._parse_alert(alert_data, repo) for alert_data in data]
+            for kind, changed in store.upsert(alerts).items():
+                deltas[kind].extend(changed)
+            store.mark_synced(self._sync_scope(repo), alerts)
+        
+        print(f"  {sum(len(v) for v in deltas.values())} changes: "
+              f"{len(deltas['new'])} new, {len(deltas['resolved'])} resolved, "
+              f"{len(deltas['escalated'])} escalated")
+        return deltas
+    
+    def _sync_scope(self, repo: Optional[str]) -> str:
+        return f"{self.org}/{repo}" if repo else self.org
+    
     def categorize_alerts(self, alerts: List[VulnerabilityAlert]) -> Dict[str, List[VulnerabilityAlert]]:
         """分類告警"""
         categories = {
@@ -185,8 +661,32 @@ class VulnerabilityManager:
             
         return plan
 
-    def generate_security_advisory(self, alerts: List[VulnerabilityAlert]) -> str:
-        """產生安全建議報告"""
+    @staticmethod
+    def summarize_alerts(alerts: List[VulnerabilityAlert]) -> Dict:
+        """安全建議報告所需的統計（與 AlertStore.advisory_summary 格式相同）"""
+        severity_counts = {}
+        package_counts = {}
+        for alert in alerts:
+            severity_counts[alert.severity] = severity_counts.get(alert.severity, 0) + 1
+            package_counts[alert.package_name] = package_counts.get(alert.package_name, 0) + 1
+        cve_alerts = [a for a in alerts if a.cve_id]
+        
+        return {
+            'total': len(alerts),
+            'severity_counts': severity_counts,
+            'top_packages': sorted(package_counts.items(), key=lambda x: x[1], reverse=True)[:10],
+            'cve_total': len(cve_alerts),
+            'cve_alerts': cve_alerts[:10],
+            'critical_alerts': [a for a in alerts if a.severity == 'critical'][:5],
+            'high_count': severity_counts.get('high', 0)
+        }
+    
+    def generate_security_advisory(self, alerts: Optional[List[VulnerabilityAlert]] = None,
+                                   summary: Optional[Dict] = None) -> str:
+        """產生安全建議報告（可直接傳入 AlertStore.advisory_summary 的統計）"""
+        if summary is None:
+            summary = self.summarize_alerts(alerts or [])
+        
         report = f"""# 漏洞安全建議報告
 
 生成時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -194,17 +694,15 @@ class VulnerabilityManager:
 
 ## 摘要統計
 
-總漏洞數量: **{len(alerts)}**
+總漏洞數量: **{summary['total']}**
 """
         
-        if not alerts:
+        if not summary['total']:
             report += "\n✅ 沒有發現開放的漏洞告警。\n"
             return report
         
         # 依嚴重度統計
-        severity_counts = {}
-        for alert in alerts:
-            severity_counts[alert.severity] = severity_counts.get(alert.severity, 0) + 1
+        severity_counts = summary['severity_counts']
             
         report += "\n### 依嚴重度分布\n\n"
         severity_order = ['critical', 'high', 'moderate', 'medium', 'low']
@@ -215,29 +713,23 @@ class VulnerabilityManager:
                 report += f"{emoji.get(severity, '⚪')} **{severity.upper()}**: {count}\n"
             
         # 受影響的套件統計
-        package_counts = {}
-        for alert in alerts:
-            package_counts[alert.package_name] = package_counts.get(alert.package_name, 0) + 1
-            
         report += "\n### 受影響套件 TOP 10\n\n"
-        sorted_packages = sorted(package_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        for i, (package, count) in enumerate(sorted_packages, 1):
+        for i, (package, count) in enumerate(summary['top_packages'], 1):
             report += f"{i}. **{package}**: {count} 個漏洞\n"
             
         # CVE 統計
-        cve_alerts = [a for a in alerts if a.cve_id]
-        if cve_alerts:
-            report += f"\n### CVE 編號\n\n已識別 {len(cve_alerts)} 個 CVE 漏洞\n\n"
-            for alert in cve_alerts[:10]:
+        if summary['cve_total']:
+            report += f"\n### CVE 編號\n\n已識別 {summary['cve_total']} 個 CVE 漏洞\n\n"
+            for alert in summary['cve_alerts']:
                 report += f"- [{alert.cve_id}](https://cve.mitre.org/cgi-bin/cvename.cgi?name={alert.cve_id}) - {alert.package_name}\n"
         
         # 修復建議
         report += "\n## 修復建議\n\n"
         
-        critical_alerts = [a for a in alerts if a.severity == 'critical']
+        critical_alerts = summary['critical_alerts']
         if critical_alerts:
             report += "### 🚨 立即行動項目（Critical）\n\n"
-            for alert in critical_alerts[:5]:
+            for alert in critical_alerts:
                 report += f"#### {alert.package_name}\n"
                 report += f"- **Repository**: {alert.repository}\n"
                 report += f"- **Manifest**: `{alert.manifest_path}`\n"
@@ -248,10 +740,9 @@ class VulnerabilityManager:
                 report += f"- **告警 ID**: #{alert.id}\n"
                 report += "\n"
         
-        high_alerts = [a for a in alerts if a.severity == 'high']
-        if high_alerts:
+        if summary['high_count']:
             report += f"### ⚠️  高優先級項目（High）\n\n"
-            report += f"發現 {len(high_alerts)} 個高嚴重度漏洞，建議在 24 小時內處理。\n\n"
+            report += f"發現 {summary['high_count']} 個高嚴重度漏洞，建議在 24 小時內處理。\n\n"
         
         # SLA 建議
         report += "\n## SLA 建議\n\n"
@@ -278,6 +769,18 @@ def main():
     parser.add_argument('--token', help='GitHub Token')
     parser.add_argument('--org', required=True, help='Organization name')
     parser.add_argument('--repo', help='Repository name (optional)')
+    parser.add_argument('--repos', help='Comma-separated repository names, fetched concurrently')
+    parser.add_argument('--all-repos', action='store_true',
+                       help='Fetch alerts repository by repository across the whole organization')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default: 8)')
+    parser.add_argument('--api-url', default=os.getenv('GITHUB_API_URL', DEFAULT_API_URL),
+                       help='GitHub API base URL')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help='Conditional request (ETag) cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the conditional request cache')
+    parser.add_argument('--state-db', help='SQLite alert state store; enables incremental sync')
+    parser.add_argument('--full-sync', action='store_true', help='Ignore the last sync point of --state-db')
+    parser.add_argument('--deltas-file', help='Write new/resolved/escalated alerts of this sync as JSON')
     parser.add_argument('--severity-threshold', 
                        choices=['low', 'moderate', 'medium', 'high', 'critical'],
                        default='low',
@@ -291,31 +794,62 @@ def main():
     args = parser.parse_args()
     
     # Get token from args or environment
-    import os
     token = args.token or os.getenv('GITHUB_TOKEN')
     if not token:
         print("Error: GitHub token required. Use --token or set GITHUB_TOKEN")
         sys.exit(1)
     
-    vm = VulnerabilityManager(token, args.org)
+    vm = VulnerabilityManager(token, args.org, api_url=args.api_url,
+                              cache_dir=None if args.no_cache else args.cache_dir,
+                              max_workers=args.workers)
     
-    # Fetch alerts
-    print(f"Fetching vulnerability alerts for {args.org}...")
-    alerts = vm.get_vulnerability_alerts(args.repo)
-    print(f"Found {len(alerts)} total alerts")
+    repos = None
+    if args.all_repos or args.repos:
+        repos = args.repos.split(',') if args.repos else vm.list_repositories()
+        repos = [r.strip() for r in repos if r.strip()]
+    elif args.repo:
+        repos = [args.repo]
     
-    # Filter by severity
-    filtered_alerts = vm.filter_by_severity(alerts, args.severity_threshold)
-    print(f"After filtering by {args.severity_threshold}: {len(filtered_alerts)} alerts")
-    
-    # Generate output
-    if args.output_format == 'json':
-        # Categorize and create plan
-        categorized = vm.categorize_alerts(filtered_alerts)
-        plan = vm.create_remediation_plan(categorized)
-        output = json.dumps(plan, indent=2, ensure_ascii=False)
+    if args.state_db:
+        # Incremental sync; reports come from indexed queries on the store
+        store = AlertStore(args.state_db)
+        try:
+            deltas = vm.sync_alerts(store, repos, full=args.full_sync)
+            if args.deltas_file:
+                with open(args.deltas_file, 'w', encoding='utf-8') as f:
+                    json.dump({kind: [asdict(a) for a in changed] for kind, changed in deltas.items()},
+                              f, indent=2, ensure_ascii=False)
+                print(f"Deltas saved to {args.deltas_file}")
+            
+            min_rank = vm.SEVERITY_ORDER.get(args.severity_threshold, 0)
+            if args.output_format == 'json':
+                output = json.dumps(vm.create_remediation_plan(store.categorized(min_rank)),
+                                    indent=2, ensure_ascii=False)
+            else:
+                output = vm.generate_security_advisory(summary=store.advisory_summary(min_rank))
+        finally:
+            store.close()
     else:
-        output = vm.generate_security_advisory(filtered_alerts)
+        # Fetch alerts
+        print(f"Fetching vulnerability alerts for {args.org}...")
+        if args.all_repos or args.repos:
+            alerts = vm.get_alerts_for_repositories(repos)
+        else:
+            alerts = vm.get_vulnerability_alerts(args.repo)
+        print(f"Found {len(alerts)} total alerts")
+        
+        # Filter by severity
+        filtered_alerts = vm.filter_by_severity(alerts, args.severity_threshold)
+        print(f"After filtering by {args.severity_threshold}: {len(filtered_alerts)} alerts")
+        
+        # Generate output
+        if args.output_format == 'json':
+            # Categorize and create plan
+            categorized = vm.categorize_alerts(filtered_alerts)
+            plan = vm.create_remediation_plan(categorized)
+            output = json.dumps(plan, indent=2, ensure_ascii=False)
+        else:
+            output = vm.generate_security_advisory(filtered_alerts)
     
     # Save or print
     if args.output_file:
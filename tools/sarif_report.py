@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Unified Findings and Streaming SARIF Output
+
+Merges findings from every analyzer in this repository into one SARIF 2.1.0
+log:
+- A common Finding model with adapters for CodeIssue (advanced-system-src),
+  SecurityIssue/PerformanceIssue/ArchitectureIssue and dict issues
+  (automation-architect), TaskExecutor/CodeChecker dicts and the raw
+  bandit/safety/npm audit/snyk reports written by the docs SecurityScanner
+- Results are streamed to disk in chunks, so report size is not bounded by
+  memory
+- Stable fingerprints deduplicate the same finding reported by several tools
+
+Usage:
+    python tools/sarif_report.py -o merged.sarif \\
+        --security-reports reports/security \\
+        --issues static-issues.json:automation-architect
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+FINGERPRINT_KEY = "slasolve/v1"
+
+# Normalized severity -> SARIF result level
+SEVERITY_LEVELS = {
+    'critical': 'error',
+    'high': 'error',
+    'error': 'error',
+    'medium': 'warning',
+    'moderate': 'warning',
+    'warning': 'warning',
+    'low': 'note',
+    'info': 'note',
+    'note': 'note',
+}
+
+# GitHub code scanning ranks security results by this property
+SECURITY_SEVERITY = {
+    'critical': '9.5',
+    'high': '8.0',
+    'medium': '5.5',
+    'moderate': '5.5',
+    'low': '2.0',
+}
+
+# Generic issue types whose message identifies the actual rule
+GENERIC_TYPES = {
+    'security', 'performance', 'code_quality', 'maintainability',
+    'dependency', 'accessibility', 'compliance', 'quality'
+}
+
+# Problem classes shared across scanners: the same hardcoded password found
+# by bandit, CodeChecker and the regex SecurityScanner fingerprints alike
+# even though every tool names and numbers it differently.
+PROBLEM_CLASSES = [
+    ('hardcoded-credential', re.compile(r'password|passwd|secret|api[_ -]?key|token|credential|private[_ -]?key', re.I)),
+    ('code-execution', re.compile(r'\beval\b|\bexec\b|code execution|code injection', re.I)),
+    ('sql-injection', re.compile(r'sql', re.I)),
+    ('xss', re.compile(r'xss|innerhtml|document\.write', re.I)),
+    ('weak-crypto', re.compile(r'\bmd5\b|\bsha1\b|\bdes\b|weak[_ -]?crypto', re.I)),
+    ('path-traversal', re.compile(r'path[_ -]?traversal', re.I)),
+]
+
+# Producers whose columns are 0-based offsets (tokenize's tok.start[1]);
+# every other producer reports 1-based columns, 0 meaning "unknown".
+ZERO_BASED_COLUMN_TOOLS = {'code-checker', 'task-executor'}
+
+_SLUG_NOISE = re.compile(r'"[^"]*"|\'[^\']*\'|\([^)]*\)|\d+')
+_SLUG_SEPARATORS = re.compile(r'[^a-z]+')
+_GHSA = re.compile(r'GHSA(?:-[0-9a-z]{4}){3}', re.I)
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+@dataclass
+class Finding:
+    """One finding from any producer."""
+    rule_id: str
+    message: str
+    severity: str = 'warning'               # normalized lowercase, see SEVERITY_LEVELS
+    file: str = ''
+    line: int = 0
+    column: int = 0                         # 1-based as in SARIF; 0 = unknown
+    tool: str = 'slasolve'
+    category: Optional[str] = None          # security, performance, style, dependency...
+    cwe: Optional[str] = None               # e.g. "CWE-798"
+    help: Optional[str] = None              # recommendation / suggestion
+    key: Optional[str] = None               # identity of the underlying problem, see problem_key()
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def level(self) -> str:
+        return SEVERITY_LEVELS.get(self.severity, 'warning')
+
+    def problem_key(self) -> str:
+        """What the finding is about, independent of the tool that found it."""
+        if self.key:
+            return self.key
+        if self.category == 'security':
+            text = f"{self.rule_id} {self.message}"
+            for name, pattern in PROBLEM_CLASSES:
+                if pattern.search(text):
+                    return name
+            if self.cwe:
+                return self.cwe
+        return self.rule_id
+
+    def fingerprint(self, root: Optional[str] = None) -> str:
+        """Stable hash of location plus problem key."""
+        identity = f"{normalize_path(self.file, root)}\0{self.line}\0{self.problem_key()}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:32]
+
+
+def normalize_path(path: str, root: Optional[str] = None) -> str:
+    """Repository-relative POSIX path for locations and fingerprints."""
+    if not path:
+        return ''
+    if root and os.path.isabs(path):
+        path = os.path.relpath(path, root)
+    path = path.replace(os.sep, '/')
+    while path.startswith('./'):
+        path = path[2:]
+    return path
+
+
+def _slug(text: str) -> str:
+    text = _SLUG_NOISE.sub('', text).split(':')[0].lower()
+    return _SLUG_SEPARATORS.sub('-', text).strip('-')[:60] or 'issue'
+
+
+def _value(value: Any) -> Any:
+    # str Enums (IssueType, SeverityLevel) -> plain value
+    return getattr(value, 'value', value)
+
+
+def _normalize_cwe(value: Any) -> Optional[str]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, (list, tuple)):
+        return _normalize_cwe(value[0]) if value else None
+    if isinstance(value, dict):
+        return _normalize_cwe(value.get('id'))
+    value = str(value)
+    return value.upper() if value.upper().startswith('CWE-') else f"CWE-{value}"
+
+
+def from_issue(issue: Any, tool: Optional[str] = None, file: Optional[str] = None,
+               column_base: Optional[int] = None) -> Finding:
+    """
+    Convert an analyzer issue into a Finding.
+
+    Accepts Finding instances, issue dataclasses (CodeIssue, SecurityIssue,
+    PerformanceIssue, ArchitectureIssue) and the dict issues produced by
+    StaticAnalyzer and TaskExecutor/CodeChecker. `file` fills in the path for
+    producers that analyze a buffer (CodeChecker). `column_base` is 0 or 1
+    for the producer's column numbering; by default tools listed in
+    ZERO_BASED_COLUMN_TOOLS are 0-based and everything else 1-based.
+    """
+    if isinstance(issue, Finding):
+        return issue
+    if isinstance(issue, dict):
+        get = issue.get
+    else:
+        def get(name, default=None):
+            return getattr(issue, name, default)
+
+    issue_type = str(_value(get('type')) or 'issue')
+    type_lower = issue_type.lower()
+    generic = type_lower in GENERIC_TYPES
+    description = get('description')
+    message = get('message') or description or issue_type
+    rule_id = get('rule_id') or get('rule')
+    if not rule_id:
+        rule_id = f"{type_lower}/{_slug(message)}" if generic else issue_type
+
+    cwe = _normalize_cwe(get('cwe_id') or get('cwe'))
+    category = type_lower if generic else ('security' if cwe else None)
+
+    properties = {}
+    for name in ('confidence', 'components', 'tags', 'repair_difficulty'):
+        value = get(name)
+        if value:
+            properties[name] = list(value) if isinstance(value, (list, tuple, set)) else _value(value)
+    if description and description != message:
+        properties['description'] = description
+
+    if column_base is None:
+        column_base = 0 if tool in ZERO_BASED_COLUMN_TOOLS else 1
+    column = get('column')
+    if column is None or (column_base and not column):
+        column = 0
+    else:
+        column = int(column) + 1 - column_base
+
+    return Finding(
+        rule_id=str(rule_id),
+        message=str(message),
+        severity=str(_value(get('severity')) or 'warning').lower(),
+        file=str(get('file') or file or ''),
+        line=int(get('line') or 0),
+        column=column,
+        tool=tool or 'slasolve',
+        category=category,
+        cwe=cwe,
+        help=get('recommendation') or get('suggestion'),
+        properties=properties,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Raw scanner reports (docs/architecture/configuration/python/security_scanner.py)
+# ---------------------------------------------------------------------------
+
+def iter_bandit_report(path: str) -> Iterator[Finding]:
+    """Findings from bandit -f json output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    for result in report.get('results', []):
+        yield Finding(
+            rule_id=f"{result.get('test_id', 'B000')}:{result.get('test_name', 'bandit')}",
+            message=result.get('issue_text', ''),
+            severity=str(result.get('issue_severity', 'medium')).lower(),
+            file=result.get('filename', ''),
+            line=int(result.get('line_number') or 0),
+            column=int(result.get('col_offset') or 0) + 1,
+            tool='bandit',
+            category='security',
+            cwe=_normalize_cwe(result.get('issue_cwe')),
+            help=result.get('more_info'),
+            properties={'confidence': str(result.get('issue_confidence', '')).lower()},
+        )
+
+
+def _dependency_finding(tool: str, manifest: str, package: str, version: str,
+                        advisory: str, title: str, severity: str,
+                        cwe: Any = None, help_uri: Optional[str] = None) -> Finding:
+    advisory = advisory or _slug(title) or 'unknown'
+    return Finding(
+        rule_id=f"{tool}/{advisory}",
+        message=f"{package}{'@' + version if version else ''}: {title}",
+        severity=str(severity or 'medium').lower(),
+        file=manifest,
+        tool=tool,
+        category='dependency',
+        cwe=_normalize_cwe(cwe),
+        help=help_uri,
+        # npm audit and snyk share GHSA/CVE ids for the same advisory
+        key=f"dependency:{package}:{advisory.upper()}",
+        properties={'package': package, 'version': version},
+    )
+
+
+def iter_safety_report(path: str, manifest: str = 'requirements.txt') -> Iterator[Finding]:
+    """Findings from safety check --json (list and dict formats)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    entries = report.get('vulnerabilities', []) if isinstance(report, dict) else report
+    for entry in entries:
+        if isinstance(entry, (list, tuple)):
+            # Legacy format: [package, affected, installed, advisory, id]
+            package, _, version, title, advisory = (list(entry) + [''] * 5)[:5]
+            severity = 'high'
+        else:
+            package = entry.get('package_name') or entry.get('package', '')
+            version = entry.get('analyzed_version') or entry.get('installed_version') or entry.get('version', '')
+            title = entry.get('advisory', '')
+            advisory = entry.get('CVE') or entry.get('vulnerability_id') or entry.get('id', '')
+            severity = entry.get('severity') or 'high'
+            if isinstance(severity, dict):
+                severity = severity.get('cvssv3', {}).get('base_severity') or 'high'
+        yield _dependency_finding('safety', manifest, str(package), str(version),
+                                  str(advisory), str(title), str(severity))
+
+
+def iter_npm_audit_report(path: str, manifest: str = 'package.json') -> Iterator[Finding]:
+    """Findings from npm audit --json (npm 6 advisories and npm 7+ vulnerabilities)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    for advisory in (report.get('advisories') or {}).values():
+        url = advisory.get('url', '')
+        match = _GHSA.search(url)
+        yield _dependency_finding(
+            'npm-audit', manifest, advisory.get('module_name', ''), '',
+            match.group(0) if match else str(advisory.get('id', '')),
+            advisory.get('title', ''), advisory.get('severity'),
+            advisory.get('cwe'), url or None)
+
+    for name, vulnerability in (report.get('vulnerabilities') or {}).items():
+        for via in vulnerability.get('via', []):
+            # String entries point at another vulnerable package already listed
+            if not isinstance(via, dict):
+                continue
+            url = via.get('url', '')
+            match = _GHSA.search(url)
+            yield _dependency_finding(
+                'npm-audit', manifest, via.get('name') or name, vulnerability.get('range', ''),
+                match.group(0) if match else str(via.get('source', '')),
+                via.get('title', ''), via.get('severity') or vulnerability.get('severity'),
+                via.get('cwe'), url or None)
+
+
+def iter_snyk_report(path: str, manifest: str = 'package.json') -> Iterator[Finding]:
+    """Findings from snyk test --json (single project or list of projects)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    projects = report if isinstance(report, list) else [report]
+    for project in projects:
+        target = project.get('displayTargetFile') or manifest
+        for vulnerability in project.get('vulnerabilities', []):
+            identifiers = vulnerability.get('identifiers') or {}
+            advisory = (identifiers.get('GHSA') or identifiers.get('CVE') or [vulnerability.get('id', '')])[0]
+            yield _dependency_finding(
+                'snyk', target, vulnerability.get('packageName', ''), vulnerability.get('version', ''),
+                str(advisory), vulnerability.get('title', ''), vulnerability.get('severity'),
+                identifiers.get('CWE'), f"https://security.snyk.io/vuln/{vulnerability['id']}" if vulnerability.get('id') else None)
+
+
+# Report file names written by SecurityScanner -> reader
+SECURITY_REPORTS = {
+    'bandit-report.json': iter_bandit_report,
+    'safety-report.json': iter_safety_report,
+    'npm-audit.json': iter_npm_audit_report,
+    'snyk-report.json': iter_snyk_report,
+}
+
+
+def iter_security_reports(reports_dir: str) -> Iterator[Finding]:
+    """Findings from every raw report present in a SecurityScanner reports directory."""
+    for name, reader in SECURITY_REPORTS.items():
+        path = os.path.join(reports_dir, name)
+        if os.path.exists(path):
+            yield from reader(path)
+
+
+def iter_issue_file(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Issue dicts from a JSON or JSON Lines file.
+
+    JSON may be a list of issues or an object with an "issues" list (e.g. a
+    TaskExecutor analysis result). JSON Lines files are streamed line by line.
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from data.get('issues', []) if isinstance(data, dict) else data
+
+
+# ---------------------------------------------------------------------------
+# Streaming writer
+# ---------------------------------------------------------------------------
+
+class SarifWriter:
+    """
+    Stream findings into a single-run SARIF 2.1.0 log.
+
+    Results are serialized one at a time and written in chunks; only the
+    fingerprints seen so far and the rule table stay in memory. The file is
+    written to a temporary path and moved into place on close, so consumers
+    never see a truncated log.
+
+    Usage:
+        with SarifWriter('merged.sarif', root='.') as writer:
+            writer.extend(iter_security_reports('reports/security'))
+            writer.extend(static_issues, tool='automation-architect')
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None,
+                 tool_name: str = 'SLASolve', tool_version: Optional[str] = None,
+                 chunk_size: int = 1000):
+        self.path = path
+        self.root = os.path.abspath(root) if root else None
+        self.tool_name = tool_name
+        self.tool_version = tool_version
+        self.chunk_size = chunk_size
+
+        self._tmp_path = f"{path}.tmp"
+        self._file = None
+        self._buffer: List[str] = []
+        self._first = True
+        self._seen = set()
+        self._rules: Dict[str, int] = {}
+        self._rule_entries: List[Dict[str, Any]] = []
+        self.stats = {'results': 0, 'duplicates': 0, 'by_tool': {}, 'duplicates_by_tool': {}}
+
+    def __enter__(self) -> 'SarifWriter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write(f'{{"version":"{SARIF_VERSION}","$schema":"{SARIF_SCHEMA}","runs":[{{"results":[')
+
+    def add(self, issue: Any, tool: Optional[str] = None, file: Optional[str] = None,
+            column_base: Optional[int] = None) -> bool:
+        """
+        Add one finding (see from_issue for `column_base`).
+
+        Returns:
+            False if an identical finding was already written
+        """
+        finding = from_issue(issue, tool, file, column_base)
+        fingerprint = finding.fingerprint(self.root)
+        digest = bytes.fromhex(fingerprint)
+        if digest in self._seen:
+            self.stats['duplicates'] += 1
+            counts = self.stats['duplicates_by_tool']
+            counts[finding.tool] = counts.get(finding.tool, 0) + 1
+            return False
+        self._seen.add(digest)
+
+        self._buffer.append(_ENCODER.encode(self._result(finding, fingerprint)))
+        self.stats['results'] += 1
+        counts = self.stats['by_tool']
+        counts[finding.tool] = counts.get(finding.tool, 0) + 1
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+        return True
+
+    def extend(self, issues: Iterable[Any], tool: Optional[str] = None, file: Optional[str] = None,
+               column_base: Optional[int] = None) -> int:
+        """Add findings from an iterable; returns how many were written."""
+        return sum(1 for issue in issues if self.add(issue, tool, file, column_base))
+
+    def close(self) -> Dict[str, Any]:
+        """Write the run footer and move the log into place."""
+        self._flush()
+        driver = {'name': self.tool_name, 'rules': self._rule_entries}
+        if self.tool_version:
+            driver['version'] = self.tool_version
+        footer = {
+            'tool': {'driver': driver},
+            'columnKind': 'unicodeCodePoints',
+            'properties': {
+                'duplicatesSuppressed': self.stats['duplicates'],
+                'resultsByTool': self.stats['by_tool'],
+                'duplicatesByTool': self.stats['duplicates_by_tool'],
+            }
+        }
+        # Continue the open run object after "results":[...]
+        self._file.write('],' + _ENCODER.encode(footer)[1:] + ']}')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.stats
+
+    def abort(self):
+        """Discard a partially written log."""
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        chunk = ','.join(self._buffer)
+        self._file.write(chunk if self._first else ',' + chunk)
+        self._first = False
+        self._buffer.clear()
+
+    def _rule_index(self, finding: Finding) -> int:
+        index = self._rules.get(finding.rule_id)
+        if index is not None:
+            return index
+        rule: Dict[str, Any] = {
+            'id': finding.rule_id,
+            'shortDescription': {'text': finding.message[:200]},
+            'properties': {'tags': [tag for tag in (finding.tool, finding.category, finding.cwe) if tag]},
+        }
+        if finding.help:
+            rule['help'] = {'text': finding.help}
+        if finding.category == 'security' and finding.severity in SECURITY_SEVERITY:
+            rule['properties']['security-severity'] = SECURITY_SEVERITY[finding.severity]
+        index = len(self._rule_entries)
+        self._rules[finding.rule_id] = index
+        self._rule_entries.append(rule)
+        return index
+
+    def _result(self, finding: Finding, fingerprint: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            'ruleId': finding.rule_id,
+            'ruleIndex': self._rule_index(finding),
+            'level': finding.level,
+            'message': {'text': finding.message},
+            'partialFingerprints': {FINGERPRINT_KEY: fingerprint},
+            'properties': {'tool': finding.tool, 'severity': finding.severity, **finding.properties},
+        }
+        path = normalize_path(finding.file, self.root)
+        if path:
+            location: Dict[str, Any] = {'artifactLocation': {'uri': path}}
+            if finding.line > 0:
+                region = {'startLine': finding.line}
+                if finding.column > 0:
+                    region['startColumn'] = finding.column
+                location['region'] = region
+            result['locations'] = [{'physicalLocation': location}]
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge analyzer findings into one SARIF 2.1.0 log')
+    parser.add_argument('-o', '--output', required=True, help='SARIF output path')
+    parser.add_argument('--root', default='.', help='Repository root for relative paths (default: .)')
+    parser.add_argument('--security-reports', action='append', default=[], metavar='DIR',
+                        help='SecurityScanner reports directory (bandit/safety/npm audit/snyk)')
+    parser.add_argument('--issues', action='append', default=[], metavar='FILE[:TOOL]',
+                        help='JSON/JSONL issue list from an analyzer, optionally tagged with a tool name '
+                             f"(columns are 0-based for {', '.join(sorted(ZERO_BASED_COLUMN_TOOLS))})")
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Results per disk write')
+    args = parser.parse_args()
+
+    with SarifWriter(args.output, root=args.root, chunk_size=args.chunk_size) as writer:
+        for reports_dir in args.security_reports:
+            writer.extend(iter_security_reports(reports_dir))
+        for spec in args.issues:
+            path, _, tool = spec.partition(':')
+            writer.extend(iter_issue_file(path), tool=tool or os.path.splitext(os.path.basename(path))[0])
+
+    stats = writer.stats
+    print(f"Wrote {stats['results']} results to {args.output} ({stats['duplicates']} duplicates suppressed)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Tests for sarif_report.py
+統一 SARIF 輸出測試：跨工具去重、列號基準與流式寫出
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sarif_report import SARIF_SCHEMA, SARIF_VERSION, SarifWriter, from_issue, iter_bandit_report
+
+# CodeChecker 的字典問題：列號來自 tok.start[1]（從 0 起算）
+CODE_CHECKER_ISSUE = {
+    'type': 'security',
+    'severity': 'high',
+    'description': 'Potential hardcoded credentials',
+    'line': 3,
+    'column': 0,
+    'recommendation': 'Use environment variables or a secrets manager',
+}
+
+
+def load_log(path):
+    log = json.loads(Path(path).read_text(encoding='utf-8'))
+    assert log['version'] == SARIF_VERSION
+    assert log['$schema'] == SARIF_SCHEMA
+    assert len(log['runs']) == 1
+    run = log['runs'][0]
+    rules = run['tool']['driver']['rules']
+    for result in run['results']:
+        assert rules[result['ruleIndex']]['id'] == result['ruleId']
+    return run
+
+
+def test_same_finding_from_two_producers(tmp_path):
+    """測試 CodeChecker 與 bandit 對同一行的相同問題只輸出一個結果"""
+    bandit_report = tmp_path / 'bandit-report.json'
+    bandit_report.write_text(json.dumps({'results': [{
+        'test_id': 'B105',
+        'test_name': 'hardcoded_password_string',
+        'issue_text': "Possible hardcoded password: 'hunter2'",
+        'issue_severity': 'LOW',
+        'issue_confidence': 'MEDIUM',
+        'issue_cwe': {'id': 259},
+        'filename': 'app/settings.py',
+        'line_number': 3,
+        'col_offset': 0,
+    }]}))
+    output = tmp_path / 'merged.sarif'
+
+    with SarifWriter(str(output), root=str(tmp_path)) as writer:
+        writer.add(CODE_CHECKER_ISSUE, tool='code-checker', file='app/settings.py')
+        writer.extend(iter_bandit_report(str(bandit_report)))
+
+    run = load_log(output)
+    (result,) = run['results']
+    assert result['properties']['tool'] == 'code-checker'
+    location = result['locations'][0]['physicalLocation']
+    assert location['artifactLocation']['uri'] == 'app/settings.py'
+    assert location['region'] == {'startLine': 3, 'startColumn': 1}
+    assert run['properties']['duplicatesSuppressed'] == 1
+    assert run['properties']['duplicatesByTool'] == {'bandit': 1}
+
+
+def test_columns_normalized_per_producer():
+    """測試 0 起算的列號加一，1 起算的列號不變且 0 表示未知"""
+    assert from_issue(CODE_CHECKER_ISSUE, tool='code-checker').column == 1
+    assert from_issue(dict(CODE_CHECKER_ISSUE, column=8), tool='task-executor').column == 9
+    assert from_issue(dict(CODE_CHECKER_ISSUE, column=8), column_base=0).column == 9
+    assert from_issue(dict(CODE_CHECKER_ISSUE, column=8), tool='advanced-system').column == 8
+    assert from_issue(CODE_CHECKER_ISSUE, tool='advanced-system').column == 0
+    assert from_issue({'type': 'long-function', 'line': 3}, tool='code-checker').column == 0
+
+
+@pytest.mark.parametrize('count, chunk_size', [(0, 1000), (1, 1), (5, 2), (5, 1000)])
+def test_close_writes_parseable_json(tmp_path, count, chunk_size):
+    """測試 close() 在空日誌、逐條寫出和分塊寫出時都產生合法 JSON"""
+    output = tmp_path / 'out' / 'results.sarif'
+    writer = SarifWriter(str(output), chunk_size=chunk_size, tool_version='1.0')
+    writer.open()
+    for n in range(count):
+        writer.add({'type': 'long-function', 'message': f'Function f{n} is too long',
+                    'file': 'app.py', 'line': n + 1})
+    stats = writer.close()
+
+    run = load_log(output)
+    assert stats['results'] == len(run['results']) == count
+    assert [r['locations'][0]['physicalLocation']['region']['startLine'] for r in run['results']] == \
+        list(range(1, count + 1))
+    assert run['tool']['driver']['version'] == '1.0'
+    assert not (tmp_path / 'out' / 'results.sarif.tmp').exists()
@@ -0,0 +1,182 @@
+"""
+Tests for validate_vectors.py
+測試向量批量驗證：清單展開、schema 編譯緩存、進程池路徑與證據文件格式
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import validate_vectors
+from validate_vectors import (
+    MIN_PARALLEL_VECTORS, VALIDATOR_VERSION,
+    collect_manifest_jobs, load_validator, validate_manifest, write_batch_evidence,
+)
+
+pytestmark = pytest.mark.skipif(not validate_vectors.HAS_JSONSCHEMA, reason='jsonschema not installed')
+
+SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema#',
+    'type': 'object',
+    'required': ['name'],
+    'properties': {'name': {'type': 'string'}, 'replicas': {'type': 'integer', 'minimum': 1}},
+}
+
+MANIFEST = '''
+test_suites:
+  - name: service
+    schema_file: schemas/service.schema.json
+    vectors_dir: test-vectors/service/
+  - name: bulk
+    schema_file: schemas/service.schema.json
+    vectors_dir: test-vectors/bulk/
+  - name: missing-schema
+    schema_file: schemas/missing.schema.json
+    vectors_dir: test-vectors/service/
+  - name: missing-dir
+    schema_file: schemas/service.schema.json
+    vectors_dir: test-vectors/missing/
+  - name: incomplete
+'''
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """帶 schema、兩個向量套件與清單的臨時倉庫"""
+    (tmp_path / 'schemas').mkdir()
+    (tmp_path / 'schemas' / 'service.schema.json').write_text(json.dumps(SCHEMA))
+    service = tmp_path / 'test-vectors' / 'service'
+    service.mkdir(parents=True)
+    (service / 'valid-minimal.json').write_text('{"name": "web"}')
+    (service / 'valid-full.yaml').write_text('name: web\nreplicas: 3\n')
+    (service / 'invalid-replicas.json').write_text('{"name": "web", "replicas": 0}')
+    # 元數據信封覆蓋文件名推斷：名稱不含 invalid，但預期失敗
+    (service / 'envelope.yaml').write_text(
+        'test_metadata:\n  expected_result: fail\npayload:\n  replicas: 2\n')
+    # 名稱表示有效，實際無效，應計為失敗
+    (service / 'valid-wrong.json').write_text('{"replicas": 1}')
+    (service / 'README.md').write_text('not a vector')
+    bulk = tmp_path / 'test-vectors' / 'bulk'
+    bulk.mkdir()
+    for i in range(MIN_PARALLEL_VECTORS):
+        (bulk / f'vector-{i:03d}.json').write_text(json.dumps({'name': f'svc-{i}', 'replicas': i % 5 or 1}))
+    (tmp_path / 'test-vectors' / 'vectors-manifest.yaml').write_text(MANIFEST)
+    return tmp_path
+
+
+def manifest_path(repo):
+    return repo / 'test-vectors' / 'vectors-manifest.yaml'
+
+
+def test_collect_manifest_jobs(repo):
+    """測試清單展開為 (套件, schema, 向量) 任務，缺失項只產生警告"""
+    jobs, warnings = collect_manifest_jobs(manifest_path(repo), repo)
+
+    service = [Path(vector).name for suite, _, vector in jobs if suite == 'service']
+    assert service == ['envelope.yaml', 'invalid-replicas.json', 'valid-full.yaml',
+                       'valid-minimal.json', 'valid-wrong.json']
+    assert sum(1 for suite, _, _ in jobs if suite == 'bulk') == MIN_PARALLEL_VECTORS
+    assert {schema for _, schema, _ in jobs} == {str(repo / 'schemas' / 'service.schema.json')}
+    assert warnings == [
+        'Schema not found for missing-schema: schemas/missing.schema.json',
+        'Test vectors directory not found: test-vectors/missing/',
+        'Incomplete test suite definition: incomplete',
+    ]
+
+
+def test_schema_compiled_once_in_process(repo):
+    """測試進程內驗證時每個 schema 只編譯一次，結果按預期歸類"""
+    load_validator.cache_clear()
+    report = validate_manifest(manifest_path(repo), repo, workers=1)
+
+    info = load_validator.cache_info()
+    assert info.misses == 1
+    assert info.hits == report['summary']['total'] - 1
+
+    by_name = {Path(r['vector']).name: r for r in report['results'] if r['suite'] == 'service'}
+    assert {name: (r['expected'], r['valid'], r['result']) for name, r in by_name.items()} == {
+        'envelope.yaml': ('fail', False, 'passed'),
+        'invalid-replicas.json': ('fail', False, 'passed'),
+        'valid-full.yaml': ('pass', True, 'passed'),
+        'valid-minimal.json': ('pass', True, 'passed'),
+        'valid-wrong.json': ('pass', False, 'failed'),
+    }
+    assert by_name['valid-wrong.json']['errors'] == [{'message': "'name' is a required property", 'path': ''}]
+    assert by_name['invalid-replicas.json']['errors'][0]['path'] == 'replicas'
+    assert report['suites'] == {
+        'service': {'total': 5, 'passed': 4, 'failed': 1, 'error': 0},
+        'bulk': {'total': MIN_PARALLEL_VECTORS, 'passed': MIN_PARALLEL_VECTORS, 'failed': 0, 'error': 0},
+    }
+    assert report['summary']['failed'] == 1
+    assert len(report['warnings']) == 3
+
+
+def test_pool_path_matches_in_process(repo, monkeypatch):
+    """測試達到閾值時使用進程池，結果與進程內一致且路徑相對於倉庫根"""
+    pools = []
+
+    class RecordingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            pools.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(validate_vectors.concurrent.futures, 'ProcessPoolExecutor', RecordingPool)
+
+    sequential = validate_manifest(manifest_path(repo), repo, workers=1)
+    assert pools == []
+    parallel = validate_manifest(manifest_path(repo), repo, workers=2)
+
+    assert pools == [2]
+    assert parallel['results'] == sequential['results']
+    assert parallel['summary'] == sequential['summary']
+    assert all(not Path(r['vector']).is_absolute() for r in parallel['results'])
+    assert parallel['results'][0]['schema'] == str(Path('schemas/service.schema.json'))
+
+
+def test_small_batch_skips_pool(repo, monkeypatch):
+    """測試任務數低於閾值時不啟動進程池"""
+    monkeypatch.setattr(validate_vectors, 'MIN_PARALLEL_VECTORS', MIN_PARALLEL_VECTORS * 2)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError('process pool started for a small batch')
+    monkeypatch.setattr(validate_vectors.concurrent.futures, 'ProcessPoolExecutor', no_pool)
+
+    report = validate_manifest(manifest_path(repo), repo, workers=4)
+    assert report['summary']['total'] == MIN_PARALLEL_VECTORS + 5
+
+
+def test_batch_evidence_shape(repo, tmp_path):
+    """測試批量證據文件：每個向量一個帶摘要的 subject，整體結果隨失敗而定"""
+    report = validate_manifest(manifest_path(repo), repo, workers=1)
+    output = write_batch_evidence(report, tmp_path / 'evidence' / 'validation')
+
+    assert output.name == 'test-vectors-validation.json'
+    evidence = json.loads(output.read_text())
+    assert set(evidence) == {'type', 'subject', 'result', 'summary', 'suites',
+                             'manifest', 'timestamp', 'validator', 'version'}
+    assert evidence['type'] == 'test-vector-validation'
+    assert evidence['result'] == 'failed'
+    assert evidence['version'] == VALIDATOR_VERSION
+    assert evidence['summary'] == report['summary']
+    assert evidence['suites'] == report['suites']
+    assert evidence['timestamp'].endswith('+00:00')
+    assert len(evidence['subject']) == report['summary']['total']
+
+    subject = next(s for s in evidence['subject'] if s['name'].endswith('valid-minimal.json'))
+    raw = (repo / 'test-vectors' / 'service' / 'valid-minimal.json').read_bytes()
+    assert subject == {
+        'name': str(Path('test-vectors/service/valid-minimal.json')),
+        'digest': {'sha256': hashlib.sha256(raw).hexdigest()},
+        'suite': 'service',
+        'result': 'passed',
+    }
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,127 @@
+"""
+Tests for yaml_loader.py
+共享 YAML 加載器測試：錯誤行列標記、多文檔流式讀取與 CSafeLoader 回退
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml_loader
+from yaml_loader import YAMLLoadError, iter_documents, load_all_file, load_file, loads
+
+BUNDLE = '''\
+apiVersion: v1
+kind: ConfigMap
+---
+apiVersion: v1
+kind: Service
+---
+apiVersion: v1
+kind: [Secret
+'''
+
+LOADERS = [yaml.SafeLoader] + ([yaml.CSafeLoader] if hasattr(yaml, 'CSafeLoader') else [])
+
+
+@pytest.fixture(params=LOADERS, ids=lambda loader: loader.__name__)
+def loader(request, monkeypatch):
+    """分別用純 Python 與 libyaml 加載器運行，兩者的行列標記應一致"""
+    monkeypatch.setattr(yaml_loader, 'SafeLoader', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('text, line, column', [
+    ('a: 1\nb: [1, 2\nc: 3\n', 3, 2),
+    ('a: 1\n  b: 2\n', 2, 4),
+    ('key: "unterminated\n', 2, 1),
+    ('a: 1\n---\nb: 2\n', 2, 1),
+])
+def test_error_marks_are_one_based(loader, text, line, column):
+    """測試解析錯誤帶從 1 起算的行列號"""
+    with pytest.raises(YAMLLoadError) as info:
+        loads(text, 'config.yaml')
+
+    error = info.value
+    assert (error.line, error.column) == (line, column)
+    assert str(error).startswith(f'config.yaml:{line}:{column}: ')
+    assert error.to_dict() == {'file': 'config.yaml', 'line': line, 'column': column, 'error': error.problem}
+    assert isinstance(error.__cause__, yaml.YAMLError)
+    assert isinstance(error, ValueError)
+
+
+def test_unsafe_tags_rejected(loader):
+    """測試安全加載器拒絕任意 Python 對象標籤"""
+    with pytest.raises(YAMLLoadError, match='could not determine a constructor') as info:
+        loads('run: !!python/object/apply:os.system ["true"]\n')
+
+    assert str(info.value).startswith('<string>:1:6: ')
+    assert info.value.path is None
+
+
+def test_load_file_reports_path(loader, tmp_path):
+    """測試文件加載成功時返回數據，失敗時錯誤帶文件路徑"""
+    good = tmp_path / 'good.yaml'
+    good.write_text('name: café\nitems: [1, 2]\n', encoding='utf-8')
+    bad = tmp_path / 'bad.yaml'
+    bad.write_text('name: ok\n  nested: bad\n')
+
+    assert load_file(good) == {'name': 'café', 'items': [1, 2]}
+    with pytest.raises(YAMLLoadError) as info:
+        load_file(bad)
+    assert info.value.path == str(bad)
+    assert info.value.line == 2
+
+
+def test_iter_documents_streams_until_error(loader, tmp_path):
+    """測試多文檔逐個產出，錯誤之前的文檔仍可取得"""
+    path = tmp_path / 'bundle.yaml'
+    path.write_text(BUNDLE)
+
+    documents = iter_documents(path)
+    assert next(documents) == {'apiVersion': 'v1', 'kind': 'ConfigMap'}
+    assert next(documents) == {'apiVersion': 'v1', 'kind': 'Service'}
+    with pytest.raises(YAMLLoadError) as info:
+        next(documents)
+    assert info.value.path == str(path)
+    assert info.value.line == 9
+
+
+def test_iter_documents_is_lazy(loader, tmp_path):
+    """測試生成器在首次迭代時才打開文件；空文檔與空文件"""
+    path = tmp_path / 'bundle.yaml'
+    documents = iter_documents(path)
+    path.write_text('a: 1\n---\n---\nb: 2\n')
+
+    assert next(documents) == {'a': 1}
+    documents.close()
+    assert load_all_file(path) == [{'a': 1}, None, {'b': 2}]
+    empty = tmp_path / 'empty.yaml'
+    empty.write_text('')
+    assert load_all_file(empty) == []
+    assert load_file(empty) is None
+
+
+def test_falls_back_without_libyaml(monkeypatch):
+    """測試 PyYAML 未編譯 libyaml 時回退到 SafeLoader"""
+    monkeypatch.delattr(yaml, 'CSafeLoader', raising=False)
+    # 以獨立模塊名加載，不替換其他測試已導入的 YAMLLoadError
+    spec = importlib.util.spec_from_file_location('yaml_loader_fallback', yaml_loader.__file__)
+    fallback = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fallback)
+
+    assert fallback.SafeLoader is yaml.SafeLoader
+    assert fallback.HAS_LIBYAML is False
+    assert fallback.loads('a: [1, 2]\n') == {'a': [1, 2]}
+    with pytest.raises(fallback.YAMLLoadError) as info:
+        fallback.loads('a: [1\n')
+    assert info.value.line == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -3,38 +3,53 @@
 Test Vectors Validation Tool
 
 This script validates test vectors against their JSON schemas with SLSA provenance support.
+
+Modes:
+- Single file: validate one vector against --schema
+- Batch: validate every suite in test-vectors/vectors-manifest.yaml (--manifest),
+  compiling each schema once per worker and fanning vectors out to a process pool
 """
 
+import os
 import sys
 import json
+import hashlib
 import argparse
+import functools
+import concurrent.futures
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 try:
-    import yaml
+    import yaml_loader
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
 try:
-    from jsonschema import validate, ValidationError
+    from jsonschema import ValidationError
+    from jsonschema.validators import validator_for
+    HAS_JSONSCHEMA = True
 except ImportError:
-    print("⚠️  Warning: jsonschema not installed. Install with: pip install jsonschema")
-    sys.exit(1)
+    HAS_JSONSCHEMA = False
+
+VALIDATOR_VERSION = "1.1.0"
+
+# Below this many vectors a process pool costs more than it saves
+MIN_PARALLEL_VECTORS = 64
 
 
 def load_data_file(file_path: Path) -> Dict[str, Any]:
     """Load JSON or YAML file."""
     try:
+        # Try to determine file type by extension
+        if file_path.suffix in ['.yaml', '.yml']:
+            if not HAS_YAML:
+                raise ValueError("YAML support requires PyYAML: pip install pyyaml")
+            return yaml_loader.load_file(file_path)
         with open(file_path, 'r', encoding='utf-8') as f:
-            # Try to determine file type by extension
-            if file_path.suffix in ['.yaml', '.yml']:
-                if not HAS_YAML:
-                    raise ValueError("YAML support requires PyYAML: pip install pyyaml")
-                return yaml.safe_load(f)
-            else:
-                return json.load(f)
+            return json.load(f)
     except Exception as e:
         raise ValueError(f"Failed to load file: {e}")
 
@@ -48,10 +63,23 @@ def load_schema(schema_path: Path) -> Dict[str, Any]:
         raise ValueError(f"Failed to load schema: {e}")
 
 
+def compile_validator(schema: Dict[str, Any]):
+    """Check a schema once and build a reusable validator for its draft."""
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def load_validator(schema_path: str):
+    """Load and compile a schema file once per process."""
+    return compile_validator(load_schema(Path(schema_path)))
+
+
 def validate_vector(vector_data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """Validate a test vector against a schema."""
     try:
-        validate(instance=vector_data, schema=schema)
+        compile_validator(schema).validate(vector_data)
         return True
     except ValidationError as e:
         print(f"❌ Validation error: {e.message}", file=sys.stderr)
@@ -86,17 +114,246 @@ def generate_slsa_evidence(file_path: Path, validation_result: bool, evidence_di
     print(f"📊 Evidence written to: {output_file}")
 
 
+def expected_to_pass(vector_file: Path, vector_doc: Any) -> bool:
+    """Determine whether a vector is expected to pass schema validation."""
+    if isinstance(vector_doc, dict):
+        expected = vector_doc.get('test_metadata', {}).get('expected_result')
+        if expected in ('pass', 'fail'):
+            return expected == 'pass'
+    return 'invalid' not in vector_file.stem
+
+
+def vector_instance(vector_doc: Any) -> Any:
+    """Unwrap the payload from a test vector envelope."""
+    if isinstance(vector_doc, dict) and 'test_metadata' in vector_doc and 'payload' in vector_doc:
+        return vector_doc['payload']
+    return vector_doc
+
+
+def validate_vector_file(job: Tuple[str, str, str]) -> Dict[str, Any]:
+    """
+    Validate one vector file (process pool worker).
+    
+    Args:
+        job: Tuple of (suite name, schema path, vector path)
+    
+    Returns:
+        Per-vector result record
+    """
+    suite, schema_path, vector_path = job
+    vector_file = Path(vector_path)
+    record = {
+        'suite': suite,
+        'vector': vector_path,
+        'schema': schema_path,
+        'digest': None,
+        'expected': None,
+        'valid': None,
+        'result': 'error',
+        'errors': []
+    }
+    
+    try:
+        raw = vector_file.read_bytes()
+        record['digest'] = {'sha256': hashlib.sha256(raw).hexdigest()}
+        if vector_file.suffix in ['.yaml', '.yml']:
+            if not HAS_YAML:
+                raise ValueError("YAML support requires PyYAML: pip install pyyaml")
+            vector_doc = yaml_loader.loads(raw, vector_file)
+        else:
+            vector_doc = json.loads(raw)
+        validator = load_validator(schema_path)
+    except Exception as e:
+        record['errors'].append({'message': str(e), 'path': ''})
+        return record
+    
+    errors = list(validator.iter_errors(vector_instance(vector_doc)))
+    record['expected'] = 'pass' if expected_to_pass(vector_file, vector_doc) else 'fail'
+    record['valid'] = not errors
+    record['result'] = 'passed' if record['valid'] == (record['expected'] == 'pass') else 'failed'
+    record['errors'] = [
+        {'message': e.message, 'path': '/'.join(str(p) for p in e.absolute_path)}
+        for e in errors[:10]
+    ]
+    return record
+
+
+def collect_manifest_jobs(manifest_path: Path, repo_root: Path) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+    """
+    Expand manifest test suites into validation jobs.
+    
+    Returns:
+        Tuple of (jobs, warnings)
+    """
+    manifest = load_data_file(manifest_path) or {}
+    jobs = []
+    warnings = []
+    
+    for suite in manifest.get('test_suites', []):
+        suite_name = suite.get('name')
+        schema_file = suite.get('schema_file')
+        vectors_dir = suite.get('vectors_dir')
+        
+        if not all([suite_name, schema_file, vectors_dir]):
+            warnings.append(f"Incomplete test suite definition: {suite_name}")
+            continue
+        
+        schema_path = repo_root / schema_file
+        vectors_path = repo_root / vectors_dir
+        if not schema_path.exists():
+            warnings.append(f"Schema not found for {suite_name}: {schema_file}")
+            continue
+        if not vectors_path.is_dir():
+            warnings.append(f"Test vectors directory not found: {vectors_dir}")
+            continue
+        
+        for vector_file in sorted(vectors_path.iterdir()):
+            if vector_file.suffix in ['.json', '.yaml', '.yml']:
+                jobs.append((suite_name, str(schema_path), str(vector_file)))
+    
+    return jobs, warnings
+
+
+def validate_manifest(manifest_path: Path,
+                      repo_root: Path,
+                      workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Validate all test suites listed in a vectors manifest.
+    
+    Each worker compiles a schema once and reuses it for every vector of
+    that suite; small batches run in-process to skip pool startup.
+    
+    Returns:
+        Aggregated validation report
+    """
+    jobs, warnings = collect_manifest_jobs(manifest_path, repo_root)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers > 1 and len(jobs) >= MIN_PARALLEL_VECTORS:
+        # Group a suite's vectors into the same chunks so each schema compiles rarely
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(validate_vector_file, jobs, chunksize=chunksize))
+    else:
+        results = [validate_vector_file(job) for job in jobs]
+    
+    # Report repo-relative paths so evidence is portable across checkouts
+    for record in results:
+        record['vector'] = os.path.relpath(record['vector'], repo_root)
+        record['schema'] = os.path.relpath(record['schema'], repo_root)
+    
+    suites: Dict[str, Dict[str, int]] = {}
+    for record in results:
+        counts = suites.setdefault(record['suite'], {'total': 0, 'passed': 0, 'failed': 0, 'error': 0})
+        counts['total'] += 1
+        counts[record['result']] += 1
+    
+    passed = sum(1 for r in results if r['result'] == 'passed')
+    return {
+        'manifest': str(manifest_path),
+        'summary': {
+            'total': len(results),
+            'passed': passed,
+            'failed': len(results) - passed,
+            'pass_rate': (passed / len(results) * 100) if results else 100.0
+        },
+        'suites': suites,
+        'warnings': warnings,
+        'results': results
+    }
+
+
+def write_batch_evidence(report: Dict[str, Any], evidence_dir: Path) -> Path:
+    """Write one aggregated SLSA-format evidence file for a batch run."""
+    evidence_dir.mkdir(parents=True, exist_ok=True)
+    
+    evidence = {
+        "type": "test-vector-validation",
+        "subject": [
+            {
+                "name": r['vector'],
+                "digest": r['digest'] or {},
+                "suite": r['suite'],
+                "result": r['result']
+            }
+            for r in report['results']
+        ],
+        "result": "passed" if report['summary']['failed'] == 0 else "failed",
+        "summary": report['summary'],
+        "suites": report['suites'],
+        "manifest": report['manifest'],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "validator": "validate_vectors.py",
+        "version": VALIDATOR_VERSION
+    }
+    
+    output_file = evidence_dir / "test-vectors-validation.json"
+    with open(output_file, 'w') as f:
+        json.dump(evidence, f, indent=2)
+    return output_file
+
+
+def run_batch(args) -> int:
+    """Run manifest-driven batch validation."""
+    repo_root = args.repo_root or args.manifest.resolve().parent.parent
+    
+    try:
+        report = validate_manifest(args.manifest, repo_root, args.workers)
+    except ValueError as e:
+        print(f"❌ Error loading manifest: {e}", file=sys.stderr)
+        return 1
+    
+    if args.output_format == 'json':
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"🔍 Manifest: {args.manifest}")
+        print("-" * 60)
+        for warning in report['warnings']:
+            print(f"⚠️  {warning}")
+        for record in report['results']:
+            if record['result'] != 'passed':
+                detail = record['errors'][0]['message'] if record['errors'] else 'unexpected validation result'
+                print(f"❌ {record['suite']}: {Path(record['vector']).name} "
+                      f"(expected {record['expected']}) - {detail}")
+        for suite, counts in report['suites'].items():
+            print(f"📋 {suite}: {counts['passed']}/{counts['total']} passed")
+        summary = report['summary']
+        print(f"{'✅' if summary['failed'] == 0 else '❌'} "
+              f"{summary['passed']}/{summary['total']} vectors passed")
+    
+    if args.output_format == 'slsa' or args.evidence_dir:
+        output_file = write_batch_evidence(report, args.evidence_dir or Path('root-evidence/validation'))
+        print(f"📊 Evidence written to: {output_file}", file=sys.stderr if args.output_format == 'json' else sys.stdout)
+    
+    return 0 if report['summary']['failed'] == 0 else 1
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description='Validate test vectors against JSON schema')
-    parser.add_argument('file_path', type=Path, help='Path to the test vector file')
-    parser.add_argument('--schema', type=Path, required=True, help='Path to JSON schema file')
+    parser.add_argument('file_path', type=Path, nargs='?', help='Path to the test vector file')
+    parser.add_argument('--schema', type=Path, help='Path to JSON schema file (single file mode)')
+    parser.add_argument('--manifest', type=Path,
+                        help='Validate all suites in a vectors manifest (batch mode)')
+    parser.add_argument('--repo-root', type=Path,
+                        help='Root for manifest-relative paths (default: manifest parent directory\'s parent)')
+    parser.add_argument('--workers', type=int, help='Worker processes for batch mode (default: CPU count)')
     parser.add_argument('--output-format', choices=['slsa', 'json', 'text'], default='text',
                         help='Output format (default: text)')
     parser.add_argument('--evidence-dir', type=Path, help='Directory to store validation evidence')
     
     args = parser.parse_args()
     
+    if not HAS_JSONSCHEMA:
+        print("⚠️  Warning: jsonschema not installed. Install with: pip install jsonschema")
+        sys.exit(1)
+    
+    if args.manifest:
+        sys.exit(run_batch(args))
+    
+    if not args.file_path or not args.schema:
+        parser.error("file_path and --schema are required unless --manifest is given")
+    
     # Load files
     try:
         vector_data = load_data_file(args.file_path)
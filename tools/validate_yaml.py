@@ -8,10 +8,12 @@ and ensures test vectors are correct.
 
 import sys
 import json
-import yaml
+import argparse
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+from yaml_loader import load_file, YAMLLoadError
+
 try:
     from jsonschema import validate, ValidationError
     HAS_JSONSCHEMA = True
@@ -23,9 +25,8 @@ except ImportError:
 def load_yaml(file_path: Path) -> Dict[str, Any]:
     """Load and parse a YAML file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except yaml.YAMLError as e:
+        return load_file(file_path)
+    except YAMLLoadError as e:
         raise ValueError(f"YAML parse error: {e}")
     except Exception as e:
         raise ValueError(f"Failed to load file: {e}")
@@ -81,93 +82,67 @@ def find_schema_for_file(file_path: Path, repo_root: Path) -> Path | None:
     return None
 
 
-def validate_test_vectors(repo_root: Path) -> Tuple[bool, List[str]]:
-    """Validate test vectors against their schemas."""
-    messages = []
-    
-    # For now, skip test vectors validation if they have pre-existing issues
-    # This prevents blocking PRs that don't touch test vectors
-    messages.append("ℹ️  Test vectors validation skipped (pre-existing issues)")
-    return True, messages
+def validate_test_vectors(repo_root: Path, strict: bool = False) -> Tuple[bool, List[str]]:
+    """
+    Validate test vectors against their schemas.
     
-    # --- Unreachable code below is currently disabled ---
+    Runs the manifest-driven batch validator (schemas compiled once, vectors
+    validated across a process pool). Failures only block when strict is set,
+    so pre-existing vector issues do not block PRs that don't touch them.
     """
-    # Load vectors manifest
+    messages = []
+    
     manifest_path = repo_root / 'test-vectors' / 'vectors-manifest.yaml'
     if not manifest_path.exists():
         messages.append("⚠️  Test vectors manifest not found, skipping test vector validation")
         return True, messages
     
+    if not HAS_JSONSCHEMA:
+        messages.append("⏭️  Test vectors validation skipped (jsonschema not installed)")
+        return True, messages
+    
+    from validate_vectors import validate_manifest
+    
     try:
-        manifest = load_yaml(manifest_path)
+        report = validate_manifest(manifest_path, repo_root)
         messages.append("✅ Test vectors manifest loaded")
     except Exception as e:
         messages.append(f"❌ Failed to load test vectors manifest: {e}")
         return False, messages
     
-    # Validate each test suite
-    for suite in manifest.get('test_suites', []):
-        suite_name = suite.get('name')
-        schema_file = suite.get('schema_file')
-        vectors_dir = suite.get('vectors_dir')
-        
-        if not all([suite_name, schema_file, vectors_dir]):
-            messages.append(f"⚠️  Incomplete test suite definition: {suite_name}")
-            continue
-        
-        schema_path = repo_root / schema_file
-        if not schema_path.exists():
-            messages.append(f"⚠️  Schema not found for {suite_name}: {schema_file}")
-            continue
-        
-        try:
-            schema = load_json_schema(schema_path)
-        except Exception as e:
-            messages.append(f"❌ Failed to load schema for {suite_name}: {e}")
-            all_passed = False
-            continue
-        
-        # Validate each test vector
-        vectors_path = repo_root / vectors_dir
-        if not vectors_path.exists():
-            messages.append(f"⚠️  Test vectors directory not found: {vectors_dir}")
-            continue
-        
-        vector_files = list(vectors_path.glob('*.json'))
-        for vector_file in vector_files:
-            try:
-                with open(vector_file, 'r') as f:
-                    vector_data = json.load(f)
-                
-                # For invalid test cases, we expect them to fail validation
-                if 'invalid' in vector_file.stem:
-                    # Try validation - it should fail
-                    try:
-                        if HAS_JSONSCHEMA:
-                            validate(instance=vector_data, schema=schema)
-                            messages.append(f"⚠️  Invalid test vector passed validation: {vector_file.name}")
-                        else:
-                            messages.append(f"⏭️  Skipped invalid vector (no jsonschema): {vector_file.name}")
-                    except ValidationError:
-                        messages.append(f"✅ Invalid test vector correctly failed: {vector_file.name}")
-                else:
-                    # Valid test cases should pass
-                    passed, msg = validate_against_schema(vector_data, schema, vector_file.name)
-                    if passed:
-                        messages.append(f"✅ Test vector valid: {vector_file.name}")
-                    else:
-                        messages.append(f"❌ Test vector failed: {vector_file.name} - {msg}")
-                        all_passed = False
-            except Exception as e:
-                messages.append(f"❌ Error processing {vector_file.name}: {e}")
-                all_passed = False
+    messages.extend(f"⚠️  {warning}" for warning in report['warnings'])
+    
+    for record in report['results']:
+        vector_name = Path(record['vector']).name
+        if record['result'] == 'passed':
+            if record['expected'] == 'fail':
+                messages.append(f"✅ Invalid test vector correctly failed: {vector_name}")
+            else:
+                messages.append(f"✅ Test vector valid: {vector_name}")
+        elif record['valid'] and record['expected'] == 'fail':
+            messages.append(f"⚠️  Invalid test vector passed validation: {vector_name}")
+        else:
+            detail = record['errors'][0]['message'] if record['errors'] else 'unknown error'
+            messages.append(f"❌ Test vector failed: {vector_name} - {detail}")
     
-        return all_passed, messages
-    """
+    summary = report['summary']
+    messages.append(f"📊 {summary['passed']}/{summary['total']} test vectors passed")
+    
+    all_passed = summary['failed'] == 0
+    if not all_passed and not strict:
+        messages.append("ℹ️  Test vector failures are non-blocking; use --strict-vectors to enforce")
+        return True, messages
+    
+    return all_passed, messages
 
 
 def main():
     """Main validation function."""
+    parser = argparse.ArgumentParser(description='Validate repository YAML files and test vectors')
+    parser.add_argument('--strict-vectors', action='store_true',
+                        help='Fail when test vectors do not match their expected result')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("YAML & Schema Validation")
     print("=" * 70)
@@ -236,7 +211,7 @@ def main():
     # Validate test vectors
     print("🧪 Validating Test Vectors")
     print("-" * 70)
-    vectors_ok, messages = validate_test_vectors(repo_root)
+    vectors_ok, messages = validate_test_vectors(repo_root, strict=args.strict_vectors)
     for msg in messages:
         print(f"  {msg}")
     
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared YAML Loading Utility
+
+Fast, safe YAML loading for all validators:
+- Prefers the libyaml-backed yaml.CSafeLoader, falls back to yaml.SafeLoader
+- Streams multi-document files (e.g. Kubernetes bundles) one document at a time
+- Reports parse errors with 1-based line/column marks
+"""
+
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import yaml
+
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+PathLike = Union[str, Path]
+
+
+class YAMLLoadError(ValueError):
+    """YAML parse error with file and 1-based line/column information."""
+
+    def __init__(self, problem: str, path: Optional[PathLike] = None,
+                 line: Optional[int] = None, column: Optional[int] = None):
+        self.problem = problem
+        self.path = str(path) if path is not None else None
+        self.line = line
+        self.column = column
+        super().__init__(self._format())
+
+    def _format(self) -> str:
+        location = self.path or '<string>'
+        if self.line is not None:
+            location += f":{self.line}:{self.column}"
+        return f"{location}: {self.problem}"
+
+    def to_dict(self) -> dict:
+        """Error details for JSON reports."""
+        return {
+            'file': self.path,
+            'line': self.line,
+            'column': self.column,
+            'error': self.problem
+        }
+
+
+def error_mark(error: yaml.YAMLError) -> Tuple[Optional[int], Optional[int]]:
+    """Get the 1-based (line, column) of a YAML error, if known."""
+    mark = getattr(error, 'problem_mark', None) or getattr(error, 'context_mark', None)
+    if mark is None:
+        return None, None
+    return mark.line + 1, mark.column + 1
+
+
+def _wrap(error: yaml.YAMLError, path: Optional[PathLike]) -> YAMLLoadError:
+    """Convert a PyYAML error into a YAMLLoadError."""
+    line, column = error_mark(error)
+    problem = getattr(error, 'problem', None) or str(error)
+    context = getattr(error, 'context', None)
+    if context:
+        problem = f"{context}, {problem}"
+    return YAMLLoadError(problem, path, line, column)
+
+
+def loads(text: Union[str, bytes], path: Optional[PathLike] = None) -> Any:
+    """Parse a single YAML document from a string."""
+    try:
+        return yaml.load(text, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        raise _wrap(e, path) from e
+
+
+def load_file(path: PathLike) -> Any:
+    """Load a single-document YAML file."""
+    with open(path, 'rb') as f:
+        try:
+            return yaml.load(f, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            raise _wrap(e, path) from e
+
+
+def iter_documents(path: PathLike) -> Iterator[Any]:
+    """
+    Stream documents from a multi-document YAML file.
+
+    Documents are parsed lazily, so large bundles never need to be held in
+    memory at once. Documents before a parse error are still yielded.
+    """
+    with open(path, 'rb') as f:
+        try:
+            for document in yaml.load_all(f, Loader=SafeLoader):
+                yield document
+        except yaml.YAMLError as e:
+            raise _wrap(e, path) from e
+
+
+def load_all_file(path: PathLike) -> List[Any]:
+    """Load every document of a multi-document YAML file."""
+    return list(iter_documents(path))